@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Candle store with gap detection and targeted backfill.
+
+Bars are kept per (symbol, timeframe) keyed by open time. Before serving a
+window the store checks bar timestamps for holes (disconnects, restarts,
+sleep) and fetches exactly the missing ranges: nearby gaps are merged into one
+request when that saves a call, each request is capped at the exchange kline
+limit, and symbols are refreshed concurrently. Per-symbol quality counters
+record detected, filled and unfilled gaps.
+"""
+
+import asyncio
+import time
+from collections.abc import Iterable
+from typing import Any
+
+TIMEFRAME_MS: dict[str, int] = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+# Binance USDⓈ-M /fapi/v1/klines max limit per request
+MAX_KLINES_PER_REQUEST = 1500
+
+
+class CandleStore:
+    """OHLCV cache that keeps windows contiguous with minimal REST calls."""
+
+    def __init__(
+        self,
+        exchange,
+        max_bars: int = 1000,
+        max_batch: int = MAX_KLINES_PER_REQUEST,
+        max_concurrency: int = 4,
+    ):
+        self.exchange = exchange
+        self.max_bars = max_bars
+        self.max_batch = max_batch
+        self.max_concurrency = max_concurrency
+        self._bars: dict[tuple[str, str], dict[int, list[float]]] = {}
+        # Ranges the exchange had no data for (listing start, halts): not refetched every cycle
+        self._history_floor: dict[tuple[str, str], int] = {}
+        self._dead_gaps: dict[tuple[str, str], set[tuple[int, int]]] = {}
+        self.quality: dict[str, dict[str, int]] = {}
+
+    # ---------- helpers ----------
+    @staticmethod
+    def timeframe_ms(timeframe: str) -> int:
+        try:
+            return TIMEFRAME_MS[timeframe]
+        except KeyError as e:
+            raise ValueError(f"Unsupported timeframe: {timeframe}") from e
+
+    def _quality(self, symbol: str) -> dict[str, int]:
+        return self.quality.setdefault(
+            symbol,
+            {
+                "gaps_detected": 0,
+                "bars_backfilled": 0,
+                "backfill_requests": 0,
+                "failed_requests": 0,
+                "unfilled_gaps": 0,
+            },
+        )
+
+    def ingest(self, symbol: str, timeframe: str, bars: Iterable[list[float]]) -> int:
+        """Merge bars by open time (newer data overwrites), trimming to max_bars. Returns bars merged."""
+        series = self._bars.setdefault((symbol, timeframe), {})
+        count = 0
+        for bar in bars or []:
+            try:
+                series[int(bar[0])] = list(bar)
+                count += 1
+            except (TypeError, ValueError, IndexError):
+                continue
+        if len(series) > self.max_bars:
+            for ts in sorted(series)[: len(series) - self.max_bars]:
+                del series[ts]
+        return count
+
+    def bars(self, symbol: str, timeframe: str, limit: int | None = None) -> list[list[float]]:
+        series = self._bars.get((symbol, timeframe), {})
+        ordered = [series[ts] for ts in sorted(series)]
+        return ordered[-limit:] if limit else ordered
+
+    def find_gaps(self, symbol: str, timeframe: str) -> list[tuple[int, int]]:
+        """Missing open-time ranges [start, end] (inclusive) between stored bars."""
+        step = self.timeframe_ms(timeframe)
+        stamps = sorted(self._bars.get((symbol, timeframe), {}))
+        gaps = []
+        for prev, cur in zip(stamps, stamps[1:], strict=False):
+            if cur - prev > step:
+                gaps.append((prev + step, cur - step))
+        return gaps
+
+    def _plan_requests(self, ranges: list[tuple[int, int]], step: int) -> list[tuple[int, int]]:
+        """Turn missing ranges into (since, limit) requests.
+
+        Adjacent ranges are merged when the combined span fits in one request, since
+        refetching a few known bars is cheaper than an extra call; long ranges are chunked.
+        """
+        requests: list[tuple[int, int]] = []
+        cur_start: int | None = None
+        cur_end = 0
+        for start, end in sorted(ranges):
+            if cur_start is not None and (end - cur_start) // step + 1 <= self.max_batch:
+                cur_end = max(cur_end, end)
+                continue
+            if cur_start is not None:
+                requests.extend(self._chunk(cur_start, cur_end, step))
+            cur_start, cur_end = start, end
+        if cur_start is not None:
+            requests.extend(self._chunk(cur_start, cur_end, step))
+        return requests
+
+    def _chunk(self, start: int, end: int, step: int) -> list[tuple[int, int]]:
+        out = []
+        while start <= end:
+            n = min(self.max_batch, (end - start) // step + 1)
+            out.append((start, n))
+            start += n * step
+        return out
+
+    # ---------- backfill ----------
+    async def _fetch(self, symbol: str, timeframe: str, since: int, limit: int) -> list[list[float]]:
+        """One kline request; raises on failure so an error is never taken for a range without bars."""
+        quality = self._quality(symbol)
+        quality["backfill_requests"] += 1
+        try:
+            bars = await self.exchange.get_ohlcv(
+                symbol, timeframe=timeframe, limit=limit, since=since, raise_errors=True
+            )
+        except Exception:
+            quality["failed_requests"] += 1
+            raise
+        return bars or []
+
+    async def get_candles(
+        self, symbol: str, timeframe: str = "5m", limit: int = 150, now_ms: int | None = None
+    ) -> list[list[float]]:
+        """Return the latest `limit` bars, filling internal gaps, history and the tail first.
+
+        A failed kline request propagates after the bars fetched so far are merged; holes are
+        only marked unfillable (and the history floor raised) when every request was answered.
+        """
+        step = self.timeframe_ms(timeframe)
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        current_open = now_ms - now_ms % step
+        window_start = current_open - (limit - 1) * step
+
+        key = (symbol, timeframe)
+        floor = max(window_start, self._history_floor.get(key, window_start))
+        dead = self._dead_gaps.setdefault(key, set())
+        stamps = sorted(self._bars.get(key, {}))
+        quality = self._quality(symbol)
+
+        missing: list[tuple[int, int]] = []
+        if not stamps or stamps[-1] < window_start:
+            missing.append((floor, current_open))
+        else:
+            if stamps[0] > floor:
+                missing.append((floor, stamps[0] - step))
+            gaps = [(s, e) for s, e in self.find_gaps(symbol, timeframe) if e >= window_start and (s, e) not in dead]
+            quality["gaps_detected"] += len(gaps)
+            missing.extend((max(s, window_start), e) for s, e in gaps)
+            # Last stored bar may have been in progress: refetch it together with the tail
+            missing.append((stamps[-1], current_open))
+
+        before = len(self._bars.get(key, {}))
+        try:
+            for since, n in self._plan_requests(missing, step):
+                self.ingest(symbol, timeframe, await self._fetch(symbol, timeframe, since, n))
+        finally:
+            quality["bars_backfilled"] += max(0, len(self._bars.get(key, {})) - before)
+
+        # Every request was answered: what is still missing does not exist on the exchange
+        stamps = sorted(self._bars.get(key, {}))
+        if stamps and stamps[0] > floor:
+            self._history_floor[key] = stamps[0]  # nothing older exists on the exchange
+        holes = [(s, e) for s, e in self.find_gaps(symbol, timeframe) if e >= window_start and s <= current_open]
+        dead.update(holes)
+        quality["unfilled_gaps"] = len(holes)
+
+        window = [b for b in self.bars(symbol, timeframe) if window_start <= b[0] <= current_open]
+        return window[-limit:]
+
+    async def refresh(self, symbols: Iterable[str], timeframe: str = "5m", limit: int = 150) -> dict[str, Any]:
+        """Bring several symbols up to date concurrently (bounded by max_concurrency)."""
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def one(symbol: str):
+            async with sem:
+                return await self.get_candles(symbol, timeframe, limit)
+
+        symbols = list(symbols)
+        results = await asyncio.gather(*(one(s) for s in symbols), return_exceptions=True)
+        return dict(zip(symbols, results, strict=False))
+
+    def is_contiguous(self, symbol: str) -> bool:
+        """True when the last served window had no unfilled gaps."""
+        return self._quality(symbol)["unfilled_gaps"] == 0
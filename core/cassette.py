@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Record / replay of exchange HTTP traffic ("cassettes").
+
+`Cassette.wrap(owner, fetch)` wraps any ccxt-signature `fetch(url, method,
+headers, body)` — the raw ccxt exchange and the direct order transport — below
+the limiter/breaker hook:
+
+  - record: every request goes out as usual; the parsed response (or the ccxt
+    error it raised), the response headers and the elapsed time are appended
+    to a JSON-lines file
+  - replay: nothing goes out; each request is answered from the file, matched
+    by method, path and parameters. Volatile parameters (timestamp, signature,
+    recvWindow, client order ids) are ignored when matching. Repeated identical
+    requests get the recorded answers in order, the last one repeating once
+    they run out (polling loops). Recorded errors are raised again with their
+    ccxt class; an unrecorded request raises `CassetteMiss`.
+
+Replayed answers are instant unless `latency_scale` > 0, which sleeps the
+recorded elapsed time times the scale (1.0 = as recorded), so whole flows
+run offline in milliseconds or with realistic, reproducible timing.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+import ccxt.async_support as ccxt
+
+MODES = ("record", "replay")
+
+# Parameters that differ between runs of the same flow
+VOLATILE_PARAMS = frozenset({"timestamp", "signature", "recvWindow", "newClientOrderId", "origClientOrderId"})
+
+
+class CassetteMiss(ccxt.ExchangeError):
+    """Replay got a request that is not on the cassette."""
+
+
+def _params(data: Any) -> list[tuple[str, str]]:
+    if isinstance(data, dict):
+        return [(str(k), json.dumps(v) if isinstance(v, (dict, list)) else str(v)) for k, v in data.items()]
+    if isinstance(data, bytes):
+        data = data.decode()
+    if not data:
+        return []
+    text = str(data)
+    if text.lstrip().startswith(("{", "[")):
+        try:
+            return _params(json.loads(text))
+        except ValueError:
+            pass
+    return parse_qsl(text, keep_blank_values=True)
+
+
+def request_key(method: str, url: str, body: Any = None, ignore: frozenset[str] = VOLATILE_PARAMS) -> str:
+    """Host-independent match key: METHOD path?sorted non-volatile query+body params."""
+    parts = urlsplit(url)
+    params = sorted((k, v) for k, v in _params(parts.query) + _params(body) if k not in ignore)
+    query = "&".join(f"{k}={v}" for k, v in params)
+    return f"{str(method).upper()} {parts.path}" + (f"?{query}" if query else "")
+
+
+class Cassette:
+    """JSON-lines recorder / deterministic replayer for `fetch(url, method, headers, body)`."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        mode: str,
+        latency_scale: float = 0.0,
+        ignore: frozenset[str] = VOLATILE_PARAMS,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"cassette mode must be one of {MODES}, got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.ignore = ignore
+        self.tracks: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        self.last: dict[str, dict[str, Any]] = {}
+        self.stats = {"recorded": 0, "replayed": 0, "repeated": 0, "misses": 0}
+        self._file = None
+        if mode == "replay":
+            self._load()
+
+    def _load(self) -> None:
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self.tracks[entry["key"]].append(entry)
+        logging.info(f"Cassette {self.path}: {sum(len(t) for t in self.tracks.values())} interactions loaded")
+
+    def _write(self, entry: dict[str, Any]) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("w", encoding="utf-8")
+        self._file.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+        self._file.flush()  # a crashed run still leaves a usable cassette
+        self.stats["recorded"] += 1
+
+    def wrap(self, owner: Any, fetch: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """Recording or replaying `fetch`; `owner.last_response_headers` is read (record) or set (replay)."""
+        if self.mode == "record":
+
+            async def recorded(url, method="GET", headers=None, body=None):
+                entry = {"key": request_key(method, url, body, self.ignore), "method": method, "url": url}
+                started = time.monotonic()
+                try:
+                    result = await fetch(url, method, headers, body)
+                except ccxt.BaseError as e:
+                    entry["error"] = {"type": type(e).__name__, "message": str(e)}
+                    raise
+                else:
+                    entry["response"] = result
+                    return result
+                finally:
+                    entry["elapsed"] = round(time.monotonic() - started, 6)
+                    entry["headers"] = dict(getattr(owner, "last_response_headers", None) or {})
+                    self._write(entry)
+
+            return recorded
+
+        async def replayed(url, method="GET", headers=None, body=None):
+            key = request_key(method, url, body, self.ignore)
+            track = self.tracks.get(key)
+            if track:
+                entry = track.popleft()
+                self.last[key] = entry
+                self.stats["replayed"] += 1
+            elif key in self.last:
+                entry = self.last[key]
+                self.stats["repeated"] += 1
+            else:
+                self.stats["misses"] += 1
+                raise CassetteMiss(f"cassette {self.path.name}: no recorded response for {key}")
+            if self.latency_scale > 0 and entry.get("elapsed"):
+                await asyncio.sleep(entry["elapsed"] * self.latency_scale)
+            if hasattr(owner, "last_response_headers"):
+                owner.last_response_headers = dict(entry.get("headers") or {})
+            error = entry.get("error")
+            if error:
+                exc_cls = getattr(ccxt, error["type"], None)
+                if not (isinstance(exc_cls, type) and issubclass(exc_cls, ccxt.BaseError)):
+                    exc_cls = ccxt.ExchangeError
+                raise exc_cls(error["message"])
+            return entry.get("response")
+
+        return replayed
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"mode": self.mode, "path": str(self.path), **self.stats}
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Passive exchange health tracking with per-endpoint-class circuit breakers.
+
+Every real REST request reports its outcome and latency; there are no periodic
+health requests. Each endpoint class (market data, account, orders) has its
+own breaker:
+
+  closed     requests pass; a rolling window tracks error rate and slow calls
+  open       too many recent failures: non-critical requests fail fast with
+             `CircuitOpen`; a cheap probe (`/fapi/v1/time`) runs every
+             `probe_interval` seconds and moves the breaker to half-open
+  half-open  one trial request is let through; success closes the breaker,
+             failure reopens it
+
+Only transport-level failures count (timeouts, connection errors, 5xx /
+maintenance); business errors such as a rejected order mean the exchange
+answered. Rate-limit responses are left to the rate limiter, and timestamp
+rejections (-1021) to the server clock.
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from urllib.parse import urlparse
+
+import ccxt.async_support as ccxt
+
+from core.server_time import is_clock_rejection
+
+ENDPOINT_CLASSES: tuple[str, ...] = ("market", "account", "order")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# Endpoints that place, amend or cancel orders (when not read with GET)
+_ORDER_WRITE_PATHS: tuple[str, ...] = (
+    "/order",
+    "/batchOrders",
+    "/algoOrder",
+    "/allOpenOrders",
+    "/algoOpenOrders",
+    "/countdownCancelAll",
+)
+
+
+class CircuitOpen(Exception):
+    """Request refused because its endpoint class is failing."""
+
+
+def endpoint_class(method: str, url: str, body: str | None = None) -> str:
+    """Classify a Binance REST request: order writes, other signed calls (order reads too), or public market data."""
+    path = urlparse(url).path
+    if method.upper() in ("POST", "PUT", "DELETE") and path.endswith(_ORDER_WRITE_PATHS):
+        return "order"
+    if "signature=" in url or (isinstance(body, str) and "signature=" in body) or path.endswith("/listenKey"):
+        return "account"
+    return "market"
+
+
+def is_health_failure(exc: BaseException) -> bool:
+    """Transport-level failure (counts against the breaker) vs. an answer from the exchange."""
+    if isinstance(exc, (ccxt.RateLimitExceeded, ccxt.DDoSProtection)) or is_clock_rejection(exc):
+        return False
+    return isinstance(exc, (ccxt.NetworkError, TimeoutError, OSError))
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a rolling window of request outcomes."""
+
+    def __init__(
+        self,
+        name: str,
+        window_sec: float = 60.0,
+        min_requests: int = 5,
+        error_rate: float = 0.5,
+        consecutive_failures: int = 3,
+        slow_call_sec: float = 5.0,
+    ):
+        self.name = name
+        self.window_sec = window_sec
+        self.min_requests = min_requests
+        self.error_rate = error_rate
+        self.consecutive_failures = consecutive_failures
+        self.slow_call_sec = slow_call_sec
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._outcomes: deque[tuple[float, bool, float]] = deque()  # (ts, failed, latency)
+        self._streak = 0
+        self._trial_in_flight = False
+        self.stats = {"requests": 0, "failures": 0, "slow": 0, "rejected": 0, "opened": 0}
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window_sec:
+            self._outcomes.popleft()
+
+    def allow(self) -> bool:
+        """Whether a (non-critical) request may go out now."""
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.stats["rejected"] += 1
+        return False
+
+    def record(self, ok: bool, latency: float) -> str | None:
+        """Record one request outcome. Returns the new state if it changed."""
+        now = time.monotonic()
+        slow = ok and latency >= self.slow_call_sec
+        failed = not ok or slow
+        self.stats["requests"] += 1
+        self.stats["failures"] += not ok
+        self.stats["slow"] += slow
+        self._streak = self._streak + 1 if failed else 0
+
+        if self.state != CLOSED:
+            self._trial_in_flight = False
+            if not failed:
+                return self._set(CLOSED)
+            if self.state == HALF_OPEN:
+                return self._set(OPEN)
+            return None
+
+        self._outcomes.append((now, failed, latency))
+        self._trim(now)
+        n = len(self._outcomes)
+        failures = sum(1 for _, f, _ in self._outcomes if f)
+        if self._streak >= self.consecutive_failures or (n >= self.min_requests and failures / n >= self.error_rate):
+            return self._set(OPEN)
+        return None
+
+    def probe_succeeded(self) -> str | None:
+        """A cheap probe got through: let one trial request test the class."""
+        if self.state == OPEN:
+            return self._set(HALF_OPEN)
+        return None
+
+    def _set(self, state: str) -> str:
+        self.state = state
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+            self.stats["opened"] += 1
+        if state == CLOSED:
+            self._outcomes.clear()
+            self._streak = 0
+        return state
+
+    def snapshot(self) -> dict[str, float | str]:
+        now = time.monotonic()
+        self._trim(now)
+        n = len(self._outcomes)
+        latencies = sorted(lat for _, _, lat in self._outcomes)
+        return {
+            "state": self.state,
+            "window_requests": n,
+            "error_rate": round(sum(1 for _, f, _ in self._outcomes if f) / n, 3) if n else 0.0,
+            "p50_latency_ms": round(latencies[n // 2] * 1000, 1) if n else 0.0,
+            "max_latency_ms": round(latencies[-1] * 1000, 1) if n else 0.0,
+            **self.stats,
+        }
+
+
+class HealthMonitor:
+    """Breakers per endpoint class, fed from real requests; probes only while a breaker is open."""
+
+    def __init__(
+        self,
+        probe: Callable[[], Awaitable[object]] | None = None,
+        probe_interval: float = 5.0,
+        on_change: Callable[[str, str], None] | None = None,
+        **breaker_kwargs,
+    ):
+        self.breakers = {name: CircuitBreaker(name, **breaker_kwargs) for name in ENDPOINT_CLASSES}
+        self.probe = probe
+        self.probe_interval = probe_interval
+        self.on_change = on_change
+        self._probe_task: asyncio.Task | None = None
+
+    @property
+    def healthy(self) -> bool:
+        """Every breaker closed; a half-open class has not proven itself with a trial yet."""
+        return all(b.state == CLOSED for b in self.breakers.values())
+
+    def open_classes(self) -> list[str]:
+        """Classes not yet closed again (open or half-open)."""
+        return [name for name, b in self.breakers.items() if b.state != CLOSED]
+
+    def check(self, cls: str, critical: bool = False) -> None:
+        """Raise CircuitOpen if `cls` is failing. Critical requests (protective orders) always go out."""
+        breaker = self.breakers[cls]
+        if critical:
+            return
+        if not breaker.allow():
+            raise CircuitOpen(f"{cls} endpoints unavailable (circuit open)")
+
+    def release(self, cls: str) -> None:
+        """The request let through was shed, cancelled or rate limited before the exchange answered."""
+        self.breakers[cls]._trial_in_flight = False
+
+    def record(self, cls: str, ok: bool, latency: float) -> None:
+        changed = self.breakers[cls].record(ok, latency)
+        if changed:
+            self._changed(cls, changed)
+
+    def _changed(self, cls: str, state: str) -> None:
+        if self.on_change:
+            try:
+                self.on_change(cls, state)
+            except Exception:
+                pass
+        if state == OPEN:
+            self._ensure_probing()
+
+    def _ensure_probing(self) -> None:
+        if self.probe is None or (self._probe_task and not self._probe_task.done()):
+            return
+        try:
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_loop())
+        except RuntimeError:
+            pass  # no running loop: the next real request will retry
+
+    async def _probe_loop(self) -> None:
+        while self.open_classes():
+            await asyncio.sleep(self.probe_interval)
+            try:
+                await self.probe()
+            except Exception:
+                continue
+            for cls in self.open_classes():
+                changed = self.breakers[cls].probe_succeeded()
+                if changed:
+                    self._changed(cls, changed)
+
+    def stop(self) -> None:
+        if self._probe_task and not self._probe_task.done():
+            self._probe_task.cancel()
+
+    def snapshot(self) -> dict[str, dict[str, float | str]]:
+        return {name: b.snapshot() for name, b in self.breakers.items()}
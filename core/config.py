@@ -121,9 +121,94 @@ class TradingConfig(BaseModel):
     ws_reconnect_interval: int = Field(default=5, description="WebSocket reconnect interval in seconds")
     ws_heartbeat_interval: int = Field(default=30, description="WebSocket heartbeat interval in seconds")
 
+    # Rate Limit Configuration
+    rate_limit_weight_per_min: int = Field(default=2400, description="Binance IP request weight limit per minute")
+    rate_limit_safety: float = Field(default=0.9, description="Fraction of exchange limits the limiter may use")
+
+    # Single-Flight Read Configuration
+    single_flight_ttls: dict[str, float] = Field(
+        default_factory=lambda: {
+            "get_ticker": 1.0,
+            "get_book_ticker": 1.0,
+            "get_ohlcv": 1.0,
+            "get_position": 0.5,
+            "get_all_positions": 0.5,
+            "get_open_orders": 0.5,
+            "get_order": 0.5,
+        },
+        description="Result TTL (seconds) per exchange read method; concurrent identical reads always coalesce",
+    )
+
+    # Snapshot Configuration
+    markets_snapshot_path: str = Field(
+        default="data/runtime/markets_snapshot.json", description="On-disk snapshot of quote-coin markets"
+    )
+    markets_snapshot_max_age: float = Field(default=86_400, description="Max snapshot age (s) used at startup")
+    position_snapshot_max_age: float = Field(
+        default=5.0, description="Max age of the all-positions REST snapshot (ACCOUNT_UPDATE applies in between)"
+    )
+
+    # Retry Configuration
+    retry_attempts: int = Field(default=3, description="Attempts per idempotent read on transport failures")
+    retry_base_delay: float = Field(default=0.2, description="Base of the jittered exponential retry backoff (s)")
+    retry_max_delay: float = Field(default=2.0, description="Cap of the retry backoff (s)")
+    retry_hedge_methods: list[str] = Field(
+        default_factory=lambda: ["get_ticker", "get_order", "get_position", "get_open_orders"],
+        description="Reads that send a duplicate request once their observed p95 latency has passed",
+    )
+    order_retry_attempts: int = Field(
+        default=2, description="Order sends per request; resent only after a clientOrderId lookup finds nothing"
+    )
+
+    # Order Transport Configuration
+    fast_order_transport: bool = Field(
+        default=False, description="Send plain market/limit orders and cancels over the direct signed REST transport"
+    )
+    ws_order_api: bool = Field(
+        default=False, description="Place/cancel/modify plain orders over the WebSocket API; REST while disconnected"
+    )
+    protective_batch: bool = Field(
+        default=True, description="Send SL and the TP ladder together (batchOrders / concurrent) instead of one by one"
+    )
+
+    # Exchange Health Configuration
+    health_window_sec: float = Field(default=60.0, description="Rolling window for request error rate / latency")
+    health_min_requests: int = Field(default=5, description="Requests in the window before the error rate can trip")
+    health_error_rate: float = Field(default=0.5, description="Failure fraction that opens an endpoint breaker")
+    health_consecutive_failures: int = Field(default=3, description="Consecutive failures that open a breaker")
+    health_slow_call_sec: float = Field(default=5.0, description="Requests slower than this count as failures")
+    health_probe_interval_sec: float = Field(
+        default=5.0, description="Probe interval (/fapi/v1/time) while a breaker is open"
+    )
+
+    # Server Time Configuration
+    server_time_sync: bool = Field(
+        default=True, description="Sign requests with a sampled, drift-corrected server clock (resync on -1021)"
+    )
+    server_time_sync_sec: float = Field(default=60.0, description="Server time sampling interval (s)")
+
+    # HTTP Pool Configuration
+    http_pool_limit: int = Field(default=100, description="Max open connections in the shared HTTP pool")
+    http_pool_per_host: int = Field(default=20, description="Max open connections per host (WebSockets included)")
+    http_keepalive_sec: float = Field(default=60.0, description="Idle keep-alive time of pooled connections")
+    http_dns_ttl_sec: int = Field(default=300, description="DNS cache TTL of the shared HTTP pool")
+
+    # Cassette Configuration
+    cassette_mode: str | None = Field(
+        default=None, description="'record' exchange HTTP traffic to cassette_path, or 'replay' it offline"
+    )
+    cassette_path: str = Field(default="data/cassettes/exchange.jsonl", description="Cassette file (JSON lines)")
+    cassette_latency_scale: float = Field(
+        default=0.0, description="Replay: sleep recorded latency x this factor (0 = instant, 1 = as recorded)"
+    )
+
     # Performance Settings
     update_interval: float = Field(default=1.0, description="Main loop update interval in seconds")
     symbol_rotation_interval: int = Field(default=300, description="Symbol rotation interval in seconds")
+    symbol_universe_size: int = Field(default=10, description="Number of symbols kept in the trading universe")
+    symbol_ranking_refresh_sec: float = Field(
+        default=15.0, description="Re-rank interval when the all-market ticker stream is live"
+    )
 
     # Emergency Settings
     emergency_stop_enabled: bool = Field(default=True, description="Enable emergency stop")
@@ -131,6 +216,9 @@ class TradingConfig(BaseModel):
 
     # Dry Run Mode
     dry_run: bool = Field(default=True, description="Enable dry run mode (no real trades)")
+    paper_trading: bool = Field(
+        default=True, description="In dry run, fill orders locally against live prices (no order/account requests)"
+    )
 
     # Leverage Configuration
     leverage_map: dict[str, int] = Field(
@@ -152,6 +240,9 @@ class TradingConfig(BaseModel):
         },
         description="Leverage mapping for symbols",
     )
+    margin_type: str | None = Field(
+        default=None, description="Target margin mode per symbol ('cross' / 'isolated'); None leaves it unchanged"
+    )
 
     # Trading Symbols (leave empty by default; fallback is dynamic)
     usdt_symbols: list = Field(default_factory=list, description="USDT trading pairs (used on testnet)")
@@ -206,6 +297,30 @@ class TradingConfig(BaseModel):
 
     # WebSocket Settings (disabled by default)
     enable_websocket: bool = Field(default=False, description="Enable WebSocket streams")
+    enable_market_ticker_stream: bool = Field(
+        default=True, description="Subscribe to !miniTicker@arr for live universe ranking"
+    )
+    mark_price_stale_sec: float = Field(default=3.0, description="Staleness budget for streamed mark prices")
+    ticker_stale_sec: float = Field(default=5.0, description="Staleness budget for streamed 24h tickers")
+
+    # Order Fill Detection
+    order_fill_poll_sec: float = Field(
+        default=15.0, description="TP/SL fill check interval over REST while the user-data stream is down"
+    )
+    entry_fill_timeout_sec: float = Field(
+        default=2.0, description="Wait for the entry's fill event this long before asking REST"
+    )
+
+    # Market Data Collectors
+    enable_market_stats: bool = Field(default=True, description="Poll open interest and funding in the background")
+    market_stats_poll_sec: float = Field(default=60.0, description="Open interest / funding poll interval")
+    market_stats_weight_budget: int = Field(
+        default=40, description="Max request weight one collection cycle queues on the shared limiter"
+    )
+    enable_order_book: bool = Field(default=True, description="Maintain local order books from depth streams")
+    order_book_depth_bps: list[int] = Field(
+        default_factory=lambda: [5, 10, 25, 50], description="Depth bands (bps from mid) cached per book"
+    )
 
     # ATR-based TP/SL (disabled by default)
     use_atr_based_tp_sl: bool = Field(default=False)
@@ -284,6 +399,7 @@ class TradingConfig(BaseModel):
         self.reduce_only = _get_bool("REDUCE_ONLY", self.reduce_only)
         self.enable_websocket = _get_bool("ENABLE_WEBSOCKET", self.enable_websocket)
         self.dry_run = _get_bool("DRY_RUN", self.dry_run)
+        self.paper_trading = _get_bool("PAPER_TRADING", self.paper_trading)
         self.enable_trailing_stop = _get_bool("ENABLE_TRAILING_STOP", self.enable_trailing_stop)
         self.disable_spread_filter_testnet = _get_bool(
             "DISABLE_SPREAD_FILTER_TESTNET", getattr(self, "disable_spread_filter_testnet", False)
@@ -416,6 +532,11 @@ class TradingConfig(BaseModel):
             "BINANCE_API_SECRET": "api_secret",
             "BINANCE_TESTNET": "testnet",
             "DRY_RUN": "dry_run",
+            "PAPER_TRADING": "paper_trading",
+            # Exchange traffic record/replay
+            "CASSETTE_MODE": "cassette_mode",
+            "CASSETTE_PATH": "cassette_path",
+            "CASSETTE_LATENCY_SCALE": "cassette_latency_scale",
             # Logging
             "LOG_LEVEL": "log_level",
             "LOG_TO_FILE": "log_to_file",
@@ -479,6 +600,7 @@ class TradingConfig(BaseModel):
             if config_key in (
                 "testnet",
                 "dry_run",
+                "paper_trading",
                 "enable_websocket",
                 "telegram_enabled",
                 "log_to_file",
@@ -523,6 +645,7 @@ class TradingConfig(BaseModel):
                 "trailing_stop_percent",
                 "base_position_size_usdt",
                 "max_auto_increase_usdt",
+                "cassette_latency_scale",
             ):
                 try:
                     setattr(self, config_key, float(val))
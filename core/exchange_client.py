@@ -5,6 +5,7 @@ Simplified version based on v2 structure
 """
 
 import asyncio
+import json
 import math
 import time
 from typing import Any
@@ -12,9 +13,54 @@ from typing import Any
 import ccxt.async_support as ccxt
 
 from core.balance_utils import free
+from core.cassette import Cassette
+from core.circuit_breaker import HealthMonitor, endpoint_class, is_health_failure
 from core.config import TradingConfig
+from core.http_pool import HttpPool
+from core.leverage_cache import LeverageCache
+from core.market_registry import MarketRegistry, MarketSpec
+from core.markets_cache import MarketsSnapshot, filter_quote_markets, markets_hash
+from core.order_transport import OrderTransport, binance_exceptions
+from core.paper_exchange import PaperExchange
+from core.position_snapshot import PositionSnapshot
+from core.rate_limiter import (
+    RequestShed,
+    endpoint_cost,
+    get_rate_limiter,
+    priority_scope,
+    request_priority,
+    with_priority,
+)
+from core.retry_policy import RetryPolicy
 from core.risk_guard_stage_f import RiskGuardStageF
+from core.server_time import ServerClock, is_clock_rejection
+from core.single_flight import SingleFlight
+from core.symbol_utils import to_binance_symbol
 from core.unified_logger import UnifiedLogger
+from core.ws_orders import WSOrderClient, ws_api_url
+
+# Binance /fapi/v1/batchOrders accepts at most 5 orders per request
+BATCH_ORDERS_MAX = 5
+
+# Max age (seconds) of a local order book whose top of book is served as the ticker bid/ask
+BOOK_QUOTE_MAX_AGE_SEC = 2.0
+
+_CONDITIONAL_PARAMS = (
+    "stopPrice",
+    "triggerPrice",
+    "stopLossPrice",
+    "takeProfitPrice",
+    "callbackRate",
+    "activationPrice",
+)
+
+
+def _is_conditional(order_type: str, params: dict[str, Any]) -> bool:
+    """Stop / take-profit / trailing orders (placed via the algo order endpoint, which has no batch form)."""
+    t = str(order_type).upper()
+    return any(k in t for k in ("STOP", "TAKE_PROFIT", "TRAILING")) or any(
+        params.get(k) is not None for k in _CONDITIONAL_PARAMS
+    )
 
 
 class OptimizedExchangeClient:
@@ -29,15 +75,73 @@ class OptimizedExchangeClient:
         self.cached_balance = None
         self.balance_cache_duration = 30  # seconds
 
-        # Rate limiting
+        # Rate limiting: process-wide weight-aware token bucket (core.rate_limiter)
         self.request_count = 0
-        self.last_request_time = 0
-        self.max_requests_per_second = 10
-
-        # Connection status
+        self.rate_limiter = get_rate_limiter(
+            weight_per_minute=getattr(config, "rate_limit_weight_per_min", 2400),
+            safety=getattr(config, "rate_limit_safety", 0.9),
+        )
+        self._limiter_hooked = False
+        # One keep-alive connection pool / DNS cache / TLS context for every HTTP and WebSocket client
+        self.http_pool = HttpPool(
+            limit=getattr(config, "http_pool_limit", 100),
+            limit_per_host=getattr(config, "http_pool_per_host", 20),
+            keepalive_timeout=getattr(config, "http_keepalive_sec", 60.0),
+            dns_ttl=getattr(config, "http_dns_ttl_sec", 300),
+        )
+        # Identical concurrent reads share one request; results live for short per-method TTLs
+        self.single_flight = SingleFlight(getattr(config, "single_flight_ttls", None))
+        # Backoff/hedging for reads, clientOrderId-deduplicated retries for orders
+        self.retry = RetryPolicy(
+            attempts=getattr(config, "retry_attempts", 3),
+            base_delay=getattr(config, "retry_base_delay", 0.2),
+            max_delay=getattr(config, "retry_max_delay", 2.0),
+            hedge_methods=getattr(config, "retry_hedge_methods", ()),
+            order_attempts=getattr(config, "order_retry_attempts", 2),
+        )
+        self.batch_stats = {"batches": 0, "batched_orders": 0, "rejected": 0, "fallbacks": 0, "singles": 0}
+        # Per-symbol leverage / margin mode; changes sent only where they differ
+        self.leverage_cache = LeverageCache(self)
+        # All positions from one request + ACCOUNT_UPDATE deltas; per-symbol reads from memory
+        self.position_snapshot = PositionSnapshot(self, getattr(config, "position_snapshot_max_age", 5.0))
+        # Persisted quote-coin markets (core.markets_cache.MarketsSnapshot)
+        self.markets_snapshot: MarketsSnapshot | None = None
+        self.market_registry = MarketRegistry()
+        self._registry_source: int | None = None  # id() of the ccxt markets dict the registry was built from
+        self._markets_task: asyncio.Task | None = None
+
+        # Lean signed REST path for plain orders (core.order_transport.OrderTransport), see _init_order_transport
+        self.order_transport: OrderTransport | None = None
+        # Orders over the WebSocket API (core.ws_orders.WSOrderClient); REST is used while it is disconnected
+        self.ws_orders: WSOrderClient | None = None
+        # Exchange clock estimate used to sign requests (live keys only)
+        self.server_clock: ServerClock | None = None
+        # Record/replay of exchange HTTP traffic (config.cassette_mode)
+        self.cassette: Cassette | None = None
+        # Dry-run execution simulator (replaces self.exchange for orders/positions/balance)
+        self.simulator: PaperExchange | None = None
+
+        # Connection status, inferred from real requests (core.circuit_breaker)
         self.connection_healthy = False
-        self.last_health_check = 0
-        self.health_check_interval = 60  # seconds
+        self.health = HealthMonitor(
+            probe=self._health_probe,
+            probe_interval=getattr(config, "health_probe_interval_sec", 5.0),
+            on_change=self._on_health_change,
+            window_sec=getattr(config, "health_window_sec", 60.0),
+            min_requests=getattr(config, "health_min_requests", 5),
+            error_rate=getattr(config, "health_error_rate", 0.5),
+            consecutive_failures=getattr(config, "health_consecutive_failures", 3),
+            slow_call_sec=getattr(config, "health_slow_call_sec", 5.0),
+        )
+
+        # Local order books (core.order_book.OrderBookManager), attached when market WS is enabled
+        self.order_books = None
+        # All-market 24h stats (core.market_ticker.MarketTickerTable), fed by !miniTicker@arr
+        self.ticker_table = None
+        # Open interest / funding cache (core.market_stats.MarketStatsCollector)
+        self.market_stats = None
+        # Stream freshness (core.market_data.FreshnessTracker); get_ticker serves fresh streamed data
+        self.market_freshness = None
 
         # Stage F: Global risk guard (daily SL streak and daily loss %)
         self.risk_guard_f = RiskGuardStageF(config, logger)
@@ -52,7 +156,10 @@ class OptimizedExchangeClient:
                 "apiKey": self.config.api_key,
                 "secret": self.config.api_secret,
                 "sandbox": self.config.testnet,
-                "enableRateLimit": True,
+                # Throttling is done by the shared weight-aware limiter hooked into fetch()
+                "enableRateLimit": False,
+                # Shared connection pool (not owned by ccxt: closed by close() after the exchange)
+                "session": self.http_pool.session,
                 "options": {
                     "defaultType": "future",
                     "adjustForTimeDifference": True,
@@ -72,6 +179,8 @@ class OptimizedExchangeClient:
                 opts["adjustForTimeDifference"] = True
                 opts["recvWindow"] = 10000
                 opts["warnOnFetchOpenOrdersWithoutSymbol"] = False
+                # Only USDⓈ-M contracts are traded: skip spot/COIN-M exchangeInfo downloads
+                opts["fetchMarkets"] = {**dict(opts.get("fetchMarkets") or {}), "types": ["linear"]}
                 self.exchange.options = opts
             except Exception:
                 pass
@@ -81,18 +190,24 @@ class OptimizedExchangeClient:
                 self.exchange.set_sandbox_mode(True)
                 self.logger.log_event("EXCHANGE", "INFO", "Testnet mode enabled")
 
+            self._install_cassette()
+            self._install_rate_limiter()
+            await self._init_server_clock()
+            self._init_order_transport()
+            await self._init_ws_orders()
+            await self._init_simulator()
+
             # Test connection
             await self._test_connection()
 
-            # Load markets
-            await self.exchange.load_markets()
+            # Load markets: disk snapshot first (revalidated in background), exchange otherwise
+            await self._load_markets()
 
             # Set default leverage
             await self._set_default_leverage()
 
             self.is_initialized = True
             self.connection_healthy = True
-            self.last_health_check = time.time()
 
             self.logger.log_event("EXCHANGE", "INFO", "Exchange connection initialized successfully")
 
@@ -135,9 +250,9 @@ class OptimizedExchangeClient:
     async def _test_connection(self):
         """Test exchange connection (USDC-focused, without hardcoded tickers)"""
         try:
-            # Public API: load markets
-            await self.exchange.load_markets()
-            self.logger.log_event("EXCHANGE", "DEBUG", "Markets loaded (public API OK)")
+            # Public API: server time (weight 1; markets are loaded separately)
+            await self.exchange.fetch_time()
+            self.logger.log_event("EXCHANGE", "DEBUG", "Server time fetched (public API OK)")
 
             # Private API: fetch balance (skip in DRY RUN or when no keys configured)
             if self.config.dry_run or not (self.config.api_key and self.config.api_secret):
@@ -161,6 +276,74 @@ class OptimizedExchangeClient:
             self.logger.log_event("EXCHANGE", "ERROR", f"Connection test failed: {e}")
             raise
 
+    def _markets_snapshot(self) -> MarketsSnapshot:
+        return MarketsSnapshot(
+            path=getattr(self.config, "markets_snapshot_path", "data/runtime/markets_snapshot.json"),
+            quote=self.config.resolved_quote_coin,
+            testnet=self.config.testnet,
+            ccxt_version=getattr(ccxt, "__version__", ""),
+            max_age_sec=getattr(self.config, "markets_snapshot_max_age", 86_400),
+        )
+
+    async def _load_markets(self) -> None:
+        """Apply the on-disk markets snapshot if valid, else fetch from the exchange."""
+        if self.markets_snapshot is None:
+            self.markets_snapshot = self._markets_snapshot()
+        cached = self.markets_snapshot.load()
+        if cached:
+            self.exchange.set_markets(cached)
+            self._index_markets(compact=True)
+            self.logger.log_event(
+                "EXCHANGE",
+                "INFO",
+                f"Markets loaded from snapshot ({len(cached)} {self.config.resolved_quote_coin} contracts)",
+            )
+            self._markets_task = asyncio.create_task(self._revalidate_markets())
+            return
+        await self._refresh_markets()
+
+    async def _refresh_markets(self) -> bool:
+        """Fetch quote-coin markets, apply them if changed and persist the snapshot. Returns True if changed."""
+        fetched = await self.exchange.fetch_markets()
+        markets = filter_quote_markets(fetched, self.config.resolved_quote_coin)
+        if not markets:
+            raise RuntimeError(f"No {self.config.resolved_quote_coin} contract markets returned")
+        changed = not self.exchange.markets or markets_hash(markets) != self.markets_snapshot.saved_hash
+        if changed:
+            self.exchange.set_markets(markets)
+        try:
+            self.markets_snapshot.save(markets)
+        except OSError as e:
+            self.logger.log_event("EXCHANGE", "WARNING", f"Failed to persist markets snapshot: {e}")
+        if changed:
+            # After saving: ccxt keeps the input dicts in markets_by_id, compaction trims them too
+            self._index_markets(compact=True)
+        return changed
+
+    def _index_markets(self, compact: bool = False) -> int:
+        """Rebuild the market registry from ccxt markets; optionally trim raw `info` of indexed markets."""
+        markets = self.exchange.markets or {}
+        count = self.market_registry.build(markets, self.config.resolved_quote_coin)
+        self._registry_source = id(self.exchange.markets)
+        if compact:
+            self.market_registry.compact(markets, getattr(self.exchange, "markets_by_id", None))
+        return count
+
+    def market_spec(self, symbol: str | None) -> MarketSpec | None:
+        """Parsed trading rules for a quote-coin contract, or None if unknown."""
+        markets = getattr(self.exchange, "markets", None)
+        if markets and id(markets) != self._registry_source:
+            self._index_markets()
+        return self.market_registry.get(symbol)
+
+    async def _revalidate_markets(self) -> None:
+        try:
+            changed = await self._refresh_markets()
+            msg = "Markets snapshot revalidated" + (" (updated from exchange)" if changed else " (unchanged)")
+            self.logger.log_event("EXCHANGE", "DEBUG", msg)
+        except Exception as e:
+            self.logger.log_event("EXCHANGE", "WARNING", f"Markets revalidation failed, keeping snapshot: {e}")
+
     async def _set_default_leverage(self):
         """Set default leverage for USDC-margined futures"""
         try:
@@ -190,13 +373,19 @@ class OptimizedExchangeClient:
                     ]
                 symbols = fallback
 
-            for pair in symbols[:5]:  # limit to a small set on init
-                try:
-                    await self.exchange.set_leverage(self.config.default_leverage, pair)
-                    msg = f"Set leverage {self.config.default_leverage} for {pair}"
-                    self.logger.log_event("EXCHANGE", "DEBUG", msg)
-                except Exception as e:
-                    self.logger.log_event("EXCHANGE", "WARNING", f"Failed to set leverage for {pair}: {e}")
+            # One bulk read of current settings, then concurrent changes only where they differ
+            cache = self.leverage_cache
+            await cache.load()
+            results = await cache.ensure_many(
+                symbols[:5],  # limit to a small set on init
+                self.config.default_leverage,
+                getattr(self.config, "margin_type", None),
+            )
+            msg = (
+                f"Leverage {self.config.default_leverage} ensured for {sum(results.values())}/{len(results)} symbols "
+                f"({cache.stats['leverage_changes']} changed, {cache.stats['hits']} already set)"
+            )
+            self.logger.log_event("EXCHANGE", "DEBUG", msg)
 
         except Exception as e:
             self.logger.log_event("EXCHANGE", "WARNING", f"Failed to set default leverage: {e}")
@@ -214,7 +403,7 @@ class OptimizedExchangeClient:
             ):
                 return self.cached_balance
 
-            await self._rate_limit()
+            await self._rate_limit(weight=5)
             balance = await self.exchange.fetch_balance()
 
             # Cache the balance
@@ -257,8 +446,9 @@ class OptimizedExchangeClient:
     async def get_position(self, symbol: str) -> dict[str, Any] | None:
         """Get current position for a symbol"""
         try:
-            await self._rate_limit()
-            positions = await self.exchange.fetch_positions([symbol])
+            positions = await self._coalesced(
+                "get_position", symbol, lambda: self.exchange.fetch_positions([symbol]), weight=5
+            )
 
             for position in positions:
                 if position.get("symbol") != symbol:
@@ -276,11 +466,16 @@ class OptimizedExchangeClient:
             self.logger.log_event("EXCHANGE", "ERROR", f"Failed to get position for {symbol}: {e}")
             return None
 
+    async def fetch_positions_snapshot(self) -> list[dict[str, Any]]:
+        """All positions in one request (flat ones included); raises on failure."""
+        if not self.exchange:
+            raise RuntimeError("Exchange not initialized")
+        return await self._coalesced("get_all_positions", None, self.exchange.fetch_positions, weight=5)
+
     async def get_all_positions(self) -> list[dict[str, Any]]:
         """Get all open positions"""
         try:
-            await self._rate_limit()
-            positions = await self.exchange.fetch_positions()
+            positions = await self.fetch_positions_snapshot()
 
             # Filter only open positions, tolerant to size/"contracts" keys
             open_positions: list[dict[str, Any]] = []
@@ -311,13 +506,28 @@ class OptimizedExchangeClient:
         price: float | None = None,
         params: dict[str, Any] = None,
     ) -> dict[str, Any]:
-        """Create an order"""
+        """Create an order (protective / reduce-only orders are scheduled as critical)"""
+        order_params = params or {}
+        protective = bool(order_params.get("reduceOnly") or order_params.get("closePosition")) or any(
+            t in str(order_type).upper() for t in ("STOP", "TAKE_PROFIT", "TRAILING")
+        )
+        with priority_scope("critical" if protective else "normal"):
+            return await self._create_order(symbol, order_type, side, amount, price, order_params)
+
+    async def _create_order(
+        self,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: float | None,
+        order_params: dict[str, Any],
+    ) -> dict[str, Any]:
         try:
             await self._rate_limit()
 
-            order_params = params or {}
-            # Only send validation-only orders in DRY_RUN mode
-            if self.config.dry_run:
+            # Only send validation-only orders in DRY_RUN mode (the paper simulator fills locally instead)
+            if self.config.dry_run and self.simulator is None:
                 order_params["test"] = True
 
             # Stage F: Block only orders that OPEN positions (not reduceOnly)
@@ -330,9 +540,41 @@ class OptimizedExchangeClient:
 
             normalized_type = self._normalize_order_type(order_type, price)
 
-            order = await self.exchange.create_order(
-                symbol=symbol, type=normalized_type, side=side, amount=amount, price=price, params=order_params
+            # The direct paths skip ccxt's amount/price_to_precision, so they need the market's filters
+            spec = self.market_spec(symbol)
+            direct = (
+                spec is not None
+                and (self.ws_orders or self.order_transport) is not None
+                and OrderTransport.supports(normalized_type, order_params)
             )
+            if direct:
+                qty = spec.floor_qty(amount)
+                px = spec.floor_price(price) if price is not None else None
+
+            async def send():
+                # WebSocket API while connected, then the direct REST transport, then ccxt
+                if direct:
+                    ws, transport = self.ws_orders, self.order_transport
+                    if ws is not None and ws.connected:
+                        return await ws.create_order(spec.id, symbol, normalized_type, side, qty, px, order_params)
+                    if transport is not None:
+                        return await transport.create_order(
+                            spec.id, symbol, normalized_type, side, qty, px, order_params
+                        )
+                return await self.exchange.create_order(
+                    symbol=symbol, type=normalized_type, side=side, amount=amount, price=price, params=order_params
+                )
+
+            # Resend after a timeout only if the order can be found (or ruled out) by its clientOrderId
+            client_id = order_params.get("newClientOrderId")
+            lookup = None
+            if client_id and not self.config.dry_run:
+
+                async def lookup():
+                    return await self.exchange.fetch_order(None, symbol, {"origClientOrderId": client_id})
+
+            order = await self.retry.run_order(send, lookup)
+            self._invalidate_reads(symbol)
 
             self.logger.log_event(
                 "EXCHANGE",
@@ -347,6 +589,73 @@ class OptimizedExchangeClient:
             self.logger.log_event("EXCHANGE", "ERROR", f"Failed to create order for {symbol}: {e}")
             raise
 
+    async def create_orders_batch(self, symbol: str, orders: list[dict[str, Any]]) -> list[dict[str, Any] | Exception]:
+        """Place several reduce-only orders for one symbol in a single round trip.
+
+        Each entry has type/side/amount/price/params as for create_order. Plain orders
+        go to /fapi/v1/batchOrders (BATCH_ORDERS_MAX per request); conditional orders
+        (stop / take-profit / trailing), which Binance only accepts on the algo order
+        endpoint that has no batch form, are sent individually at the same time, as is
+        everything in dry-run. Results align with `orders`: the created order, or the
+        exception for that leg. If a batch request itself fails, its legs are resent
+        individually (create_order's clientOrderId rules apply).
+        """
+        results: list[dict[str, Any] | Exception | None] = [None] * len(orders)
+        batchable: list[int] = []
+        singles: list[int] = []
+        can_batch = not self.config.dry_run and hasattr(self.exchange, "create_orders")
+        for i, o in enumerate(orders):
+            params = o.get("params") or {}
+            if can_batch and params.get("reduceOnly") and not _is_conditional(o["type"], params):
+                batchable.append(i)
+            else:
+                singles.append(i)
+
+        async def single(i: int) -> None:
+            o = orders[i]
+            try:
+                results[i] = await self.create_order(
+                    symbol, o["type"], o["side"], o["amount"], o.get("price"), dict(o.get("params") or {})
+                )
+            except Exception as e:
+                results[i] = e
+
+        async def batch(chunk: list[int]) -> None:
+            requests = [
+                {
+                    "symbol": symbol,
+                    "type": self._normalize_order_type(orders[i]["type"], orders[i].get("price")),
+                    "side": orders[i]["side"],
+                    "amount": orders[i]["amount"],
+                    "price": orders[i].get("price"),
+                    "params": dict(orders[i].get("params") or {}),
+                }
+                for i in chunk
+            ]
+            self.batch_stats["batches"] += 1
+            try:
+                with priority_scope("critical"):
+                    response = await self.exchange.create_orders(requests)
+            except Exception as e:
+                self.batch_stats["fallbacks"] += 1
+                self.logger.log_event("EXCHANGE", "WARNING", f"batchOrders failed for {symbol}, placing singly: {e}")
+                await asyncio.gather(*(single(i) for i in chunk))
+                return
+            self._invalidate_reads(symbol)
+            for i, order in zip(chunk, list(response or []) + [None] * len(chunk), strict=False):
+                if order and order.get("id") and order.get("status") != "rejected":
+                    results[i] = order
+                    self.batch_stats["batched_orders"] += 1
+                else:
+                    info = (order or {}).get("info") or {"msg": "missing from batchOrders response"}
+                    results[i] = ccxt.InvalidOrder(f"binance {json.dumps(info)}")
+                    self.batch_stats["rejected"] += 1
+
+        chunks = [batchable[k : k + BATCH_ORDERS_MAX] for k in range(0, len(batchable), BATCH_ORDERS_MAX)]
+        self.batch_stats["singles"] += len(singles)
+        await asyncio.gather(*(batch(c) for c in chunks), *(single(i) for i in singles))
+        return results
+
     # Stage F helper: call when trade close PnL is known (hook from settlement/close flows)
     def record_trade_close_stage_f(self, pnl_pct: float) -> None:
         try:
@@ -390,11 +699,18 @@ class OptimizedExchangeClient:
             params["stopPrice"] = float(take_profit_price)
             return await self.create_order(symbol, "TAKE_PROFIT", side, amount, float(take_profit_price), params)
 
+    @with_priority("critical")
     async def cancel_order(self, order_id: str, symbol: str) -> dict[str, Any]:
         """Cancel an order"""
         try:
             await self._rate_limit()
-            result = await self.exchange.cancel_order(order_id, symbol)
+            if self.ws_orders is not None and self.ws_orders.connected:
+                result = await self.ws_orders.cancel_order(order_id, self._market_id(symbol), symbol)
+            elif self.order_transport is not None:
+                result = await self.order_transport.cancel_order(order_id, self._market_id(symbol), symbol)
+            else:
+                result = await self.exchange.cancel_order(order_id, symbol)
+            self._invalidate_reads(symbol)
 
             self.logger.log_event("EXCHANGE", "INFO", f"Cancelled order {order_id} for {symbol}")
 
@@ -404,11 +720,34 @@ class OptimizedExchangeClient:
             self.logger.log_event("EXCHANGE", "ERROR", f"Failed to cancel order {order_id}: {e}")
             raise
 
+    @with_priority("critical")
+    async def modify_order(self, order_id: str, symbol: str, side: str, amount: float, price: float) -> dict[str, Any]:
+        """Amend a resting LIMIT order's price/quantity in place (order.modify over WS, PUT /fapi/v1/order otherwise)"""
+        try:
+            await self._rate_limit()
+            if self.ws_orders is not None and self.ws_orders.connected:
+                result = await self.ws_orders.modify_order(
+                    order_id, self._market_id(symbol), symbol, side, amount, price
+                )
+            else:
+                result = await self.exchange.edit_order(order_id, symbol, "limit", side, amount, price)
+            self._invalidate_reads(symbol)
+
+            self.logger.log_event("EXCHANGE", "INFO", f"Modified order {order_id} for {symbol}: {amount} @ {price}")
+
+            return result
+
+        except Exception as e:
+            self.logger.log_event("EXCHANGE", "ERROR", f"Failed to modify order {order_id}: {e}")
+            raise
+
+    @with_priority("critical")
     async def cancel_all_orders(self, symbol: str) -> list[dict[str, Any]]:
         """Cancel all orders for a symbol"""
         try:
             await self._rate_limit()
             result = await self.exchange.cancel_all_orders(symbol)
+            self._invalidate_reads(symbol)
 
             self.logger.log_event("EXCHANGE", "INFO", f"Cancelled all orders for {symbol}")
 
@@ -418,6 +757,7 @@ class OptimizedExchangeClient:
             self.logger.log_event("EXCHANGE", "ERROR", f"Failed to cancel all orders for {symbol}: {e}")
             return []
 
+    @with_priority("critical")
     async def cancel_sl_order(self, symbol: str, side: str | None) -> None:
         """
         Cancel current SL/trailing reduceOnly order for a symbol, if found.
@@ -454,20 +794,46 @@ class OptimizedExchangeClient:
     async def get_order(self, order_id: str, symbol: str) -> dict[str, Any] | None:
         """Get order details"""
         try:
-            await self._rate_limit()
-            return await self.exchange.fetch_order(order_id, symbol)
+            return await self._coalesced(
+                "get_order", (order_id, symbol), lambda: self.exchange.fetch_order(order_id, symbol)
+            )
         except Exception as e:
             self.logger.log_event("EXCHANGE", "ERROR", f"Failed to get order {order_id}: {e}")
             return None
 
+    async def get_open_algo_orders(self, symbol: str) -> list[dict[str, Any]]:
+        """Open conditional (algo) orders of a symbol; TP/SL live here, not in openOrders (weight 1)."""
+        try:
+            return await self._coalesced(
+                "get_open_algo_orders",
+                symbol,
+                lambda: self.exchange.fetch_open_orders(symbol, params={"trigger": True}),
+            )
+        except Exception as e:
+            self.logger.log_event("EXCHANGE", "ERROR", f"Failed to get open algo orders for {symbol}: {e}")
+            return []
+
+    async def get_recent_algo_orders(self, symbol: str, limit: int = 20) -> list[dict[str, Any]]:
+        """Latest conditional (algo) orders of a symbol in any status (one allAlgoOrders request, weight 5)."""
+        try:
+            return await self._coalesced(
+                "get_recent_algo_orders",
+                (symbol, limit),
+                lambda: self.exchange.fetch_orders(symbol, limit=limit, params={"trigger": True}),
+                weight=5,
+            )
+        except Exception as e:
+            self.logger.log_event("EXCHANGE", "ERROR", f"Failed to get recent algo orders for {symbol}: {e}")
+            return []
+
     async def get_open_orders(self, symbol: str | None = None) -> list[dict[str, Any]]:
         """Get open orders.
         Prefer passing a symbol to avoid strict Binance rate limits.
         """
         try:
-            await self._rate_limit()
             if symbol:
-                return await self.exchange.fetch_open_orders(symbol)
+                return await self._coalesced("get_open_orders", symbol, lambda: self.exchange.fetch_open_orders(symbol))
+            await self._rate_limit()
             # Fallback: fetch per symbol when not provided, to avoid ccxt warning and rate penalties
             try:
                 markets = await self.get_markets()
@@ -488,33 +854,124 @@ class OptimizedExchangeClient:
             self.logger.log_event("EXCHANGE", "ERROR", f"Failed to get open orders: {e}")
             return []
 
-    async def get_ticker(self, symbol: str) -> dict[str, Any] | None:
-        """Get ticker for a symbol"""
+    def _streamed_ticker(self, symbol: str) -> dict[str, Any] | None:
+        """Build a ccxt-shaped ticker from streamed data if the symbol's feeds are fresh."""
+        freshness, table = self.market_freshness, self.ticker_table
+        if freshness is None or table is None:
+            return None
+        try:
+            raw = to_binance_symbol(symbol)
+        except Exception:
+            return None
+        if not freshness.is_fresh("ticker", raw):
+            return None
+        row = table.get(raw)
+        if not row or not row["last"]:
+            return None
+
+        info: dict[str, Any] = {"symbol": raw, "lastPrice": str(row["last"]), "quoteVolume": str(row["quote_volume"])}
+        ticker: dict[str, Any] = {
+            "symbol": symbol,
+            "timestamp": int(row["event_time"]) or None,
+            "last": row["last"],
+            "close": row["last"],
+            "open": row["open"],
+            "high": row["high"],
+            "low": row["low"],
+            "baseVolume": row["base_volume"],
+            "quoteVolume": row["quote_volume"],
+            "info": info,
+        }
+        if row["open"]:
+            ticker["change"] = row["last"] - row["open"]
+            ticker["percentage"] = ticker["change"] / row["open"] * 100.0
+        mark = freshness.get("mark", raw)
+        if mark:
+            ticker["markPrice"] = mark
+            info["markPrice"] = str(mark)
+        ticker.update(self._book_quotes(symbol) or {})
+        return ticker
+
+    def _book_quotes(self, symbol: str) -> dict[str, float] | None:
+        """Best bid/ask from the local order book, if it is tracked and fresh."""
+        try:
+            book = self.order_books.get_book(symbol) if self.order_books is not None else None
+        except Exception:
+            return None
+        if book is None or not book.is_fresh(BOOK_QUOTE_MAX_AGE_SEC) or not (book.best_bid and book.best_ask):
+            return None
+        return {"bid": book.best_bid, "ask": book.best_ask}
+
+    async def _quotes(self, symbol: str) -> dict[str, float]:
+        """Best bid/ask: local order book first, else REST bookTicker (weight 2)."""
+        local = self._book_quotes(symbol)
+        if local is not None:
+            return local
+        raw_ex = self.exchange
+        tickers = await self._coalesced("get_book_ticker", symbol, lambda: raw_ex.fetch_bids_asks([symbol]), weight=2)
+        top = (tickers or {}).get(symbol) or {}
+        return {side: top[side] for side in ("bid", "ask") if top.get(side)}
+
+    @with_priority("background")
+    async def get_ticker(self, symbol: str, with_quotes: bool = False) -> dict[str, Any] | None:
+        """Get ticker for a symbol (streamed when fresh, REST only for stale symbols).
+
+        Neither the miniTicker stream nor the REST 24h ticker carries bid/ask; with `with_quotes`
+        they are filled from the local order book, or from REST bookTicker when no fresh book exists.
+        """
         try:
             # Avoid REST calls during shutdown
             raw_ex = getattr(self, "exchange", None)
-            if not raw_ex:
-                return None
-            await self._rate_limit()
-            return await raw_ex.fetch_ticker(symbol)
+            ticker = self._streamed_ticker(symbol)
+            if ticker is None:
+                if self.market_freshness is not None:
+                    self.market_freshness.note_rest_fallback("ticker")
+                if not raw_ex:
+                    return None
+                ticker = await self._coalesced("get_ticker", symbol, lambda: raw_ex.fetch_ticker(symbol))
+            if with_quotes and ticker and raw_ex and not (ticker.get("bid") and ticker.get("ask")):
+                ticker = {**ticker, **await self._quotes(symbol)}  # REST results are cached: don't mutate
+            return ticker
+        except RequestShed:
+            return None
         except Exception as e:
             self.logger.log_event("EXCHANGE", "ERROR", f"Failed to get ticker for {symbol}: {e}")
             return None
 
-    async def get_ohlcv(self, symbol: str, timeframe: str = "1m", limit: int = 100) -> list[list[float]]:
-        """Get OHLCV data"""
+    @with_priority("background")
+    async def get_ohlcv(
+        self,
+        symbol: str,
+        timeframe: str = "1m",
+        limit: int = 100,
+        since: int | None = None,
+        raise_errors: bool = False,
+    ) -> list[list[float]]:
+        """Get OHLCV data (optionally starting at `since` open time, ms).
+
+        Failures return [] unless `raise_errors` is set, for callers that must tell
+        a failed request from a range the exchange has no bars for.
+        """
         try:
-            await self._rate_limit()
-            return await self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            return await self._coalesced(
+                "get_ohlcv",
+                (symbol, timeframe, limit, since),
+                lambda: self.exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=limit),
+            )
+        except RequestShed:
+            # Caller retries next cycle; an empty result would look like missing exchange data
+            raise
         except Exception as e:
             self.logger.log_event("EXCHANGE", "ERROR", f"Failed to get OHLCV for {symbol}: {e}")
+            if raise_errors:
+                raise
             return []
 
     async def get_markets(self) -> dict[str, Any]:
         """Get available markets"""
         try:
             if not self.exchange.markets:
-                await self.exchange.load_markets()
+                await self.single_flight.do("get_markets", None, self.exchange.load_markets)
             return self.exchange.markets
         except Exception as e:
             self.logger.log_event("EXCHANGE", "ERROR", f"Failed to get markets: {e}")
@@ -587,52 +1044,257 @@ class OptimizedExchangeClient:
             self.logger.log_event("EXCHANGE", "ERROR", f"Failed to get USDT symbols: {e}")
             return []
 
-    async def _rate_limit(self):
-        """Simple rate limiting"""
-        current_time = time.time()
-
-        if current_time - self.last_request_time < 1.0 / self.max_requests_per_second:
-            await asyncio.sleep(0.1)
-
-        self.last_request_time = current_time
-        self.request_count += 1
-
-    async def health_check(self) -> bool:
-        """Check exchange connection health (no hardcoded USDT dependency)"""
-        try:
-            current_time = time.time()
+    def _install_rate_limiter(self) -> None:
+        """Charge every ccxt HTTP request its endpoint weight and correct the budget from headers.
 
-            # Only check if enough time has passed
-            if current_time - self.last_health_check < self.health_check_interval:
-                return self.connection_healthy
+        The same hook feeds request outcomes and latency to the health monitor and
+        fails fast with CircuitOpen while the request's endpoint class is failing.
+        """
+        raw = self.exchange
+        if raw is None or self._limiter_hooked:
+            return
+        raw.fetch = self._guard_fetch(raw, raw.fetch)
+        self._limiter_hooked = True
+
+    def _install_cassette(self) -> None:
+        """Record or replay the raw exchange's HTTP traffic (below the limiter hook, so replays are still paced)."""
+        mode = getattr(self.config, "cassette_mode", None)
+        raw = self.exchange
+        if not mode or raw is None or self.cassette is not None:
+            return
+        self.cassette = Cassette(
+            self.config.cassette_path, mode, latency_scale=getattr(self.config, "cassette_latency_scale", 0.0)
+        )
+        raw.fetch = self.cassette.wrap(raw, raw.fetch)
+        self.logger.log_event("EXCHANGE", "INFO", f"Cassette {mode}: {self.cassette.path}")
 
-            # Public + (optional) private quick checks
-            await self.exchange.load_markets()
-            if not self.config.dry_run and (self.config.api_key and self.config.api_secret):
-                try:
-                    await self.exchange.fetch_balance()
-                except Exception as e:
-                    if not self.config.testnet:
-                        raise
-                    # On testnet tolerate private fetch failures
-                    self.logger.log_event("EXCHANGE", "WARNING", f"Health check: private fetch failed on testnet: {e}")
+    def _guard_fetch(self, owner, original_fetch):
+        """Wrap a `fetch(url, method, headers, body)` with limiter, breaker and header accounting.
 
-            self.connection_healthy = True
-            self.last_health_check = current_time
+        `owner.last_response_headers` is read after each request (ccxt exchange or OrderTransport).
+        """
+        raw = owner
+        limiter = self.rate_limiter
+        health = self.health
+
+        async def fetch(url, method="GET", headers=None, body=None):
+            cls = endpoint_class(method, url, body)
+            health.check(cls, critical=request_priority.get() == "critical")
+            weight, orders = endpoint_cost(method, url, body)
+            try:
+                await limiter.acquire(weight, orders)
+            except BaseException:
+                # Shed or cancelled while queued: a half-open trial never went out
+                health.release(cls)
+                raise
+            started = time.monotonic()
+            try:
+                result = await original_fetch(url, method, headers, body)
+            except (ccxt.RateLimitExceeded, ccxt.DDoSProtection):
+                health.release(cls)
+                resp_headers = getattr(raw, "last_response_headers", None) or {}
+                retry_after = {str(k).lower(): v for k, v in dict(resp_headers).items()}.get("retry-after")
+                limiter.penalize(float(retry_after) if retry_after else None)
+                self.logger.log_event("EXCHANGE", "WARNING", f"Rate limited by exchange, pausing {retry_after or 60}s")
+                raise
+            except asyncio.CancelledError:
+                health.release(cls)
+                raise
+            except Exception as e:
+                health.record(cls, not is_health_failure(e), time.monotonic() - started)
+                if self.server_clock is not None and is_clock_rejection(e):
+                    self.server_clock.note_rejection()
+                raise
+            else:
+                health.record(cls, True, time.monotonic() - started)
+                return result
+            finally:
+                limiter.update_from_headers(getattr(raw, "last_response_headers", None))
 
-            return True
+        return fetch
 
+    async def _init_server_clock(self) -> None:
+        """Sign with a drift-corrected server clock estimate (ccxt, direct transport, WebSocket API)."""
+        if not getattr(self.config, "server_time_sync", True) or self.server_clock is not None:
+            return
+        if not (self.config.api_key and self.config.api_secret):
+            return
+        raw = self.exchange
+        clock = ServerClock(self._fetch_server_time, interval=getattr(self.config, "server_time_sync_sec", 60.0))
+        try:
+            await clock.sync()
         except Exception as e:
-            self.logger.log_event("EXCHANGE", "WARNING", f"Health check failed: {e}")
-            self.connection_healthy = False
-            return False
+            self.logger.log_event("EXCHANGE", "WARNING", f"Server time sync failed, using ccxt time difference: {e}")
+            return
+        self.server_clock = clock
+        raw.nonce = clock.now_ms  # ccxt signs with nonce(); the transport and WebSocket API take it as their clock
+        raw.options["adjustForTimeDifference"] = False
+        self.retry.resync = clock.resync
+        await clock.start()
+        self.logger.log_event(
+            "EXCHANGE", "INFO", f"Server clock offset {clock.offset_ms:.0f} ms (rtt {clock.last_rtt_ms:.0f} ms)"
+        )
+
+    async def _fetch_server_time(self) -> int:
+        with priority_scope("critical"):
+            return await self.exchange.fetch_time()
+
+    def _init_order_transport(self) -> None:
+        """Attach the direct order transport (live trading with keys only), behind the same limiter/breakers."""
+        if not getattr(self.config, "fast_order_transport", False) or self.order_transport is not None:
+            return
+        if self.config.dry_run or not (self.config.api_key and self.config.api_secret):
+            return
+        raw = self.exchange
+        try:
+            base_url = raw.urls["api"]["fapiPrivate"]
+        except (AttributeError, KeyError, TypeError):
+            base_url = None
+        transport = OrderTransport(
+            self.config.api_key,
+            self.config.api_secret,
+            base_url=base_url,
+            clock=getattr(raw, "nonce", None),  # server clock estimate (ccxt time difference without one)
+            exceptions=binance_exceptions(raw),
+            recv_window=int((getattr(raw, "options", None) or {}).get("recvWindow", 10000)),
+            http_pool=self.http_pool,
+        )
+        fetch = self.cassette.wrap(transport, transport.fetch) if self.cassette else transport.fetch
+        transport.fetch = self._guard_fetch(transport, fetch)
+        self.order_transport = transport
+        self.logger.log_event("EXCHANGE", "INFO", f"Direct order transport enabled ({transport.base_url})")
+
+    async def _init_ws_orders(self) -> None:
+        """Open the WebSocket API order connection (live trading with keys only); orders use REST until it is up."""
+        if not getattr(self.config, "ws_order_api", False) or self.ws_orders is not None:
+            return
+        if self.config.dry_run or not (self.config.api_key and self.config.api_secret):
+            return
+        if self.cassette is not None:
+            # Frames are not on the cassette: orders use the recorded REST paths instead
+            self.logger.log_event("EXCHANGE", "INFO", "WebSocket API orders disabled while a cassette is active")
+            return
+        raw = self.exchange
+        client = WSOrderClient(
+            self.config.api_key,
+            self.config.api_secret,
+            url=ws_api_url(self.config.testnet),
+            clock=getattr(raw, "nonce", None),
+            exceptions=binance_exceptions(raw),
+            recv_window=int((getattr(raw, "options", None) or {}).get("recvWindow", 10000)),
+            http_pool=self.http_pool,
+        )
+        client.fetch = self._guard_fetch(client, client.fetch)
+        self.ws_orders = client
+        await client.start()
+        self.logger.log_event("EXCHANGE", "INFO", f"WebSocket API order connection started ({client.url})")
+
+    async def _init_simulator(self) -> None:
+        """In dry run, serve orders/positions/balance from the local paper exchange fed by live prices."""
+        if not self.config.dry_run or not getattr(self.config, "paper_trading", False) or self.simulator is not None:
+            return
+        self.simulator = PaperExchange(
+            self.exchange,
+            quote=self.config.resolved_quote_coin,
+            balance=self.config.trading_deposit,
+            price_source=self._paper_price,
+            market_id=self._market_id,
+            taker_fee=getattr(self.config, "taker_fee_percent", 0.04) / 100,
+            maker_fee=getattr(self.config, "maker_fee_percent", 0.02) / 100,
+            default_leverage=self.config.default_leverage,
+        )
+        self.exchange = self.simulator
+        await self.simulator.start()
+        self.logger.log_event(
+            "EXCHANGE", "INFO", f"Paper trading: orders fill locally, balance {self.config.trading_deposit}"
+        )
+
+    async def _paper_price(self, symbol: str) -> dict[str, Any] | None:
+        """Price paper fills and TP/SL triggers like real protective orders: critical, never shed."""
+        with priority_scope("critical"):
+            return await self.get_ticker(symbol, with_quotes=True)
+
+    def _market_id(self, symbol: str) -> str:
+        spec = self.market_spec(symbol)
+        return spec.id if spec is not None else to_binance_symbol(symbol)
+
+    async def _health_probe(self) -> None:
+        """Cheap public request (weight 1) used only while a breaker is open."""
+        with priority_scope("critical"):
+            await self.exchange.fetch_time()
+
+    def _on_health_change(self, cls: str, state: str) -> None:
+        self.connection_healthy = self.health.healthy
+        level = "WARNING" if state == "open" else "INFO"
+        self.logger.log_event("EXCHANGE", level, f"Circuit breaker [{cls}] -> {state}")
+
+    async def _rate_limit(self, weight: int = 1):
+        """Count the call; charge the shared limiter only when requests bypass the fetch hook."""
+        self.request_count += 1
+        if not self._limiter_hooked:
+            await self.rate_limiter.acquire(weight)
+
+    async def _coalesced(self, method: str, key, call, weight: int = 1):
+        """Run a read through the single-flight layer (with retries); only the leading caller spends rate budget."""
+
+        async def run():
+            await self._rate_limit(weight=weight)
+            return await self.retry.run(method, call)
+
+        return await self.single_flight.do(method, key, run)
+
+    def _invalidate_reads(self, symbol: str | None = None) -> None:
+        """Drop cached order/position reads after a write so callers see the new state."""
+        sf = self.single_flight
+        for method in ("get_open_orders", "get_open_algo_orders", "get_position"):
+            sf.invalidate(method, symbol)
+        sf.invalidate("get_all_positions")
+        sf.invalidate("get_recent_algo_orders")
+        sf.invalidate("get_order")
+        self.position_snapshot.invalidate()
+
+    def request_stats(self) -> dict[str, dict[str, float]]:
+        """Per priority class queueing delay / shed counters from the shared limiter, plus breaker health and retries."""
+        return {
+            **self.rate_limiter.queue_stats(),
+            "health": self.health.snapshot(),
+            "retries": self.retry.stats,
+            "order_batches": self.batch_stats,
+            **({"order_transport": self.order_transport.snapshot()} if self.order_transport else {}),
+            **({"ws_orders": self.ws_orders.snapshot()} if self.ws_orders else {}),
+            **({"paper": self.simulator.snapshot()} if self.simulator else {}),
+            **({"cassette": self.cassette.snapshot()} if self.cassette else {}),
+            "http_pool": self.http_pool.snapshot(),
+            **({"server_clock": self.server_clock.snapshot()} if self.server_clock else {}),
+        }
+
+    async def health_check(self) -> bool:
+        """Exchange health from the circuit breakers (no requests: health is inferred from real traffic)."""
+        self.connection_healthy = self.health.healthy
+        if not self.connection_healthy:
+            self.logger.log_event(
+                "EXCHANGE", "DEBUG", f"Unhealthy endpoint classes: {', '.join(self.health.open_classes())}"
+            )
+        return self.connection_healthy
 
     async def close(self):
         """Close exchange connection"""
         try:
+            if self._markets_task and not self._markets_task.done():
+                self._markets_task.cancel()
+            self.health.stop()
+            if self.server_clock is not None:
+                await self.server_clock.stop()
+            if self.order_transport is not None:
+                await self.order_transport.close()
+            if self.ws_orders is not None:
+                await self.ws_orders.stop()
+            if self.cassette is not None:
+                self.cassette.close()
             if self.exchange:
                 await self.exchange.close()
                 self.logger.log_event("EXCHANGE", "INFO", "Exchange connection closed")
+            await self.http_pool.close()
         except Exception as e:
             self.logger.log_event("EXCHANGE", "ERROR", f"Failed to close exchange: {e}")
 
@@ -668,6 +1330,10 @@ class OptimizedExchangeClient:
             if not raw_ex or not getattr(raw_ex, "markets", None):
                 return float(amount)
 
+            spec = self.market_spec(symbol)
+            if spec is not None and spec.step:
+                return spec.floor_qty(amount)
+
             market = raw_ex.markets.get(symbol, {}) or {}
             if not market:
                 return float(amount)
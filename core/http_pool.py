@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP / WebSocket connection layer.
+
+One `aiohttp.ClientSession` over one `TCPConnector` serves every component:
+the ccxt client, the direct order transport, the WebSocket API and user-data
+streams, market data streams, the market stats collector and Telegram.
+
+  - per-host keep-alive pools: REST bursts reuse open connections instead of
+    paying a TCP + TLS handshake per request
+  - DNS cache (`dns_ttl`): reconnect storms do not re-resolve every host
+  - one TLS context: CA store loaded once instead of per session
+
+Components take an optional pool and fall back to a private session without
+one, so they still work standalone (tools, tests). Shared sessions are never
+closed by a component; the pool owner (the exchange client) closes it last.
+
+`snapshot()` reports open sockets (per host, in use vs idle keep-alive) and
+counters from aiohttp tracing: new connections, reused connections, DNS cache
+hits/misses, requests.
+"""
+
+import ssl
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import aiohttp
+
+
+class HttpPool:
+    """Lazily created shared aiohttp session with keep-alive, DNS cache and a shared TLS context."""
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 60.0,
+        dns_ttl: int = 300,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_ttl = dns_ttl
+        self.ssl_context = ssl.create_default_context()
+        self._session: aiohttp.ClientSession | None = None
+        self.stats = {
+            "sessions": 0,
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+        }
+
+    def _trace(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        def count(key: str):
+            async def hook(session, ctx, params) -> None:
+                self.stats[key] += 1
+
+            return hook
+
+        trace.on_request_start.append(count("requests"))
+        trace.on_connection_create_end.append(count("connections_created"))
+        trace.on_connection_reuseconn.append(count("connections_reused"))
+        trace.on_dns_cache_hit.append(count("dns_cache_hits"))
+        trace.on_dns_cache_miss.append(count("dns_cache_misses"))
+        return trace
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The shared session (created on first use inside the running loop, recreated after close)."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_ttl,
+                ssl=self.ssl_context,
+                enable_cleanup_closed=True,
+                happy_eyeballs_delay=0,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, trace_configs=[self._trace()])
+            self.stats["sessions"] += 1
+        return self._session
+
+    @property
+    def closed(self) -> bool:
+        return self._session is None or self._session.closed
+
+    def snapshot(self) -> dict[str, Any]:
+        """Open sockets (in use / idle keep-alive, per host) and connection reuse counters."""
+        per_host: dict[str, int] = {}
+        in_use = idle = 0
+        connector = None if self.closed else self._session.connector
+        if connector is not None:
+            for key, protos in getattr(connector, "_acquired_per_host", {}).items():
+                per_host[key.host] = per_host.get(key.host, 0) + len(protos)
+                in_use += len(protos)
+            for key, conns in getattr(connector, "_conns", {}).items():
+                per_host[key.host] = per_host.get(key.host, 0) + len(conns)
+                idle += len(conns)
+        created, reused = self.stats["connections_created"], self.stats["connections_reused"]
+        return {
+            "open": in_use + idle,
+            "in_use": in_use,
+            "idle": idle,
+            "per_host": per_host,
+            "reuse_ratio": round(reused / (created + reused), 3) if created + reused else None,
+            **self.stats,
+        }
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+@asynccontextmanager
+async def client_session(pool: HttpPool | None, **kwargs: Any) -> AsyncIterator[aiohttp.ClientSession]:
+    """The pool's shared session (left open), or a private one closed on exit when there is no pool."""
+    if pool is not None:
+        yield pool.session
+        return
+    async with aiohttp.ClientSession(**kwargs) as session:
+        yield session
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Per-symbol leverage and margin-mode cache.
+
+The exchange's current settings for every symbol are loaded in one request
+(`/fapi/v1/symbolConfig` via ccxt `fetch_leverages`) and kept current from
+ACCOUNT_CONFIG_UPDATE events. `ensure` only sends `marginType` / `leverage`
+changes where the cached value differs from the target, so the entry path
+normally makes no request at all; `ensure_many` applies changes concurrently.
+"""
+
+import asyncio
+from collections.abc import Iterable
+from typing import Any
+
+
+class LeverageCache:
+    """Known leverage / margin mode per ccxt symbol, with change-only updates."""
+
+    def __init__(self, exchange_client, concurrency: int = 5):
+        self.client = exchange_client
+        self.concurrency = concurrency
+        self.leverage: dict[str, int] = {}
+        self.margin_mode: dict[str, str] = {}
+        self.loaded = False
+        self._locks: dict[str, asyncio.Lock] = {}
+        self.stats = {"bulk_loads": 0, "hits": 0, "leverage_changes": 0, "margin_changes": 0, "failures": 0}
+
+    def _to_ccxt(self, raw: str) -> str:
+        registry = getattr(self.client, "market_registry", None)
+        spec = registry.get(raw) if registry is not None else None
+        if spec is not None:
+            return spec.symbol
+        q = self.client.config.resolved_quote_coin
+        if raw.endswith(q) and "/" not in raw:
+            return f"{raw[: -len(q)]}/{q}:{q}"
+        return raw
+
+    async def load(self, symbols: list[str] | None = None) -> bool:
+        """Bulk-load current settings. Returns False if the exchange could not be queried."""
+        raw = self.client.exchange
+        try:
+            leverages = await raw.fetch_leverages(symbols)
+        except Exception as e:
+            self.stats["failures"] += 1
+            self.client.logger.log_event("EXCHANGE", "WARNING", f"Leverage settings bulk load failed: {e}")
+            return False
+        for symbol, item in (leverages or {}).items():
+            lev = item.get("longLeverage") or item.get("shortLeverage")
+            if lev:
+                self.leverage[symbol] = int(lev)
+            if item.get("marginMode"):
+                self.margin_mode[symbol] = str(item["marginMode"]).lower()
+        self.loaded = True
+        self.stats["bulk_loads"] += 1
+        return True
+
+    async def ensure(self, symbol: str, leverage: int, margin_mode: str | None = None) -> bool:
+        """Make the exchange match the target, sending only what differs. Returns False on failure."""
+        margin_mode = margin_mode.lower() if margin_mode else None
+        if self.leverage.get(symbol) == int(leverage) and (
+            margin_mode is None or self.margin_mode.get(symbol) == margin_mode
+        ):
+            self.stats["hits"] += 1
+            return True
+
+        lock = self._locks.setdefault(symbol, asyncio.Lock())
+        async with lock:
+            raw = self.client.exchange
+            try:
+                if margin_mode and self.margin_mode.get(symbol) != margin_mode:
+                    try:
+                        await raw.set_margin_mode(margin_mode, symbol)
+                    except Exception as e:
+                        if "-4046" not in str(e):  # "No need to change margin type"
+                            raise
+                    self.margin_mode[symbol] = margin_mode
+                    self.stats["margin_changes"] += 1
+                if self.leverage.get(symbol) != int(leverage):
+                    await raw.set_leverage(int(leverage), symbol)
+                    self.leverage[symbol] = int(leverage)
+                    self.stats["leverage_changes"] += 1
+                return True
+            except Exception as e:
+                # State on the exchange is now uncertain: force a change request next time
+                self.leverage.pop(symbol, None)
+                self.margin_mode.pop(symbol, None)
+                self.stats["failures"] += 1
+                self.client.logger.log_event("EXCHANGE", "WARNING", f"Failed to set leverage/margin for {symbol}: {e}")
+                return False
+
+    async def ensure_many(
+        self, symbols: Iterable[str], leverage: int, margin_mode: str | None = None
+    ) -> dict[str, bool]:
+        """Apply the target to several symbols concurrently (bounded by `concurrency`)."""
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def one(symbol: str) -> bool:
+            async with sem:
+                return await self.ensure(symbol, leverage, margin_mode)
+
+        symbols = list(symbols)
+        results = await asyncio.gather(*(one(s) for s in symbols))
+        return dict(zip(symbols, results, strict=False))
+
+    def apply_config_update(self, event: dict[str, Any]) -> None:
+        """ACCOUNT_CONFIG_UPDATE: `ac` carries a symbol's new leverage."""
+        ac = event.get("ac") or {}
+        if ac.get("s") and ac.get("l") is not None:
+            try:
+                self.leverage[self._to_ccxt(ac["s"])] = int(ac["l"])
+            except (TypeError, ValueError):
+                pass
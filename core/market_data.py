@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Freshness tracking for streamed market data.
+
+Every stream records (feed, symbol) -> last update time (and optionally the
+latest value). Consumers ask `is_fresh` against a per-feed staleness budget
+and fall back to REST only for the symbols that are stale. Time spent in the
+stale state is accumulated per feed so degraded periods are visible.
+"""
+
+import time
+from typing import Any
+
+DEFAULT_BUDGETS: dict[str, float] = {
+    "mark": 3.0,  # <symbol>@markPrice@1s
+    "ticker": 5.0,  # !miniTicker@arr (only changed symbols are pushed)
+}
+
+
+class FreshnessTracker:
+    """Per-feed, per-symbol last-update timestamps with staleness budgets."""
+
+    def __init__(self, budgets: dict[str, float] | None = None, default_budget: float = 5.0):
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.default_budget = default_budget
+        self._last: dict[tuple[str, str], float] = {}
+        self._values: dict[tuple[str, str], Any] = {}
+        self._degraded_since: dict[tuple[str, str], float] = {}
+        self.degraded_sec: dict[str, float] = {}
+        self.degraded_episodes: dict[str, int] = {}
+        self.rest_fallbacks: dict[str, int] = {}
+
+    @staticmethod
+    def _key(feed: str, symbol: str) -> tuple[str, str]:
+        return feed, str(symbol).upper()
+
+    def budget(self, feed: str) -> float:
+        return self.budgets.get(feed, self.default_budget)
+
+    def mark(self, feed: str, symbol: str, value: Any = None, ts: float | None = None) -> None:
+        """Record a streamed update; closes a degraded episode for this key if one is open."""
+        key = self._key(feed, symbol)
+        now = time.time() if ts is None else ts
+        self._last[key] = now
+        if value is not None:
+            self._values[key] = value
+        since = self._degraded_since.pop(key, None)
+        if since is not None:
+            self.degraded_sec[feed] = self.degraded_sec.get(feed, 0.0) + max(0.0, now - since)
+
+    def age(self, feed: str, symbol: str) -> float | None:
+        last = self._last.get(self._key(feed, symbol))
+        return None if last is None else time.time() - last
+
+    def is_fresh(self, feed: str, symbol: str) -> bool:
+        key = self._key(feed, symbol)
+        last = self._last.get(key)
+        now = time.time()
+        if last is not None and now - last <= self.budget(feed):
+            return True
+        # Only symbols that streamed before can be degraded; never-seen ones are just unknown
+        if last is not None and key not in self._degraded_since:
+            self._degraded_since[key] = last + self.budget(feed)
+            self.degraded_episodes[feed] = self.degraded_episodes.get(feed, 0) + 1
+        return False
+
+    def get(self, feed: str, symbol: str) -> Any:
+        """Latest streamed value if fresh, else None."""
+        if not self.is_fresh(feed, symbol):
+            return None
+        return self._values.get(self._key(feed, symbol))
+
+    def stale_symbols(self, feed: str, symbols: list[str]) -> list[str]:
+        return [s for s in symbols if not self.is_fresh(feed, s)]
+
+    def note_rest_fallback(self, feed: str) -> None:
+        self.rest_fallbacks[feed] = self.rest_fallbacks.get(feed, 0) + 1
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        now = time.time()
+        feeds = {f for f, _ in self._last} | set(self.rest_fallbacks)
+        out: dict[str, dict[str, float]] = {}
+        for feed in sorted(feeds):
+            open_sec = sum(max(0.0, now - since) for (f, _), since in self._degraded_since.items() if f == feed)
+            out[feed] = {
+                "degraded_sec": round(self.degraded_sec.get(feed, 0.0) + open_sec, 3),
+                "degraded_episodes": self.degraded_episodes.get(feed, 0),
+                "stale_now": sum(1 for f, _ in self._degraded_since if f == feed),
+                "rest_fallbacks": self.rest_fallbacks.get(feed, 0),
+            }
+        return out
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Compact market registry.
+
+ccxt keeps a full nested dict per market (and a second copy in
+`markets_by_id`), including the raw `info.filters` list that is re-scanned on
+every precision lookup. The registry parses each tradable quote-coin contract
+once into a `__slots__` record holding only what order sizing needs; the raw
+`info` payload of indexed markets can then be trimmed to the few keys ccxt
+itself still reads when building requests.
+
+Tick and step are also kept as exact Decimals so prices and quantities can be
+converted to integer tick/step counts: flooring `0.3` to a `0.1` tick in
+floats gives `0.2` (0.3 / 0.1 == 2.9999999999999996), in ticks it gives 3.
+"""
+
+from __future__ import annotations
+
+import sys
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+from typing import Any
+
+from core.precision import _extract_min_cost_limit, extract_binance_filters, fallback_from_precision
+
+# market['info'] keys ccxt's binance implementation reads after load (order type checks, pair/contractType params)
+INFO_KEEP_KEYS = ("symbol", "pair", "contractType", "status", "orderTypes", "marginAsset")
+
+
+def _decimal(value: float | None) -> Decimal | None:
+    # str() gives the shortest repr, i.e. the exchange's own string for filter values like "0.001"
+    return Decimal(str(value)) if value else None
+
+
+def _units(value: float, unit: Decimal | None, up: bool) -> int:
+    if not unit:
+        raise ValueError("no tick/step size for this market")
+    return int((Decimal(str(value)) / unit).to_integral_value(rounding=ROUND_CEILING if up else ROUND_FLOOR))
+
+
+def _limit(market: dict[str, Any], kind: str, bound: str) -> float | None:
+    try:
+        value = ((market.get("limits") or {}).get(kind) or {}).get(bound)
+        value = float(value) if value is not None else None
+        return value if value and value > 0 else None
+    except (TypeError, ValueError):
+        return None
+
+
+class MarketSpec:
+    """Parsed trading rules of one contract (exchange filters plus ccxt precision/limits)."""
+
+    __slots__ = (
+        "symbol",
+        "id",
+        "active",
+        "tick",
+        "min_price",
+        "max_price",
+        "step",
+        "min_qty",
+        "max_qty",
+        "min_notional",
+        "min_cost",
+        "min_amount",
+        "precision_tick",
+        "precision_step",
+        "tick_d",
+        "step_d",
+    )
+    _FIELDS = __slots__[3:-2]
+
+    def __init__(self, symbol: str, id: str | None = None, active: bool = True, **fields: float | None):
+        self.symbol = symbol
+        self.id = id
+        self.active = active
+        for name in self._FIELDS:
+            setattr(self, name, fields.get(name))
+        # Effective increments (exchange filter, else ccxt precision) as exact decimals
+        self.tick_d = _decimal(self.tick or self.precision_tick)
+        self.step_d = _decimal(self.step or self.precision_step)
+
+    @classmethod
+    def from_market(cls, market: dict[str, Any]) -> MarketSpec:
+        f = extract_binance_filters(market)
+        precision_tick, precision_step = fallback_from_precision(market)
+        return cls(
+            market.get("symbol", ""),
+            id=market.get("id"),
+            active=market.get("active") is not False,
+            tick=f["tick"],
+            min_price=f["minPrice"],
+            max_price=f["maxPrice"],
+            step=f["step"],
+            min_qty=f["minQty"],
+            max_qty=f["maxQty"],
+            min_notional=f["minNotional"],
+            min_cost=_extract_min_cost_limit(market),
+            min_amount=_limit(market, "amount", "min"),
+            precision_tick=precision_tick,
+            precision_step=precision_step,
+        )
+
+    # ---------- integer tick/step representation ----------
+    def price_ticks(self, price: float, up: bool = False) -> int:
+        """Price as a whole number of ticks (floored, or ceiled with up=True)."""
+        return _units(price, self.tick_d, up)
+
+    def qty_steps(self, qty: float, up: bool = False) -> int:
+        """Quantity as a whole number of lot steps (floored, or ceiled with up=True)."""
+        return _units(qty, self.step_d, up)
+
+    def price_from_ticks(self, ticks: int) -> float:
+        return float(self.tick_d * ticks) if self.tick_d else float(ticks)
+
+    def qty_from_steps(self, steps: int) -> float:
+        return float(self.step_d * steps) if self.step_d else float(steps)
+
+    def floor_price(self, price: float) -> float:
+        """Price floored to the tick grid, exact (no float division drift)."""
+        return self.price_from_ticks(self.price_ticks(price)) if self.tick_d else float(price)
+
+    def floor_qty(self, qty: float) -> float:
+        """Quantity floored to the lot step grid, exact (no float division drift)."""
+        return self.qty_from_steps(self.qty_steps(qty)) if self.step_d else float(qty)
+
+    def as_filters(self) -> dict[str, float | None]:
+        """Same shape as `extract_binance_filters`."""
+        return {
+            "tick": self.tick,
+            "minPrice": self.min_price,
+            "maxPrice": self.max_price,
+            "step": self.step,
+            "minQty": self.min_qty,
+            "maxQty": self.max_qty,
+            "minNotional": self.min_notional,
+        }
+
+    def __repr__(self) -> str:
+        return f"MarketSpec({self.symbol!r}, tick={self.tick}, step={self.step}, minNotional={self.min_notional})"
+
+
+class MarketRegistry:
+    """MarketSpec per quote-coin contract, keyed by ccxt symbol and exchange id."""
+
+    def __init__(self):
+        self.specs: dict[str, MarketSpec] = {}
+        self._by_id: dict[str, MarketSpec] = {}
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.specs or symbol in self._by_id
+
+    def build(self, markets: dict[str, Any], quote: str) -> int:
+        """Replace the registry with the contract markets quoted or settled in `quote`. Returns the count."""
+        specs: dict[str, MarketSpec] = {}
+        for symbol, m in (markets or {}).items():
+            if not m or not m.get("contract"):
+                continue
+            if m.get("quote") != quote and m.get("settle") != quote:
+                continue
+            specs[symbol] = MarketSpec.from_market(m)
+        self.specs = specs
+        self._by_id = {s.id: s for s in specs.values() if s.id}
+        return len(specs)
+
+    def get(self, symbol: str | None) -> MarketSpec | None:
+        """Spec by ccxt symbol ("BTC/USDC:USDC") or exchange id ("BTCUSDC")."""
+        if not symbol:
+            return None
+        return self.specs.get(symbol) or self._by_id.get(symbol)
+
+    def compact(self, markets: dict[str, Any], markets_by_id: dict[str, Any] | None = None) -> int:
+        """Trim `info` of indexed markets to INFO_KEEP_KEYS in place. Returns markets trimmed."""
+        trimmed = 0
+        seen: set[int] = set()
+        candidates = [markets.get(symbol) for symbol in self.specs]
+        for spec in self.specs.values():
+            candidates.extend((markets_by_id or {}).get(spec.id) or [])
+        for m in candidates:
+            if not isinstance(m, dict) or id(m) in seen:
+                continue
+            seen.add(id(m))
+            info = m.get("info")
+            if isinstance(info, dict) and "filters" in info:
+                m["info"] = {k: info[k] for k in INFO_KEEP_KEYS if k in info}
+                trimmed += 1
+        return trimmed
+
+
+def deep_sizeof(obj: Any, _seen: set[int] | None = None) -> int:
+    """Approximate retained size in bytes of a nested dict/list/slots structure."""
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(deep_sizeof(getattr(obj, s, None), seen) for s in obj.__slots__)
+    return size
+
+
+def rules_for(exchange: Any, symbol: str | None, market: dict[str, Any] | None = None) -> MarketSpec | dict[str, Any]:
+    """Registry spec for `symbol` from an exchange client, else the raw ccxt market dict."""
+    lookup = getattr(exchange, "market_spec", None)
+    if callable(lookup):
+        try:
+            spec = lookup(symbol)
+        except Exception:
+            spec = None
+        if isinstance(spec, MarketSpec):
+            return spec
+    return market or {}
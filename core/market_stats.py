@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Async open-interest and funding collector for Binance USDⓈ-M futures.
+
+Polls `/fapi/v1/openInterest` (per symbol) and `/fapi/v1/premiumIndex`
+(one all-symbol request) for the tracked universe on a shared aiohttp session.
+Requests in a cycle run concurrently but never exceed `weight_budget`; when the
+client's rate limiter is given they are charged to it at background priority, so
+they queue behind trading traffic and are shed when the shared budget runs low.
+Results land in a TTL cache that strategies read synchronously.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from typing import Any
+from urllib.parse import urlencode
+
+import aiohttp
+
+from core.http_pool import HttpPool
+from core.rate_limiter import RequestShed, WeightRateLimiter, endpoint_cost
+from core.symbol_utils import to_binance_symbol
+
+# Request weights (Binance USDⓈ-M docs)
+OPEN_INTEREST_WEIGHT = 1
+PREMIUM_INDEX_ALL_WEIGHT = 10
+
+
+class TTLCache:
+    """Tiny key -> (value, ts) cache; expired entries read as missing."""
+
+    def __init__(self, ttl_sec: float):
+        self.ttl_sec = ttl_sec
+        self._data: dict[str, tuple[Any, float]] = {}
+
+    def set(self, key: str, value: Any, ts: float | None = None) -> None:
+        self._data[key] = (value, time.time() if ts is None else ts)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None or time.time() - entry[1] > self.ttl_sec:
+            return default
+        return entry[0]
+
+    def age(self, key: str) -> float | None:
+        entry = self._data.get(key)
+        return None if entry is None else time.time() - entry[1]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MarketStatsCollector:
+    """Background poller for open interest and funding of the active universe."""
+
+    def __init__(
+        self,
+        api_base: str,
+        poll_interval: float = 60.0,
+        ttl_sec: float = 300.0,
+        weight_budget: int = 40,
+        max_concurrency: int = 5,
+        request_timeout: float = 5.0,
+        http_pool: HttpPool | None = None,
+        rate_limiter: WeightRateLimiter | None = None,
+    ):
+        self.api_base = api_base.rstrip("/")
+        self.poll_interval = poll_interval
+        self.weight_budget = max(int(weight_budget), PREMIUM_INDEX_ALL_WEIGHT + OPEN_INTEREST_WEIGHT)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.request_timeout = request_timeout
+
+        self.open_interest = TTLCache(ttl_sec)
+        self.funding = TTLCache(ttl_sec)  # raw -> {"rate", "mark_price", "next_funding_time"}
+
+        self.symbols: list[str] = []  # raw symbols, priority order
+        self._cursor = 0  # round-robin position when the universe exceeds the budget
+        self.http_pool = http_pool
+        self.rate_limiter = rate_limiter
+        self.http_session: aiohttp.ClientSession | None = None
+        self.poll_task: asyncio.Task | None = None
+        self.stats = {"cycles": 0, "requests": 0, "errors": 0, "shed": 0, "weight_used": 0}
+
+    # ---------- universe ----------
+    def track(self, symbols: Iterable[str]) -> None:
+        """Replace the tracked universe (ccxt or raw symbols)."""
+        tracked: list[str] = []
+        for symbol in symbols:
+            try:
+                raw = to_binance_symbol(symbol) if "/" in symbol else str(symbol).upper()
+            except Exception:
+                continue
+            if raw not in tracked:
+                tracked.append(raw)
+        self.symbols = tracked
+
+    # ---------- sync reads ----------
+    @staticmethod
+    def _raw(symbol: str) -> str:
+        return to_binance_symbol(symbol) if "/" in symbol else str(symbol).upper()
+
+    def get_open_interest(self, symbol: str) -> float | None:
+        return self.open_interest.get(self._raw(symbol))
+
+    def get_funding_rate(self, symbol: str) -> float | None:
+        entry = self.funding.get(self._raw(symbol))
+        return entry["rate"] if entry else None
+
+    def get_funding(self, symbol: str) -> dict[str, float] | None:
+        return self.funding.get(self._raw(symbol))
+
+    # ---------- lifecycle ----------
+    async def start(self) -> None:
+        if self.http_pool is not None:
+            self.http_session = self.http_pool.session
+        elif self.http_session is None or self.http_session.closed:
+            self.http_session = aiohttp.ClientSession()
+        self.poll_task = asyncio.create_task(self._poll_loop())
+        logging.info("Market stats collector started")
+
+    async def stop(self) -> None:
+        if self.poll_task:
+            self.poll_task.cancel()
+            try:
+                await self.poll_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self.http_pool is None and self.http_session and not self.http_session.closed:
+            await self.http_session.close()
+
+    async def _poll_loop(self) -> None:
+        while True:
+            try:
+                await self.collect_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Market stats collection failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    # ---------- collection ----------
+    async def _get(self, path: str, params: dict[str, Any] | None = None) -> Any:
+        limiter = self.rate_limiter
+        weight, _ = endpoint_cost("GET", f"{path}?{urlencode(params or {})}")
+        if limiter is not None:
+            await limiter.acquire(weight, priority="background")  # may raise RequestShed
+        self.stats["requests"] += 1
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        async with self.http_session.get(f"{self.api_base}{path}", params=params, timeout=timeout) as resp:
+            self.stats["weight_used"] += weight  # the exchange answered, so it charged the request
+            if limiter is not None:
+                limiter.update_from_headers(resp.headers)
+                if resp.status in (418, 429):
+                    limiter.penalize(resp.headers.get("Retry-After"))
+            resp.raise_for_status()
+            return await resp.json()
+
+    def _next_batch(self, budget: int) -> list[str]:
+        """Symbols to poll this cycle; rotates when the universe exceeds the weight budget."""
+        count = min(len(self.symbols), budget // OPEN_INTEREST_WEIGHT)
+        if count >= len(self.symbols):
+            self._cursor = 0
+            return list(self.symbols)
+        batch = [self.symbols[(self._cursor + i) % len(self.symbols)] for i in range(count)]
+        self._cursor = (self._cursor + count) % len(self.symbols)
+        return batch
+
+    async def _fetch_funding(self) -> None:
+        data = await self._get("/fapi/v1/premiumIndex")
+        now = time.time()
+        wanted = set(self.symbols)
+        for item in data if isinstance(data, list) else [data]:
+            raw = item.get("symbol")
+            if raw not in wanted:
+                continue
+            self.funding.set(
+                raw,
+                {
+                    "rate": float(item.get("lastFundingRate") or 0.0),
+                    "mark_price": float(item.get("markPrice") or 0.0),
+                    "next_funding_time": float(item.get("nextFundingTime") or 0.0),
+                },
+                now,
+            )
+
+    async def _fetch_open_interest(self, raw: str, sem: asyncio.Semaphore) -> None:
+        async with sem:
+            data = await self._get("/fapi/v1/openInterest", {"symbol": raw})
+        self.open_interest.set(raw, float(data.get("openInterest", 0) or 0.0))
+
+    async def collect_once(self) -> None:
+        """Run one polling cycle within the weight budget."""
+        if not self.symbols or self.http_session is None:
+            return
+
+        budget = self.weight_budget - PREMIUM_INDEX_ALL_WEIGHT
+        batch = self._next_batch(budget)
+        sem = asyncio.Semaphore(self.max_concurrency)
+        tasks = [self._fetch_funding()] + [self._fetch_open_interest(raw, sem) for raw in batch]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        shed = sum(1 for r in results if isinstance(r, RequestShed))
+        errors = [r for r in results if isinstance(r, Exception) and not isinstance(r, RequestShed)]
+        self.stats["shed"] += shed
+        self.stats["errors"] += len(errors)
+        self.stats["cycles"] += 1
+        if errors:
+            logging.debug(f"Market stats cycle: {len(errors)} request(s) failed, first: {errors[0]}")
+
+
+# Process-wide collector registered by the bot, read by open_interest_tracker
+_collector: MarketStatsCollector | None = None
+
+
+def set_collector(collector: MarketStatsCollector | None) -> None:
+    global _collector
+    _collector = collector
+
+
+def get_collector() -> MarketStatsCollector | None:
+    return _collector
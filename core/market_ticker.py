@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+All-market 24h statistics from the `!miniTicker@arr` stream.
+
+MarketTickerTable keeps one row per contract in parallel `array('d')` columns
+(struct-of-arrays) indexed by Binance raw symbol, so the whole futures universe
+costs a few kilobytes and ranking never touches REST.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from array import array
+from typing import Any
+
+import aiohttp
+
+from core.http_pool import HttpPool, client_session
+
+# miniTicker payload key -> column name
+_MINI_TICKER_FIELDS: tuple[tuple[str, str], ...] = (
+    ("c", "last"),
+    ("o", "open"),
+    ("h", "high"),
+    ("l", "low"),
+    ("v", "base_volume"),
+    ("q", "quote_volume"),
+)
+
+
+class MarketTickerTable:
+    """Rolling 24h stats for every contract, stored column-wise."""
+
+    COLUMNS: tuple[str, ...] = tuple(name for _, name in _MINI_TICKER_FIELDS) + ("event_time",)
+
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}  # raw symbol (BTCUSDC) -> row
+        self.symbols: list[str] = []
+        self.columns: dict[str, array] = {name: array("d") for name in self.COLUMNS}
+        self.version = 0  # bumped on every applied batch
+        self.last_update_ts = 0.0
+        # Optional core.market_data.FreshnessTracker; rows are recorded under feed "ticker"
+        self.freshness = None
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _row(self, raw: str) -> int:
+        row = self.index.get(raw)
+        if row is None:
+            row = len(self.symbols)
+            self.index[raw] = row
+            self.symbols.append(raw)
+            for col in self.columns.values():
+                col.append(0.0)
+        return row
+
+    def update(self, items: list[dict[str, Any]]) -> int:
+        """Apply a `!miniTicker@arr` (or `!ticker@arr`) batch. Returns rows updated."""
+        updated = 0
+        now = time.time()
+        for item in items or []:
+            raw = item.get("s")
+            if not raw:
+                continue
+            try:
+                row = self._row(str(raw).upper())
+                for key, name in _MINI_TICKER_FIELDS:
+                    value = item.get(key)
+                    if value is not None:
+                        self.columns[name][row] = float(value)
+                self.columns["event_time"][row] = float(item.get("E") or 0)
+                if self.freshness is not None:
+                    self.freshness.mark("ticker", raw, ts=now)
+                updated += 1
+            except Exception:
+                continue
+        if updated:
+            self.version += 1
+            self.last_update_ts = now
+        return updated
+
+    def get(self, raw: str) -> dict[str, float] | None:
+        row = self.index.get(str(raw).upper())
+        if row is None:
+            return None
+        return {name: self.columns[name][row] for name in self.COLUMNS}
+
+    def quote_volume(self, raw: str) -> float:
+        row = self.index.get(str(raw).upper())
+        return self.columns["quote_volume"][row] if row is not None else 0.0
+
+    def is_fresh(self, max_age_sec: float = 10.0) -> bool:
+        return bool(self.symbols) and (time.time() - self.last_update_ts) <= max_age_sec
+
+    def rank(
+        self,
+        candidates: set[str] | None = None,
+        min_quote_volume: float = 0.0,
+        top_n: int | None = None,
+    ) -> list[str]:
+        """Raw symbols ordered by 24h quote volume (desc).
+
+        `candidates` restricts ranking to the tradable universe (e.g. active USDC perpetuals).
+        """
+        qv = self.columns["quote_volume"]
+        rows = [
+            (qv[row], raw)
+            for raw, row in self.index.items()
+            if (candidates is None or raw in candidates) and qv[row] >= min_quote_volume
+        ]
+        rows.sort(reverse=True)
+        ranked = [raw for _, raw in rows]
+        return ranked[:top_n] if top_n else ranked
+
+
+class AllMarketTickerStream:
+    """Subscriber for `!miniTicker@arr` that feeds a MarketTickerTable."""
+
+    def __init__(
+        self,
+        ws_base: str,
+        table: MarketTickerTable | None = None,
+        stream: str = "!miniTicker@arr",
+        reconnect_interval: int = 5,
+        http_pool: HttpPool | None = None,
+    ):
+        self.ws_base = ws_base.rstrip("/")
+        self.table = table or MarketTickerTable()
+        self.stream = stream
+        self.reconnect_interval = reconnect_interval
+        self.http_pool = http_pool
+        self.stream_task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self.stream_task = asyncio.create_task(self._stream_loop())
+        logging.info(f"All-market ticker stream started ({self.stream})")
+
+    async def stop(self) -> None:
+        if self.stream_task:
+            self.stream_task.cancel()
+
+    async def _stream_loop(self) -> None:
+        url = f"{self.ws_base}/ws/{self.stream}"
+        while True:
+            try:
+                async with client_session(self.http_pool) as session:
+                    async with session.ws_connect(url, heartbeat=30, autoping=True) as ws:
+                        async for msg in ws:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                data = json.loads(msg.data)
+                                if isinstance(data, dict):
+                                    data = data.get("data", [])
+                                if isinstance(data, list):
+                                    self.table.update(data)
+                            elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"All-market ticker WS error: {e}")
+            await asyncio.sleep(self.reconnect_interval)
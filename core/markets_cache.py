@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+On-disk snapshot of parsed market metadata.
+
+Only the configured quote coin's contracts are kept. The file carries a
+version stamp (schema, ccxt version, environment, quote coin and a content
+hash) so a stale or foreign snapshot is never applied; startup uses a valid
+snapshot immediately and revalidates it against the exchange in the background.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from typing import Any
+
+SCHEMA_VERSION = 1
+
+
+def filter_quote_markets(markets: dict[str, Any] | list[dict[str, Any]], quote: str) -> dict[str, Any]:
+    """Keep contract markets quoted or settled in `quote`, keyed by ccxt symbol."""
+    items = markets.values() if isinstance(markets, dict) else markets
+    out: dict[str, Any] = {}
+    for m in items:
+        if not m or not m.get("contract"):
+            continue
+        if m.get("quote") == quote or m.get("settle") == quote:
+            out[m["symbol"]] = m
+    return out
+
+
+def markets_hash(markets: dict[str, Any]) -> str:
+    """Content hash over ids and exchange filters (changes when listings or filters change)."""
+    digest = hashlib.sha1()
+    for symbol in sorted(markets):
+        m = markets[symbol]
+        info = m.get("info") or {}
+        digest.update(
+            json.dumps(
+                [symbol, m.get("id"), m.get("active"), info.get("status"), info.get("filters")],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        )
+    return digest.hexdigest()
+
+
+class MarketsSnapshot:
+    """Versioned JSON snapshot of one environment/quote coin's markets."""
+
+    def __init__(self, path: str, quote: str, testnet: bool, ccxt_version: str, max_age_sec: float = 86_400):
+        self.path = path
+        self.stamp = {
+            "schema": SCHEMA_VERSION,
+            "ccxt_version": ccxt_version,
+            "testnet": bool(testnet),
+            "quote": quote,
+        }
+        self.max_age_sec = max_age_sec
+        self.saved_hash: str | None = None
+
+    def load(self) -> dict[str, Any] | None:
+        """Markets from disk, or None if missing, unreadable, expired or stamped for something else."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return None
+        stamp = payload.get("stamp") or {}
+        if any(stamp.get(k) != v for k, v in self.stamp.items()):
+            return None
+        if time.time() - float(stamp.get("saved_at", 0)) > self.max_age_sec:
+            return None
+        markets = payload.get("markets")
+        if not isinstance(markets, dict) or not markets:
+            return None
+        self.saved_hash = stamp.get("hash")
+        return markets
+
+    def save(self, markets: dict[str, Any]) -> str:
+        """Atomically write markets with a fresh stamp. Returns the content hash."""
+        digest = markets_hash(markets)
+        payload = {"stamp": {**self.stamp, "saved_at": time.time(), "hash": digest}, "markets": markets}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(payload, f, default=str)
+        os.replace(tmp, self.path)
+        self.saved_hash = digest
+        return digest
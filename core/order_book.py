@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Local order book for Binance USDⓈ-M futures.
+
+Each book is seeded from a REST depth snapshot and kept current from
+`<symbol>@depth@100ms` diff events. Sequence gaps (pu != previous u) mark the
+book as out of sync and trigger a fresh snapshot.
+
+Spread, mid and depth within the configured bps bands are cached on every
+update so that pre-trade checks can read them in O(1) without network calls.
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import time
+from collections.abc import Iterable
+from typing import Any
+
+import aiohttp
+
+from core.http_pool import HttpPool
+from core.symbol_utils import to_binance_symbol
+
+DEFAULT_DEPTH_BPS: tuple[int, ...] = (5, 10, 25, 50)
+
+
+class LocalOrderBook:
+    """Price-level book for a single symbol.
+
+    Prices are kept in ascending sorted lists (bids and asks) next to
+    price -> qty dicts, so the best levels are list ends and band sums use bisect.
+    """
+
+    def __init__(self, symbol: str, depth_bps: Iterable[int] = DEFAULT_DEPTH_BPS):
+        self.symbol = symbol
+        self.depth_bps = tuple(sorted(int(b) for b in depth_bps))
+
+        self._bids: dict[float, float] = {}
+        self._asks: dict[float, float] = {}
+        self._bid_prices: list[float] = []  # ascending, best bid is last
+        self._ask_prices: list[float] = []  # ascending, best ask is first
+
+        self.last_update_id: int = 0
+        self.synced: bool = False
+        self.last_update_ts: float = 0.0
+        self.resync_count: int = 0
+
+        # Cached top-of-book metrics (recomputed on every applied update)
+        self.best_bid: float | None = None
+        self.best_ask: float | None = None
+        self.mid: float | None = None
+        self.spread_pct: float | None = None
+        self._depth_cache: dict[int, tuple[float, float]] = {}
+
+    # ---------- mutation ----------
+    def _set_level(self, book: dict[float, float], prices: list[float], price: float, qty: float) -> None:
+        if qty <= 0:
+            if price in book:
+                del book[price]
+                idx = bisect.bisect_left(prices, price)
+                if idx < len(prices) and prices[idx] == price:
+                    prices.pop(idx)
+            return
+        if price not in book:
+            bisect.insort(prices, price)
+        book[price] = qty
+
+    def apply_snapshot(self, snapshot: dict[str, Any]) -> None:
+        """Replace the book with a REST `/fapi/v1/depth` snapshot."""
+        self._bids.clear()
+        self._asks.clear()
+        self._bid_prices.clear()
+        self._ask_prices.clear()
+        for price, qty in snapshot.get("bids", []) or []:
+            self._set_level(self._bids, self._bid_prices, float(price), float(qty))
+        for price, qty in snapshot.get("asks", []) or []:
+            self._set_level(self._asks, self._ask_prices, float(price), float(qty))
+        self.last_update_id = int(snapshot.get("lastUpdateId", 0) or 0)
+        # First diff after a snapshot is validated with U/u, not pu
+        self.synced = False
+        self._refresh_cache()
+
+    def apply_diff(self, event: dict[str, Any]) -> bool:
+        """Apply a depthUpdate event.
+
+        Returns False when the event reveals a sequence gap and the book needs a new snapshot.
+        Stale events (u < lastUpdateId) are ignored and return True.
+        """
+        first_id = int(event.get("U", 0) or 0)
+        final_id = int(event.get("u", 0) or 0)
+        prev_final_id = int(event.get("pu", 0) or 0)
+
+        if final_id < self.last_update_id:
+            return True
+
+        if not self.synced:
+            # First event after snapshot must straddle lastUpdateId
+            if not (first_id <= self.last_update_id <= final_id):
+                return False
+        elif prev_final_id != self.last_update_id:
+            self.synced = False
+            return False
+
+        for price, qty in event.get("b", []) or []:
+            self._set_level(self._bids, self._bid_prices, float(price), float(qty))
+        for price, qty in event.get("a", []) or []:
+            self._set_level(self._asks, self._ask_prices, float(price), float(qty))
+
+        self.last_update_id = final_id
+        self.synced = True
+        self._refresh_cache()
+        return True
+
+    def _refresh_cache(self) -> None:
+        self.last_update_ts = time.time()
+        self.best_bid = self._bid_prices[-1] if self._bid_prices else None
+        self.best_ask = self._ask_prices[0] if self._ask_prices else None
+        if self.best_bid and self.best_ask:
+            self.mid = (self.best_bid + self.best_ask) / 2.0
+            self.spread_pct = (self.best_ask - self.best_bid) / self.mid * 100.0
+        else:
+            self.mid = None
+            self.spread_pct = None
+        self._depth_cache = {bps: self._compute_depth(bps) for bps in self.depth_bps} if self.mid else {}
+
+    def _compute_depth(self, bps: float) -> tuple[float, float]:
+        """Quote notional resting within `bps` of mid on (bid side, ask side)."""
+        mid = self.mid or 0.0
+        band = mid * float(bps) / 10_000.0
+        lo = bisect.bisect_left(self._bid_prices, mid - band)
+        bid_notional = sum(p * self._bids[p] for p in self._bid_prices[lo:])
+        hi = bisect.bisect_right(self._ask_prices, mid + band)
+        ask_notional = sum(p * self._asks[p] for p in self._ask_prices[:hi])
+        return bid_notional, ask_notional
+
+    # ---------- reads ----------
+    def is_fresh(self, max_age_sec: float) -> bool:
+        return self.synced and self.mid is not None and (time.time() - self.last_update_ts) <= max_age_sec
+
+    def depth_within_bps(self, bps: float) -> tuple[float, float]:
+        """(bid_notional, ask_notional) within `bps` of mid. O(1) for configured bands."""
+        cached = self._depth_cache.get(int(bps)) if float(bps).is_integer() else None
+        if cached is not None:
+            return cached
+        if self.mid is None:
+            return 0.0, 0.0
+        return self._compute_depth(bps)
+
+    def estimate_slippage_pct(self, side: str, notional: float) -> float | None:
+        """Average-price slippage vs mid (percent) for a market order of `notional` quote.
+
+        Returns None when the visible book cannot absorb the order.
+        """
+        if self.mid is None or notional <= 0:
+            return 0.0 if self.mid is not None else None
+        remaining = float(notional)
+        filled_qty = 0.0
+        spent = 0.0
+        if str(side).lower() == "buy":
+            levels = ((p, self._asks[p]) for p in self._ask_prices)
+        else:
+            levels = ((p, self._bids[p]) for p in reversed(self._bid_prices))
+        for price, qty in levels:
+            level_notional = price * qty
+            take = min(level_notional, remaining)
+            spent += take
+            filled_qty += take / price
+            remaining -= take
+            if remaining <= 1e-12:
+                break
+        if remaining > 1e-9 or filled_qty <= 0:
+            return None
+        avg_price = spent / filled_qty
+        return abs(avg_price - self.mid) / self.mid * 100.0
+
+    def top(self, levels: int = 5) -> dict[str, list[tuple[float, float]]]:
+        return {
+            "bids": [(p, self._bids[p]) for p in reversed(self._bid_prices[-levels:])],
+            "asks": [(p, self._asks[p]) for p in self._ask_prices[:levels]],
+        }
+
+
+class OrderBookManager:
+    """Maintains LocalOrderBook instances from a combined depth diff stream.
+
+    Books are keyed by ccxt symbol (e.g. BTC/USDC:USDC). New symbols can be added at
+    runtime via `track()`; the manager subscribes on the live socket and snapshots them.
+    """
+
+    def __init__(
+        self,
+        api_base: str,
+        ws_base: str,
+        resolved_quote_coin: str = "USDT",
+        depth_bps: Iterable[int] = DEFAULT_DEPTH_BPS,
+        snapshot_limit: int = 500,
+        reconnect_interval: int = 5,
+        http_pool: HttpPool | None = None,
+    ):
+        self.api_base = api_base.rstrip("/")
+        self.ws_base = ws_base.rstrip("/")
+        self.resolved_quote_coin = resolved_quote_coin
+        self.depth_bps = tuple(depth_bps)
+        self.snapshot_limit = snapshot_limit
+        self.reconnect_interval = reconnect_interval
+
+        self.books: dict[str, LocalOrderBook] = {}
+        self._raw_to_symbol: dict[str, str] = {}
+        self._pending_snapshot: set[str] = set()
+        self._buffers: dict[str, list[dict[str, Any]]] = {}
+        self.max_buffered_events = 1000
+
+        self.http_pool = http_pool
+        self.http_session: aiohttp.ClientSession | None = None
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._sub_id = 0
+        self.stream_task: asyncio.Task | None = None
+        self._snapshot_tasks: dict[str, asyncio.Task] = {}
+
+    # ---------- public API ----------
+    def get_book(self, symbol: str) -> LocalOrderBook | None:
+        return self.books.get(symbol)
+
+    async def track(self, symbols: Iterable[str]) -> None:
+        """Start maintaining books for `symbols` (no-op for already tracked ones)."""
+        new_streams: list[str] = []
+        for symbol in symbols:
+            if symbol in self.books:
+                continue
+            try:
+                raw = to_binance_symbol(symbol)
+            except Exception:
+                continue
+            self.books[symbol] = LocalOrderBook(symbol, self.depth_bps)
+            self._raw_to_symbol[raw] = symbol
+            self._pending_snapshot.add(symbol)
+            new_streams.append(f"{raw.lower()}@depth@100ms")
+
+        if new_streams and self._ws is not None and not self._ws.closed:
+            self._sub_id += 1
+            await self._ws.send_str(json.dumps({"method": "SUBSCRIBE", "params": new_streams, "id": self._sub_id}))
+
+    async def start(self, symbols: Iterable[str] = ()) -> None:
+        if self.http_session is None:
+            self.http_session = self.http_pool.session if self.http_pool else aiohttp.ClientSession()
+        await self.track(symbols)
+        self.stream_task = asyncio.create_task(self._stream_loop())
+        logging.info(f"Order book stream started for {len(self.books)} symbols")
+
+    async def stop(self) -> None:
+        if self.stream_task:
+            self.stream_task.cancel()
+        for task in self._snapshot_tasks.values():
+            task.cancel()
+        if self.http_session and self.http_pool is None:
+            await self.http_session.close()
+
+    # ---------- internals ----------
+    def _stream_url(self) -> str:
+        streams = [f"{to_binance_symbol(s).lower()}@depth@100ms" for s in self.books]
+        return f"{self.ws_base}/stream?streams={'/'.join(streams)}"
+
+    async def _fetch_snapshot(self, symbol: str) -> dict[str, Any]:
+        assert self.http_session is not None
+        url = f"{self.api_base}/fapi/v1/depth"
+        params = {"symbol": to_binance_symbol(symbol), "limit": self.snapshot_limit}
+        async with self.http_session.get(url, params=params) as response:
+            if response.status != 200:
+                text = await response.text()
+                raise Exception(f"Depth snapshot failed for {symbol}: {response.status} - {text}")
+            return await response.json()
+
+    def _schedule_snapshot(self, symbol: str) -> None:
+        task = self._snapshot_tasks.get(symbol)
+        if task and not task.done():
+            return
+        self._snapshot_tasks[symbol] = asyncio.create_task(self._resync(symbol))
+
+    async def _resync(self, symbol: str) -> None:
+        book = self.books.get(symbol)
+        if book is None:
+            return
+        try:
+            snapshot = await self._fetch_snapshot(symbol)
+            book.apply_snapshot(snapshot)
+            book.resync_count += 1
+            # Replay diffs buffered while the snapshot was in flight
+            buffered = self._buffers.pop(symbol, [])
+            self._pending_snapshot.discard(symbol)
+            for event in buffered:
+                if not book.apply_diff(event):
+                    self._pending_snapshot.add(symbol)
+                    break
+            if symbol in self._pending_snapshot:
+                logging.info(f"Order book for {symbol} still out of sequence after snapshot, retrying")
+                self._snapshot_tasks.pop(symbol, None)
+                await asyncio.sleep(0.5)
+                self._schedule_snapshot(symbol)
+            else:
+                logging.debug(f"Order book snapshot applied for {symbol} (lastUpdateId={book.last_update_id})")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.warning(f"Order book resync failed for {symbol}: {e}")
+            self._pending_snapshot.add(symbol)
+
+    def handle_depth_event(self, data: dict[str, Any]) -> None:
+        """Route a depthUpdate payload to its book; schedule a snapshot on gaps."""
+        raw = str(data.get("s") or "").upper()
+        symbol = self._raw_to_symbol.get(raw)
+        if not symbol:
+            return
+        if symbol in self._pending_snapshot:
+            buffer = self._buffers.setdefault(symbol, [])
+            buffer.append(data)
+            if len(buffer) > self.max_buffered_events:
+                del buffer[: len(buffer) - self.max_buffered_events]
+            self._schedule_snapshot(symbol)
+            return
+        book = self.books[symbol]
+        if not book.apply_diff(data):
+            logging.info(f"Order book gap for {symbol} (pu={data.get('pu')} last={book.last_update_id}), resyncing")
+            self._pending_snapshot.add(symbol)
+            self._buffers[symbol] = [data]
+            self._schedule_snapshot(symbol)
+
+    async def _stream_loop(self) -> None:
+        while True:
+            try:
+                if not self.books:
+                    await asyncio.sleep(1)
+                    continue
+                assert self.http_session is not None
+                async with self.http_session.ws_connect(self._stream_url(), heartbeat=30, autoping=True) as ws:
+                    self._ws = ws
+                    # Fresh connection: every book must be re-snapshotted
+                    for symbol in self.books:
+                        self._pending_snapshot.add(symbol)
+                        self._buffers.pop(symbol, None)
+                        self._schedule_snapshot(symbol)
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            payload = json.loads(msg.data)
+                            data = payload.get("data", payload)
+                            if isinstance(data, dict) and data.get("e") == "depthUpdate":
+                                self.handle_depth_event(data)
+                        elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Order book WS error: {e}")
+            finally:
+                self._ws = None
+                for book in self.books.values():
+                    book.synced = False
+            await asyncio.sleep(self.reconnect_interval)
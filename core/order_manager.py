@@ -15,8 +15,13 @@ from core.config import TradingConfig
 from core.exchange_client import OptimizedExchangeClient
 from core.idempotency_store import IdempotencyStore
 from core.ids import make_client_id
+from core.leverage_cache import LeverageCache
+from core.market_registry import MarketSpec, rules_for
+from core.order_state import TERMINAL_STATUSES, OrderState, OrderStateMachine
+from core.position_snapshot import PositionSnapshot
 from core.precision import PrecisionError, normalize
 from core.qty_rules import minimal_trade_qty
+from core.rate_limiter import priority_scope, with_priority
 from core.risk_checks import check_margin_before_entry
 from core.risk_guard import (
     is_symbol_blocked,
@@ -64,6 +69,11 @@ class OrderManager:
         self.tp_orders: dict[str, list[dict]] = {}  # symbol -> [tp_orders]
         self.sl_orders: dict[str, dict] = {}  # symbol -> sl_order
 
+        # Order/position state from user-data events, reconciled by sync_with_exchange
+        self.state = OrderStateMachine()
+        self._settled_orders: set[str] = set()  # TP/SL ids whose final status was already reported
+        self._last_fill_poll = 0.0
+
         # Trailing stop state per symbol
         self.trailing_stops: dict[str, dict] = {}
 
@@ -229,7 +239,7 @@ class OrderManager:
                 orders = []
 
             try:
-                pos = await self.exchange.get_position(sym)
+                pos = await self._get_position(sym)
             except Exception:
                 pos = None
 
@@ -342,6 +352,7 @@ class OrderManager:
         except Exception as e:
             self.logger.log_event("ORDER_MANAGER", "ERROR", f"Failed to sync positions: {e}")
 
+    @with_priority("normal")
     async def place_position_with_tp_sl(
         self, symbol: str, side: str, quantity: float, entry_price: float, leverage: int = 5
     ) -> dict[str, Any]:
@@ -399,7 +410,9 @@ class OrderManager:
                 return {"success": False, "reason": msg}
 
             # 7. Run pre-trade filters
-            ok_filters, filter_details = await can_enter_position(self, symbol, sizing.margin)
+            ok_filters, filter_details = await can_enter_position(
+                self, symbol, sizing.margin, side=side, notional=sizing.notional
+            )
             if not ok_filters:
                 failed_checks = [k for k, v in filter_details.items() if not v]
                 self.logger.log_event("PRE_TRADE", "INFO", f"Filters failed for {symbol}: {failed_checks}")
@@ -433,15 +446,19 @@ class OrderManager:
                 )
                 return {"success": False, "reason": "Maximum positions reached"}
 
-            # Set leverage
-            try:
-                await self.exchange.exchange.set_leverage(leverage, symbol)
-            except Exception as e:
-                self.logger.log_event("ORDER_MANAGER", "WARNING", f"Failed to set leverage for {symbol}: {e}")
+            # Set leverage (no request when the exchange already has it)
+            cache = getattr(self.exchange, "leverage_cache", None)
+            if isinstance(cache, LeverageCache):
+                await cache.ensure(symbol, leverage, getattr(self.config, "margin_type", None))
+            else:
+                try:
+                    await self.exchange.exchange.set_leverage(leverage, symbol)
+                except Exception as e:
+                    self.logger.log_event("ORDER_MANAGER", "WARNING", f"Failed to set leverage for {symbol}: {e}")
 
             # Precision gate for market entry
             markets = await self.exchange.get_markets()
-            market = markets.get(symbol, {})
+            market = rules_for(self.exchange, symbol, markets.get(symbol, {}))
             ticker = await self.exchange.get_ticker(symbol)
             try:
                 current_price = float((ticker or {}).get("last") or (ticker or {}).get("close") or 0) or None
@@ -493,24 +510,15 @@ class OrderManager:
             actual_filled: float = float(quantity)
             try:
                 if order and order.get("id"):
-                    # Give exchange a brief moment to settle order fills
-                    await asyncio.sleep(0.5)
-                    details = await self.exchange.exchange.fetch_order(order["id"], symbol)
-                    try:
-                        actual_filled = float(details.get("filled", 0.0))
-                    except Exception:
-                        actual_filled = 0.0
-                    if actual_filled <= 0:
-                        try:
-                            actual_filled = float(order.get("filled", quantity))
-                        except Exception:
-                            actual_filled = float(quantity)
+                    started = time.perf_counter()
+                    actual_filled, source = await self._entry_filled_qty(symbol, order, cid_entry, quantity)
                     # Round by LOT_SIZE step size
                     actual_filled = self.exchange.round_amount(symbol, actual_filled)
                     self.logger.log_event(
                         "ORDER_MANAGER",
                         "INFO",
-                        f"Entry filled: {symbol} {side} requested={quantity} filled={actual_filled}",
+                        f"Entry filled: {symbol} {side} requested={quantity} filled={actual_filled} "
+                        f"({source}, {(time.perf_counter() - started) * 1000:.0f} ms)",
                     )
             except Exception as e:
                 self.logger.log_event("ORDER_MANAGER", "WARNING", f"Failed to fetch filled qty: {e}")
@@ -554,6 +562,42 @@ class OrderManager:
             self.logger.log_event("ORDER_MANAGER", "ERROR", f"Failed to place position for {symbol}: {e}")
             return {"success": False, "reason": str(e)}
 
+    async def _entry_filled_qty(
+        self, symbol: str, order: dict[str, Any], client_id: str, quantity: float
+    ) -> tuple[float, str]:
+        """Filled quantity of a market entry and where it came from.
+
+        The order response when it already reports the fill, else the ORDER_TRADE_UPDATE for
+        `client_id` (awaited up to `entry_fill_timeout_sec` while a stream is attached), else REST.
+        """
+        try:
+            filled = float(order.get("filled") or 0.0)
+        except (TypeError, ValueError):
+            filled = 0.0
+        if order.get("status") == "closed" and filled > 0:
+            return filled, "response"
+
+        if self.state.stream_attached:
+            timeout = float(getattr(self.config, "entry_fill_timeout_sec", 2.0))
+            tracked = await self.state.wait_final(client_id, timeout, order_id=order["id"])
+            if tracked is not None and tracked.filled > 0:
+                return tracked.filled, "event"
+            self.logger.log_event(
+                "ORDER_MANAGER", "WARNING", f"{symbol}: no fill event for entry {order['id']} in {timeout}s, using REST"
+            )
+
+        details = await self.exchange.get_order(order["id"], symbol)
+        try:
+            filled = float((details or {}).get("filled") or 0.0)
+        except (TypeError, ValueError):
+            filled = 0.0
+        if filled <= 0:
+            try:
+                filled = float(order.get("filled") or quantity)
+            except (TypeError, ValueError):
+                filled = float(quantity)
+        return filled, "rest"
+
     async def place_tp_sl_orders(
         self, symbol: str, side: str, quantity: float, entry_price: float, actual_filled: float | None = None
     ) -> dict[str, Any]:
@@ -571,7 +615,9 @@ class OrderManager:
             actual_filled=actual_filled,
         )
 
-    def _get_tick_size(self, market: dict) -> float:
+    def _get_tick_size(self, market: dict | MarketSpec) -> float:
+        if isinstance(market, MarketSpec):
+            return market.tick or 0.01
         return next(
             (
                 float(f.get("tickSize"))
@@ -581,15 +627,19 @@ class OrderManager:
             0.01,
         )
 
-    def _get_min_qty(self, market: dict) -> float:
+    def _get_min_qty(self, market: dict | MarketSpec) -> float:
+        if isinstance(market, MarketSpec):
+            return market.min_amount or 0.0
         limits = (market.get("limits", {}) or {}).get("amount", {}) or {}
         try:
             return float(limits.get("min") or 0.0)
         except Exception:
             return 0.0
 
-    def _get_step_size(self, market: dict) -> float:
+    def _get_step_size(self, market: dict | MarketSpec) -> float:
         """Extract LOT_SIZE.stepSize if present, else fall back to precision.amount."""
+        if isinstance(market, MarketSpec):
+            return market.step or market.precision_step or 0.0
         try:
             filters = (market.get("info", {}) or {}).get("filters", []) or []
             for f in filters:
@@ -607,8 +657,10 @@ class OrderManager:
             pass
         return 0.0
 
-    def _get_min_notional(self, market: dict) -> float | None:
+    def _get_min_notional(self, market: dict | MarketSpec) -> float | None:
         """Try to extract minNotional from filters if available; otherwise None."""
+        if isinstance(market, MarketSpec):
+            return market.min_notional
         try:
             filters = (market.get("info", {}) or {}).get("filters", []) or []
             for f in filters:
@@ -621,9 +673,13 @@ class OrderManager:
         return None
 
     async def get_trigger_ref_price(self, symbol: str, working_type: str) -> tuple[float, float, float]:
-        """Return (trigger_ref, mark, last) based on working_type, tolerant to missing fields."""
+        """Return (trigger_ref, mark, last) based on working_type, tolerant to missing fields.
+
+        Prices protective orders, so the read is critical and never shed like a scanner's.
+        """
         try:
-            ticker = await self.exchange.get_ticker(symbol)
+            with priority_scope("critical"):
+                ticker = await self.exchange.get_ticker(symbol)
         except Exception:
             ticker = None
         info = {}
@@ -669,6 +725,13 @@ class OrderManager:
             pass
         return binance_symbol
 
+    async def _get_position(self, symbol: str) -> dict[str, Any] | None:
+        """Position for symbol from the exchange's snapshot service (one REST call per cycle)."""
+        snapshot = getattr(self.exchange, "position_snapshot", None)
+        if isinstance(snapshot, PositionSnapshot):
+            return await snapshot.get(symbol)
+        return await self.exchange.get_position(symbol)
+
     async def _post_check_protectives(self, symbol: str, expected_tp_count: int) -> bool:
         """Verify exactly one SL reduceOnly and expected number of TP reduceOnly orders exist with workingType set.
 
@@ -878,7 +941,7 @@ class OrderManager:
 
         # 2) Market metadata
         markets = await self.exchange.get_markets()
-        market = markets.get(symbol, {})
+        market = rules_for(self.exchange, symbol, markets.get(symbol, {}))
         min_qty = self._get_min_qty(market)
         tick_size = self._get_tick_size(market)
         step_size = self._get_step_size(market)
@@ -963,13 +1026,10 @@ class OrderManager:
             sl_price0 = round_to_tick(sl_candidate0, tick_size, direction="up")
             sl_price0 = nudge_price(sl_price0, trigger_ref_initial, tick_size, side=side, is_sl=True, min_ticks=2)
         sl_price_norm, sl_qty_norm, _ = normalize(float(sl_price0), float(order_qty), market, current_price, symbol)
-        # Idempotent client ID for SL
-        attempt = 0
         max_attempts = int(getattr(self.config, "sl_retry_limit", 3))
-        sl_order = None
-        while attempt < max_attempts:
-            attempt += 1
-            # Refresh trigger reference each attempt
+
+        async def sl_request(attempt: int) -> dict[str, Any]:
+            # Refresh trigger reference each attempt; the barrier widens with k_ticks
             trigger_ref, mark, last = await self.get_trigger_ref_price(symbol, self.config.working_type)
             k_ticks = max(2, 2 + attempt)
             if side == "buy":
@@ -983,13 +1043,6 @@ class OrderManager:
                 sl_calc = round_to_tick(sl_candidate, tick_size, direction="up")
                 sl_calc = nudge_price(sl_calc, trigger_ref, tick_size, side=side, is_sl=True, min_ticks=2)
             sl_price_norm, sl_qty_norm, _ = normalize(float(sl_calc), float(order_qty), market, current_price, symbol)
-            sl_params = {
-                "stopPrice": float(sl_price_norm),
-                "reduceOnly": True,
-                "workingType": self.config.working_type,
-                "timeInForce": self.config.time_in_force,
-                "newClientOrderId": self._cid(symbol, "SL", "A"),
-            }
             try:
                 self.logger.log_event(
                     "ORDER_MANAGER",
@@ -997,62 +1050,26 @@ class OrderManager:
                     f"{symbol}: workingType={self.config.working_type} mark={float(mark):.6f} last={float(last):.6f} "
                     f"attempt={attempt}/{max_attempts} k_ticks={k_ticks} -> SL={float(sl_price_norm):.6f}",
                 )
-                sl_order = await self.exchange.create_order(
-                    symbol,
-                    getattr(self.config, "sl_order_type", "STOP_MARKET"),
-                    close_side,
-                    float(sl_qty_norm or order_qty),
-                    None,
-                    sl_params,
-                )
-                break
-            except Exception as e:
-                es = str(e)
-                if "-2021" in es or "immediately" in es.lower():
-                    # retry next loop; barrier will be increased via k_ticks
-                    if attempt >= max_attempts:
-                        self.logger.log_event(
-                            "ORDER_MANAGER",
-                            "CRITICAL",
-                            f"{symbol}: SL rejected (-2021) after {attempt} attempts — closing position",
-                        )
-                        try:
-                            await self.close_position_market(symbol)
-                        except Exception:
-                            pass
-                        sl_order = None
-                        break
-                    continue
-                else:
-                    self.logger.log_event("ORDER_MANAGER", "ERROR", f"SL failed: {e}")
-                    sl_order = None
-                    break
-
-        # SL must exist before proceeding with TPs; otherwise cancel and emergency close
-        if not sl_order or not sl_order.get("id"):
-            try:
-                self.logger.log_event(
-                    "ORDER_MANAGER", "CRITICAL", f"{symbol}: SL not placed — cancelling TPs and emergency closing"
-                )
             except Exception:
                 pass
-            try:
-                await self.cancel_all_orders(symbol)
-            except Exception:
-                pass
-            try:
-                await self.close_position_emergency(symbol)
-            except Exception:
-                pass
-            return {"sl_order": None, "tp_orders": []}
-
-        # 5) TP levels
-        tp_levels_cfg = self.config.tp_levels
-        tp_orders: list[dict] = []
-        last_tp_id = None
-        last_tp_price = None
+            return {
+                "type": getattr(self.config, "sl_order_type", "STOP_MARKET"),
+                "side": close_side,
+                "amount": float(sl_qty_norm or order_qty),
+                "price": None,
+                "params": {
+                    "stopPrice": float(sl_price_norm),
+                    "reduceOnly": True,
+                    "workingType": self.config.working_type,
+                    "timeInForce": self.config.time_in_force,
+                    # Idempotent client ID for SL
+                    "newClientOrderId": self._cid(symbol, "SL", "A"),
+                },
+            }
 
-        for i, level in enumerate(tp_levels_cfg, start=1):
+        # 5.1) TP legs (computed up front so SL + TP ladder go out in one round trip)
+        tp_legs: list[dict[str, Any]] = []
+        for i, level in enumerate(self.config.tp_levels, start=1):
             try:
                 tp_pct = float(level["percent"])  # percent (1.0 == 1%)
                 size_pct = float(level.get("size", 0))  # 0..1
@@ -1092,12 +1109,11 @@ class OrderManager:
             order_type = getattr(self.config, "tp_order_type", None) or (
                 "TAKE_PROFIT_MARKET" if getattr(self.config, "tp_order_style", "limit") == "market" else "TAKE_PROFIT"
             )
-            cid_tp = self._cid(symbol, "TP", f"L{i}")
             params_tp = {
                 "reduceOnly": True,
                 "workingType": self.config.working_type,
                 "timeInForce": self.config.time_in_force,
-                "newClientOrderId": cid_tp,
+                "newClientOrderId": self._cid(symbol, "TP", f"L{i}"),
                 "stopPrice": float(tp_price_norm),
             }
 
@@ -1110,31 +1126,127 @@ class OrderManager:
                 )
             except Exception:
                 pass
+            tp_legs.append(
+                {
+                    "i": i,
+                    "tp_qty": tp_qty,
+                    "tp_price": tp_price,
+                    "tp_price_norm": tp_price_norm,
+                    "tp_qty_norm": tp_qty_norm,
+                    "order_type": order_type,
+                    "params": params_tp,
+                }
+            )
+
+        def tp_request(leg: dict[str, Any], params: dict[str, Any]) -> dict[str, Any]:
+            market_tp = leg["order_type"] == "TAKE_PROFIT_MARKET"
+            return {
+                "type": "TAKE_PROFIT_MARKET" if market_tp else "TAKE_PROFIT",
+                "side": close_side,
+                "amount": float(leg["tp_qty_norm"]),
+                "price": None if market_tp else float(leg["tp_price_norm"]),
+                "params": params,
+            }
+
+        # 5.2) First attempt of every leg in one go; legs that fail continue in the per-leg retry loops
+        first_results: dict[Any, Any] = {}
+        batch = getattr(self.exchange, "create_orders_batch", None)
+        if getattr(self.config, "protective_batch", True) and callable(batch):
+            requests = [await sl_request(1)] + [tp_request(leg, leg["params"]) for leg in tp_legs]
+            results = await batch(symbol, requests)
+            first_results = {"SL": results[0], **{leg["i"]: r for leg, r in zip(tp_legs, results[1:], strict=False)}}
+
+        def take_first(key: Any, attempt: int) -> dict | None:
+            """Result of the batched first attempt for a leg (raises its error), or None to send now."""
+            if attempt != 1 or key not in first_results:
+                return None
+            result = first_results.pop(key)
+            if isinstance(result, Exception):
+                raise result
+            return result or {}
+
+        attempt = 0
+        sl_order = None
+        while attempt < max_attempts:
+            attempt += 1
+            try:
+                sl_order = take_first("SL", attempt)
+                if sl_order is None:
+                    req = await sl_request(attempt)
+                    sl_order = await self.exchange.create_order(
+                        symbol, req["type"], req["side"], req["amount"], req["price"], req["params"]
+                    )
+                break
+            except Exception as e:
+                es = str(e)
+                if "-2021" in es or "immediately" in es.lower():
+                    # retry next loop; barrier will be increased via k_ticks
+                    if attempt >= max_attempts:
+                        self.logger.log_event(
+                            "ORDER_MANAGER",
+                            "CRITICAL",
+                            f"{symbol}: SL rejected (-2021) after {attempt} attempts — closing position",
+                        )
+                        try:
+                            await self.close_position_market(symbol)
+                        except Exception:
+                            pass
+                        sl_order = None
+                        break
+                    continue
+                else:
+                    self.logger.log_event("ORDER_MANAGER", "ERROR", f"SL failed: {e}")
+                    sl_order = None
+                    break
+
+        # SL must exist before proceeding with TPs; otherwise cancel and emergency close
+        if not sl_order or not sl_order.get("id"):
+            try:
+                self.logger.log_event(
+                    "ORDER_MANAGER", "CRITICAL", f"{symbol}: SL not placed — cancelling TPs and emergency closing"
+                )
+            except Exception:
+                pass
+            try:
+                await self.cancel_all_orders(symbol)
+            except Exception:
+                pass
+            try:
+                await self.close_position_emergency(symbol)
+            except Exception:
+                pass
+            return {"sl_order": None, "tp_orders": []}
 
+        # 6) TP levels
+        tp_orders: list[dict] = []
+        last_tp_id = None
+        last_tp_price = None
+
+        for leg in tp_legs:
+            i = leg["i"]
+            tp_qty, tp_price = leg["tp_qty"], leg["tp_price"]
+            tp_price_norm, tp_qty_norm = leg["tp_price_norm"], leg["tp_qty_norm"]
             attempt_tp = 0
             tp_order = None
             while attempt_tp < int(getattr(self.config, "sl_retry_limit", 3)):
                 attempt_tp += 1
-                cid_tp_attempt = self._cid(symbol, "TP", f"L{i}")
-                params_tp_attempt = dict(params_tp)
-                params_tp_attempt["newClientOrderId"] = cid_tp_attempt
                 try:
-                    try:
-                        self.logger.log_event("ORDER_MANAGER", "INFO", f"TP{i} CID -> {cid_tp_attempt}")
-                    except Exception:
-                        pass
-                    if order_type == "TAKE_PROFIT_MARKET":
-                        tp_order = await self.exchange.create_order(
-                            symbol, "TAKE_PROFIT_MARKET", close_side, float(tp_qty_norm), None, params_tp_attempt
+                    tp_order = take_first(i, attempt_tp)
+                    if tp_order is None:
+                        params_tp_attempt = dict(leg["params"])
+                        params_tp_attempt["newClientOrderId"] = self._cid(symbol, "TP", f"L{i}")
+                        params_tp_attempt["stopPrice"] = float(tp_price_norm)
+                        try:
+                            self.logger.log_event(
+                                "ORDER_MANAGER", "INFO", f"TP{i} CID -> {params_tp_attempt['newClientOrderId']}"
+                            )
+                        except Exception:
+                            pass
+                        req = tp_request(
+                            {**leg, "tp_price_norm": tp_price_norm, "tp_qty_norm": tp_qty_norm}, params_tp_attempt
                         )
-                    else:
                         tp_order = await self.exchange.create_order(
-                            symbol,
-                            "TAKE_PROFIT",
-                            close_side,
-                            float(tp_qty_norm),
-                            float(tp_price_norm),
-                            params_tp_attempt,
+                            symbol, req["type"], req["side"], req["amount"], req["price"], req["params"]
                         )
                     if tp_order:
                         tp_orders.append(tp_order)
@@ -1202,6 +1314,7 @@ class OrderManager:
         # Store last placed orders
         try:
             async with self.order_lock:
+                self._forget_protective(symbol)
                 self.sl_orders[symbol] = sl_order
                 self.tp_orders[symbol] = tp_orders
         except Exception:
@@ -1311,8 +1424,7 @@ class OrderManager:
 
             # Clear from tracking
             async with self.order_lock:
-                self.sl_orders.pop(symbol, None)
-                self.tp_orders.pop(symbol, None)
+                self._forget_protective(symbol)
 
             self.logger.log_event("ORDER_MANAGER", "INFO", f"Cancelled all orders for {symbol}")
 
@@ -1339,22 +1451,53 @@ class OrderManager:
         except Exception as e:
             self.logger.log_event("ORDER_MANAGER", "ERROR", f"Failed to cleanup hanging orders: {e}")
 
+    async def _on_position_flat(self, symbol: str) -> None:
+        """Position gone on the exchange: drop it and its remaining orders."""
+        async with self.position_lock:
+            if self.active_positions.pop(symbol, None) is None:
+                return
+        await self.cancel_all_orders(symbol)
+        self.logger.log_event("ORDER_MANAGER", "INFO", f"Position closed on exchange: {symbol}")
+
     async def monitor_positions(self):
         """Monitor active positions"""
         try:
+            if self.state.authoritative:
+                # Stream-fed state is current: no REST
+                for symbol, position in list(self.active_positions.items()):
+                    pos = self.state.position(symbol)
+                    if pos is None:
+                        # Only on evidence newer than the entry (its ACCOUNT_UPDATE may still be in flight)
+                        if self.state.flat_since(symbol, position.get("timestamp", 0)):
+                            await self._on_position_flat(symbol)
+                    elif symbol in self.active_positions:
+                        freshness = getattr(self.exchange, "market_freshness", None)
+                        mark = freshness.get("mark", pos.symbol) if freshness is not None else None
+                        if mark is None:
+                            # ACCOUNT_UPDATE only comes with balance/position changes: its mark can be
+                            # hours old, and emergency stops are judged on this price
+                            with priority_scope("normal"):
+                                ticker = await self.exchange.get_ticker(symbol) or {}
+                            mark = (
+                                ticker.get("markPrice")
+                                or (ticker.get("info") or {}).get("markPrice")
+                                or ticker.get("last")
+                            )
+                            if not mark:
+                                continue  # keep the previous reading rather than a stale one
+                        mark = float(mark)
+                        self.active_positions[symbol].update(
+                            {"mark_price": mark, "unrealized_pnl": (mark - pos.entry_price) * pos.amount}
+                        )
+                return
+
             for symbol, _position in list(self.active_positions.items()):
                 # Check if position still exists on exchange
-                current_position = await self.exchange.get_position(symbol)
+                current_position = await self._get_position(symbol)
 
                 if not current_position:
                     # Position was closed
-                    async with self.position_lock:
-                        self.active_positions.pop(symbol, None)
-
-                    # Clean up orders
-                    await self.cancel_all_orders(symbol)
-
-                    self.logger.log_event("ORDER_MANAGER", "INFO", f"Position closed on exchange: {symbol}")
+                    await self._on_position_flat(symbol)
 
                 else:
                     # Update position data
@@ -1369,27 +1512,82 @@ class OrderManager:
         except Exception as e:
             self.logger.log_event("ORDER_MANAGER", "ERROR", f"Failed to monitor positions: {e}")
 
+    def _protective_ids(self, symbol: str) -> set[str]:
+        ids = {str(o["id"]) for o in self.tp_orders.get(symbol) or [] if o and o.get("id") is not None}
+        sl = self.sl_orders.get(symbol) or {}
+        if sl.get("id") is not None:
+            ids.add(str(sl["id"]))
+        return ids
+
+    def _forget_protective(self, symbol: str) -> None:
+        """Stop tracking a symbol's TP/SL, and with them their settled ids."""
+        self._settled_orders -= self._protective_ids(symbol)
+        self.sl_orders.pop(symbol, None)
+        self.tp_orders.pop(symbol, None)
+
+    def _settle_protective(self, symbol: str, order: OrderState) -> None:
+        """Report a TP/SL reaching its final status (once per order)."""
+        if order.status not in TERMINAL_STATUSES or order.order_id in self._settled_orders:
+            return
+        if order.order_id not in self._protective_ids(symbol):
+            return
+        self._settled_orders.add(order.order_id)
+        if order.status != "FILLED":
+            return
+        is_sl = order.order_id == str((self.sl_orders.get(symbol) or {}).get("id"))
+        self.logger.log_event(
+            "ORDER_MANAGER",
+            "WARNING" if is_sl else "INFO",
+            f"{'Stop loss' if is_sl else 'Take profit'} executed: {symbol} @ {order.avg_price}",
+        )
+
     async def check_order_executions(self):
-        """Check for executed orders"""
+        """Check for executed TP/SL orders.
+
+        Fills are reported from ALGO_UPDATE / ORDER_TRADE_UPDATE events as they happen. This poll only
+        runs while no user-data stream is attached, at most once per `order_fill_poll_sec`. TP/SL are
+        conditional (algo) orders, so it reads openAlgoOrders per symbol (weight 1); an order that left
+        that list is looked up once in allAlgoOrders (weight 5), and once triggered, its placed order by id.
+        """
+        if self.state.stream_attached:
+            return
+        now = time.time()
+        if now - self._last_fill_poll < getattr(self.config, "order_fill_poll_sec", 15.0):
+            return
+        self._last_fill_poll = now
         try:
             for symbol in list(self.active_positions.keys()):
-                # Check TP orders
-                if symbol in self.tp_orders:
-                    for tp_order in self.tp_orders[symbol]:
-                        order_status = await self.exchange.get_order(tp_order["id"], symbol)
-                        if order_status and order_status["status"] == "closed":
-                            self.logger.log_event(
-                                "ORDER_MANAGER", "INFO", f"Take profit executed: {symbol} @ {order_status['price']}"
-                            )
-
-                # Check SL order
-                if symbol in self.sl_orders:
-                    sl_order = self.sl_orders[symbol]
-                    order_status = await self.exchange.get_order(sl_order["id"], symbol)
-                    if order_status and order_status["status"] == "closed":
-                        self.logger.log_event(
-                            "ORDER_MANAGER", "WARNING", f"Stop loss executed: {symbol} @ {order_status['price']}"
-                        )
+                pending = self._protective_ids(symbol) - self._settled_orders
+                if not pending:
+                    continue
+                open_ids = {str(o.get("id")) for o in await self.exchange.get_open_algo_orders(symbol)}
+                gone = pending - open_ids
+                if not gone:
+                    continue
+                triggered = []
+                unknown = set()
+                for algo_id in gone:
+                    known = self.state.order(algo_id)
+                    if known is not None and known.triggered_id:
+                        triggered.append(known.triggered_id)
+                    else:
+                        unknown.add(algo_id)
+                if unknown:
+                    for order in await self.exchange.get_recent_algo_orders(symbol):
+                        if str(order.get("id")) not in unknown:
+                            continue
+                        tracked = self.state.apply_rest_order(order)
+                        if tracked is None:
+                            continue
+                        if tracked.is_open and tracked.triggered_id:
+                            triggered.append(tracked.triggered_id)
+                        else:
+                            self._settle_protective(symbol, tracked)
+                for order_id in triggered:
+                    # The order placed on trigger is a regular order: its fill settles the algo order
+                    tracked = self.state.apply_rest_order(await self.exchange.get_order(order_id, symbol))
+                    if tracked is not None:
+                        self._settle_protective(symbol, tracked)
 
         except Exception as e:
             self.logger.log_event("ORDER_MANAGER", "ERROR", f"Failed to check order executions: {e}")
@@ -1423,6 +1621,7 @@ class OrderManager:
         except Exception as e:
             self.logger.log_event("ORDER_MANAGER", "ERROR", f"Failed to check timeouts: {e}")
 
+    @with_priority("normal")
     async def check_auto_profit(self) -> None:
         """Check positions for auto-profit closure"""
         if not self.config.auto_profit_enabled:
@@ -1481,7 +1680,8 @@ class OrderManager:
                     self._bonus_closing[symbol] = now
 
                     # Close using existing method
-                    await self.close_position_market(symbol)
+                    with priority_scope("critical"):
+                        await self.close_position_market(symbol)
 
         except Exception as e:
             self.logger.log_event("AUTO_PROFIT", "ERROR", f"Check failed: {e}")
@@ -1525,7 +1725,8 @@ class OrderManager:
         etype = event.get("e")
         try:
             ts = event.get("E")
-            oid = event.get("o", {}).get("i") if etype == "ORDER_TRADE_UPDATE" else None
+            o = event.get("o", {})
+            oid = o.get("i") if etype == "ORDER_TRADE_UPDATE" else o.get("aid") if etype == "ALGO_UPDATE" else None
             eid = (etype, ts, oid)
             if eid in self._ws_seen:
                 return
@@ -1553,12 +1754,13 @@ class OrderManager:
             order_id = o.get("i")
             client_id = str(o.get("c") or "")
 
-            # Обновить внутреннее состояние ордера если есть метод
-            if hasattr(self, "_update_order_state"):
-                try:
-                    await self._update_order_state(order_id, status, o)  # type: ignore[misc]
-                except Exception as e:
-                    self.logger.log_event("WS", "WARNING", f"_update_order_state failed: {e}")
+            # Обновить внутреннее состояние ордера
+            try:
+                tracked = self.state.apply_order_update(event)
+                if tracked is not None and symbol:
+                    self._settle_protective(self._binance_to_ccxt(symbol), tracked)
+            except Exception as e:
+                self.logger.log_event("WS", "WARNING", f"Order state update failed: {e}")
 
             # --- КРИТИЧНО: Правильная детекция ликвидации/ADL с безопасной проверкой CALCULATED ---
             is_liq = (
@@ -1610,14 +1812,8 @@ class OrderManager:
 
             # --- Активация трейлинга после последнего TP ---
             try:
-                pending = self.pending_trailing.get(symbol)
-                if status == "FILLED" and pending and pending.get("tp_order_id") == order_id:
-                    self.logger.log_event(
-                        "ORDER_MANAGER", "INFO", f"{symbol}: last TP filled, activating trailing stop"
-                    )
-                    ccxt_symbol = pending.get("ccxt_symbol") or self._binance_to_ccxt(symbol)
-                    await self._activate_trailing(ccxt_symbol, pending)
-                    self.pending_trailing[symbol] = None
+                if status == "FILLED" and symbol:
+                    await self._activate_pending_trailing(symbol, order_id)
             except Exception as e:
                 self.logger.log_event("ORDER_MANAGER", "WARNING", f"Trailing activation check failed: {e}")
 
@@ -1673,10 +1869,29 @@ class OrderManager:
 
             # Activation check is handled in ORDER_TRADE_UPDATE below
 
+        # === ALGO_UPDATE: условные TP/SL, отслеживаются по algoId ===
+        elif etype == "ALGO_UPDATE":
+            symbol = event.get("o", {}).get("s")
+            tracked = None
+            try:
+                tracked = self.state.apply_algo_update(event)
+                if tracked is not None and symbol:
+                    self._settle_protective(self._binance_to_ccxt(symbol), tracked)
+            except Exception as e:
+                self.logger.log_event("WS", "WARNING", f"Algo order state update failed: {e}")
+            try:
+                if tracked is not None and symbol and tracked.status == "FILLED":
+                    await self._activate_pending_trailing(symbol, tracked.order_id)
+            except Exception as e:
+                self.logger.log_event("ORDER_MANAGER", "WARNING", f"Trailing activation check failed: {e}")
+
         # === ACCOUNT_UPDATE: обновляем кэш позиций ===
         elif etype == "ACCOUNT_UPDATE":
             a = event.get("a", {})
             self._ensure_pos_cache()
+            snapshot = getattr(self.exchange, "position_snapshot", None)
+            if isinstance(snapshot, PositionSnapshot):
+                snapshot.apply_account_update(event)
 
             # Обновляем позиции из события
             try:
@@ -1696,6 +1911,15 @@ class OrderManager:
             except Exception as e:
                 self.logger.log_event("WS", "WARNING", f"ACCOUNT_UPDATE parse error: {e}")
 
+            # Позиция закрылась на бирже: снимаем её и оставшиеся защитные ордера сразу, без ожидания опроса
+            try:
+                for pos in self.state.apply_account_update(event):
+                    ccxt_symbol = self._binance_to_ccxt(pos.symbol)
+                    if not pos.amount and ccxt_symbol in self.active_positions:
+                        await self._on_position_flat(ccxt_symbol)
+            except Exception as e:
+                self.logger.log_event("WS", "WARNING", f"Position state update failed: {e}")
+
             # Балансы (опционально можно сохранять)
             for b in a.get("B", []):  # Balances array
                 _asset = b.get("a")
@@ -1703,6 +1927,12 @@ class OrderManager:
                 _cross_wallet = float(b.get("cw", 0))
                 # Ничего не делаем по умолчанию
 
+        # === ACCOUNT_CONFIG_UPDATE: leverage changed (also from outside the bot) ===
+        elif etype == "ACCOUNT_CONFIG_UPDATE":
+            cache = getattr(self.exchange, "leverage_cache", None)
+            if isinstance(cache, LeverageCache):
+                cache.apply_config_update(event)
+
         # === MARGIN_CALL: предупреждение о риске (НЕ факт ликвидации!) ===
         elif etype == "MARGIN_CALL":
             self.logger.log_event("WS", "WARNING", f"⚠️ MARGIN_CALL warning: {event}")
@@ -1737,17 +1967,24 @@ class OrderManager:
             symbol_raw = event.get("s")
             if status != "FILLED" or not symbol_raw or order_id is None:
                 return
-            pending = self.pending_trailing.get(symbol_raw)
-            if pending and pending.get("tp_order_id") == order_id:
-                ccxt_symbol = pending.get("ccxt_symbol") or self._binance_to_ccxt(symbol_raw)
-                self.logger.log_event(
-                    "ORDER_MANAGER", "INFO", f"{ccxt_symbol}: last TP filled, activating trailing stop"
-                )
-                await self._activate_trailing(ccxt_symbol, pending)
-                self.pending_trailing[symbol_raw] = None
+            await self._activate_pending_trailing(symbol_raw, order_id)
         except Exception as e:
             self.logger.log_event("ORDER_MANAGER", "WARNING", f"handle_order_update failed: {e}")
 
+    async def _activate_pending_trailing(self, symbol_raw: str, order_id) -> None:
+        """Activate the trailing stop armed for `symbol_raw` once its last TP filled.
+
+        The TP is an algo order: its fill arrives either as ALGO_UPDATE (keyed by algoId) or as the
+        triggered order's ORDER_TRADE_UPDATE, whose orderId is mapped back to the algoId.
+        """
+        pending = self.pending_trailing.get(symbol_raw)
+        if not pending or str(pending.get("tp_order_id")) != self.state.algo_id_for(order_id):
+            return
+        ccxt_symbol = pending.get("ccxt_symbol") or self._binance_to_ccxt(symbol_raw)
+        self.logger.log_event("ORDER_MANAGER", "INFO", f"{ccxt_symbol}: last TP filled, activating trailing stop")
+        await self._activate_trailing(ccxt_symbol, pending)
+        self.pending_trailing[symbol_raw] = None
+
     async def handle_price_update(self, event: dict) -> None:
         """
         Lightweight handler for price updates from market WS streams.
@@ -1820,6 +2057,7 @@ class OrderManager:
         """Check if emergency shutdown is active"""
         return self.emergency_shutdown_flag
 
+    @with_priority("normal")
     async def place_order(
         self,
         symbol: str,
@@ -1848,7 +2086,7 @@ class OrderManager:
             # Pull market schema once from exchange client
             try:
                 markets = await self.exchange.get_markets()
-                market_schema = markets.get(symbol, {})
+                market_schema = rules_for(self.exchange, symbol, markets.get(symbol, {}))
             except Exception:
                 market_schema = {}
 
@@ -1917,9 +2155,11 @@ class OrderManager:
     async def sync_with_exchange(self):
         """Синхронизация локального состояния с биржей каждые 30 сек"""
         try:
-            # Получаем реальные позиции с биржи
-            positions = await self.exchange.get_positions()
+            # Получаем реальные позиции с биржи (ошибка прерывает синхронизацию, а не обнуляет позиции)
+            started = time.time()
+            positions = await self.exchange.fetch_positions_snapshot()
             exchange_positions = {p["symbol"]: p for p in positions if float(p.get("contracts", p.get("size", 0))) > 0}
+            symbol_orders: dict[str, list[dict]] = {}  # symbols whose open orders were fetched in full
 
             # Проверяем каждую позицию на наличие SL
             for symbol, pos in exchange_positions.items():
@@ -1927,6 +2167,7 @@ class OrderManager:
                 if self._emergency_closing.get(symbol, False):
                     continue
                 open_orders = await self.exchange.get_open_orders(symbol)
+                symbol_orders[symbol] = open_orders
 
                 # Нормализованная проверка SL
                 has_sl = False
@@ -1970,6 +2211,18 @@ class OrderManager:
                         else:
                             raise
 
+            # Сверка состояния из user-data событий с REST-снимком, полученным выше
+            missed = self.state.reconcile(
+                list(exchange_positions.values()),
+                [o for orders in symbol_orders.values() for o in orders] + all_orders,
+                started,
+                symbols={to_binance_symbol(s) for s in symbol_orders if "/" in s},
+            )
+            for order in missed:
+                self.state.apply_rest_order(
+                    await self.exchange.get_order(order.order_id, self._binance_to_ccxt(order.symbol))
+                )
+
         except Exception as e:
             self.logger.log_event("SYNC", "ERROR", f"Sync failed: {e}")
 
@@ -1983,7 +2236,11 @@ async def cleanup_stray_orders(exchange_client: OptimizedExchangeClient, symbol:
     kept = 0
     try:
         try:
-            pos = await exchange_client.get_position(symbol)
+            snapshot = getattr(exchange_client, "position_snapshot", None)
+            if isinstance(snapshot, PositionSnapshot):
+                pos = await snapshot.get(symbol)
+            else:
+                pos = await exchange_client.get_position(symbol)
         except Exception:
             pos = None
         has_pos = False
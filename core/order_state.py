@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+Event-sourced order and position state.
+
+ORDER_TRADE_UPDATE and ACCOUNT_UPDATE events from the user-data stream (or
+the paper simulator) are folded into one in-memory view of every order and
+position the account has:
+
+  - orders follow the Binance status machine (NEW -> PARTIALLY_FILLED ->
+    FILLED / CANCELED / EXPIRED ...); a terminal order never reopens and an
+    event older than the last applied one for the same order is dropped, so
+    reconnect replays and out-of-order delivery cannot move state backwards
+  - positions are replaced by the latest ACCOUNT_UPDATE amount for a symbol
+  - `reconcile()` folds in a REST snapshot (positions + open orders) that the
+    periodic exchange sync fetches anyway; stream updates newer than the REST
+    request win, and open orders that vanished without an event are returned
+    so the caller can look them up once
+
+Conditional orders (TP/SL) live in the algo service and are tracked under
+their algoId from ALGO_UPDATE events. Once triggered, an algo order places a
+regular order whose ORDER_TRADE_UPDATE events carry a different orderId; the
+algo event names it (`ai`) and its progress is mirrored onto the algo order.
+
+While a stream is attached and the last reconcile is recent, the view is
+`authoritative` and callers read it instead of polling REST. `wait_final()`
+lets a caller await an order's final status by clientOrderId (e.g. an entry
+fill) instead of sleeping and fetching it.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from core.symbol_utils import to_binance_symbol
+
+OPEN_STATUSES = {"NEW", "PARTIALLY_FILLED"}
+TERMINAL_STATUSES = {"FILLED", "CANCELED", "EXPIRED", "EXPIRED_IN_MATCH", "REJECTED"}
+TRANSITIONS = {
+    "NEW": {"NEW", "PARTIALLY_FILLED"} | TERMINAL_STATUSES,
+    "PARTIALLY_FILLED": {"PARTIALLY_FILLED", "FILLED", "CANCELED", "EXPIRED", "EXPIRED_IN_MATCH"},
+}
+CCXT_STATUS = {"open": "NEW", "closed": "FILLED", "canceled": "CANCELED", "expired": "EXPIRED", "rejected": "REJECTED"}
+# Algo order status -> order status; FINISHED means the triggered order is done (see _apply_algo)
+ALGO_STATUS = {
+    "NEW": "NEW",
+    "TRIGGERING": "NEW",
+    "TRIGGERED": "NEW",
+    "FINISHED": "FILLED",
+    "CANCELED": "CANCELED",
+    "REJECTED": "REJECTED",
+    "EXPIRED": "EXPIRED",
+}
+
+
+def _f(value: Any) -> float:
+    try:
+        return float(value or 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _raw_symbol(item: dict[str, Any]) -> str:
+    """Binance raw symbol of a ccxt order/position (info.symbol, else converted from the unified symbol)."""
+    raw = (item.get("info") or {}).get("symbol")
+    if raw:
+        return str(raw)
+    symbol = str(item.get("symbol") or "")
+    return to_binance_symbol(symbol) if "/" in symbol else symbol
+
+
+@dataclass
+class OrderState:
+    order_id: str
+    symbol: str  # Binance raw symbol (BTCUSDT)
+    client_id: str = ""
+    side: str = ""
+    order_type: str = ""
+    status: str = "NEW"
+    amount: float = 0.0
+    filled: float = 0.0
+    avg_price: float = 0.0
+    reduce_only: bool = False
+    realized_pnl: float = 0.0
+    algo: bool = False  # conditional order tracked under its algoId
+    triggered_id: str = ""  # algo orders: orderId of the order placed when it triggered
+    event_time: int = 0  # exchange E (ms) of the last applied event
+    updated_at: float = field(default_factory=time.time)  # local receive time
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in OPEN_STATUSES
+
+
+@dataclass
+class PositionState:
+    symbol: str  # Binance raw symbol
+    amount: float = 0.0  # signed: > 0 long, < 0 short
+    entry_price: float = 0.0
+    unrealized_pnl: float = 0.0
+    event_time: int = 0
+    updated_at: float = field(default_factory=time.time)
+
+    @property
+    def side(self) -> str:
+        return "long" if self.amount > 0 else "short" if self.amount < 0 else "flat"
+
+
+class OrderStateMachine:
+    """Orders and positions of the account, driven by user-data events and reconciled from REST."""
+
+    def __init__(self, max_reconcile_age: float = 90.0, keep_terminal: int = 2000):
+        self.max_reconcile_age = max_reconcile_age
+        self.orders: dict[str, OrderState] = {}
+        self.positions: dict[str, PositionState] = {}
+        self.stream_attached = False
+        self.reconciled_at = 0.0
+        self._terminal: deque[str] = deque()
+        self._keep_terminal = keep_terminal
+        self._client_ids: dict[str, str] = {}  # clientOrderId -> orderId
+        self._algo_ids: dict[str, str] = {}  # triggered orderId -> algoId
+        self._waiters: dict[str, list[tuple[asyncio.Future, str | None]]] = {}  # clientOrderId -> (future, orderId)
+        self.stats = {
+            "order_events": 0,
+            "algo_events": 0,
+            "account_events": 0,
+            "stale_events": 0,
+            "invalid_transitions": 0,
+            "reconciles": 0,
+            "reconcile_position_fixes": 0,
+            "reconcile_order_fixes": 0,
+        }
+
+    # ---------- authority ----------
+    def attach_stream(self, attached: bool = True) -> None:
+        """Mark whether a user-data stream (or the simulator) is feeding events.
+
+        A dropped stream may have missed events, so authority returns only after the next reconcile.
+        """
+        if not attached:
+            self.reconciled_at = 0.0
+        self.stream_attached = attached
+
+    @property
+    def authoritative(self) -> bool:
+        return self.stream_attached and time.time() - self.reconciled_at <= self.max_reconcile_age
+
+    # ---------- events ----------
+    def apply_order_update(self, event: dict[str, Any]) -> OrderState | None:
+        """Apply ORDER_TRADE_UPDATE; returns the updated order, or None if the event was stale.
+
+        For an order placed by a triggered algo order, the algo order it was mirrored onto is returned.
+        """
+        o = event.get("o") or {}
+        if o.get("i") is None or not o.get("s"):
+            return None
+        self.stats["order_events"] += 1
+        order_id = str(o["i"])
+        status = str(o.get("X") or "NEW").upper()
+        event_time = int(event.get("E") or 0)
+        order = self.orders.get(order_id)
+        if order is not None and not self._accepts(order, status, event_time, _f(o.get("z", order.filled))):
+            return None
+        if order is None:
+            order = self.orders[order_id] = OrderState(order_id=order_id, symbol=o["s"])
+        order.client_id = str(o.get("c") or order.client_id)
+        order.side = str(o.get("S") or order.side).lower()
+        order.order_type = str(o.get("ot") or o.get("o") or order.order_type).upper()
+        order.amount = _f(o.get("q")) or order.amount
+        order.filled = max(order.filled, _f(o.get("z")))
+        order.avg_price = _f(o.get("ap")) or order.avg_price
+        order.reduce_only = bool(o.get("R", order.reduce_only))
+        order.realized_pnl += _f(o.get("rp"))
+        self._set_status(order, status, event_time)
+        return self._mirror(order) or order
+
+    def apply_algo_update(self, event: dict[str, Any]) -> OrderState | None:
+        """Apply ALGO_UPDATE; returns the algo order, or None if the event was stale or it already settled."""
+        o = event.get("o") or {}
+        if o.get("aid") is None or not o.get("s"):
+            return None
+        self.stats["algo_events"] += 1
+        return self._apply_algo(
+            str(o["aid"]),
+            o["s"],
+            str(o.get("X") or "NEW").upper(),
+            int(event.get("E") or 0),
+            triggered_id=o.get("ai"),
+            client_id=o.get("caid"),
+            side=o.get("S"),
+            order_type=o.get("o"),
+            amount=_f(o.get("q")),
+            filled=_f(o.get("aq")),
+            avg_price=_f(o.get("ap")),
+            reduce_only=o.get("R"),
+        )
+
+    def _apply_algo(
+        self,
+        algo_id: str,
+        symbol: str,
+        algo_status: str,
+        event_time: int,
+        triggered_id: Any = None,
+        client_id: Any = None,
+        side: Any = None,
+        order_type: Any = None,
+        amount: float = 0.0,
+        filled: float = 0.0,
+        avg_price: float = 0.0,
+        reduce_only: Any = None,
+    ) -> OrderState | None:
+        algo = self.orders.get(algo_id)
+        if algo is not None and algo.status in TERMINAL_STATUSES:
+            return None  # already settled, e.g. from the triggered order's own events
+        if algo is None:
+            algo = self.orders[algo_id] = OrderState(order_id=algo_id, symbol=symbol, algo=True)
+        triggered_id = str(triggered_id or "")
+        if triggered_id and triggered_id != "0":
+            algo.triggered_id = triggered_id
+            self._algo_ids[triggered_id] = algo_id
+        status = ALGO_STATUS.get(algo_status, "NEW")
+        linked = self.orders.get(algo.triggered_id) if algo.triggered_id else None
+        if status == "FILLED" and not filled:
+            status = "NEW"  # FINISHED without an executed quantity: the triggered order's status decides
+        if status == "NEW" and algo.status != "NEW":
+            status = algo.status  # late TRIGGERED after the triggered order's own fill events
+        if not self._accepts(algo, status, event_time, max(filled, algo.filled)):
+            return None
+        algo.client_id = str(client_id or algo.client_id)
+        algo.side = str(side or algo.side).lower()
+        algo.order_type = str(order_type or algo.order_type).upper()
+        algo.amount = amount or algo.amount
+        algo.filled = max(algo.filled, filled)
+        algo.avg_price = avg_price or algo.avg_price
+        algo.reduce_only = bool(algo.reduce_only if reduce_only is None else reduce_only in (True, "true"))
+        self._set_status(algo, status, event_time)
+        if linked is not None:
+            self._mirror(linked)
+        return algo
+
+    def _mirror(self, order: OrderState) -> OrderState | None:
+        """Carry a triggered order's progress over to the algo order that placed it."""
+        algo = self.orders.get(self._algo_ids.get(order.order_id, ""))
+        if algo is None or algo.status in TERMINAL_STATUSES or order.status not in TRANSITIONS.get(algo.status, set()):
+            return None
+        algo.filled = max(algo.filled, order.filled)
+        algo.avg_price = order.avg_price or algo.avg_price
+        algo.realized_pnl = order.realized_pnl
+        self._set_status(algo, order.status, order.event_time)
+        return algo
+
+    def apply_account_update(self, event: dict[str, Any]) -> list[PositionState]:
+        """Apply ACCOUNT_UPDATE position amounts; returns positions whose amount changed."""
+        self.stats["account_events"] += 1
+        event_time = int(event.get("E") or 0)
+        changed: list[PositionState] = []
+        for p in (event.get("a") or {}).get("P", []) or []:
+            symbol = p.get("s")
+            if not symbol:
+                continue
+            pos = self.positions.get(symbol)
+            if pos is not None and event_time and event_time < pos.event_time:
+                self.stats["stale_events"] += 1
+                continue
+            if pos is None:
+                pos = self.positions[symbol] = PositionState(symbol=symbol)
+            before = pos.amount
+            pos.amount = _f(p.get("pa"))
+            pos.entry_price = _f(p.get("ep")) if pos.amount else 0.0
+            pos.unrealized_pnl = _f(p.get("up"))
+            pos.event_time = max(pos.event_time, event_time)
+            pos.updated_at = time.time()
+            if pos.amount != before:
+                changed.append(pos)
+        return changed
+
+    def _accepts(self, order: OrderState, status: str, event_time: int, filled: float) -> bool:
+        if (event_time and event_time < order.event_time) or filled < order.filled:
+            self.stats["stale_events"] += 1
+            return False
+        if status not in TRANSITIONS.get(order.status, set()):
+            self.stats["invalid_transitions"] += 1
+            return False
+        return True
+
+    def _set_status(self, order: OrderState, status: str, event_time: int) -> None:
+        was_terminal = order.status in TERMINAL_STATUSES
+        order.status = status
+        order.event_time = max(order.event_time, event_time)
+        order.updated_at = time.time()
+        if status in TERMINAL_STATUSES and not was_terminal:
+            self._terminal.append(order.order_id)
+            while len(self._terminal) > self._keep_terminal:
+                dropped = self.orders.pop(self._terminal.popleft(), None)
+                if dropped is not None and self._client_ids.get(dropped.client_id) == dropped.order_id:
+                    del self._client_ids[dropped.client_id]
+                if dropped is not None:
+                    self._algo_ids.pop(dropped.triggered_id or dropped.order_id, None)
+        if order.client_id:
+            self._client_ids[order.client_id] = order.order_id
+            if status in TERMINAL_STATUSES and order.client_id in self._waiters:
+                self._resolve(order)
+
+    def _resolve(self, order: OrderState) -> None:
+        pending = []
+        for fut, order_id in self._waiters.pop(order.client_id, []):
+            if order_id is not None and order_id != order.order_id:
+                pending.append((fut, order_id))  # same clientOrderId, different (earlier) order
+            elif not fut.done():
+                fut.set_result(order)
+        if pending:
+            self._waiters[order.client_id] = pending
+
+    async def wait_final(self, client_id: str, timeout: float, order_id: Any = None) -> OrderState | None:
+        """Wait for the order with this clientOrderId (and orderId, when known) to reach a final status.
+
+        Returns at once if its final event already arrived; None on timeout.
+        """
+        order_id = None if order_id is None else str(order_id)
+        known = self.orders.get(self._client_ids.get(client_id, ""))
+        if known is not None and known.status in TERMINAL_STATUSES and order_id in (None, known.order_id):
+            return known
+        fut = asyncio.get_running_loop().create_future()
+        entry = (fut, order_id)
+        self._waiters.setdefault(client_id, []).append(entry)
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        except TimeoutError:
+            return None
+        finally:
+            waiters = self._waiters.get(client_id)
+            if waiters and entry in waiters:
+                waiters.remove(entry)
+                if not waiters:
+                    del self._waiters[client_id]
+
+    # ---------- REST ----------
+    def apply_rest_order(self, order: dict[str, Any] | None) -> OrderState | None:
+        """Fold a ccxt order (e.g. looked up after reconcile) into the view."""
+        if not order or order.get("id") is None:
+            return None
+        info = order.get("info") or {}
+        if info.get("algoId") is not None:
+            return self._apply_algo(
+                str(info["algoId"]),
+                _raw_symbol(order),
+                str(info.get("algoStatus") or "NEW").upper(),
+                0,
+                triggered_id=info.get("actualOrderId"),
+                client_id=info.get("clientAlgoId"),
+                side=order.get("side"),
+                order_type=info.get("orderType"),
+                amount=_f(order.get("amount")),
+            ) or self.orders.get(str(info["algoId"]))
+        status = str(info.get("status") or CCXT_STATUS.get(order.get("status"), "NEW")).upper()
+        state = self.orders.get(str(order["id"]))
+        if state is None:
+            state = self.orders[str(order["id"])] = OrderState(order_id=str(order["id"]), symbol=_raw_symbol(order))
+        elif state.status in TERMINAL_STATUSES:
+            return state
+        state.client_id = str(order.get("clientOrderId") or state.client_id)
+        state.side = str(order.get("side") or state.side).lower()
+        state.order_type = str(info.get("type") or order.get("type") or state.order_type).upper()
+        state.amount = _f(order.get("amount")) or state.amount
+        state.filled = max(state.filled, _f(order.get("filled")))
+        state.avg_price = _f(order.get("average")) or state.avg_price
+        state.reduce_only = bool(order.get("reduceOnly") or info.get("reduceOnly") in (True, "true"))
+        self._set_status(state, status, 0)
+        return self._mirror(state) or state
+
+    def reconcile(
+        self,
+        positions: list[dict[str, Any]],
+        open_orders: list[dict[str, Any]],
+        started: float,
+        symbols: set[str] | None = None,
+    ) -> list[OrderState]:
+        """Fold in a REST snapshot taken at `started` (local time); stream updates newer than that win.
+
+        `positions` must be complete (all open positions). `open_orders` is complete for `symbols`
+        (raw symbols; None = all). Returns locally open orders on those symbols that are no longer
+        open on the exchange and saw no event since `started`: their final status was missed.
+        """
+        seen: set[str] = set()
+        for p in positions or []:
+            symbol = _raw_symbol(p)
+            if not symbol:
+                continue
+            amount = _f((p.get("info") or {}).get("positionAmt"))
+            if not amount:
+                size = abs(_f(p.get("contracts", p.get("size"))))
+                amount = -size if p.get("side") == "short" else size
+            seen.add(symbol)
+            self._reconcile_position(symbol, amount, _f(p.get("entryPrice")), _f(p.get("unrealizedPnl")), started)
+        for symbol in list(self.positions):
+            if symbol not in seen:
+                self._reconcile_position(symbol, 0.0, 0.0, 0.0, started)
+
+        open_ids: set[str] = set()
+        for order in open_orders or []:
+            oid = str(order.get("id"))
+            open_ids.add(oid)
+            state = self.orders.get(oid)
+            if state is not None and not state.is_open and state.updated_at <= started:
+                self.stats["reconcile_order_fixes"] += 1
+                self.orders.pop(oid)
+                state = None
+            if state is None:
+                self.apply_rest_order(order)
+        missed = [
+            o
+            for o in self.orders.values()
+            if o.is_open
+            and not o.algo  # openOrders never lists algo orders
+            and o.order_id not in open_ids
+            and o.updated_at <= started
+            and (symbols is None or o.symbol in symbols)
+        ]
+        self.stats["reconcile_order_fixes"] += len(missed)
+        self.stats["reconciles"] += 1
+        self.reconciled_at = started
+        return missed
+
+    def _reconcile_position(self, symbol: str, amount: float, entry: float, upnl: float, started: float) -> None:
+        pos = self.positions.get(symbol)
+        if pos is not None and pos.updated_at > started:
+            return  # stream is newer than the REST snapshot
+        if pos is None:
+            if not amount:
+                return
+            pos = self.positions[symbol] = PositionState(symbol=symbol)
+        if abs(pos.amount - amount) > 1e-12:
+            self.stats["reconcile_position_fixes"] += 1
+        pos.amount, pos.entry_price, pos.unrealized_pnl = amount, entry, upnl
+        pos.updated_at = started
+        if not amount:
+            self.positions.pop(symbol, None)
+
+    # ---------- queries ----------
+    def position(self, symbol: str) -> PositionState | None:
+        """Open position for a raw or ccxt symbol (None when flat)."""
+        pos = self.positions.get(_raw_symbol({"symbol": symbol}))
+        return pos if pos is not None and pos.amount else None
+
+    def flat_since(self, symbol: str, since: float) -> bool:
+        """True if the symbol is known flat from an event or reconcile newer than `since` (local time)."""
+        pos = self.positions.get(_raw_symbol({"symbol": symbol}))
+        if pos is not None:
+            return not pos.amount and pos.updated_at >= since
+        return self.reconciled_at >= since
+
+    def order(self, order_id: Any) -> OrderState | None:
+        return self.orders.get(str(order_id))
+
+    def algo_id_for(self, order_id: Any) -> str:
+        """algoId of the algo order that placed `order_id` when it triggered, else `order_id` itself."""
+        return self._algo_ids.get(str(order_id), str(order_id))
+
+    def open_orders(self, symbol: str | None = None) -> list[OrderState]:
+        raw = _raw_symbol({"symbol": symbol}) if symbol else None
+        return [o for o in self.orders.values() if o.is_open and (raw is None or o.symbol == raw)]
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "authoritative": self.authoritative,
+            "positions": sum(1 for p in self.positions.values() if p.amount),
+            "open_orders": len(self.open_orders()),
+            "tracked_orders": len(self.orders),
+            "reconcile_age_sec": round(time.time() - self.reconciled_at, 1) if self.reconciled_at else None,
+            **self.stats,
+        }
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Direct signed REST transport for USDⓈ-M order placement and cancellation.
+
+ccxt builds every order request through its generic machinery (parameter
+handling, market lookup, unified-structure parsing). On the order hot path
+this transport sends `POST/DELETE /fapi/v1/order` itself instead:
+
+  - one keep-alive aiohttp session (pooled connections, no per-call setup)
+  - HMAC-SHA256 with the key schedule computed once (`hmac.copy()` per request)
+  - only the fields OrderManager reads are parsed into the ccxt order shape
+
+Error codes are mapped with ccxt's own Binance exception table, so the same
+exception classes reach retry and order-management code. Conditional
+orders (sent by ccxt to the algo endpoint) and anything else unsupported keep
+going through ccxt.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+from urllib.parse import urlencode
+
+import aiohttp
+import ccxt.async_support as ccxt
+
+from core.http_pool import HttpPool
+from core.retry_policy import LatencyWindow
+
+DEFAULT_BASE_URL = "https://fapi.binance.com/fapi/v1"
+
+# Binance order status -> ccxt unified status
+ORDER_STATUS = {
+    "NEW": "open",
+    "PARTIALLY_FILLED": "open",
+    "FILLED": "closed",
+    "CANCELED": "canceled",
+    "EXPIRED": "expired",
+    "EXPIRED_IN_MATCH": "expired",
+    "REJECTED": "rejected",
+}
+
+SUPPORTED_TYPES = ("market", "limit")
+
+
+def _num(value: Any) -> str:
+    """Plain decimal string for a quantity/price (no exponent, no float noise)."""
+    return format(Decimal(repr(float(value))).normalize(), "f")
+
+
+def _float(value: Any) -> float | None:
+    try:
+        f = float(value)
+    except (TypeError, ValueError):
+        return None
+    return f if f else None
+
+
+def format_param(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return _num(value)
+    return str(value)
+
+
+def binance_exceptions(exchange: Any) -> dict[str, type[Exception]]:
+    """ccxt's exact-match error table for USDⓈ-M endpoints (linear entries take precedence)."""
+    table = getattr(exchange, "exceptions", None) or {}
+    return {**(table.get("exact") or {}), **((table.get("linear") or {}).get("exact") or {})}
+
+
+def binance_error(exceptions: dict[str, type[Exception]], status: int, reason: str, text: str, data: Any) -> Exception:
+    """Same classes as ccxt: 418/429 throttling, exact code/message match, 5xx unavailable."""
+    if status in (418, 429):
+        return ccxt.DDoSProtection(f"binance {status} {reason} {text}")
+    if isinstance(data, dict):
+        for key in (str(data.get("code")), str(data.get("msg"))):
+            cls = exceptions.get(key)
+            if cls is not None:
+                return cls(f"binance {text}")
+    if status >= 500:
+        return ccxt.ExchangeNotAvailable(f"binance {status} {reason} {text}")
+    return ccxt.ExchangeError(f"binance {text}")
+
+
+def order_request(
+    market_id: str, order_type: str, side: str, amount: float, price: float | None, params: dict[str, Any] | None
+) -> dict[str, Any]:
+    """`/fapi/v1/order` parameters for a plain order, as ccxt would send them."""
+    order_type = order_type.upper()
+    request: dict[str, Any] = {"symbol": market_id, "side": side.upper(), "type": order_type, "quantity": amount}
+    if order_type == "LIMIT":
+        request["price"] = price
+        request["timeInForce"] = "GTC"
+    request.update({k: v for k, v in (params or {}).items() if v is not None})
+    return request
+
+
+def supports(order_type: str, params: dict[str, Any] | None) -> bool:
+    """Plain market/limit orders; conditional (algo endpoint) and test orders stay on ccxt."""
+    params = params or {}
+    if str(order_type).lower() not in SUPPORTED_TYPES or params.get("test"):
+        return False
+    return not any(k in params for k in ("stopPrice", "triggerPrice", "closePosition", "callbackRate"))
+
+
+def parse_order(data: dict[str, Any], symbol: str) -> dict[str, Any]:
+    """Fields of ccxt's unified order that callers use; the raw reply stays in `info`."""
+    amount = float(data.get("origQty") or 0.0)
+    filled = float(data.get("executedQty") or 0.0)
+    average = _float(data.get("avgPrice"))
+    return {
+        "id": str(data.get("orderId")),
+        "clientOrderId": data.get("clientOrderId"),
+        "timestamp": data.get("updateTime"),
+        "symbol": symbol,
+        "type": str(data.get("type") or "").lower(),
+        "side": str(data.get("side") or "").lower(),
+        "price": _float(data.get("price")),
+        "average": average,
+        "amount": amount,
+        "filled": filled,
+        "remaining": max(amount - filled, 0.0),
+        "cost": filled * average if average else 0.0,
+        "status": ORDER_STATUS.get(data.get("status"), data.get("status")),
+        "reduceOnly": data.get("reduceOnly"),
+        "timeInForce": data.get("timeInForce"),
+        "stopPrice": _float(data.get("stopPrice")),
+        "info": data,
+    }
+
+
+class OrderTransport:
+    """Keep-alive, pre-signed order requests returning ccxt-shaped order dicts."""
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        base_url: str | None = None,
+        clock: Callable[[], int] | None = None,
+        exceptions: dict[str, type[Exception]] | None = None,
+        recv_window: int = 10000,
+        timeout: float = 10.0,
+        pool_size: int = 10,
+        http_pool: HttpPool | None = None,
+    ):
+        self.base_url = (base_url or DEFAULT_BASE_URL).rstrip("/")
+        self.recv_window = recv_window
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.http_pool = http_pool
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self.clock = clock or (lambda: int(time.time() * 1000))
+        self.exceptions = exceptions or {}
+        self._headers = {"X-MBX-APIKEY": api_key, "Content-Type": "application/x-www-form-urlencoded"}
+        self._mac = hmac.new(api_secret.encode(), digestmod=hashlib.sha256)
+        self.session: aiohttp.ClientSession | None = None
+        self.last_response_headers: dict[str, str] = {}
+        self.latency: dict[str, LatencyWindow] = {}
+        self.stats = {"requests": 0, "errors": 0}
+
+    # ---------- HTTP ----------
+    def _session(self) -> aiohttp.ClientSession:
+        if self.http_pool is not None:
+            return self.http_pool.session  # keep-alive connections shared with ccxt on the same host
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60, ttl_dns_cache=300)
+            )
+        return self.session
+
+    def sign(self, params: dict[str, Any]) -> str:
+        """Query string with timestamp, recvWindow and signature appended."""
+        query = urlencode(
+            {
+                **{k: format_param(v) for k, v in params.items()},
+                "timestamp": self.clock(),
+                "recvWindow": self.recv_window,
+            }
+        )
+        mac = self._mac.copy()
+        mac.update(query.encode())
+        return f"{query}&signature={mac.hexdigest()}"
+
+    async def fetch(self, url: str, method: str = "GET", headers=None, body=None) -> Any:
+        """Send one request and return the decoded JSON (same signature as ccxt's `fetch`)."""
+        try:
+            async with self._session().request(
+                method, url, data=body, headers=self._headers, timeout=self._timeout
+            ) as resp:
+                text = await resp.text()
+                self.last_response_headers = dict(resp.headers)
+                status, reason = resp.status, resp.reason or ""
+        except TimeoutError as e:
+            raise ccxt.RequestTimeout(f"binance {method} {url} request timeout") from e
+        except aiohttp.ClientError as e:
+            raise ccxt.NetworkError(f"binance {method} {url} {type(e).__name__} {e}") from e
+
+        try:
+            data = json.loads(text) if text else None
+        except ValueError:
+            data = None
+        if status >= 400 or (isinstance(data, dict) and int(data.get("code") or 0) < 0):
+            self.stats["errors"] += 1
+            raise binance_error(self.exceptions, status, reason, text, data)
+        return data
+
+    async def request(self, method: str, path: str, params: dict[str, Any]) -> dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self.stats["requests"] += 1
+        data = await self.fetch(f"{self.base_url}/{path}?{self.sign(params)}", method)
+        self.latency.setdefault(f"{method} {path}", LatencyWindow()).add(loop.time() - started)
+        return data
+
+    # ---------- orders ----------
+    supports = staticmethod(supports)
+    parse_order = staticmethod(parse_order)
+
+    async def create_order(
+        self,
+        market_id: str,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: float | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        data = await self.request("POST", "order", order_request(market_id, order_type, side, amount, price, params))
+        return parse_order(data, symbol)
+
+    async def cancel_order(self, order_id: str, market_id: str, symbol: str) -> dict[str, Any]:
+        data = await self.request("DELETE", "order", {"symbol": market_id, "orderId": order_id})
+        return parse_order(data, symbol)
+
+    def snapshot(self) -> dict[str, Any]:
+        out: dict[str, Any] = dict(self.stats)
+        for name, window in self.latency.items():
+            p50, p95 = window.percentile(0.5), window.percentile(0.95)
+            out[name] = {
+                "samples": len(window.samples),
+                "p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+            }
+        return out
+
+    async def close(self) -> None:
+        if self.session and not self.session.closed:
+            await self.session.close()
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Local execution simulator for dry-run (paper trading).
+
+`PaperExchange` stands in for the raw ccxt exchange: market data, markets and
+precision helpers are passed through to ccxt, while order, position, balance
+and leverage calls are served from local state, so a dry run makes no
+order-endpoint or account requests at all.
+
+  - market orders fill at once at the current ask/bid (last price if no book)
+  - limit orders fill when the market trades through their price (maker fee)
+  - STOP/TAKE_PROFIT(_MARKET) trigger on last or mark price per `workingType`;
+    immediately-triggering ones are rejected like Binance does (-2021)
+  - reduce-only/closePosition orders never increase a position; with nothing
+    left to reduce they expire
+  - one-way positions: weighted entry price, realized PnL and fees booked to
+    the wallet; new exposure is checked against available margin (-2019)
+
+Every state change is reported as a synthetic ORDER_TRADE_UPDATE /
+ACCOUNT_UPDATE event (Binance user-data format) to `on_event`, i.e.
+`OrderManager.handle_ws_event`, so protective-order, trailing and exit logic
+run exactly as with the live user-data stream. Resting orders are checked
+against the price feed every `poll_interval` seconds.
+"""
+
+import asyncio
+import copy
+import inspect
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import ccxt.async_support as ccxt
+
+CONDITIONAL_TYPES = ("STOP", "STOP_MARKET", "TAKE_PROFIT", "TAKE_PROFIT_MARKET")
+
+# ccxt unified status -> Binance order status
+BINANCE_STATUS = {"open": "NEW", "closed": "FILLED", "canceled": "CANCELED", "expired": "EXPIRED"}
+
+
+def _error(exc_cls: type[Exception], code: int, msg: str) -> Exception:
+    return exc_cls(f"binance {json.dumps({'code': code, 'msg': msg})}")
+
+
+class PaperExchange:
+    """ccxt-shaped dry-run exchange: orders fill locally against live prices."""
+
+    def __init__(
+        self,
+        raw: Any,
+        quote: str,
+        balance: float,
+        price_source: Callable[[str], Awaitable[dict[str, Any] | None]],
+        market_id: Callable[[str], str],
+        taker_fee: float = 0.0004,
+        maker_fee: float = 0.0002,
+        default_leverage: int = 5,
+        poll_interval: float = 1.0,
+        on_event: Callable[[dict[str, Any]], Any] | None = None,
+    ):
+        self._raw = raw
+        self.quote = quote
+        self.wallet = float(balance)
+        self.price_source = price_source
+        self.market_id = market_id
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.default_leverage = default_leverage
+        self.poll_interval = poll_interval
+        self.on_event = on_event
+
+        self.orders: dict[str, dict[str, Any]] = {}
+        self.positions: dict[str, dict[str, float]] = {}  # symbol -> {"amount": signed, "entry": price}
+        self.leverage: dict[str, int] = {}
+        self.margin_mode: dict[str, str] = {}
+        self.prices: dict[str, float] = {}
+        self._next_id = 1_000_000
+        self._last_ts = 0
+        self._task: asyncio.Task | None = None
+        self._event_tasks: set[asyncio.Task] = set()
+        self.stats = {"orders": 0, "fills": 0, "triggers": 0, "expired": 0, "rejected": 0, "events": 0}
+
+    def __getattr__(self, name: str) -> Any:
+        # Market data, markets and precision helpers come from the real ccxt exchange
+        return getattr(self._raw, name)
+
+    # ---------- lifecycle ----------
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def close(self) -> None:
+        await self.stop()
+        await self._raw.close()
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            for symbol in {o["symbol"] for o in self.orders.values() if o["status"] == "open"}:
+                try:
+                    await self.evaluate(symbol)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logging.warning(f"Paper fill check failed for {symbol}: {e}")
+
+    # ---------- prices ----------
+    async def _quote(self, symbol: str) -> dict[str, float] | None:
+        ticker = await self.price_source(symbol)
+        if not ticker:
+            return None
+        info = ticker.get("info") or {}
+        last = ticker.get("last") or ticker.get("close") or ticker.get("mark")
+        if not last:
+            return None
+        last = float(last)
+        self.prices[symbol] = last
+        return {
+            "last": last,
+            "bid": float(ticker.get("bid") or last),
+            "ask": float(ticker.get("ask") or last),
+            "mark": float(ticker.get("mark") or info.get("markPrice") or last),
+        }
+
+    @staticmethod
+    def _triggered(order: dict[str, Any], q: dict[str, float]) -> bool:
+        ref = q["mark"] if order["info"].get("wt") == "MARK_PRICE" else q["last"]
+        stop, buy = order["stopPrice"], order["side"] == "buy"
+        if order["info"]["ot"] in ("STOP", "STOP_MARKET"):
+            return ref >= stop if buy else ref <= stop
+        return ref <= stop if buy else ref >= stop
+
+    async def evaluate(self, symbol: str) -> None:
+        """Check the symbol's resting orders against the current price."""
+        q = await self._quote(symbol)
+        if q is None:
+            return
+        for order in [o for o in self.orders.values() if o["symbol"] == symbol and o["status"] == "open"]:
+            otype = order["type"].upper()
+            if otype in CONDITIONAL_TYPES and not order["info"].get("triggered"):
+                if not self._triggered(order, q):
+                    continue
+                order["info"]["triggered"] = True
+                self.stats["triggers"] += 1
+                if otype.endswith("_MARKET"):
+                    self._fill(order, q["ask"] if order["side"] == "buy" else q["bid"], maker=False)
+                    continue
+            if order["price"] is not None and otype in ("LIMIT", "STOP", "TAKE_PROFIT"):
+                if (order["side"] == "buy" and q["ask"] <= order["price"]) or (
+                    order["side"] == "sell" and q["bid"] >= order["price"]
+                ):
+                    self._fill(order, order["price"], maker=True)
+
+    # ---------- orders ----------
+    async def create_order(
+        self,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float,
+        price: float | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        params = dict(params or {})
+        params.pop("test", None)
+        otype, side = str(type).upper(), str(side).lower()
+        stop_price = params.get("stopPrice") or params.get("triggerPrice")
+        reduce_only = bool(params.get("reduceOnly") or params.get("closePosition"))
+        if otype in CONDITIONAL_TYPES and not stop_price:
+            raise _error(ccxt.InvalidOrder, -1102, "Mandatory parameter 'stopPrice' was not sent.")
+
+        q = await self._quote(symbol)
+        if q is None:
+            raise ccxt.ExchangeNotAvailable(f"paper: no price for {symbol}")
+        order_id = str(self._next_id)
+        self._next_id += 1
+        order = {
+            "id": order_id,
+            "clientOrderId": params.get("newClientOrderId") or f"paper-{order_id}",
+            "timestamp": self._now(),
+            "symbol": symbol,
+            "type": otype.lower() if otype in ("LIMIT", "MARKET") else otype,
+            "side": side,
+            "price": float(price) if price is not None else None,
+            "stopPrice": float(stop_price) if stop_price else None,
+            "amount": float(amount),
+            "filled": 0.0,
+            "remaining": float(amount),
+            "average": None,
+            "status": "open",
+            "reduceOnly": reduce_only,
+            "info": {
+                "ot": otype,
+                "wt": params.get("workingType", "CONTRACT_PRICE"),
+                "cp": bool(params.get("closePosition")),
+            },
+        }
+        self.stats["orders"] += 1
+
+        if order["stopPrice"] is not None and self._triggered(order, q):
+            self.stats["rejected"] += 1
+            raise _error(ccxt.OrderImmediatelyFillable, -2021, "Order would immediately trigger.")
+        if not reduce_only:
+            self._check_margin(symbol, side, float(amount), price or q["last"])
+
+        self.orders[order_id] = order
+        self._emit_order(order, "NEW")
+        if otype == "MARKET":
+            self._fill(order, q["ask"] if side == "buy" else q["bid"], maker=False)
+        elif otype == "LIMIT" and (
+            (side == "buy" and q["ask"] <= order["price"]) or (side == "sell" and q["bid"] >= order["price"])
+        ):
+            self._fill(order, q["ask"] if side == "buy" else q["bid"], maker=False)  # marketable: taker
+        return copy.deepcopy(order)
+
+    async def edit_order(
+        self,
+        id: str,
+        symbol: str,
+        type: str,
+        side: str,
+        amount: float | None = None,
+        price: float | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        order = self._open_order(id)
+        if amount is not None:
+            order["amount"] = float(amount)
+            order["remaining"] = float(amount) - order["filled"]
+        if price is not None:
+            order["price"] = float(price)
+        self._emit_order(order, "AMENDMENT")
+        await self.evaluate(symbol)
+        return copy.deepcopy(order)
+
+    async def cancel_order(self, id: str, symbol: str | None = None, params: dict[str, Any] | None = None) -> dict:
+        order = self._open_order(id)
+        order["status"] = "canceled"
+        self._emit_order(order, "CANCELED")
+        return copy.deepcopy(order)
+
+    async def cancel_all_orders(self, symbol: str | None = None, params: dict[str, Any] | None = None) -> list[dict]:
+        return [
+            await self.cancel_order(o["id"])
+            for o in list(self.orders.values())
+            if o["status"] == "open" and (symbol is None or o["symbol"] == symbol)
+        ]
+
+    async def fetch_order(self, id: str | None, symbol: str | None = None, params: dict[str, Any] | None = None):
+        client_id = (params or {}).get("origClientOrderId")
+        for order in self.orders.values():
+            if (id is not None and order["id"] == str(id)) or (client_id and order["clientOrderId"] == client_id):
+                return copy.deepcopy(order)
+        raise _error(ccxt.OrderNotFound, -2013, "Order does not exist.")
+
+    async def fetch_open_orders(self, symbol: str | None = None, since=None, limit=None, params=None) -> list[dict]:
+        return [
+            copy.deepcopy(o)
+            for o in self.orders.values()
+            if o["status"] == "open" and (symbol is None or o["symbol"] == symbol)
+        ]
+
+    def _open_order(self, order_id: str) -> dict[str, Any]:
+        order = self.orders.get(str(order_id))
+        if order is None or order["status"] != "open":
+            raise _error(ccxt.OrderNotFound, -2011, "Unknown order sent.")
+        return order
+
+    # ---------- fills and accounting ----------
+    def _fill(self, order: dict[str, Any], price: float, maker: bool) -> None:
+        symbol = order["symbol"]
+        pos = self.positions.setdefault(symbol, {"amount": 0.0, "entry": 0.0})
+        qty = order["remaining"]
+        if order["reduceOnly"]:
+            closes = pos["amount"] < 0 if order["side"] == "buy" else pos["amount"] > 0
+            if not closes:
+                order["status"] = "expired"
+                self.stats["expired"] += 1
+                self._emit_order(order, "EXPIRED")
+                return
+            qty = abs(pos["amount"]) if order["info"]["cp"] else min(qty, abs(pos["amount"]))
+
+        signed = qty if order["side"] == "buy" else -qty
+        old = pos["amount"]
+        realized = 0.0
+        if old and (old > 0) != (signed > 0):
+            closing = min(qty, abs(old))
+            realized = (price - pos["entry"]) * closing * (1 if old > 0 else -1)
+        new = round(old + signed, 12)
+        if new == 0:
+            pos["entry"] = 0.0
+        elif old == 0 or (old > 0) != (new > 0):
+            pos["entry"] = price
+        elif abs(new) > abs(old):
+            pos["entry"] = (pos["entry"] * abs(old) + price * qty) / abs(new)
+        pos["amount"] = new
+        fee = price * qty * (self.maker_fee if maker else self.taker_fee)
+        self.wallet += realized - fee
+        self.prices[symbol] = price
+
+        order.update(
+            filled=order["filled"] + qty, remaining=0.0, average=price, status="closed", lastTradeTimestamp=self._now()
+        )
+        self.stats["fills"] += 1
+        self._emit_order(order, "TRADE", last_qty=qty, last_price=price, realized=realized, fee=fee, maker=maker)
+        self._emit_account(symbol)
+
+    def _used_margin(self) -> float:
+        return sum(
+            abs(p["amount"]) * self.prices.get(s, p["entry"]) / self.leverage.get(s, self.default_leverage)
+            for s, p in self.positions.items()
+        )
+
+    def _unrealized(self, symbol: str) -> float:
+        pos = self.positions.get(symbol) or {"amount": 0.0, "entry": 0.0}
+        return (self.prices.get(symbol, pos["entry"]) - pos["entry"]) * pos["amount"]
+
+    def _check_margin(self, symbol: str, side: str, amount: float, price: float) -> None:
+        required = amount * price / self.leverage.get(symbol, self.default_leverage)
+        available = self.wallet + sum(self._unrealized(s) for s in self.positions) - self._used_margin()
+        if required > available:
+            self.stats["rejected"] += 1
+            raise _error(ccxt.InsufficientFunds, -2019, "Margin is insufficient.")
+
+    # ---------- account ----------
+    async def fetch_balance(self, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        used = self._used_margin()
+        total = self.wallet + sum(self._unrealized(s) for s in self.positions)
+        entry = {"free": max(total - used, 0.0), "used": used, "total": total}
+        return {
+            "info": {"paper": True},
+            self.quote: entry,
+            "free": {self.quote: entry["free"]},
+            "used": {self.quote: used},
+            "total": {self.quote: total},
+        }
+
+    async def fetch_positions(self, symbols: list[str] | None = None, params: dict[str, Any] | None = None) -> list:
+        out = []
+        for symbol, pos in self.positions.items():
+            if symbols and symbol not in symbols:
+                continue
+            mark = self.prices.get(symbol, pos["entry"])
+            out.append(
+                {
+                    "symbol": symbol,
+                    "contracts": abs(pos["amount"]),
+                    "contractSize": 1.0,
+                    "side": "long" if pos["amount"] > 0 else ("short" if pos["amount"] < 0 else None),
+                    "entryPrice": pos["entry"],
+                    "markPrice": mark,
+                    "notional": abs(pos["amount"]) * mark,
+                    "unrealizedPnl": self._unrealized(symbol),
+                    "leverage": self.leverage.get(symbol, self.default_leverage),
+                    "marginMode": self.margin_mode.get(symbol, "cross"),
+                    "info": {"symbol": self.market_id(symbol), "positionAmt": str(pos["amount"])},
+                }
+            )
+        return out
+
+    async def set_leverage(self, leverage: int, symbol: str | None = None, params: dict[str, Any] | None = None):
+        self.leverage[symbol] = int(leverage)
+        return {"symbol": self.market_id(symbol), "leverage": int(leverage)}
+
+    async def set_margin_mode(self, marginMode: str, symbol: str | None = None, params: dict[str, Any] | None = None):
+        self.margin_mode[symbol] = str(marginMode).lower()
+        return {"code": 200, "msg": "success"}
+
+    async def fetch_leverages(self, symbols: list[str] | None = None, params: dict[str, Any] | None = None) -> dict:
+        return {
+            s: {"symbol": s, "marginMode": self.margin_mode.get(s, "cross"), "longLeverage": lev, "shortLeverage": lev}
+            for s, lev in self.leverage.items()
+            if not symbols or s in symbols
+        }
+
+    # ---------- synthetic user-data events ----------
+    def _now(self) -> int:
+        # Strictly increasing: handle_ws_event de-duplicates on (type, E, order id)
+        self._last_ts = max(int(time.time() * 1000), self._last_ts + 1)
+        return self._last_ts
+
+    def _emit(self, event: dict[str, Any]) -> None:
+        self.stats["events"] += 1
+        if self.on_event is None:
+            return
+        try:
+            result = self.on_event(event)
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._event_tasks.add(task)
+                task.add_done_callback(self._event_tasks.discard)
+        except Exception as e:
+            logging.warning(f"Paper event handler failed: {e}")
+
+    def _emit_order(
+        self,
+        order: dict[str, Any],
+        exec_type: str,
+        last_qty: float = 0.0,
+        last_price: float = 0.0,
+        realized: float = 0.0,
+        fee: float = 0.0,
+        maker: bool = False,
+    ) -> None:
+        ts = self._now()
+        info = order["info"]
+        self._emit(
+            {
+                "e": "ORDER_TRADE_UPDATE",
+                "E": ts,
+                "T": ts,
+                "o": {
+                    "s": self.market_id(order["symbol"]),
+                    "c": order["clientOrderId"],
+                    "S": order["side"].upper(),
+                    "o": order["type"].upper(),
+                    "f": "GTC",
+                    "q": str(order["amount"]),
+                    "p": str(order["price"] or 0),
+                    "ap": str(order["average"] or 0),
+                    "sp": str(order["stopPrice"] or 0),
+                    "x": exec_type,
+                    "X": BINANCE_STATUS.get(order["status"], "NEW"),
+                    "i": int(order["id"]),
+                    "l": str(last_qty),
+                    "z": str(order["filled"]),
+                    "L": str(last_price),
+                    "n": str(fee),
+                    "N": self.quote,
+                    "T": ts,
+                    "m": maker,
+                    "R": order["reduceOnly"],
+                    "wt": info["wt"],
+                    "ot": info["ot"],
+                    "ps": "BOTH",
+                    "cp": info["cp"],
+                    "rp": str(realized),
+                },
+            }
+        )
+
+    def _emit_account(self, symbol: str) -> None:
+        ts = self._now()
+        pos = self.positions.get(symbol) or {"amount": 0.0, "entry": 0.0}
+        self._emit(
+            {
+                "e": "ACCOUNT_UPDATE",
+                "E": ts,
+                "T": ts,
+                "a": {
+                    "m": "ORDER",
+                    "B": [{"a": self.quote, "wb": str(self.wallet), "cw": str(self.wallet), "bc": "0"}],
+                    "P": [
+                        {
+                            "s": self.market_id(symbol),
+                            "pa": str(pos["amount"]),
+                            "ep": str(pos["entry"]),
+                            "cr": "0",
+                            "up": str(self._unrealized(symbol)),
+                            "mt": self.margin_mode.get(symbol, "cross"),
+                            "iw": "0",
+                            "ps": "BOTH",
+                        }
+                    ],
+                },
+            }
+        )
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            **self.stats,
+            "wallet": round(self.wallet, 6),
+            "open_orders": sum(1 for o in self.orders.values() if o["status"] == "open"),
+            "positions": {s: dict(p) for s, p in self.positions.items() if p["amount"]},
+        }
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Position snapshot service.
+
+All positions are fetched in one request and kept current from ACCOUNT_UPDATE
+events; per-symbol queries are answered from memory. The REST snapshot is
+refreshed at most once per `max_age_sec`, so position checks cost O(1) REST
+calls per cycle instead of one `fetch_positions([symbol])` per symbol.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+
+def _position_size(pos: dict[str, Any]) -> float:
+    try:
+        return abs(float(pos.get("contracts", pos.get("size", 0)) or 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class PositionSnapshot:
+    """In-memory view of open positions keyed by ccxt symbol."""
+
+    def __init__(self, exchange, max_age_sec: float = 5.0):
+        self.exchange = exchange
+        self.max_age_sec = max_age_sec
+        self.positions: dict[str, dict[str, Any]] = {}
+        self.fetched_at = 0.0  # 0 = no valid snapshot yet
+        self._ws_updated: dict[str, float] = {}
+        self._lock = asyncio.Lock()
+        self.stats = {"rest_refreshes": 0, "ws_updates": 0, "fallbacks": 0}
+
+    def _to_ccxt(self, raw: str) -> str:
+        q = self.exchange.config.resolved_quote_coin
+        if raw.endswith(q):
+            return f"{raw[: -len(q)]}/{q}:{q}"
+        return raw
+
+    @property
+    def is_fresh(self) -> bool:
+        return bool(self.fetched_at) and time.time() - self.fetched_at <= self.max_age_sec
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Fetch all positions in one request. Returns False if the snapshot could not be loaded."""
+        if not force and self.is_fresh:
+            return True
+        async with self._lock:
+            if not force and self.is_fresh:
+                return True
+            started = time.time()
+            try:
+                positions = await self.exchange.fetch_positions_snapshot()
+            except Exception:
+                return False
+
+            fresh: dict[str, dict[str, Any]] = {}
+            for pos in positions or []:
+                symbol = pos.get("symbol")
+                if symbol and _position_size(pos) > 0:
+                    fresh[symbol] = pos
+            # Keep stream updates that are newer than this REST request
+            for symbol, ts in self._ws_updated.items():
+                if ts > started:
+                    if symbol in self.positions:
+                        fresh[symbol] = self.positions[symbol]
+                    else:
+                        fresh.pop(symbol, None)
+            self.positions = fresh
+            self.fetched_at = started
+            self.stats["rest_refreshes"] += 1
+            return True
+
+    async def get(self, symbol: str) -> dict[str, Any] | None:
+        """Open position for symbol (None when flat), from memory when the snapshot is fresh."""
+        if await self.refresh():
+            return self.positions.get(symbol)
+        # Snapshot unavailable: per-symbol REST as before
+        self.stats["fallbacks"] += 1
+        return await self.exchange.get_position(symbol)
+
+    async def get_all(self) -> list[dict[str, Any]]:
+        if await self.refresh():
+            return list(self.positions.values())
+        self.stats["fallbacks"] += 1
+        return await self.exchange.get_all_positions()
+
+    def apply_account_update(self, event: dict[str, Any]) -> None:
+        """Apply ACCOUNT_UPDATE position deltas (`a.P`)."""
+        now = time.time()
+        for p in (event.get("a") or {}).get("P", []) or []:
+            raw = p.get("s")
+            if not raw:
+                continue
+            symbol = self._to_ccxt(raw)
+            try:
+                amount = float(p.get("pa") or 0.0)
+            except (TypeError, ValueError):
+                continue
+            self._ws_updated[symbol] = now
+            self.stats["ws_updates"] += 1
+            if amount == 0:
+                self.positions.pop(symbol, None)
+                continue
+
+            prev = self.positions.get(symbol) or {}
+            entry = float(p.get("ep") or prev.get("entryPrice") or 0.0)
+            self.positions[symbol] = {
+                **prev,
+                "symbol": symbol,
+                "contracts": abs(amount),
+                "side": "long" if amount > 0 else "short",
+                "entryPrice": entry,
+                "markPrice": prev.get("markPrice") or entry,
+                "unrealizedPnl": float(p.get("up") or 0.0),
+                "info": {**(prev.get("info") or {}), "positionAmt": str(amount), "symbol": raw},
+            }
+
+    def invalidate(self) -> None:
+        self.fetched_at = 0.0
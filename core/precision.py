@@ -1,5 +1,6 @@
 import logging
 import math
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
@@ -40,8 +41,12 @@ def extract_binance_filters(market: dict) -> dict:
       - step, minQty, maxQty (LOT_SIZE or MARKET_LOT_SIZE)
       - minNotional (MIN_NOTIONAL or NOTIONAL)
 
-    If filters are absent, all fields are None.
+    If filters are absent, all fields are None. A pre-parsed
+    `core.market_registry.MarketSpec` is accepted too and skips the scan.
     """
+    if hasattr(market, "as_filters"):
+        return market.as_filters()
+
     result = {
         "tick": None,
         "minPrice": None,
@@ -92,6 +97,8 @@ def fallback_from_precision(market: dict) -> tuple[float | None, float | None]:
     tick = 10 ** (-precision['price']) if present
     step = 10 ** (-precision['amount']) if present
     """
+    if hasattr(market, "precision_step"):
+        return market.precision_tick, market.precision_step
     precision = (market or {}).get("precision", {}) or {}
     tick: float | None = None
     step: float | None = None
@@ -109,6 +116,8 @@ def fallback_from_precision(market: dict) -> tuple[float | None, float | None]:
 
 
 def _extract_min_cost_limit(market: dict) -> float | None:
+    if hasattr(market, "min_cost"):
+        return market.min_cost
     try:
         limits = (market or {}).get("limits", {}) or {}
         cost = limits.get("cost", {}) or {}
@@ -120,13 +129,15 @@ def _extract_min_cost_limit(market: dict) -> float | None:
 def normalize(
     price: float | None,
     qty: float,
-    market: dict,
+    market: dict | Any,
     current_price: float | None = None,
     symbol: str | None = None,
     logger: logging.Logger | None = None,
 ) -> tuple[float | None, float, float | None]:
     """Normalize price and quantity according to exchange filters and validate notional.
 
+    `market` is a ccxt market dict or a MarketSpec from the market registry.
+
     Returns (price_norm, qty_norm, minNotional).
 
     Raises PrecisionError on violations or missing current price for market orders.
@@ -156,9 +167,13 @@ def normalize(
     if price is not None and price <= 0:
         raise PrecisionError("price must be > 0 when provided")
 
-    # Normalization (floor to step)
-    price_norm = round_to_step(price, tick) if (price is not None and tick is not None) else price
-    qty_norm = round_to_step(qty, step) if (step is not None) else qty
+    # Normalization (floor to step); registry specs floor on the exact tick/step grid
+    if hasattr(market, "floor_price"):
+        price_norm = market.floor_price(price) if (price is not None and tick is not None) else price
+        qty_norm = market.floor_qty(qty) if (step is not None) else qty
+    else:
+        price_norm = round_to_step(price, tick) if (price is not None and tick is not None) else price
+        qty_norm = round_to_step(qty, step) if (step is not None) else qty
 
     # Determine effective price
     effective_price = price_norm if price_norm is not None else current_price
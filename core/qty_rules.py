@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Dynamic quantity calculation rules"""
 
+from core.market_registry import MarketSpec, rules_for
 from core.precision import normalize
 
 
@@ -18,10 +19,13 @@ async def minimal_trade_qty(exchange, symbol: str, price: float) -> float:
     """
     try:
         markets = await exchange.get_markets()
-        market = markets.get(symbol, {})
+        market = rules_for(exchange, symbol, markets.get(symbol, {}))
 
         # Get minimum notional
-        min_cost = market.get("limits", {}).get("cost", {}).get("min", 5.0)
+        if isinstance(market, MarketSpec):
+            min_cost = market.min_cost or 5.0
+        else:
+            min_cost = market.get("limits", {}).get("cost", {}).get("min", 5.0)
 
         # Calculate rough quantity
         rough_qty = float(min_cost) / float(price)
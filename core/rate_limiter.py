@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Weight-aware token-bucket rate limiter for Binance USDⓈ-M REST.
+
+One limiter is shared by every coroutine in the process (`get_rate_limiter`).
+Requests are charged their documented endpoint weight (and order count for
+order placement) and pass concurrently while the buckets have budget; only
+callers that would overdraw a bucket wait. The buckets are corrected from the
+`X-MBX-USED-WEIGHT-1M` / `X-MBX-ORDER-COUNT-*` response headers, and a 418/429
+pauses everyone until the server's Retry-After.
+
+Requests carry a priority class (critical / normal / background, taken from
+the `request_priority` context variable). Waiters are served from a priority
+queue, lower classes must leave a reserve of the weight budget untouched, and
+background work is shed with `RequestShed` when the budget runs low.
+"""
+
+import asyncio
+import functools
+import heapq
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import parse_qs, urlparse
+
+PRIORITY_CLASSES: tuple[str, ...] = ("critical", "normal", "background")
+_RANK = {name: rank for rank, name in enumerate(PRIORITY_CLASSES)}
+
+# Fraction of the weight budget a class must leave free for the classes above it
+CLASS_RESERVE: dict[str, float] = {"critical": 0.0, "normal": 0.05, "background": 0.25}
+
+# None until a scope is opened; requests outside any scope run as "normal"
+request_priority: ContextVar[str | None] = ContextVar("request_priority", default=None)
+
+
+class RequestShed(Exception):
+    """Background request dropped because the weight budget is low."""
+
+
+@contextmanager
+def priority_scope(priority: str):
+    """Run the enclosed exchange calls under `priority`."""
+    token = request_priority.set(priority)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+def with_priority(priority: str):
+    """Decorator giving an async client method a default priority.
+
+    An enclosing priority_scope wins, so a ticker read on the entry path stays
+    critical while the same read from a scanner runs as background.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            if request_priority.get() is not None:
+                return await fn(*args, **kwargs)
+            with priority_scope(priority):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# (method, path) -> weight; None method matches any. Limit-dependent endpoints are handled below.
+ENDPOINT_WEIGHTS: dict[tuple[str | None, str], int] = {
+    (None, "/fapi/v1/ping"): 1,
+    (None, "/fapi/v1/time"): 1,
+    (None, "/fapi/v1/exchangeInfo"): 1,
+    (None, "/fapi/v1/openInterest"): 1,
+    (None, "/fapi/v1/fundingRate"): 1,
+    ("GET", "/fapi/v1/order"): 1,
+    ("POST", "/fapi/v1/order"): 0,  # 0 on the IP weight limit; counted as an order
+    ("DELETE", "/fapi/v1/order"): 1,
+    ("PUT", "/fapi/v1/order"): 1,
+    ("POST", "/fapi/v1/batchOrders"): 5,
+    ("DELETE", "/fapi/v1/batchOrders"): 1,
+    (None, "/fapi/v1/allOpenOrders"): 1,
+    (None, "/fapi/v1/leverage"): 1,
+    (None, "/fapi/v1/marginType"): 1,
+    (None, "/fapi/v1/symbolConfig"): 5,
+    (None, "/fapi/v1/leverageBracket"): 1,
+    (None, "/fapi/v1/listenKey"): 1,
+    (None, "/fapi/v1/userTrades"): 5,
+    (None, "/fapi/v1/allOrders"): 5,
+    ("GET", "/fapi/v1/algoOrder"): 1,
+    (None, "/fapi/v1/allAlgoOrders"): 5,
+    (None, "/fapi/v1/income"): 30,
+    (None, "/fapi/v2/balance"): 5,
+    (None, "/fapi/v3/balance"): 5,
+    (None, "/fapi/v2/account"): 5,
+    (None, "/fapi/v3/account"): 5,
+    (None, "/fapi/v2/positionRisk"): 5,
+    (None, "/fapi/v3/positionRisk"): 5,
+}
+
+# Endpoints whose weight depends on whether `symbol` is given: (with symbol, without)
+SYMBOL_OPTIONAL_WEIGHTS: dict[str, tuple[int, int]] = {
+    "/fapi/v1/openOrders": (1, 40),
+    "/fapi/v1/openAlgoOrders": (1, 40),
+    "/fapi/v1/ticker/24hr": (1, 40),
+    "/fapi/v1/ticker/price": (1, 2),
+    "/fapi/v2/ticker/price": (1, 2),
+    "/fapi/v1/ticker/bookTicker": (2, 5),
+    "/fapi/v1/premiumIndex": (1, 10),
+}
+
+DEFAULT_WEIGHT = 1
+
+
+def _klines_weight(limit: int) -> int:
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def _depth_weight(limit: int) -> int:
+    if limit <= 50:
+        return 2
+    if limit <= 100:
+        return 5
+    if limit <= 500:
+        return 10
+    return 20
+
+
+def endpoint_cost(method: str, url: str, body: str | None = None) -> tuple[int, int]:
+    """Return (weight, orders) for a REST request."""
+    method = (method or "GET").upper()
+    parsed = urlparse(url)
+    path = parsed.path
+    params = parse_qs(parsed.query)
+    if body and isinstance(body, str) and "=" in body:
+        params.update(parse_qs(body))
+
+    orders = 0
+    if method in ("POST", "PUT") and path == "/fapi/v1/order":
+        orders = 1
+    elif method == "POST" and path == "/fapi/v1/batchOrders":
+        raw = (params.get("batchOrders") or ["[]"])[0]
+        orders = max(1, raw.count("{"))
+
+    limit = int((params.get("limit") or [500])[0] or 500)
+    if path in ("/fapi/v1/klines", "/fapi/v1/continuousKlines", "/fapi/v1/markPriceKlines"):
+        return _klines_weight(limit), orders
+    if path == "/fapi/v1/depth":
+        return _depth_weight(limit), orders
+    if path in SYMBOL_OPTIONAL_WEIGHTS:
+        with_symbol, without = SYMBOL_OPTIONAL_WEIGHTS[path]
+        return (with_symbol if params.get("symbol") else without), orders
+
+    weight = ENDPOINT_WEIGHTS.get((method, path))
+    if weight is None:
+        weight = ENDPOINT_WEIGHTS.get((None, path), DEFAULT_WEIGHT)
+    return weight, orders
+
+
+class TokenBucket:
+    """Continuous-refill bucket: `capacity` tokens per `period` seconds."""
+
+    def __init__(self, capacity: float, period: float):
+        self.capacity = float(capacity)
+        self.period = float(period)
+        self.rate = self.capacity / self.period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        self.refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.tokens -= amount
+
+    def correct(self, used: float, window_changed: bool) -> None:
+        """Apply a server-reported usage: authoritative at a new window, otherwise only tightens."""
+        self.refill()
+        remaining = max(0.0, self.capacity - used)
+        self.tokens = remaining if window_changed else min(self.tokens, remaining)
+
+
+class WeightRateLimiter:
+    """IP weight (1m) and order-count (10s / 1m) buckets with header correction and priority classes."""
+
+    def __init__(
+        self,
+        weight_per_minute: int = 2400,
+        orders_per_10s: int = 300,
+        orders_per_minute: int = 1200,
+        safety: float = 0.9,
+        max_background_wait: float = 2.0,
+    ):
+        self.safety = safety
+        self.weight = TokenBucket(weight_per_minute * safety, 60.0)
+        self.orders_10s = TokenBucket(orders_per_10s * safety, 10.0)
+        self.orders_1m = TokenBucket(orders_per_minute * safety, 60.0)
+        self.max_background_wait = max_background_wait
+        self._blocked_until = 0.0
+        self._header_window: dict[str, int] = {}
+        self._waiters: list[tuple] = []  # heap of (rank, seq, weight, orders, priority, enqueued, future)
+        self._seq = 0
+        self._wakeup: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.stats = {"requests": 0, "waits": 0, "wait_sec": 0.0, "corrections": 0, "bans": 0}
+        self.class_stats: dict[str, dict[str, float]] = {
+            name: {"requests": 0, "delay_sec": 0.0, "max_delay_sec": 0.0, "shed": 0} for name in PRIORITY_CLASSES
+        }
+
+    # ---------- admission ----------
+    def _ready_in(self, weight: int, orders: int, priority: str) -> float:
+        """Seconds until a request of this class fits (0 = now), honouring class reserves."""
+        blocked = self._blocked_until - time.monotonic()
+        if blocked > 0:
+            return blocked
+        reserve = CLASS_RESERVE.get(priority, 0.0) * self.weight.capacity
+        return max(
+            self.weight.wait_time(weight + reserve) if weight or reserve else 0.0,
+            self.orders_10s.wait_time(orders) if orders else 0.0,
+            self.orders_1m.wait_time(orders) if orders else 0.0,
+        )
+
+    def _charge(self, weight: int, orders: int, priority: str, delay: float) -> None:
+        self.weight.take(weight)
+        if orders:
+            self.orders_10s.take(orders)
+            self.orders_1m.take(orders)
+        self.stats["requests"] += 1
+        if delay > 0:
+            self.stats["waits"] += 1
+            self.stats["wait_sec"] += delay
+        cs = self.class_stats[priority]
+        cs["requests"] += 1
+        cs["delay_sec"] += delay
+        cs["max_delay_sec"] = max(cs["max_delay_sec"], delay)
+
+    def _shed(self, priority: str) -> RequestShed:
+        self.class_stats[priority]["shed"] += 1
+        return RequestShed(f"{priority} request shed: weight budget low")
+
+    async def acquire(self, weight: int = DEFAULT_WEIGHT, orders: int = 0, priority: str | None = None) -> None:
+        """Wait until the request fits the budget, then charge it.
+
+        Requests that fit and have no equal-or-higher class queued ahead pass immediately,
+        so concurrent callers are not serialized.
+        """
+        priority = priority if priority in _RANK else request_priority.get()
+        if priority not in _RANK:
+            priority = "normal"
+        rank = _RANK[priority]
+
+        queued_ahead = bool(self._waiters) and self._waiters[0][0] <= rank
+        if not queued_ahead and self._ready_in(weight, orders, priority) <= 0:
+            self._charge(weight, orders, priority, 0.0)
+            return
+        if priority == "background" and self._ready_in(weight, orders, priority) > self.max_background_wait:
+            raise self._shed(priority)
+
+        fut = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        heapq.heappush(self._waiters, (rank, self._seq, weight, orders, priority, time.monotonic(), fut))
+        self._wake()
+        await fut
+
+    def _wake(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # The limiter is process-wide; rebind queue primitives if the event loop changed
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._dispatcher = None
+            self._waiters = [e for e in self._waiters if e[6].get_loop() is loop]
+            heapq.heapify(self._waiters)
+        self._wakeup.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    def _shed_stale_background(self) -> None:
+        now = time.monotonic()
+        kept = []
+        for entry in self._waiters:
+            priority, enqueued, fut = entry[4], entry[5], entry[6]
+            if priority == "background" and not fut.done() and now - enqueued > self.max_background_wait:
+                fut.set_exception(self._shed(priority))
+                continue
+            if not fut.done():
+                kept.append(entry)
+        if len(kept) != len(self._waiters):
+            heapq.heapify(kept)
+            self._waiters = kept
+
+    async def _dispatch(self) -> None:
+        """Serve queued requests highest class first, as budget allows."""
+        while self._waiters:
+            self._shed_stale_background()
+            if not self._waiters:
+                break
+            _, _, weight, orders, priority, enqueued, fut = self._waiters[0]
+            delay = self._ready_in(weight, orders, priority)
+            if delay <= 0:
+                heapq.heappop(self._waiters)
+                self._charge(weight, orders, priority, time.monotonic() - enqueued)
+                fut.set_result(None)
+                continue
+            # Sleep until budget refills or a new (possibly higher-priority) request arrives
+            self._wakeup.clear()
+            timeout = min(delay, self.max_background_wait)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except TimeoutError:
+                pass
+        self._dispatcher = None
+
+    def queue_stats(self) -> dict[str, dict[str, float]]:
+        """Per-class request count, average/max queueing delay (ms), shed count and queue depth."""
+        out = {}
+        for name, cs in self.class_stats.items():
+            n = cs["requests"]
+            out[name] = {
+                "requests": n,
+                "avg_delay_ms": round(cs["delay_sec"] / n * 1000, 2) if n else 0.0,
+                "max_delay_ms": round(cs["max_delay_sec"] * 1000, 2),
+                "shed": cs["shed"],
+                "queued": sum(1 for e in self._waiters if e[4] == name and not e[6].done()),
+            }
+        return out
+
+    def update_from_headers(self, headers) -> None:
+        """Correct buckets from X-MBX-USED-WEIGHT-1M / X-MBX-ORDER-COUNT-10S / -1M."""
+        if not headers:
+            return
+        lowered = {str(k).lower(): v for k, v in dict(headers).items()}
+        for header, bucket, window in (
+            ("x-mbx-used-weight-1m", self.weight, 60),
+            ("x-mbx-order-count-10s", self.orders_10s, 10),
+            ("x-mbx-order-count-1m", self.orders_1m, 60),
+        ):
+            value = lowered.get(header)
+            if value is None:
+                continue
+            try:
+                used = float(value)
+            except (TypeError, ValueError):
+                continue
+            window_id = int(time.time() // window)
+            changed = self._header_window.get(header) not in (None, window_id)
+            self._header_window[header] = window_id
+            bucket.correct(used, changed)
+            self.stats["corrections"] += 1
+
+    def penalize(self, retry_after: float | None) -> None:
+        """418/429: block every caller until Retry-After (default 60s)."""
+        pause = float(retry_after) if retry_after else 60.0
+        self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+        self.weight.tokens = 0.0
+        self.stats["bans"] += 1
+
+
+_shared: WeightRateLimiter | None = None
+
+
+def get_rate_limiter(**kwargs) -> WeightRateLimiter:
+    """Process-wide limiter (created on first use; later kwargs are ignored)."""
+    global _shared
+    if _shared is None:
+        _shared = WeightRateLimiter(**kwargs)
+    return _shared
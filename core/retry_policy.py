@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Retry policies for exchange requests.
+
+Idempotent reads are retried on transport failures with exponential backoff
+and full jitter, and can be hedged: if the reply has not arrived after the
+method's observed p95 latency, a duplicate is sent and whichever answer comes
+first wins. Orders are never blindly resent: a retry is only made when the
+order carries a clientOrderId, and only after looking the order up by that id
+(a timed-out request may still have been accepted). A -1021 timestamp
+rejection was never executed, so it is resent at once after `resync` (the
+server clock service) has corrected the signing clock. Per-method counters
+record attempts, retries, hedges and recoveries.
+"""
+
+import asyncio
+import random
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import ccxt.async_support as ccxt
+
+from core.circuit_breaker import is_health_failure
+from core.server_time import is_clock_rejection
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transport failures only; rate limiting, open breakers and rejections are not retried."""
+    return is_health_failure(exc)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given retry number (1-based)."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class LatencyWindow:
+    """Recent latencies of one method, for the hedge delay."""
+
+    def __init__(self, size: int = 200):
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def add(self, latency: float) -> None:
+        self.samples.append(latency)
+
+    def percentile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RetryPolicy:
+    """Backoff/hedging per method class; orders go through `run_order`."""
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 2.0,
+        hedge_methods: tuple[str, ...] | list[str] = (),
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        order_attempts: int = 2,
+    ):
+        self.attempts = max(1, attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge_methods = set(hedge_methods)
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.order_attempts = max(1, order_attempts)
+        self.latency: dict[str, LatencyWindow] = {}
+        self.stats: dict[str, dict[str, int]] = {}
+        # Awaited before resending a request rejected for its timestamp (core.server_time.ServerClock.resync)
+        self.resync: Callable[[], Awaitable[Any]] | None = None
+
+    def _count(self, method: str, field: str) -> None:
+        st = self.stats.setdefault(
+            method,
+            {"calls": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "recovered": 0, "failures": 0, "clock_retries": 0},
+        )
+        st[field] += 1
+
+    def hedge_delay(self, method: str) -> float | None:
+        """Observed p95 for `method`, or None when it is not hedged or has too few samples."""
+        window = self.latency.get(method)
+        if method not in self.hedge_methods or window is None or len(window.samples) < self.hedge_min_samples:
+            return None
+        return window.percentile(self.hedge_quantile)
+
+    async def _timed(self, method: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await fn()
+        self.latency.setdefault(method, LatencyWindow()).add(loop.time() - started)
+        return result
+
+    async def _attempt(self, method: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        delay = self.hedge_delay(method)
+        if delay is None:
+            return await self._timed(method, fn)
+
+        primary = asyncio.ensure_future(self._timed(method, fn))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        self._count(method, "hedges")
+        hedge = asyncio.ensure_future(self._timed(method, fn))
+        pending = {primary, hedge}
+        error: BaseException | None = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._count(method, "hedge_wins")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def run(self, method: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run an idempotent read with retries (and hedging when enabled for `method`)."""
+        self._count(method, "calls")
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return await self._attempt(method, fn)
+            except Exception as e:
+                if self.resync is not None and is_clock_rejection(e) and attempt < self.attempts:
+                    self._count(method, "clock_retries")
+                    await self.resync()
+                    continue
+                if attempt >= self.attempts or not is_retryable(e):
+                    self._count(method, "failures")
+                    raise
+            self._count(method, "retries")
+            await asyncio.sleep(backoff_delay(attempt, self.base_delay, self.max_delay))
+
+    async def run_order(
+        self,
+        send: Callable[[], Awaitable[Any]],
+        lookup: Callable[[], Awaitable[Any]] | None = None,
+    ) -> Any:
+        """Place an order, retrying only when it can be deduplicated by clientOrderId.
+
+        After a transport failure the outcome is unknown: `lookup` (fetch by
+        clientOrderId) decides between returning the accepted order and resending.
+        Without `lookup` the error is raised as before.
+        """
+        method = "create_order"
+        self._count(method, "calls")
+        for attempt in range(1, self.order_attempts + 1):
+            try:
+                return await send()
+            except Exception as e:
+                if self.resync is not None and is_clock_rejection(e) and attempt < self.order_attempts:
+                    # Rejected for its timestamp, so never placed: resend with the corrected clock
+                    self._count(method, "clock_retries")
+                    await self.resync()
+                    continue
+                duplicate = attempt > 1 and isinstance(e, ccxt.InvalidOrder) and "-4116" in str(e)
+                if not duplicate and (lookup is None or attempt >= self.order_attempts or not is_retryable(e)):
+                    self._count(method, "failures")
+                    raise
+                if duplicate:
+                    # The earlier attempt was accepted after all
+                    self._count(method, "recovered")
+                    return await lookup()
+            await asyncio.sleep(backoff_delay(attempt, self.base_delay, self.max_delay))
+            try:
+                order = await lookup()
+            except ccxt.OrderNotFound:
+                order = None
+            if order:
+                self._count(method, "recovered")
+                return order
+            self._count(method, "retries")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Server time-offset service for request signing.
+
+Binance rejects a signed request with -1021 when its timestamp is ahead of
+the server clock or older than `recvWindow`. `ServerClock` keeps its own
+estimate of the server clock instead of relying on one ccxt time difference
+taken at startup:
+
+  - each sync takes a few `/fapi/v1/time` samples and keeps the one with the
+    lowest round trip; offset = serverTime - midpoint of the round trip
+  - the offset is smoothed (EWMA) and a drift rate is tracked between syncs,
+    so `now_ms()` extrapolates between samples; a jump larger than
+    `step_ms` (host clock stepped by NTP, VM resume) replaces the estimate
+  - `now_ms()` is biased `safety_ms` behind the estimate: a timestamp that is
+    slightly old is accepted, one ahead of the server is not
+  - a -1021 rejection counts and schedules an early resync; callers resend
+    after `resync()` (the rejected request was never accepted)
+
+`snapshot()` reports the offset, drift, last RTT, rejections and the recent
+offset history.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import ccxt.async_support as ccxt
+
+
+def is_clock_rejection(exc: BaseException) -> bool:
+    """-1021: timestamp outside recvWindow / ahead of the server."""
+    return isinstance(exc, ccxt.InvalidNonce) or (isinstance(exc, ccxt.BaseError) and "-1021" in str(exc))
+
+
+class ServerClock:
+    """Smoothed, drift-corrected estimate of the exchange clock (ms)."""
+
+    def __init__(
+        self,
+        fetch_server_time: Callable[[], Awaitable[int]],
+        interval: float = 60.0,
+        samples: int = 3,
+        alpha: float = 0.3,
+        safety_ms: float = 100.0,
+        step_ms: float = 500.0,
+        max_drift: float = 1.0,
+        min_resync_interval: float = 1.0,
+        history: int = 120,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self.fetch_server_time = fetch_server_time
+        self.interval = interval
+        self.samples = max(1, samples)
+        self.alpha = alpha
+        self.safety_ms = safety_ms
+        self.step_ms = step_ms
+        self.max_drift = max_drift  # ms of drift per second (1.0 = 1000 ppm), clamps sample noise
+        self.min_resync_interval = min_resync_interval
+        self.wall_clock = wall_clock
+
+        self.offset_ms: float | None = None  # server - local at `synced_at`
+        self.drift = 0.0  # ms per second
+        self.synced_at: float | None = None  # local wall time (s) of the last accepted sample
+        self.last_rtt_ms: float | None = None
+        self.history: deque[tuple[float, float, float]] = deque(maxlen=history)  # (local s, raw offset, rtt)
+        self.stats = {"syncs": 0, "sync_errors": 0, "steps": 0, "rejections": 0, "resyncs": 0}
+
+        self._wake = asyncio.Event()
+        self._inflight: asyncio.Task | None = None
+        self._task: asyncio.Task | None = None
+
+    # ---------- estimate ----------
+    def offset_at(self, now: float) -> float:
+        if self.offset_ms is None or self.synced_at is None:
+            return 0.0
+        return self.offset_ms + self.drift * (now - self.synced_at)
+
+    def now_ms(self) -> int:
+        """Timestamp for signing: estimated server time, biased slightly into the past."""
+        now = self.wall_clock()
+        return int(now * 1000 + self.offset_at(now) - self.safety_ms)
+
+    async def _sample(self) -> tuple[float, float, float]:
+        sent = self.wall_clock()
+        server_ms = float(await self.fetch_server_time())
+        received = self.wall_clock()
+        midpoint = (sent + received) / 2
+        return midpoint, server_ms - midpoint * 1000, (received - sent) * 1000
+
+    async def sync(self) -> float:
+        """Take `samples` round trips, keep the fastest, fold it into the estimate; returns the offset (ms)."""
+        try:
+            best = None
+            for _ in range(self.samples):
+                sample = await self._sample()
+                if best is None or sample[2] < best[2]:
+                    best = sample
+        except Exception:
+            self.stats["sync_errors"] += 1
+            raise
+        at, raw, rtt = best
+        self.history.append((at, raw, rtt))
+        self.last_rtt_ms = rtt
+        self.stats["syncs"] += 1
+
+        if self.offset_ms is None or abs(raw - self.offset_at(at)) > self.step_ms:
+            if self.offset_ms is not None:
+                self.stats["steps"] += 1
+                logging.warning(f"Server clock offset stepped to {raw:.0f} ms (expected {self.offset_at(at):.0f})")
+            self.offset_ms, self.drift = raw, 0.0
+        else:
+            predicted = self.offset_at(at)
+            elapsed = at - self.synced_at
+            if elapsed > 0:
+                observed = (raw - self.offset_ms) / elapsed
+                self.drift += self.alpha * (observed - self.drift)
+                self.drift = max(-self.max_drift, min(self.max_drift, self.drift))
+            self.offset_ms = predicted + self.alpha * (raw - predicted)
+        self.synced_at = at
+        return self.offset_ms
+
+    # ---------- rejections / background ----------
+    def note_rejection(self) -> None:
+        self.stats["rejections"] += 1
+        self._wake.set()
+
+    async def resync(self) -> None:
+        """Resync now (shared by concurrent callers, at most once per `min_resync_interval`)."""
+        if self._inflight is None or self._inflight.done():
+            if self.synced_at is not None and self.wall_clock() - self.synced_at < self.min_resync_interval:
+                return
+            self.stats["resyncs"] += 1
+            self._inflight = asyncio.ensure_future(self.sync())
+        try:
+            await asyncio.shield(self._inflight)
+        except Exception as e:
+            logging.warning(f"Server time resync failed: {e}")
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with asyncio.timeout(self.interval):  # wait_for can swallow stop()'s cancel when woken
+                    await self._wake.wait()
+            except TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.resync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"Server time sync failed: {e}")
+
+    async def stop(self) -> None:
+        for task in (self._task, self._inflight):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+
+    def snapshot(self) -> dict[str, Any]:
+        now = self.wall_clock()
+        return {
+            "offset_ms": round(self.offset_at(now), 2),
+            "drift_ppm": round(self.drift * 1000, 1),
+            "last_rtt_ms": round(self.last_rtt_ms, 2) if self.last_rtt_ms is not None else None,
+            "age_sec": round(now - self.synced_at, 1) if self.synced_at is not None else None,
+            **self.stats,
+            "history": [(round(t, 3), round(o, 2), round(r, 2)) for t, o, r in list(self.history)[-10:]],
+        }
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Single-flight coalescing for exchange reads.
+
+Concurrent calls with the same (method, key) share one in-flight request and
+its result; a successful result is then served for a short per-method TTL.
+Errors are never cached, so the next caller retries. A caller only joins a
+leader of the same or a more urgent priority class, so a critical read never
+inherits a background leader's queueing delay or RequestShed.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from core.rate_limiter import PRIORITY_CLASSES, request_priority
+
+DEFAULT_TTLS: dict[str, float] = {
+    "get_ticker": 1.0,
+    "get_book_ticker": 1.0,
+    "get_ohlcv": 1.0,
+    "get_markets": 0.0,  # ccxt keeps markets; only coalesce concurrent loads
+    "get_position": 0.5,
+    "get_all_positions": 0.5,
+    "get_open_orders": 0.5,
+    "get_order": 0.5,
+}
+
+
+class SingleFlight:
+    """Per-method TTL cache + in-flight request sharing with hit/coalesce counters."""
+
+    def __init__(self, ttls: dict[str, float] | None = None):
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self._cache: dict[tuple[str, Hashable], tuple[float, Any]] = {}
+        self._inflight: dict[tuple[str, Hashable, int], asyncio.Future] = {}
+        self.stats: dict[str, dict[str, int]] = {}
+
+    def _count(self, method: str, field: str) -> None:
+        st = self.stats.setdefault(method, {"calls": 0, "hits": 0, "coalesced": 0, "fetches": 0})
+        st[field] += 1
+
+    async def do(self, method: str, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a cached/in-flight result for (method, key) or run `fn` once for everyone."""
+        self._count(method, "calls")
+        ck = (method, key)
+        ttl = self.ttls.get(method, 0.0)
+
+        if ttl > 0:
+            cached = self._cache.get(ck)
+            if cached is not None and time.monotonic() - cached[0] <= ttl:
+                self._count(method, "hits")
+                return cached[1]
+
+        priority = request_priority.get()
+        rank = PRIORITY_CLASSES.index(priority if priority in PRIORITY_CLASSES else "normal")
+        fut = self._leader(ck, rank)
+        if fut is not None:
+            self._count(method, "coalesced")
+            try:
+                return await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                if not fut.cancelled():
+                    raise
+                # The leading caller was cancelled, not us: run the request ourselves
+                return await self.do(method, key, fn)
+
+        fk = (*ck, rank)
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[fk] = fut
+        self._count(method, "fetches")
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            if not fut.done():
+                fut.set_exception(e)
+                fut.exception()  # mark retrieved when nobody else is waiting
+            raise
+        else:
+            if not fut.done():
+                fut.set_result(result)
+            if ttl > 0 and result is not None:
+                self._cache[ck] = (time.monotonic(), result)
+            return result
+        finally:
+            if self._inflight.get(fk) is fut:
+                del self._inflight[fk]
+
+    def _leader(self, ck: tuple[str, Hashable], rank: int) -> asyncio.Future | None:
+        """In-flight request for `ck` started at `rank` or a more urgent class, if any."""
+        loop = asyncio.get_running_loop()
+        for r in range(rank + 1):
+            fut = self._inflight.get((*ck, r))
+            if fut is not None and fut.get_loop() is loop:
+                return fut
+        return None
+
+    def invalidate(self, method: str | None = None, key: Hashable | None = None) -> None:
+        """Drop cached results (all, one method, or one method+key)."""
+        if method is None:
+            self._cache.clear()
+            return
+        for ck in [ck for ck in self._cache if ck[0] == method and (key is None or ck[1] == key)]:
+            del self._cache[ck]
@@ -6,7 +6,7 @@ import asyncio
 
 from core.config import TradingConfig
 from core.exchange_client import OptimizedExchangeClient
-from core.symbol_utils import ensure_perp_usdc_format
+from core.symbol_utils import ensure_perp_usdc_format, to_binance_symbol
 from core.unified_logger import UnifiedLogger
 
 
@@ -28,20 +28,43 @@ class SymbolManager:
         self.last_update = 0
         self.cache_duration = 300  # 5 minutes
 
+        # Live all-market ticker ranking (exchange.ticker_table), refreshed continuously
+        self.universe_size = int(getattr(config, "symbol_universe_size", 10) or 10)
+        self.ranking_refresh_sec = float(getattr(config, "symbol_ranking_refresh_sec", 15.0) or 15.0)
+        self.ticker_table_max_age = 10.0
+
         # Symbol rotation index
         self.current_symbol_index = 0
 
+    def _live_ticker_table(self):
+        """Return exchange.ticker_table if it is receiving updates, else None."""
+        table = getattr(self.exchange, "ticker_table", None)
+        try:
+            if table is not None and table.is_fresh(self.ticker_table_max_age):
+                return table
+        except Exception:
+            pass
+        return None
+
     async def get_available_symbols(self) -> list[str]:
-        """Get list of available symbols for trading"""
+        """Get list of available symbols for trading.
+
+        When the all-market ticker table is live, symbols are ranked by 24h quote volume
+        and the ranking is refreshed every `ranking_refresh_sec` at zero REST cost.
+        """
         try:
+            table = self._live_ticker_table()
+            ttl = self.ranking_refresh_sec if table is not None else self.cache_duration
+
             # Check if cache is still valid
-            if self.symbols_cache and (asyncio.get_event_loop().time() - self.last_update) < self.cache_duration:
+            if self.symbols_cache and (asyncio.get_event_loop().time() - self.last_update) < ttl:
                 return self.symbols_cache
 
             # Fetch symbols from exchange
             if self.exchange.is_initialized:
                 markets = await self.exchange.get_markets()
                 selected_symbols: list[str] = []
+                raw_ids: dict[str, str] = {}
 
                 for symbol, market in markets.items():
                     # On testnet use USDT-margined perpetuals; in production use USDC perpetuals
@@ -55,13 +78,29 @@ class SymbolManager:
                         # Normalize only for USDC where needed
                         s = ensure_perp_usdc_format(symbol) if q == "USDC" else symbol
                         selected_symbols.append(s)
+                        try:
+                            raw_ids[str(market.get("id") or to_binance_symbol(s)).upper()] = s
+                        except Exception:
+                            pass
+
+                ranked_live = False
+                if table is not None and raw_ids:
+                    ranked = table.rank(candidates=set(raw_ids), top_n=self.universe_size)
+                    if ranked:
+                        selected_symbols = [raw_ids[r] for r in ranked]
+                        ranked_live = True
 
                 if selected_symbols:
                     # Keep a manageable top slice
-                    self.symbols_cache = selected_symbols[:10]  # Top 10
+                    previous = self.symbols_cache
+                    self.symbols_cache = selected_symbols[: self.universe_size]
                     self.last_update = asyncio.get_event_loop().time()
                     q = self.config.resolved_quote_coin
-                    self.logger.log_event("SYMBOL", "INFO", f"Loaded {len(self.symbols_cache)} {q} symbols")
+                    if self.symbols_cache != previous:
+                        source = "ranked by live 24h volume" if ranked_live else "from markets"
+                        self.logger.log_event(
+                            "SYMBOL", "INFO", f"Loaded {len(self.symbols_cache)} {q} symbols ({source})"
+                        )
                     return self.symbols_cache
 
             # Fallback to default symbols
@@ -93,12 +132,20 @@ class SymbolManager:
         try:
             symbols = await self.get_available_symbols()
             filtered_symbols = []
+            table = self._live_ticker_table()
 
             for symbol in symbols[:20]:  # Check top 20
                 try:
                     # Skip invalid/delisted symbols
                     if any(x in symbol for x in ["TUSD", "BUSD", "QTUM", "NEO", "IOTA", "ONT"]):
                         continue
+
+                    # Live all-market table: no REST ticker needed
+                    if table is not None:
+                        if table.quote_volume(to_binance_symbol(symbol)) >= float(min_volume_usdc):
+                            filtered_symbols.append(symbol)
+                        continue
+
                     ticker = await self.exchange.get_ticker(symbol)
                     if not ticker:
                         continue
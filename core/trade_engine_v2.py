@@ -15,9 +15,11 @@ from __future__ import annotations
 
 from collections import defaultdict
 
+from core.candle_store import CandleStore
 from core.config import TradingConfig
 from core.exchange_client import OptimizedExchangeClient
 from core.order_manager import OrderManager
+from core.rate_limiter import RequestShed
 from core.risk_guard import is_symbol_blocked, is_symbol_recently_traded, update_symbol_last_entry
 from core.symbol_manager import SymbolManager
 from core.unified_logger import UnifiedLogger
@@ -42,6 +44,7 @@ class TradeEngineV2:
         # Core helpers
         self.symbol_manager = SymbolManager(config, exchange, logger)
         self.strategy = ScalpingV1(config, logger)
+        self.candles = CandleStore(exchange)
 
         # State
         self._last_symbols: list[str] = []
@@ -70,6 +73,21 @@ class TradeEngineV2:
             )
             self._last_symbols = symbols
 
+            # Keep local order books for scanned symbols so pre-trade checks avoid REST
+            books = getattr(self.exchange, "order_books", None)
+            if books is not None:
+                try:
+                    await books.track(symbols[:5])
+                except Exception as e:
+                    self.logger.log_event("ENGINE", "DEBUG", f"Order book tracking failed: {e}")
+
+            stats = getattr(self.exchange, "market_stats", None)
+            if stats is not None:
+                stats.track(symbols)
+
+            # Backfill candle gaps for the whole slice concurrently (minimal kline requests)
+            candles = await self.candles.refresh(symbols[:5], timeframe="5m", limit=150)
+
             for symbol in symbols[:5]:  # Limit per cycle
                 if await self.order_manager.has_position(symbol):
                     continue
@@ -82,7 +100,7 @@ class TradeEngineV2:
                     self.logger.log_event("ENGINE", "DEBUG", f"{symbol}: skip due to recent entry cooldown")
                     continue
 
-                direction, breakdown = await self._evaluate_symbol(symbol)
+                direction, breakdown = await self._evaluate_symbol(symbol, candles.get(symbol))
                 if not direction:
                     continue
 
@@ -140,12 +158,19 @@ class TradeEngineV2:
         except Exception as e:
             self.logger.log_event("ENGINE", "ERROR", f"run_cycle error: {e}")
 
-    async def _evaluate_symbol(self, symbol: str) -> tuple[str | None, dict]:
+    async def _evaluate_symbol(self, symbol: str, ohlcv: list | None = None) -> tuple[str | None, dict]:
         """Evaluate a single symbol using ScalpingV1 directly."""
         try:
-            ohlcv = await self.exchange.get_ohlcv(symbol, timeframe="5m", limit=150)
+            if isinstance(ohlcv, RequestShed):
+                return None, {"reason": "shed"}
+            if not isinstance(ohlcv, list):
+                ohlcv = await self.candles.get_candles(symbol, timeframe="5m", limit=150)
             if not ohlcv or len(ohlcv) < 30:
                 return None, {"reason": "no_data"}
+            if not self.candles.is_contiguous(symbol):
+                quality = self.candles.quality.get(symbol, {})
+                self.logger.log_event("ENGINE", "WARNING", f"{symbol}: candle gaps not fillable, skipping ({quality})")
+                return None, {"reason": "candle_gaps"}
 
             # Convert to DataFrame inline to avoid StrategyManager coupling
             import pandas as pd
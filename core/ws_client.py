@@ -13,6 +13,8 @@ from urllib.parse import urljoin
 
 import aiohttp
 
+from core.http_pool import HttpPool, client_session
+
 
 def get_endpoint_prefix(resolved_quote_coin: str) -> str:
     """Get API endpoint prefix based on quote coin.
@@ -107,6 +109,8 @@ async def stream_user_data(
     on_event: Callable[[dict[str, Any]], None],
     ws_reconnect_interval: int = 5,
     ws_heartbeat_interval: int = 30,
+    http_pool: HttpPool | None = None,
+    on_status: Callable[[bool], None] | None = None,
 ) -> None:
     """
     Stream user data from WebSocket.
@@ -117,6 +121,8 @@ async def stream_user_data(
         on_event: Callback function to handle incoming events
         ws_reconnect_interval: Reconnect interval in seconds (default: 5)
         ws_heartbeat_interval: Heartbeat interval in seconds (default: 30)
+        http_pool: Shared connection pool (reconnects reuse its DNS cache / TLS context)
+        on_status: Called with True once connected and False when the connection drops
 
     This function handles:
     - WebSocket connection and reconnection
@@ -130,9 +136,11 @@ async def stream_user_data(
         try:
             logging.info(f"Connecting to WebSocket: {ws_url}/ws/{listen_key[:8]}...")
 
-            async with aiohttp.ClientSession() as session:
+            async with client_session(http_pool) as session:
                 async with session.ws_connect(full_url, heartbeat=ws_heartbeat_interval, autoping=True) as ws:
                     logging.info("WebSocket connected successfully")
+                    if on_status:
+                        on_status(True)
 
                     async for msg in ws:
                         if msg.type == aiohttp.WSMsgType.TEXT:
@@ -161,6 +169,10 @@ async def stream_user_data(
         except Exception as e:
             logging.error(f"Unexpected error in WebSocket stream: {e}")
 
+        finally:
+            if on_status:
+                on_status(False)
+
         # Wait before reconnecting
         logging.info(f"Reconnecting in {ws_reconnect_interval} seconds...")
         await asyncio.sleep(ws_reconnect_interval)
@@ -180,6 +192,8 @@ class UserDataStreamManager:
         ws_reconnect_interval: int = 5,
         ws_heartbeat_interval: int = 30,
         resolved_quote_coin: str = "USDT",
+        http_pool: HttpPool | None = None,
+        on_status: Callable[[bool], None] | None = None,
     ):
         """
         Initialize UserDataStreamManager.
@@ -192,6 +206,8 @@ class UserDataStreamManager:
             ws_reconnect_interval: Reconnect interval
             ws_heartbeat_interval: Heartbeat interval
             resolved_quote_coin: Quote coin (USDT or USDC)
+            http_pool: Shared connection pool; a private session is used without one
+            on_status: Connection status callback (True = connected, False = dropped)
         """
         self.api_base = api_base
         self.ws_url = ws_url
@@ -200,6 +216,8 @@ class UserDataStreamManager:
         self.ws_reconnect_interval = ws_reconnect_interval
         self.ws_heartbeat_interval = ws_heartbeat_interval
         self.resolved_quote_coin = resolved_quote_coin
+        self.http_pool = http_pool
+        self.on_status = on_status
 
         self.listen_key = None
         self.http_session = None
@@ -210,8 +228,8 @@ class UserDataStreamManager:
         """Start the user data stream with automatic keepalive."""
         headers = {"X-MBX-APIKEY": self.api_key}
 
-        # Create HTTP session
-        self.http_session = aiohttp.ClientSession()
+        # Shared pool session when available (never closed here), else a private one
+        self.http_session = self.http_pool.session if self.http_pool else aiohttp.ClientSession()
 
         try:
             # Get listen key
@@ -223,7 +241,13 @@ class UserDataStreamManager:
             # Start streaming
             self.stream_task = asyncio.create_task(
                 stream_user_data(
-                    self.ws_url, self.listen_key, self.on_event, self.ws_reconnect_interval, self.ws_heartbeat_interval
+                    self.ws_url,
+                    self.listen_key,
+                    self.on_event,
+                    self.ws_reconnect_interval,
+                    self.ws_heartbeat_interval,
+                    self.http_pool,
+                    self.on_status,
                 )
             )
 
@@ -316,6 +340,8 @@ class UserDataStreamManager:
                                 self.on_event,
                                 self.ws_reconnect_interval,
                                 self.ws_heartbeat_interval,
+                                self.http_pool,
+                                self.on_status,
                             )
                         )
 
@@ -339,8 +365,8 @@ class UserDataStreamManager:
         if self.stream_task:
             self.stream_task.cancel()
 
-        # Close HTTP session
-        if self.http_session:
+        # Close HTTP session (only our own; the shared pool is closed by its owner)
+        if self.http_session and self.http_pool is None:
             await self.http_session.close()
 
         logging.info("User Data Stream stopped")
@@ -375,13 +401,29 @@ class MarketDataStream:
     """Manager for market data streams (prices)"""
 
     def __init__(
-        self, ws_url: str, symbols: list[str], on_price_update, resolved_quote_coin: str = "USDT", testnet: bool = False
+        self,
+        ws_url: str,
+        symbols: list[str],
+        on_price_update,
+        resolved_quote_coin: str = "USDT",
+        testnet: bool = False,
+        freshness=None,
+        stall_timeout: float = 10.0,
+        max_backoff: float = 5.0,
+        http_pool: HttpPool | None = None,
     ):
         self.symbols = symbols[:10]  # Limit 10
         self.on_price_update = on_price_update
         self.resolved_quote_coin = resolved_quote_coin
         self.testnet = testnet
         self.stream_task = None
+        # Optional core.market_data.FreshnessTracker; mark prices are recorded under feed "mark"
+        self.freshness = freshness
+        # No message for this long means a silent stall: reconnect instead of waiting on heartbeats
+        self.stall_timeout = stall_timeout
+        self.max_backoff = max_backoff
+        self.reconnects = 0
+        self.http_pool = http_pool
 
     def _get_stream_url(self) -> str:
         """Build WebSocket URL"""
@@ -411,33 +453,48 @@ class MarketDataStream:
         self.stream_task = asyncio.create_task(self._stream_loop(url))
         logging.info(f"Market stream started for {len(self.symbols)} symbols")
 
+    def handle_message(self, data: dict) -> None:
+        """Dispatch one combined-stream message."""
+        stream_data = data.get("data", {})
+
+        if stream_data.get("e") == "markPriceUpdate":
+            symbol = stream_data.get("s")
+            price = float(stream_data.get("p", 0))
+
+            if symbol and price:
+                if self.freshness is not None:
+                    self.freshness.mark("mark", symbol, price)
+                # Convert to ccxt format
+                quote = self.resolved_quote_coin
+                base = symbol[: -len(quote)]
+                ccxt_symbol = f"{base}/{quote}:{quote}"
+                self.on_price_update(ccxt_symbol, price)
+
     async def _stream_loop(self, url: str) -> None:
-        """Streaming loop"""
+        """Streaming loop with stall detection and short, capped backoff between reconnects."""
+        backoff = 0.5
         while True:
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.ws_connect(url, heartbeat=30, autoping=True) as ws:
+                async with client_session(self.http_pool) as session:
+                    async with session.ws_connect(
+                        url, heartbeat=30, autoping=True, receive_timeout=self.stall_timeout
+                    ) as ws:
                         async for msg in ws:
                             if msg.type == aiohttp.WSMsgType.TEXT:
-                                data = json.loads(msg.data)
-                                stream_data = data.get("data", {})
-
-                                if stream_data.get("e") == "markPriceUpdate":
-                                    symbol = stream_data.get("s")
-                                    price = float(stream_data.get("p", 0))
-
-                                    if symbol and price:
-                                        # Convert to ccxt format
-                                        quote = self.resolved_quote_coin
-                                        base = symbol[: -len(quote)]
-                                        ccxt_symbol = f"{base}/{quote}:{quote}"
-                                        self.on_price_update(ccxt_symbol, price)
+                                self.handle_message(json.loads(msg.data))
+                                backoff = 0.5
 
                             elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
                                 break
+            except asyncio.CancelledError:
+                raise
+            except TimeoutError:
+                logging.warning(f"Market WS stalled for {self.stall_timeout}s, reconnecting")
             except Exception as e:
                 logging.error(f"Market WS error: {e}")
-            await asyncio.sleep(5)
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
 
     async def stop(self) -> None:
         if self.stream_task:
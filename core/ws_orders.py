@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Order placement over the Binance USDⓈ-M WebSocket API.
+
+One persistent connection to `ws-fapi` carries `order.place`, `order.cancel`
+and `order.modify` requests, so an order costs a frame on an open socket
+instead of an HTTP request. Each request carries an id; replies are matched
+to the waiting caller by that id, so any number of requests can be in flight.
+
+HMAC keys cannot log a session on (`session.logon` needs an Ed25519 key), so
+every request is signed: parameters sorted by name, `apiKey` and `timestamp`
+included. Replies carry the same order payload as REST and are parsed into
+the same ccxt-shaped dict; `rateLimits` are turned into the REST header names
+so the shared limiter can correct its buckets.
+
+The connection reconnects in the background. While it is down `connected` is
+False and callers use REST; requests in flight when it drops fail with a
+NetworkError, which the order retry policy resolves by clientOrderId lookup.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+import aiohttp
+import ccxt.async_support as ccxt
+
+from core.http_pool import HttpPool
+from core.order_transport import binance_error, format_param, order_request, parse_order
+from core.retry_policy import LatencyWindow
+
+WS_API_URL = "wss://ws-fapi.binance.com/ws-fapi/v1"
+WS_API_TESTNET_URL = "wss://testnet.binancefuture.com/ws-fapi/v1"
+
+# WebSocket method -> equivalent REST endpoint (weight / order-count accounting and endpoint class)
+REST_EQUIVALENT = "https://fapi.binance.com"
+WS_METHODS = {
+    "order.place": ("POST", "/fapi/v1/order"),
+    "order.cancel": ("DELETE", "/fapi/v1/order"),
+    "order.modify": ("PUT", "/fapi/v1/order"),
+}
+
+# rateLimits entry (type, interval, intervalNum) -> REST response header
+RATE_LIMIT_HEADERS = {
+    ("REQUEST_WEIGHT", "MINUTE", 1): "x-mbx-used-weight-1m",
+    ("ORDERS", "SECOND", 10): "x-mbx-order-count-10s",
+    ("ORDERS", "MINUTE", 1): "x-mbx-order-count-1m",
+}
+
+
+def ws_api_url(testnet: bool) -> str:
+    return WS_API_TESTNET_URL if testnet else WS_API_URL
+
+
+class WSOrderClient:
+    """Id-correlated order requests over one authenticated WebSocket API connection."""
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        url: str = WS_API_URL,
+        clock: Callable[[], int] | None = None,
+        exceptions: dict[str, type[Exception]] | None = None,
+        recv_window: int = 10000,
+        timeout: float = 5.0,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        http_pool: HttpPool | None = None,
+    ):
+        self.url = url
+        self.api_key = api_key
+        self.clock = clock or (lambda: int(time.time() * 1000))
+        self.exceptions = exceptions or {}
+        self.recv_window = recv_window
+        self.timeout = timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._mac = hmac.new(api_secret.encode(), digestmod=hashlib.sha256)
+        self.http_pool = http_pool
+        self.session: aiohttp.ClientSession | None = None
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._task: asyncio.Task | None = None
+        self._pending: dict[str, asyncio.Future] = {}
+        self.last_response_headers: dict[str, str] = {}
+        self.latency: dict[str, LatencyWindow] = {}
+        self.stats = {"requests": 0, "errors": 0, "connects": 0, "disconnects": 0, "failed_in_flight": 0}
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None and not self._ws.closed
+
+    # ---------- connection ----------
+    async def start(self) -> None:
+        if self.http_pool is not None:
+            self.session = self.http_pool.session
+        elif self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def wait_connected(self, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.connected and loop.time() < deadline:
+            await asyncio.sleep(0.05)
+        return self.connected
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        while True:
+            try:
+                session = self.http_pool.session if self.http_pool else self.session
+                async with session.ws_connect(self.url, autoping=True, max_msg_size=0) as ws:
+                    self._ws = ws
+                    self.stats["connects"] += 1
+                    delay = self.reconnect_delay
+                    logging.info("WebSocket API connected")
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            self._on_message(msg.data)
+                        elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(f"WebSocket API connection error: {e}")
+            finally:
+                if self._ws is not None:
+                    self.stats["disconnects"] += 1
+                self._ws = None
+                self._fail_pending(ccxt.NetworkError("binance WebSocket API disconnected before reply"))
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _fail_pending(self, exc: Exception) -> None:
+        for fut in self._pending.values():
+            if not fut.done():
+                fut.set_exception(exc)
+                self.stats["failed_in_flight"] += 1
+        self._pending.clear()
+
+    def _on_message(self, raw: str) -> None:
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            return
+        headers = {}
+        for limit in data.get("rateLimits") or []:
+            key = (limit.get("rateLimitType"), limit.get("interval"), limit.get("intervalNum"))
+            if key in RATE_LIMIT_HEADERS and limit.get("count") is not None:
+                headers[RATE_LIMIT_HEADERS[key]] = str(limit["count"])
+        if headers:
+            self.last_response_headers = headers
+        fut = self._pending.pop(str(data.get("id")), None)
+        if fut is not None and not fut.done():
+            fut.set_result(data)
+
+    # ---------- requests ----------
+    def sign(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Params with apiKey, timestamp, recvWindow and the signature over the sorted query."""
+        signed = {k: format_param(v) for k, v in params.items()}
+        signed.update(apiKey=self.api_key, timestamp=self.clock(), recvWindow=self.recv_window)
+        mac = self._mac.copy()
+        mac.update("&".join(f"{k}={v}" for k, v in sorted(signed.items())).encode())
+        signed["signature"] = mac.hexdigest()
+        return signed
+
+    async def fetch(self, url: str, method: str = "GET", headers=None, body=None) -> Any:
+        """Send one request frame and wait for its reply.
+
+        Same signature as ccxt's `fetch` so the exchange client's limiter/breaker
+        hook can wrap it: `url` names the equivalent REST endpoint, `body` is the frame.
+        """
+        ws = self._ws
+        if ws is None or ws.closed:
+            raise ccxt.NetworkError("binance WebSocket API not connected")
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[body["id"]] = fut
+        try:
+            await ws.send_str(json.dumps(body))
+            reply = await asyncio.wait_for(fut, self.timeout)
+        except TimeoutError as e:
+            raise ccxt.RequestTimeout(f"binance WebSocket API {body['method']} request timeout") from e
+        except (aiohttp.ClientError, ConnectionError) as e:
+            raise ccxt.NetworkError(f"binance WebSocket API {body['method']} {type(e).__name__} {e}") from e
+        finally:
+            self._pending.pop(body["id"], None)
+
+        status = int(reply.get("status") or 0)
+        if status != 200:
+            self.stats["errors"] += 1
+            error = reply.get("error") or {}
+            raise binance_error(self.exceptions, status, "", json.dumps(error), error)
+        return reply.get("result")
+
+    async def request(self, method: str, params: dict[str, Any]) -> dict[str, Any]:
+        http_method, path = WS_METHODS[method]
+        frame = {"id": uuid.uuid4().hex, "method": method, "params": self.sign(params)}
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self.stats["requests"] += 1
+        result = await self.fetch(f"{REST_EQUIVALENT}{path}", http_method, None, frame)
+        self.latency.setdefault(method, LatencyWindow()).add(loop.time() - started)
+        return result
+
+    # ---------- orders ----------
+    async def create_order(
+        self,
+        market_id: str,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: float | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        data = await self.request("order.place", order_request(market_id, order_type, side, amount, price, params))
+        return parse_order(data, symbol)
+
+    async def cancel_order(self, order_id: str, market_id: str, symbol: str) -> dict[str, Any]:
+        data = await self.request("order.cancel", {"symbol": market_id, "orderId": order_id})
+        return parse_order(data, symbol)
+
+    async def modify_order(
+        self, order_id: str, market_id: str, symbol: str, side: str, amount: float, price: float
+    ) -> dict[str, Any]:
+        """Amend a resting LIMIT order's price/quantity in place (keeps its id)."""
+        params = {"symbol": market_id, "orderId": order_id, "side": side.upper(), "quantity": amount, "price": price}
+        data = await self.request("order.modify", params)
+        return parse_order(data, symbol)
+
+    def snapshot(self) -> dict[str, Any]:
+        out: dict[str, Any] = {"connected": self.connected, **self.stats}
+        for name, window in self.latency.items():
+            p50, p95 = window.percentile(0.5), window.percentile(0.95)
+            out[name] = {
+                "samples": len(window.samples),
+                "p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+            }
+        return out
+
+    async def stop(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self.http_pool is None and self.session and not self.session.closed:
+            await self.session.close()
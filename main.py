@@ -70,7 +70,9 @@ class SimplifiedTradingBot:
         # Get Telegram credentials
         telegram_token, telegram_chat_id = self.config.get_telegram_credentials()
         # Initialize Telegram Bot
-        self.telegram_bot = TelegramBot(telegram_token, telegram_chat_id, self.logger)
+        self.telegram_bot = TelegramBot(
+            telegram_token, telegram_chat_id, self.logger, http_pool=self.exchange.http_pool
+        )
         # Attach Telegram to logger for runtime alerts
         try:
             self.logger.attach_telegram(self.telegram_bot)
@@ -154,6 +156,8 @@ class SimplifiedTradingBot:
                         api_key=self.config.api_key,
                         on_event=lambda e: asyncio.create_task(self.order_manager.handle_ws_event(e)),
                         resolved_quote_coin=self.config.resolved_quote_coin,
+                        http_pool=self.exchange.http_pool,
+                        on_status=self.order_manager.state.attach_stream,
                     )
                     await self.user_stream.start()
                     self.logger.log_event("MAIN", "INFO", "✅ WebSocket connected")
@@ -165,6 +169,105 @@ class SimplifiedTradingBot:
                         self.tasks = []
                     self.tasks.append(asyncio.create_task(self._rest_polling()))
 
+            # Paper trading: the simulator's fills arrive as synthetic user-data events
+            simulator = getattr(self.exchange, "simulator", None)
+            if simulator is not None:
+                simulator.on_event = lambda e: asyncio.create_task(self.order_manager.handle_ws_event(e))
+                self.order_manager.state.attach_stream()
+                self.logger.log_event("MAIN", "INFO", "Paper trading: simulated fills feed the order manager")
+
+            # Per-symbol stream freshness; get_ticker falls back to REST only for stale symbols
+            from core.market_data import FreshnessTracker
+
+            self.market_freshness = FreshnessTracker(
+                budgets={"mark": self.config.mark_price_stale_sec, "ticker": self.config.ticker_stale_sec}
+            )
+            self.exchange.market_freshness = self.market_freshness
+
+            # Mark prices for the core symbols (stall detection + fast reconnect)
+            if self.config.enable_websocket:
+                try:
+                    from core.symbol_utils import default_symbols
+                    from core.ws_client import MarketDataStream
+
+                    self.market_stream = MarketDataStream(
+                        ws_url="",
+                        symbols=default_symbols(self.config.resolved_quote_coin),
+                        on_price_update=lambda symbol, price: None,
+                        resolved_quote_coin=self.config.resolved_quote_coin,
+                        testnet=self.config.testnet,
+                        freshness=self.market_freshness,
+                        max_backoff=float(self.config.ws_reconnect_interval),
+                        http_pool=self.exchange.http_pool,
+                    )
+                    await self.market_stream.start()
+                except Exception as e:
+                    self.logger.log_event("MAIN", "WARNING", f"⚠️ Market data stream failed: {e}")
+
+            # All-market 24h stats for universe ranking (zero REST cost)
+            if self.config.enable_websocket and getattr(self.config, "enable_market_ticker_stream", True):
+                try:
+                    from core.market_ticker import AllMarketTickerStream
+
+                    ticker_ws = "wss://stream.binancefuture.com" if self.config.testnet else "wss://fstream.binance.com"
+                    self.ticker_stream = AllMarketTickerStream(
+                        ws_base=ticker_ws,
+                        reconnect_interval=self.config.ws_reconnect_interval,
+                        http_pool=self.exchange.http_pool,
+                    )
+                    await self.ticker_stream.start()
+                    self.ticker_stream.table.freshness = self.market_freshness
+                    self.exchange.ticker_table = self.ticker_stream.table
+                    self.logger.log_event("MAIN", "INFO", "✅ All-market ticker stream started")
+                except Exception as e:
+                    self.logger.log_event("MAIN", "WARNING", f"⚠️ All-market ticker stream failed: {e}")
+
+            # Local order books from depth diff streams (public data, also useful in dry-run)
+            if self.config.enable_websocket and getattr(self.config, "enable_order_book", True):
+                try:
+                    from core.order_book import OrderBookManager
+
+                    if self.config.testnet:
+                        book_api, book_ws = "https://testnet.binancefuture.com", "wss://stream.binancefuture.com"
+                    else:
+                        book_api, book_ws = "https://fapi.binance.com", "wss://fstream.binance.com"
+
+                    self.order_books = OrderBookManager(
+                        api_base=book_api,
+                        ws_base=book_ws,
+                        resolved_quote_coin=self.config.resolved_quote_coin,
+                        depth_bps=getattr(self.config, "order_book_depth_bps", [5, 10, 25, 50]),
+                        reconnect_interval=self.config.ws_reconnect_interval,
+                        http_pool=self.exchange.http_pool,
+                    )
+                    await self.order_books.start()
+                    self.exchange.order_books = self.order_books
+                    self.logger.log_event("MAIN", "INFO", "✅ Order book stream started")
+                except Exception as e:
+                    self.logger.log_event("MAIN", "WARNING", f"⚠️ Order book stream failed: {e}, using REST ticker")
+
+            # Open interest + funding collector (async, shared session, weight-budgeted)
+            if getattr(self.config, "enable_market_stats", True):
+                try:
+                    from core.market_stats import MarketStatsCollector, set_collector
+
+                    stats_api = (
+                        "https://testnet.binancefuture.com" if self.config.testnet else "https://fapi.binance.com"
+                    )
+                    self.market_stats = MarketStatsCollector(
+                        api_base=stats_api,
+                        poll_interval=self.config.market_stats_poll_sec,
+                        weight_budget=self.config.market_stats_weight_budget,
+                        http_pool=self.exchange.http_pool,
+                        rate_limiter=self.exchange.rate_limiter,
+                    )
+                    await self.market_stats.start()
+                    self.exchange.market_stats = self.market_stats
+                    set_collector(self.market_stats)
+                    self.logger.log_event("MAIN", "INFO", "✅ Market stats collector started")
+                except Exception as e:
+                    self.logger.log_event("MAIN", "WARNING", f"⚠️ Market stats collector failed: {e}")
+
             # Инициализируем tasks если нет
             if not hasattr(self, "tasks"):
                 self.tasks = []
@@ -420,14 +523,14 @@ class SimplifiedTradingBot:
 
             while self.running and not self._stop.is_set():
                 try:
-                    # Health checks
-                    if not await self.exchange.health_check():
-                        self.logger.log_event("MAIN", "WARNING", "⚠️ Exchange health check failed")
-                        await asyncio.sleep(5)
-                        continue
-
-                    # Scan/evaluate/execute cycle
-                    await engine.run_cycle()
+                    # Scan/evaluate/execute cycle; no new entries while an endpoint class is failing,
+                    # but open positions keep being monitored and protected below
+                    if await self.exchange.health_check():
+                        await engine.run_cycle()
+                    else:
+                        self.logger.log_event(
+                            "MAIN", "WARNING", "⚠️ Exchange unhealthy (circuit open), skipping entries"
+                        )
 
                     # Monitor positions
                     await self.order_manager.monitor_positions()
@@ -482,6 +585,7 @@ class SimplifiedTradingBot:
                 "total_pnl": round(total_pnl, 2),
                 "balance": round(balance, 2),
                 "uptime": time.time() - self.start_time,
+                "order_state": self.order_manager.state.snapshot(),
             }
 
             self.logger.log_runtime_status("RUNNING", status)
@@ -617,6 +721,26 @@ class SimplifiedTradingBot:
                     self.logger.log_event("MAIN", "INFO", "Market data stream stopped")
                 except Exception:
                     pass
+            if hasattr(self, "market_freshness"):
+                self.logger.log_event("MAIN", "INFO", f"Market data freshness: {self.market_freshness.stats()}")
+            if hasattr(self, "ticker_stream"):
+                try:
+                    await self.ticker_stream.stop()
+                    self.logger.log_event("MAIN", "INFO", "All-market ticker stream stopped")
+                except Exception:
+                    pass
+            if hasattr(self, "market_stats"):
+                try:
+                    await self.market_stats.stop()
+                    self.logger.log_event("MAIN", "INFO", "Market stats collector stopped")
+                except Exception:
+                    pass
+            if hasattr(self, "order_books"):
+                try:
+                    await self.order_books.stop()
+                    self.logger.log_event("MAIN", "INFO", "Order book stream stopped")
+                except Exception:
+                    pass
 
             # Notify Telegram about shutdown reason (before tearing down Telegram)
             try:
@@ -1,25 +1,49 @@
+import asyncio
 import time
 
 import requests
 
+from core.market_stats import get_collector
+
 _open_interest_cache = {}
 CACHE_TTL = 300  # 5 минут
 
 
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
 def fetch_open_interest(symbol):
     """
     Fetch current open interest for a symbol from Binance USDⓈ-M Futures (fapi).
     USDT/USDC contracts trade on USDⓈ-M (fapi), not COIN-M.
     Symbol must be in format 'BTC/USDC'.
+
+    Inside the bot the value comes from the async MarketStatsCollector cache; the
+    blocking REST request is only used from scripts (never on a running event loop).
     """
-    binance_symbol = symbol.replace("/", "").upper()  # BTC/USDC → BTCUSDC
+    binance_symbol = symbol.split(":")[0].replace("/", "").upper()  # BTC/USDC → BTCUSDC
     now = time.time()
 
+    collector = get_collector()
+    if collector is not None:
+        value = collector.get_open_interest(binance_symbol)
+        if value is not None:
+            return value
+
     if symbol in _open_interest_cache:
         cached_value, last_time = _open_interest_cache[symbol]
         if now - last_time < CACHE_TTL:
             return cached_value
 
+    if _in_event_loop():
+        # Never stall the loop; the collector will fill the cache on its next cycle
+        return 0.0
+
     try:
         response = requests.get(
             "https://fapi.binance.com/fapi/v1/openInterest", params={"symbol": binance_symbol}, timeout=5
@@ -33,3 +57,11 @@ def fetch_open_interest(symbol):
         return open_interest
     except Exception:
         return 0.0
+
+
+def fetch_funding_rate(symbol):
+    """Last funding rate from the MarketStatsCollector cache (None if not collected yet)."""
+    collector = get_collector()
+    if collector is None:
+        return None
+    return collector.get_funding_rate(symbol.split(":")[0].replace("/", "").upper())
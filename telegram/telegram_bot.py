@@ -9,8 +9,10 @@ import time
 from datetime import datetime
 from typing import Any
 
+import aiohttp
 import requests
 
+from core.http_pool import HttpPool
 from core.unified_logger import UnifiedLogger
 
 # All commands are now defined directly in this file
@@ -53,10 +55,12 @@ def escape_markdown_v2(text: str) -> str:
 class TelegramBot:
     """Simple Telegram bot for notifications and basic commands"""
 
-    def __init__(self, token: str, chat_id: str, logger: UnifiedLogger):
+    def __init__(self, token: str, chat_id: str, logger: UnifiedLogger, http_pool: HttpPool | None = None):
         self.token = token
         self.chat_id = chat_id
         self.logger = logger
+        # Shared connection pool; without one, blocking `requests` calls run in worker threads
+        self.http_pool = http_pool
         self.base_url = f"https://api.telegram.org/bot{token}"
         self.running = False
         self.last_update_id = 0
@@ -64,6 +68,19 @@ class TelegramBot:
         self.last_message_time = 0.0
         self.min_message_interval = 0.5  # seconds between messages
 
+    async def _request(
+        self, method: str, url: str, params: dict[str, Any] | None = None, json_body: dict[str, Any] | None = None
+    ) -> tuple[int, Any]:
+        """(status, decoded JSON on 200) via the shared pool when attached, else `requests` in a thread."""
+        if self.http_pool is not None:
+            async with self.http_pool.session.request(
+                method, url, params=params, json=json_body, timeout=aiohttp.ClientTimeout(total=15)
+            ) as resp:
+                return resp.status, (await resp.json(content_type=None) if resp.status == 200 else None)
+        call = requests.get if method == "GET" else requests.post
+        response = await asyncio.to_thread(call, url, params=params, json=json_body, timeout=15)
+        return response.status_code, (response.json() if response.status_code == 200 else None)
+
     def set_order_manager(self, order_manager):
         """
         Set reference to OrderManager for accessing real trading data
@@ -122,11 +139,8 @@ class TelegramBot:
             # Use shorter long-poll to keep shutdown responsive
             params = {"offset": self.last_update_id + 1, "timeout": 10}
 
-            # Run blocking requests in a thread to avoid blocking the event loop
-            response = await asyncio.to_thread(requests.get, url, params=params, timeout=15)
-            if response.status_code == 200:
-                data = response.json()
-
+            status, data = await self._request("GET", url, params=params)
+            if status == 200 and data:
                 if data.get("ok"):
                     updates = data.get("result", [])
 
@@ -447,10 +461,10 @@ class TelegramBot:
             url = f"{self.base_url}/sendMessage"
             data = {"chat_id": self.chat_id, "text": text, "parse_mode": "HTML"}
 
-            response = await asyncio.to_thread(requests.post, url, json=data, timeout=15)
+            status, _ = await self._request("POST", url, json_body=data)
 
-            if response.status_code != 200:
-                self.logger.log_event("TELEGRAM", "ERROR", f"Send failed: {response.status_code}")
+            if status != 200:
+                self.logger.log_event("TELEGRAM", "ERROR", f"Send failed: {status}")
                 return False
 
             self.last_message_time = time.time()
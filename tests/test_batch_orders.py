@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Batch placement: batchOrders chunks, per-order errors, single fallback, one-round-trip protectives."""
+
+import asyncio
+
+import ccxt.async_support as ccxt
+import pytest
+
+
+class RawExchange:
+    def __init__(self, fail_batch=False):
+        self.batches = []
+        self.fail_batch = fail_batch
+
+    async def create_orders(self, orders, params=None):
+        self.batches.append(orders)
+        if self.fail_batch:
+            raise ccxt.RequestTimeout("timeout")
+        out = []
+        for o in orders:
+            if o["amount"] <= 0:
+                out.append(
+                    {"info": {"code": -4003, "msg": "Quantity less than or equal to zero."}, "status": "rejected"}
+                )
+            else:
+                out.append({"id": f"b{len(out)}", "status": "open", "clientOrderId": o["params"]["newClientOrderId"]})
+        return out
+
+    async def close(self):
+        pass
+
+
+def _limit_leg(n, amount=1.0):
+    return {
+        "type": "limit",
+        "side": "sell",
+        "amount": amount,
+        "price": 100.0 + n,
+        "params": {"reduceOnly": True, "newClientOrderId": f"TP{n}"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_chunks_and_per_order_errors(exchange_client):
+    exchange_client.config.dry_run = False
+    raw = RawExchange()
+    exchange_client.exchange = raw
+    singles = []
+
+    async def fake_create_order(symbol, order_type, side, amount, price=None, params=None):
+        singles.append(order_type)
+        return {"id": f"s{len(singles)}", "type": order_type}
+
+    exchange_client.create_order = fake_create_order
+
+    legs = [_limit_leg(n) for n in range(6)] + [_limit_leg(6, amount=0)]
+    sl = {
+        "type": "STOP_MARKET",
+        "side": "sell",
+        "amount": 1.0,
+        "price": None,
+        "params": {"stopPrice": 90.0, "reduceOnly": True},
+    }
+    results = await exchange_client.create_orders_batch("BTC/USDC:USDC", [sl, *legs])
+
+    assert [len(b) for b in raw.batches] == [5, 2]
+    assert singles == ["STOP_MARKET"]  # conditional orders have no batch endpoint
+    assert results[0]["id"] == "s1"
+    assert all(r["status"] == "open" for r in results[1:7])
+    assert isinstance(results[7], ccxt.InvalidOrder) and "-4003" in str(results[7])
+    assert exchange_client.batch_stats["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_single_orders(exchange_client):
+    exchange_client.config.dry_run = False
+    exchange_client.exchange = RawExchange(fail_batch=True)
+    singles = []
+
+    async def fake_create_order(symbol, order_type, side, amount, price=None, params=None):
+        singles.append(params["newClientOrderId"])
+        return {"id": params["newClientOrderId"]}
+
+    exchange_client.create_order = fake_create_order
+
+    results = await exchange_client.create_orders_batch("BTC/USDC:USDC", [_limit_leg(1), _limit_leg(2)])
+    assert sorted(singles) == ["TP1", "TP2"]
+    assert [r["id"] for r in results] == ["TP1", "TP2"]
+    assert exchange_client.batch_stats["fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_protective_legs_go_out_together(order_manager, symbol):
+    om = order_manager
+    om.config.enable_multiple_tp = True
+    om.config.tp_levels_raw = [{"percent": 1.0, "size": 0.5}, {"percent": 2.0, "size": 0.5}]
+
+    async def fake_get_markets():
+        return {
+            symbol: {
+                "info": {
+                    "filters": [
+                        {"filterType": "PRICE_FILTER", "tickSize": "0.1"},
+                        {"filterType": "LOT_SIZE", "stepSize": "0.001"},
+                    ]
+                }
+            }
+        }
+
+    async def fake_get_ticker(_s):
+        return {"last": 100.0}
+
+    in_flight = {"now": 0, "max": 0}
+    created = []
+
+    async def fake_create_order(symbol, order_type, side, amount, price=None, params=None):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        created.append(order_type)
+        return {"id": f"{order_type}_{len(created)}", "status": "open"}
+
+    om.exchange.get_markets = fake_get_markets
+    om.exchange.get_ticker = fake_get_ticker
+    om.exchange.create_order = fake_create_order
+
+    res = await om.place_protective_orders(symbol, "buy", 100.0, 1.0, actual_filled=1.0)
+    assert res["sl_order"]["id"].startswith("STOP")
+    assert len(res["tp_orders"]) == 2
+    assert in_flight["max"] == 3  # SL and both TPs in flight at once
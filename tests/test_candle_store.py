@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Candle store: gap detection from bar timestamps and minimal-call backfill."""
+
+import pytest
+
+from core.candle_store import CandleStore
+
+STEP = 300_000  # 5m
+NOW = 1_700_000_000_000 - 1_700_000_000_000 % STEP + 1_000  # just after a bar open
+
+
+class FakeExchange:
+    """Serves a contiguous kline history; records each (since, limit) request."""
+
+    def __init__(self, first_open=None, missing=(), now=NOW):
+        self.calls = []
+        self.now = now
+        self.first_open = first_open
+        self.missing = set(missing)
+        self.failing = False
+
+    async def get_ohlcv(self, symbol, timeframe="5m", limit=100, since=None, raise_errors=False):
+        self.calls.append((since, limit))
+        if self.failing:
+            raise TimeoutError("klines timed out")
+        out = []
+        for i in range(limit):
+            ts = since + i * STEP
+            if self.now is not None and ts > self.now:
+                break
+            if (self.first_open and ts < self.first_open) or ts in self.missing:
+                continue
+            out.append([ts, 1.0, 1.0, 1.0, 1.0, 1.0])
+        return out
+
+
+def _opens(bars):
+    return [b[0] for b in bars]
+
+
+@pytest.mark.asyncio
+async def test_initial_load_then_tail_only():
+    ex = FakeExchange()
+    store = CandleStore(ex)
+    bars = await store.get_candles("BTC/USDC:USDC", "5m", 100, now_ms=NOW)
+    assert len(bars) == 100 and len(ex.calls) == 1
+    assert all(b - a == STEP for a, b in zip(_opens(bars), _opens(bars)[1:], strict=False))
+
+    # Next cycle two bars later: one request covering only last stored bar + new ones
+    ex.calls.clear()
+    ex.now = NOW + 2 * STEP
+    bars = await store.get_candles("BTC/USDC:USDC", "5m", 100, now_ms=ex.now)
+    assert ex.calls == [(NOW - NOW % STEP, 3)]
+    assert _opens(bars)[-1] == NOW - NOW % STEP + 2 * STEP
+
+
+@pytest.mark.asyncio
+async def test_internal_gap_backfilled_in_one_call():
+    ex = FakeExchange()
+    store = CandleStore(ex)
+    current = NOW - NOW % STEP
+    # Stored history with a hole of 10 bars (e.g. laptop sleep)
+    store.ingest("ETH/USDC:USDC", "5m", [[current - i * STEP, 1, 1, 1, 1, 1] for i in range(60) if not 20 <= i < 30])
+    assert store.find_gaps("ETH/USDC:USDC", "5m") == [(current - 29 * STEP, current - 20 * STEP)]
+
+    bars = await store.get_candles("ETH/USDC:USDC", "5m", 60, now_ms=NOW)
+    assert len(ex.calls) == 1  # gap + tail merged into a single request
+    assert len(bars) == 60 and not store.find_gaps("ETH/USDC:USDC", "5m")
+    q = store.quality["ETH/USDC:USDC"]
+    assert q["gaps_detected"] == 1 and q["bars_backfilled"] == 10 and q["unfilled_gaps"] == 0
+
+
+@pytest.mark.asyncio
+async def test_unfillable_gap_reported_and_not_refetched():
+    current = NOW - NOW % STEP
+    ex = FakeExchange(missing={current - 5 * STEP}, first_open=current - 40 * STEP)
+    store = CandleStore(ex, max_batch=20)
+    bars = await store.get_candles("SOL/USDC:USDC", "5m", 60, now_ms=NOW)
+    assert len(bars) == 40  # listing started 40 bars ago
+    assert not store.is_contiguous("SOL/USDC:USDC")
+    assert len(ex.calls) == 3  # 60 bars chunked by max_batch=20
+
+    ex.calls.clear()
+    await store.get_candles("SOL/USDC:USDC", "5m", 60, now_ms=NOW)
+    assert ex.calls == [(current, 1)]  # only the in-progress bar; known holes are not retried
+
+
+@pytest.mark.asyncio
+async def test_failed_request_is_retried_not_marked_unfillable():
+    current = NOW - NOW % STEP
+    ex = FakeExchange()
+    store = CandleStore(ex)
+    store.ingest("XRP/USDC:USDC", "5m", [[current - i * STEP, 1, 1, 1, 1, 1] for i in range(30) if not 10 <= i < 15])
+
+    ex.failing = True
+    with pytest.raises(TimeoutError):
+        await store.get_candles("XRP/USDC:USDC", "5m", 60, now_ms=NOW)
+    assert store.quality["XRP/USDC:USDC"]["failed_requests"] == 1
+    assert not store._dead_gaps.get(("XRP/USDC:USDC", "5m")) and not store._history_floor
+
+    ex.failing = False
+    bars = await store.get_candles("XRP/USDC:USDC", "5m", 60, now_ms=NOW)
+    assert len(bars) == 60 and store.is_contiguous("XRP/USDC:USDC")
+
+
+@pytest.mark.asyncio
+async def test_refresh_runs_symbols_concurrently():
+    store = CandleStore(FakeExchange(now=None))
+    result = await store.refresh(["A/USDC:USDC", "B/USDC:USDC"], "5m", 30)
+    assert {k: len(v) for k, v in result.items()} == {"A/USDC:USDC": 30, "B/USDC:USDC": 30}
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Cassettes: record real ccxt requests, replay them offline (ordering, errors, headers, misses, latency)."""
+
+import asyncio
+import time
+
+import ccxt.async_support as ccxt
+import pytest
+
+from core.cassette import Cassette, CassetteMiss, request_key
+
+
+class Network:
+    """Stands in for ccxt's HTTP layer: answers /time and openOrders, 400s on a bad symbol."""
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.calls = 0
+
+    async def __call__(self, url, method="GET", headers=None, body=None):
+        self.calls += 1
+        self.owner.last_response_headers = {"x-mbx-used-weight-1m": str(self.calls)}
+        if "/time" in url:
+            return {"serverTime": 1700000000000 + self.calls}
+        if "symbol=NOPE" in url:
+            raise ccxt.BadSymbol('binance {"code":-1121,"msg":"Invalid symbol."}')
+        return [{"orderId": self.calls, "symbol": "BTCUSDT"}]
+
+
+def _exchange():
+    return ccxt.binance({"apiKey": "key", "secret": "secret", "enableRateLimit": False})
+
+
+def test_key_ignores_volatile_params():
+    a = request_key("get", "https://fapi.binance.com/fapi/v1/order?symbol=X&timestamp=1&signature=aa&orderId=5")
+    b = request_key("GET", "https://testnet.binancefuture.com/fapi/v1/order?orderId=5&symbol=X&timestamp=2")
+    assert a == b == "GET /fapi/v1/order?orderId=5&symbol=X"
+    assert request_key("POST", "https://x/o", "side=BUY&newClientOrderId=c1") == "POST /o?side=BUY"
+    frame = {"symbol": "X", "timestamp": 1, "apiKey": "k"}
+    assert request_key("POST", "https://x/o", frame) == "POST /o?apiKey=k&symbol=X"
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_offline(tmp_path):
+    path = tmp_path / "session.jsonl"
+
+    raw = _exchange()
+    recorder = Cassette(path, "record")
+    raw.fetch = recorder.wrap(raw, Network(raw))
+    try:
+        assert await raw.fetch_time() == 1700000000001
+        first = await raw.fapiPrivateGetOpenOrders({"symbol": "BTCUSDT"})
+        second = await raw.fapiPrivateGetOpenOrders({"symbol": "BTCUSDT"})
+        with pytest.raises(ccxt.BadSymbol):
+            await raw.fapiPrivateGetOpenOrders({"symbol": "NOPE"})
+    finally:
+        recorder.close()
+        await raw.close()
+    assert recorder.stats["recorded"] == 4 and first != second
+
+    raw = _exchange()
+    offline = Network(raw)
+    player = Cassette(path, "replay")
+    raw.fetch = player.wrap(raw, offline)
+    try:
+        await asyncio.sleep(0.002)  # new timestamps/signatures still match
+        assert await raw.fetch_time() == 1700000000001
+        assert await raw.fapiPrivateGetOpenOrders({"symbol": "BTCUSDT"}) == first
+        assert await raw.fapiPrivateGetOpenOrders({"symbol": "BTCUSDT"}) == second
+        assert raw.last_response_headers == {"x-mbx-used-weight-1m": "3"}
+        assert await raw.fapiPrivateGetOpenOrders({"symbol": "BTCUSDT"}) == second  # last answer repeats
+        with pytest.raises(ccxt.BadSymbol):
+            await raw.fapiPrivateGetOpenOrders({"symbol": "NOPE"})
+        with pytest.raises(CassetteMiss):
+            await raw.fapiPrivateGetOpenOrders({"symbol": "ETHUSDT"})
+    finally:
+        await raw.close()
+    assert offline.calls == 0
+    assert player.snapshot()["replayed"] == 4 and player.stats["repeated"] == 1 and player.stats["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_latency_and_client_wiring(tmp_path, exchange_client):
+    path = tmp_path / "slow.jsonl"
+    path.write_text(
+        '{"key":"GET /fapi/v1/time","response":{"serverTime":1},"elapsed":0.05,"headers":{"x-mbx-used-weight-1m":"7"}}\n'
+    )
+
+    class RawExchange:
+        last_response_headers = {}
+
+        async def fetch(self, url, method="GET", headers=None, body=None):
+            raise AssertionError("network used during replay")
+
+        async def close(self):
+            pass
+
+    exchange_client.config.cassette_mode = "replay"
+    exchange_client.config.cassette_path = str(path)
+    exchange_client.config.cassette_latency_scale = 1.0
+    exchange_client.exchange = RawExchange()
+    exchange_client._install_cassette()
+    exchange_client._install_rate_limiter()
+
+    started = time.monotonic()
+    assert await exchange_client.exchange.fetch("https://fapi.binance.com/fapi/v1/time") == {"serverTime": 1}
+    assert time.monotonic() - started >= 0.045
+    assert exchange_client.request_stats()["cassette"]["replayed"] == 1
+    assert exchange_client.rate_limiter.stats["corrections"] == 1  # recorded headers feed the limiter
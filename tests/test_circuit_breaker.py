@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Passive health tracking: endpoint classes, breaker transitions, probing only while open."""
+
+import asyncio
+
+import ccxt.async_support as ccxt
+import pytest
+
+from core.circuit_breaker import CircuitBreaker, CircuitOpen, HealthMonitor, endpoint_class, is_health_failure
+from core.rate_limiter import RequestShed, WeightRateLimiter, priority_scope
+
+BASE = "https://fapi.binance.com"
+
+
+def test_endpoint_classes_and_failure_kinds():
+    assert endpoint_class("GET", f"{BASE}/fapi/v1/klines?symbol=BTCUSDC") == "market"
+    assert endpoint_class("GET", f"{BASE}/fapi/v2/positionRisk?timestamp=1&signature=ab") == "account"
+    assert endpoint_class("POST", f"{BASE}/fapi/v1/order", "symbol=BTCUSDC&signature=ab") == "order"
+    assert endpoint_class("DELETE", f"{BASE}/fapi/v1/algoOrder?algoId=1&signature=ab") == "order"
+    assert endpoint_class("GET", f"{BASE}/fapi/v1/openOrders?signature=ab") == "account"
+    assert endpoint_class("GET", f"{BASE}/fapi/v1/openAlgoOrders?signature=ab") == "account"
+    assert endpoint_class("GET", f"{BASE}/fapi/v1/allOrders?symbol=BTCUSDC&signature=ab") == "account"
+
+    assert is_health_failure(ccxt.RequestTimeout("timeout"))
+    assert is_health_failure(ccxt.ExchangeNotAvailable("503"))
+    assert not is_health_failure(ccxt.InvalidOrder("-2010"))
+    assert not is_health_failure(ccxt.RateLimitExceeded("429"))
+    assert not is_health_failure(ccxt.InvalidNonce("-1021 Timestamp for this request is outside of the recvWindow"))
+
+
+def test_breaker_opens_on_streak_and_half_open_trial():
+    breaker = CircuitBreaker("market", consecutive_failures=3, min_requests=10)
+    for _ in range(2):
+        assert breaker.record(False, 0.1) is None
+    assert breaker.record(False, 0.1) == "open"
+    assert not breaker.allow()
+
+    assert breaker.probe_succeeded() == "half_open"
+    assert breaker.allow()  # one trial
+    assert not breaker.allow()
+    assert breaker.record(False, 0.1) == "open"
+
+    breaker.probe_succeeded()
+    assert breaker.allow()
+    assert breaker.record(True, 0.1) == "closed"
+    assert breaker.allow()
+
+
+def test_breaker_error_rate_and_slow_calls():
+    breaker = CircuitBreaker("order", min_requests=4, error_rate=0.5, consecutive_failures=99, slow_call_sec=1.0)
+    breaker.record(True, 0.1)
+    breaker.record(True, 2.0)  # slow
+    breaker.record(True, 0.1)
+    assert breaker.state == "closed"
+    assert breaker.record(False, 0.1) == "open"
+    assert breaker.snapshot()["slow"] == 1
+
+
+@pytest.mark.asyncio
+async def test_probe_runs_only_while_open_and_recovers():
+    probes = []
+
+    async def probe():
+        probes.append(1)
+
+    changes = []
+    monitor = HealthMonitor(
+        probe=probe, probe_interval=0.01, on_change=lambda c, s: changes.append((c, s)), consecutive_failures=1
+    )
+    await asyncio.sleep(0.03)
+    assert probes == []
+
+    monitor.record("account", False, 0.1)
+    assert not monitor.healthy
+    with pytest.raises(CircuitOpen):
+        monitor.check("account")
+    monitor.check("account", critical=True)  # protective orders still go out
+
+    await asyncio.sleep(0.05)
+    assert len(probes) >= 1 and monitor.breakers["account"].state == "half_open"
+    assert not monitor.healthy and monitor.open_classes() == ["account"]  # no trial has succeeded yet
+    monitor.check("account")
+    monitor.release("account")  # trial shed before it was sent
+    monitor.check("account")  # the next request takes the trial
+    monitor.record("account", True, 0.1)
+    assert monitor.healthy
+    assert changes == [("account", "open"), ("account", "half_open"), ("account", "closed")]
+    await asyncio.sleep(0.03)
+    probed = len(probes)
+    await asyncio.sleep(0.03)
+    assert len(probes) == probed  # probing stops once every class is closed
+    monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_client_hook_feeds_health_and_fails_fast(exchange_client):
+    class RawExchange:
+        last_response_headers = {}
+        calls = 0
+        down = True
+
+        async def fetch(self, url, method="GET", headers=None, body=None):
+            self.calls += 1
+            if self.down:
+                raise ccxt.RequestTimeout("timed out")
+            return {"serverTime": 1}
+
+        async def fetch_time(self):
+            return await self.fetch(f"{BASE}/fapi/v1/time")
+
+        async def close(self):
+            pass
+
+    raw = RawExchange()
+    exchange_client.rate_limiter = WeightRateLimiter(weight_per_minute=2400, safety=1.0)
+    exchange_client.exchange = raw
+    exchange_client.health.probe_interval = 0.01
+    exchange_client._install_rate_limiter()
+
+    for _ in range(3):
+        with pytest.raises(ccxt.RequestTimeout):
+            await raw.fetch(f"{BASE}/fapi/v1/ticker/price?symbol=BTCUSDC")
+    assert not await exchange_client.health_check()
+
+    calls = raw.calls
+    with pytest.raises(CircuitOpen):
+        await raw.fetch(f"{BASE}/fapi/v1/ticker/price?symbol=BTCUSDC")
+    assert raw.calls == calls  # no request sent, no weight spent
+
+    raw.down = False
+    await asyncio.sleep(0.05)
+    assert await exchange_client.health_check()  # the /fapi/v1/time probe itself was the trial
+    with priority_scope("normal"):
+        assert await raw.fetch(f"{BASE}/fapi/v1/ticker/price?symbol=BTCUSDC") == {"serverTime": 1}
+
+    # A half-open trial shed by the limiter before it is sent must not lock the class
+    breaker = exchange_client.health.breakers["market"]
+    breaker._set("open")
+    breaker.probe_succeeded()
+    assert not await exchange_client.health_check()  # half-open until a trial succeeds
+    limiter = exchange_client.rate_limiter
+    limiter.max_background_wait = 0.0
+    limiter.weight.tokens = 0.0
+    with pytest.raises(RequestShed), priority_scope("background"):
+        await raw.fetch(f"{BASE}/fapi/v1/ticker/price?symbol=BTCUSDC")
+    limiter.weight.tokens = limiter.weight.capacity
+    with priority_scope("normal"):
+        assert await raw.fetch(f"{BASE}/fapi/v1/ticker/price?symbol=BTCUSDC") == {"serverTime": 1}
+    assert await exchange_client.health_check()
+    exchange_client.health.stop()
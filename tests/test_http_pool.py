@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Shared connection pool: keep-alive reuse across components, WebSocket sockets, ownership on close."""
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import WSMsgType, web
+
+from core.http_pool import HttpPool, client_session
+from core.market_stats import MarketStatsCollector
+from core.order_transport import OrderTransport
+
+
+async def _order(request: web.Request) -> web.Response:
+    return web.json_response({"orderId": 1, "symbol": "BTCUSDT", "status": "NEW", "origQty": "1", "side": "BUY"})
+
+
+async def _ws(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    async for msg in ws:
+        if msg.type == WSMsgType.TEXT:
+            await ws.send_str(msg.data)
+    return ws
+
+
+@pytest_asyncio.fixture
+async def base_url():
+    app = web.Application()
+    app.router.add_route("*", "/fapi/v1/order", _order)
+    app.router.add_get("/fapi/v1/premiumIndex", lambda r: web.json_response([]))
+    app.router.add_get("/ws", _ws)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    yield f"http://127.0.0.1:{runner.addresses[0][1]}"
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_components_share_keep_alive_connections(base_url):
+    pool = HttpPool()
+    transport = OrderTransport("key", "secret", base_url=f"{base_url}/fapi/v1", http_pool=pool)
+    stats = MarketStatsCollector(base_url, http_pool=pool)
+    try:
+        for _ in range(5):
+            await transport.create_order("BTCUSDT", "BTC/USDT:USDT", "market", "buy", 1)
+        await stats.start()
+        await stats._get("/fapi/v1/premiumIndex")
+        snap = pool.snapshot()
+        assert snap["connections_created"] == 1 and snap["connections_reused"] == 5
+        assert snap["requests"] == 6 and snap["open"] == 1 and snap["idle"] == 1
+        assert snap["per_host"] == {"127.0.0.1": 1} and snap["reuse_ratio"] == 0.833
+
+        await transport.close()
+        await stats.stop()
+        assert not pool.closed  # components never close the shared session
+    finally:
+        await pool.close()
+    assert pool.closed
+
+
+@pytest.mark.asyncio
+async def test_websockets_counted_and_private_fallback(base_url):
+    pool = HttpPool()
+    try:
+        async with client_session(pool) as session:
+            async with session.ws_connect(f"{base_url}/ws") as ws:
+                await ws.send_str("ping")
+                assert (await ws.receive()).data == "ping"
+                assert pool.snapshot()["in_use"] == 1
+        assert session is pool.session and not session.closed
+
+        async with client_session(None) as private:
+            assert private is not pool.session
+        assert private.closed
+    finally:
+        await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_exchange_client_owns_the_pool(exchange_client):
+    session = exchange_client.http_pool.session
+    assert isinstance(session, aiohttp.ClientSession)
+    assert exchange_client.request_stats()["http_pool"]["open"] == 0
+    await exchange_client.close()
+    assert session.closed
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Leverage/margin cache: bulk load, change-only updates, concurrent warm-up, config events."""
+
+import asyncio
+
+import ccxt.async_support as ccxt
+import pytest
+
+from core.leverage_cache import LeverageCache
+
+
+class RawExchange:
+    def __init__(self):
+        self.sent = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch_leverages(self, symbols=None):
+        return {
+            "BTC/USDC:USDC": {"symbol": "BTC/USDC:USDC", "marginMode": "cross", "longLeverage": 5},
+            "ETH/USDC:USDC": {"symbol": "ETH/USDC:USDC", "marginMode": "isolated", "longLeverage": 10},
+        }
+
+    async def _call(self, *args):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.sent.append(args)
+
+    async def set_leverage(self, leverage, symbol):
+        await self._call("leverage", leverage, symbol)
+
+    async def set_margin_mode(self, mode, symbol):
+        if symbol == "XRP/USDC:USDC":
+            raise ccxt.ExchangeError('binance {"code":-4046,"msg":"No need to change margin type."}')
+        await self._call("margin", mode, symbol)
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def cache(exchange_client):
+    exchange_client.exchange = RawExchange()
+    return LeverageCache(exchange_client)
+
+
+@pytest.mark.asyncio
+async def test_bulk_load_then_only_differences_are_sent(cache):
+    assert await cache.load()
+    assert cache.leverage == {"BTC/USDC:USDC": 5, "ETH/USDC:USDC": 10}
+    assert cache.margin_mode["ETH/USDC:USDC"] == "isolated"
+
+    raw = cache.client.exchange
+    assert await cache.ensure("BTC/USDC:USDC", 5, "cross")
+    assert raw.sent == []  # already set: no round trip
+    assert cache.stats["hits"] == 1
+
+    assert await cache.ensure("ETH/USDC:USDC", 5, "isolated")
+    assert raw.sent == [("leverage", 5, "ETH/USDC:USDC")]
+    assert await cache.ensure("ETH/USDC:USDC", 5)
+    assert len(raw.sent) == 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up_is_concurrent_and_tolerates_4046(cache):
+    await cache.load()
+    raw = cache.client.exchange
+    symbols = ["BTC/USDC:USDC", "ETH/USDC:USDC", "SOL/USDC:USDC", "XRP/USDC:USDC", "BNB/USDC:USDC"]
+    results = await cache.ensure_many(symbols, 5, "CROSS")
+
+    assert all(results.values())
+    assert raw.max_in_flight > 1
+    assert ("margin", "cross", "ETH/USDC:USDC") in raw.sent
+    assert not any(s[2] == "BTC/USDC:USDC" for s in raw.sent)
+    assert cache.margin_mode["XRP/USDC:USDC"] == "cross"  # -4046: already cross
+
+
+@pytest.mark.asyncio
+async def test_failure_invalidates_and_config_update_refreshes(cache):
+    await cache.load()
+
+    async def rejected(leverage, symbol):
+        raise ccxt.BadRequest("-4028 Leverage is not valid")
+
+    cache.client.exchange.set_leverage = rejected
+    assert not await cache.ensure("BTC/USDC:USDC", 200)
+    assert "BTC/USDC:USDC" not in cache.leverage
+
+    q = cache.client.config.resolved_quote_coin
+    cache.apply_config_update({"e": "ACCOUNT_CONFIG_UPDATE", "ac": {"s": f"BTC{q}", "l": 20}})
+    assert cache.leverage[f"BTC/{q}:{q}"] == 20
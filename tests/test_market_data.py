@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Market-data freshness: per-feed budgets, degraded accounting, REST fallback only when stale."""
+
+import time
+
+import pytest
+
+from core.market_data import FreshnessTracker
+from core.market_ticker import MarketTickerTable
+from core.order_book import LocalOrderBook, OrderBookManager
+from core.ws_client import MarketDataStream
+
+
+def test_budgets_and_degraded_accounting():
+    fr = FreshnessTracker(budgets={"mark": 2.0})
+    now = time.time()
+    fr.mark("mark", "BTCUSDC", 100.0, ts=now)
+    assert fr.is_fresh("mark", "btcusdc")
+    assert fr.get("mark", "BTCUSDC") == 100.0
+    assert not fr.is_fresh("mark", "ETHUSDC")  # never seen: unknown, not degraded
+
+    fr.mark("mark", "BTCUSDC", 101.0, ts=now - 10)  # last update 10s ago
+    assert fr.get("mark", "BTCUSDC") is None
+    assert fr.stats()["mark"]["degraded_episodes"] == 1
+    assert fr.stats()["mark"]["stale_now"] == 1
+
+    fr.mark("mark", "BTCUSDC", 102.0)  # stream recovers
+    stats = fr.stats()["mark"]
+    assert stats["stale_now"] == 0
+    assert stats["degraded_sec"] == pytest.approx(8.0, abs=0.5)
+
+
+def test_market_stream_records_mark_prices():
+    fr = FreshnessTracker()
+    seen = []
+    stream = MarketDataStream("", ["BTC/USDC:USDC"], lambda s, p: seen.append((s, p)), "USDC", freshness=fr)
+    stream.handle_message({"data": {"e": "markPriceUpdate", "s": "BTCUSDC", "p": "50000.5"}})
+    assert seen == [("BTC/USDC:USDC", 50000.5)]
+    assert fr.get("mark", "BTCUSDC") == pytest.approx(50000.5)
+
+
+@pytest.mark.asyncio
+async def test_get_ticker_serves_stream_and_falls_back_for_stale(exchange_client):
+    rest_calls = []
+
+    class RawExchange:
+        async def fetch_ticker(self, symbol):
+            rest_calls.append(symbol)
+            return {"symbol": symbol, "last": 1.0}
+
+        async def close(self):
+            pass
+
+    fr = FreshnessTracker()
+    table = MarketTickerTable()
+    table.freshness = fr
+    table.update(
+        [{"s": "BTCUSDC", "E": 1, "c": "50000", "o": "49000", "h": "51000", "l": "48000", "v": "10", "q": "5e8"}]
+    )
+    fr.mark("mark", "BTCUSDC", 50001.0)
+
+    exchange_client.exchange = RawExchange()
+    exchange_client.ticker_table = table
+    exchange_client.market_freshness = fr
+
+    live = await exchange_client.get_ticker("BTC/USDC:USDC")
+    assert live["last"] == 50000.0 and live["quoteVolume"] == 5e8
+    assert live["markPrice"] == 50001.0
+    assert rest_calls == []
+
+    # Symbol absent from the stream -> REST, counted as fallback
+    assert (await exchange_client.get_ticker("ETH/USDC:USDC"))["last"] == 1.0
+    assert rest_calls == ["ETH/USDC:USDC"]
+    assert fr.stats()["ticker"]["rest_fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_streamed_ticker_quotes_from_book_or_book_ticker(exchange_client):
+    quote_calls = []
+
+    class RawExchange:
+        async def fetch_bids_asks(self, symbols):
+            quote_calls.append(symbols)
+            return {s: {"symbol": s, "bid": 2999.0, "ask": 3001.0} for s in symbols}
+
+        async def close(self):
+            pass
+
+    fr = FreshnessTracker()
+    table = MarketTickerTable()
+    table.freshness = fr
+    table.update(
+        [
+            {"s": "BTCUSDC", "E": 1, "c": "50000", "o": "40000", "h": "51000", "l": "39000", "v": "10", "q": "5e8"},
+            {"s": "ETHUSDC", "E": 1, "c": "3000", "o": "3000", "h": "3100", "l": "2900", "v": "10", "q": "3e7"},
+        ]
+    )
+    book = LocalOrderBook("BTC/USDC:USDC")
+    book.apply_snapshot({"lastUpdateId": 1, "bids": [["49999", "1"]], "asks": [["50001", "1"]]})
+    assert book.apply_diff({"U": 1, "u": 2, "pu": 0, "b": [], "a": []})
+    books = OrderBookManager("https://example", "wss://example", "USDC")
+    books.books["BTC/USDC:USDC"] = book
+
+    exchange_client.exchange = RawExchange()
+    exchange_client.ticker_table = table
+    exchange_client.market_freshness = fr
+    exchange_client.order_books = books
+
+    btc = await exchange_client.get_ticker("BTC/USDC:USDC")
+    assert (btc["bid"], btc["ask"]) == (49999.0, 50001.0)
+    assert btc["percentage"] == pytest.approx(25.0)
+
+    # No local book: only callers that need quotes pay for a bookTicker read
+    assert "bid" not in await exchange_client.get_ticker("ETH/USDC:USDC")
+    assert quote_calls == []
+    eth = await exchange_client.get_ticker("ETH/USDC:USDC", with_quotes=True)
+    assert (eth["last"], eth["bid"], eth["ask"]) == (3000.0, 2999.0, 3001.0)
+    assert quote_calls == [["ETH/USDC:USDC"]]
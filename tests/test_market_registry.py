@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Compact market registry: parsed specs, compaction and precision fast path."""
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from core.market_registry import MarketRegistry, MarketSpec, rules_for
+from core.precision import PrecisionError, extract_binance_filters, normalize
+
+
+def _market(base, quote="USDC", contract=True):
+    return {
+        "symbol": f"{base}/{quote}:{quote}",
+        "id": f"{base}{quote}",
+        "quote": quote,
+        "settle": quote,
+        "contract": contract,
+        "active": True,
+        "precision": {"price": 1, "amount": 3},
+        "limits": {"amount": {"min": 0.001}, "cost": {"min": 5}},
+        "info": {
+            "symbol": f"{base}{quote}",
+            "pair": f"{base}{quote}",
+            "contractType": "PERPETUAL",
+            "orderTypes": ["LIMIT", "MARKET"],
+            "filters": [
+                {"filterType": "PRICE_FILTER", "tickSize": "0.10", "minPrice": "1", "maxPrice": "1000000"},
+                {"filterType": "LOT_SIZE", "stepSize": "0.001", "minQty": "0.001", "maxQty": "1000"},
+                {"filterType": "MIN_NOTIONAL", "notional": "20"},
+            ],
+        },
+    }
+
+
+def _markets(*markets):
+    return {m["symbol"]: m for m in markets}
+
+
+def test_build_keeps_quote_contracts_only():
+    registry = MarketRegistry()
+    count = registry.build(_markets(_market("BTC"), _market("ETH", "USDT"), _market("BNB", contract=False)), "USDC")
+    assert count == 1
+    spec = registry.get("BTC/USDC:USDC")
+    assert spec is registry.get("BTCUSDC")
+    assert registry.get("ETH/USDT:USDT") is None
+    assert (spec.tick, spec.step, spec.min_qty, spec.max_qty, spec.min_notional) == (0.1, 0.001, 0.001, 1000, 20)
+    assert (spec.min_cost, spec.min_amount, spec.precision_step) == (5, 0.001, 0.001)
+    assert not hasattr(spec, "__dict__")
+
+
+def test_spec_matches_raw_filters_and_normalize():
+    market = _market("BTC")
+    spec = MarketSpec.from_market(market)
+    assert extract_binance_filters(spec) == extract_binance_filters(market)
+    assert normalize(1000.07, 0.12345, spec) == normalize(1000.07, 0.12345, market)
+    with pytest.raises(PrecisionError, match="MIN_NOTIONAL"):
+        normalize(100.0, 0.1, spec)
+
+
+def test_compact_trims_info_of_indexed_markets():
+    markets = _markets(_market("BTC"), _market("ETH", "USDT"))
+    by_id = {m["id"]: [dict(m, info=dict(m["info"]))] for m in markets.values()}
+    registry = MarketRegistry()
+    registry.build(markets, "USDC")
+
+    assert registry.compact(markets, by_id) == 2
+    btc = markets["BTC/USDC:USDC"]["info"]
+    assert "filters" not in btc and btc["pair"] == "BTCUSDC" and btc["orderTypes"] == ["LIMIT", "MARKET"]
+    assert "filters" not in by_id["BTCUSDC"][0]["info"]
+    # Non-quote markets are left alone; specs still carry the parsed rules
+    assert "filters" in markets["ETH/USDT:USDT"]["info"]
+    assert registry.get("BTC/USDC:USDC").step == 0.001
+
+
+def test_exchange_client_rounding_and_order_manager_helpers(exchange_client, order_manager):
+    exchange_client.config._quote_coin_override = "USDC"
+    exchange_client.exchange = SimpleNamespace(markets=_markets(_market("BTC")))
+
+    assert exchange_client.round_amount("BTC/USDC:USDC", 0.12345) == pytest.approx(0.123)
+    spec = rules_for(exchange_client, "BTC/USDC:USDC")
+    assert isinstance(spec, MarketSpec)
+    assert order_manager._get_tick_size(spec) == 0.1
+    assert order_manager._get_step_size(spec) == 0.001
+    assert order_manager._get_min_qty(spec) == 0.001
+    assert order_manager._get_min_notional(spec) == 20
+
+    # Markets replaced by ccxt (reload): registry follows
+    exchange_client.exchange.markets = _markets(_market("BTC"), _market("SOL"))
+    assert exchange_client.market_spec("SOLUSDC") is not None
+    assert rules_for(exchange_client, "XRP/USDC:USDC", {"id": "raw"}) == {"id": "raw"}
+
+
+def test_integer_tick_grid_is_exact():
+    market = _market("BTC")
+    market["info"]["filters"][0]["tickSize"] = "0.05"
+    spec = MarketSpec.from_market(market)
+    assert spec.tick_d == Decimal("0.05") and spec.step_d == Decimal("0.001")
+
+    # Float division drifts below the grid point (1.001 / 0.001 == 1000.9999999999999)
+    assert spec.qty_steps(1.001) == 1001 and spec.floor_qty(1.001) == 1.001
+    assert spec.price_ticks(4.35) == 87 and spec.floor_price(4.35) == 4.35
+    assert spec.price_ticks(4.36) == 87 and spec.price_ticks(4.36, up=True) == 88
+    assert spec.price_from_ticks(88) == 4.4
+
+    _, qty, _ = normalize(None, 1.001, spec, current_price=100.0)
+    assert qty == 1.001
+
+
+def test_precision_fallback_used_when_filters_missing():
+    market = _market("ETH")
+    market["info"]["filters"] = []
+    spec = MarketSpec.from_market(market)
+    assert spec.tick is None and spec.tick_d == Decimal("0.1")
+    assert spec.floor_qty(0.12345) == 0.123
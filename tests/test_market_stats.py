@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Open interest / funding collector: budgeted concurrent polling and sync cache reads."""
+
+import pytest
+
+import open_interest_tracker
+from core.market_stats import MarketStatsCollector, set_collector
+from core.rate_limiter import WeightRateLimiter
+
+
+def _collector(weight_budget=40):
+    col = MarketStatsCollector("https://example", weight_budget=weight_budget)
+    col.http_session = object()  # _get is patched, session only needs to exist
+    calls = []
+
+    async def fake_get(path, params=None):
+        calls.append((path, (params or {}).get("symbol")))
+        if path == "/fapi/v1/premiumIndex":
+            return [
+                {"symbol": "BTCUSDC", "lastFundingRate": "0.0001", "markPrice": "100", "nextFundingTime": 1},
+                {"symbol": "DOGEUSDT", "lastFundingRate": "0.01", "markPrice": "1", "nextFundingTime": 1},
+            ]
+        return {"symbol": params["symbol"], "openInterest": "1234.5"}
+
+    col._get = fake_get
+    return col, calls
+
+
+@pytest.mark.asyncio
+async def test_collect_once_fills_caches():
+    col, calls = _collector()
+    col.track(["BTC/USDC:USDC", "ETH/USDC:USDC"])
+    await col.collect_once()
+
+    assert col.get_open_interest("BTC/USDC:USDC") == pytest.approx(1234.5)
+    assert col.get_open_interest("ETHUSDC") == pytest.approx(1234.5)
+    assert col.get_funding_rate("BTC/USDC:USDC") == pytest.approx(0.0001)
+    assert col.get_funding_rate("DOGEUSDT") is None  # not tracked
+    # One all-symbol premiumIndex request instead of one per symbol
+    assert sum(1 for p, _ in calls if p == "/fapi/v1/premiumIndex") == 1
+
+
+@pytest.mark.asyncio
+async def test_weight_budget_rotates_universe():
+    col, calls = _collector(weight_budget=12)  # premiumIndex (10) + 2 open interest
+    col.track(["AUSDC", "BUSDC", "CUSDC"])
+    await col.collect_once()
+    await col.collect_once()
+    polled = [s for p, s in calls if p == "/fapi/v1/openInterest"]
+    assert polled == ["AUSDC", "BUSDC", "CUSDC", "AUSDC"]
+
+
+@pytest.mark.asyncio
+async def test_requests_are_charged_to_the_shared_limiter_as_background():
+    class Response:
+        status = 200
+        headers = {"X-MBX-USED-WEIGHT-1M": "11"}
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            pass
+
+        async def json(self):
+            return {"openInterest": "5"}
+
+    class Session:
+        sent = []
+
+        def get(self, url, params=None, timeout=None):
+            self.sent.append(url)
+            return Response()
+
+    limiter = WeightRateLimiter(weight_per_minute=600, safety=1.0, max_background_wait=0.01)
+    col = MarketStatsCollector("https://example", rate_limiter=limiter)
+    col.http_session = Session()
+    col.track(["AUSDC", "BUSDC"])
+    await col.collect_once()
+    assert limiter.class_stats["background"]["requests"] == 3 and limiter.stats["corrections"] == 3
+    assert col.stats["errors"] == 0 and col.stats["weight_used"] == 12
+
+    limiter.weight.tokens = 0.0  # budget spent by trading traffic: the collector gives way
+    Session.sent.clear()
+    await col.collect_once()
+    assert Session.sent == [] and col.stats["shed"] == 3 and col.stats["errors"] == 0
+    assert col.stats["weight_used"] == 12  # shed requests were never sent
+
+
+@pytest.mark.asyncio
+async def test_tracker_reads_collector_without_blocking(monkeypatch):
+    def no_requests(*args, **kwargs):
+        raise AssertionError("blocking requests.get must not run on the event loop")
+
+    monkeypatch.setattr(open_interest_tracker.requests, "get", no_requests)
+    col, _ = _collector()
+    col.track(["BTC/USDC:USDC"])
+    await col.collect_once()
+    set_collector(col)
+    try:
+        assert open_interest_tracker.fetch_open_interest("BTC/USDC:USDC") == pytest.approx(1234.5)
+        assert open_interest_tracker.fetch_funding_rate("BTC/USDC:USDC") == pytest.approx(0.0001)
+        # Unknown symbol: no cache, still no blocking call on the loop
+        assert open_interest_tracker.fetch_open_interest("XRP/USDC:USDC") == 0.0
+    finally:
+        set_collector(None)
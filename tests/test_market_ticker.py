@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""All-market miniTicker table: column storage, ranking and zero-REST consumers."""
+
+import pytest
+
+from core.market_ticker import MarketTickerTable
+from core.symbol_manager import SymbolManager
+from tools.pre_trade_check import check_volume
+
+
+def _batch(**volumes):
+    return [
+        {"e": "24hrMiniTicker", "E": 1, "s": s, "c": "1", "o": "1", "h": "1", "l": "1", "v": "1", "q": str(q)}
+        for s, q in volumes.items()
+    ]
+
+
+def test_table_update_and_rank():
+    table = MarketTickerTable()
+    assert table.update(_batch(BTCUSDC=5e9, ETHUSDC=2e9, XRPUSDT=9e9)) == 3
+    assert len(table) == 3 and table.version == 1
+    assert table.rank() == ["XRPUSDT", "BTCUSDC", "ETHUSDC"]
+    assert table.rank(candidates={"BTCUSDC", "ETHUSDC"}, top_n=1) == ["BTCUSDC"]
+
+    # Updates overwrite rows in place
+    table.update(_batch(ETHUSDC=8e9))
+    assert len(table) == 3 and table.version == 2
+    assert table.rank(candidates={"BTCUSDC", "ETHUSDC"}) == ["ETHUSDC", "BTCUSDC"]
+    assert table.get("ethusdc")["quote_volume"] == pytest.approx(8e9)
+    assert table.quote_volume("UNKNOWN") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_symbol_manager_ranks_from_live_table(exchange_client):
+    config = exchange_client.config
+
+    class Logger:
+        def log_event(self, *args, **kwargs):
+            pass
+
+    markets = {
+        "BTC/USDC:USDC": {"id": "BTCUSDC", "contract": True, "quote": "USDC", "settle": "USDC", "type": "swap"},
+        "ETH/USDC:USDC": {"id": "ETHUSDC", "contract": True, "quote": "USDC", "settle": "USDC", "type": "swap"},
+        "SOL/USDC:USDC": {"id": "SOLUSDC", "contract": True, "quote": "USDC", "settle": "USDC", "type": "swap"},
+    }
+
+    async def get_markets():
+        return markets
+
+    async def get_ticker(symbol):
+        raise AssertionError("REST ticker must not be called when the table is live")
+
+    config.testnet = False
+    config._quote_coin_override = "USDC"
+    exchange_client.is_initialized = True
+    exchange_client.get_markets = get_markets
+    exchange_client.get_ticker = get_ticker
+    exchange_client.ticker_table = MarketTickerTable()
+    exchange_client.ticker_table.update(_batch(BTCUSDC=1e9, ETHUSDC=3e9, SOLUSDC=2e9, XRPUSDT=9e9))
+
+    sm = SymbolManager(config, exchange_client, Logger())
+    assert await sm.get_available_symbols() == ["ETH/USDC:USDC", "SOL/USDC:USDC", "BTC/USDC:USDC"]
+    assert await sm.get_symbols_with_volume_filter(min_volume_usdc=1.5e9) == ["ETH/USDC:USDC", "SOL/USDC:USDC"]
+    assert await check_volume(exchange_client, "BTC/USDC:USDC", size_usdc=10.0, mult=100.0)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Persisted markets snapshot: version stamp, startup from disk, background revalidation."""
+
+import asyncio
+
+import pytest
+
+from core.markets_cache import MarketsSnapshot, filter_quote_markets
+
+
+def _market(base, quote="USDC", contract=True):
+    return {
+        "symbol": f"{base}/{quote}:{quote}",
+        "id": f"{base}{quote}",
+        "quote": quote,
+        "settle": quote,
+        "contract": contract,
+        "active": True,
+        "info": {"status": "TRADING", "filters": [{"filterType": "PRICE_FILTER", "tickSize": "0.1"}]},
+    }
+
+
+class RawExchange:
+    def __init__(self, markets):
+        self.fetched = markets
+        self.markets = {}
+        self.fetch_calls = 0
+
+    async def fetch_markets(self):
+        self.fetch_calls += 1
+        await asyncio.sleep(0)
+        return self.fetched
+
+    def set_markets(self, markets):
+        self.markets = dict(markets)
+
+    async def close(self):
+        pass
+
+
+def test_filter_and_stamp_mismatch(tmp_path):
+    markets = filter_quote_markets([_market("BTC"), _market("ETH", "USDT"), _market("BNB", contract=False)], "USDC")
+    assert list(markets) == ["BTC/USDC:USDC"]
+
+    path = str(tmp_path / "m.json")
+    MarketsSnapshot(path, "USDC", testnet=False, ccxt_version="1").save(markets)
+    assert MarketsSnapshot(path, "USDC", testnet=False, ccxt_version="1").load() == markets
+    assert MarketsSnapshot(path, "USDC", testnet=True, ccxt_version="1").load() is None
+    assert MarketsSnapshot(path, "USDC", testnet=False, ccxt_version="2").load() is None
+    assert MarketsSnapshot(path, "USDC", testnet=False, ccxt_version="1", max_age_sec=-1).load() is None
+
+
+@pytest.mark.asyncio
+async def test_startup_uses_snapshot_then_revalidates(exchange_client, tmp_path):
+    cfg = exchange_client.config
+    cfg.markets_snapshot_path = str(tmp_path / "markets.json")
+    cfg.testnet = False
+    cfg._quote_coin_override = "USDC"
+
+    # Cold start: fetch from exchange and persist
+    exchange_client.exchange = RawExchange([_market("BTC"), _market("ETH", "USDT")])
+    await exchange_client._load_markets()
+    assert exchange_client.exchange.fetch_calls == 1
+    assert list(exchange_client.exchange.markets) == ["BTC/USDC:USDC"]
+
+    # Warm start: markets applied from disk before any request; refresh runs in background
+    exchange_client.markets_snapshot = None
+    exchange_client.exchange = RawExchange([_market("BTC"), _market("SOL")])
+    await exchange_client._load_markets()
+    assert exchange_client.exchange.fetch_calls == 0
+    assert list(exchange_client.exchange.markets) == ["BTC/USDC:USDC"]
+
+    await exchange_client._markets_task
+    assert exchange_client.exchange.fetch_calls == 1
+    assert set(exchange_client.exchange.markets) == {"BTC/USDC:USDC", "SOL/USDC:USDC"}
+    assert set(exchange_client.markets_snapshot.load()) == {"BTC/USDC:USDC", "SOL/USDC:USDC"}
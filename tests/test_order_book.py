@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Local order book: snapshot + diff sequencing, cached metrics, pre-trade reads."""
+
+import pytest
+
+from core.order_book import LocalOrderBook, OrderBookManager
+from tools.pre_trade_check import check_slippage, check_spread
+
+
+def _snapshot():
+    return {
+        "lastUpdateId": 100,
+        "bids": [["99.9", "2"], ["99.8", "5"], ["99.0", "10"]],
+        "asks": [["100.1", "1"], ["100.2", "4"], ["101.0", "10"]],
+    }
+
+
+def _book() -> LocalOrderBook:
+    book = LocalOrderBook("BTC/USDT:USDT", depth_bps=(5, 25))
+    book.apply_snapshot(_snapshot())
+    # First diff straddles lastUpdateId
+    assert book.apply_diff({"U": 95, "u": 105, "pu": 94, "b": [], "a": []})
+    return book
+
+
+def test_snapshot_and_cached_metrics():
+    book = _book()
+    assert book.synced
+    assert book.best_bid == pytest.approx(99.9)
+    assert book.best_ask == pytest.approx(100.1)
+    assert book.mid == pytest.approx(100.0)
+    assert book.spread_pct == pytest.approx(0.2)
+
+    bid_5, ask_5 = book.depth_within_bps(5)  # ±0.05 around mid: nothing resting there
+    assert bid_5 == 0 and ask_5 == 0
+    bid_25, ask_25 = book.depth_within_bps(25)  # ±0.25: two levels per side
+    assert bid_25 == pytest.approx(99.9 * 2 + 99.8 * 5)
+    assert ask_25 == pytest.approx(100.1 * 1 + 100.2 * 4)
+
+
+def test_diff_updates_and_removes_levels():
+    book = _book()
+    assert book.apply_diff({"U": 106, "u": 110, "pu": 105, "b": [["99.9", "0"], ["99.95", "1"]], "a": []})
+    assert book.best_bid == pytest.approx(99.95)
+    assert 99.9 not in [p for p, _ in book.top(10)["bids"]]
+    assert book.last_update_id == 110
+
+
+def test_stale_event_ignored_and_gap_detected():
+    book = _book()
+    # Stale (u < lastUpdateId) is ignored
+    assert book.apply_diff({"U": 90, "u": 99, "pu": 89, "b": [["50", "1"]], "a": []})
+    assert book.best_bid == pytest.approx(99.9)
+    # pu does not match previous u -> gap
+    assert not book.apply_diff({"U": 120, "u": 125, "pu": 119, "b": [], "a": []})
+    assert not book.synced
+
+
+def test_first_diff_must_straddle_snapshot():
+    book = LocalOrderBook("BTC/USDT:USDT")
+    book.apply_snapshot(_snapshot())
+    assert not book.apply_diff({"U": 150, "u": 160, "pu": 149, "b": [], "a": []})
+
+
+def test_slippage_estimate_walks_levels():
+    book = _book()
+    # Buying ~100 quote fits in the best ask level
+    assert book.estimate_slippage_pct("buy", 100.0) == pytest.approx(0.1, rel=1e-3)
+    # More than the visible book cannot be estimated
+    assert book.estimate_slippage_pct("buy", 10_000_000.0) is None
+
+
+def test_manager_gap_schedules_resync(monkeypatch):
+    mgr = OrderBookManager("https://example", "wss://example", "USDT")
+    mgr.books["BTC/USDT:USDT"] = _book()
+    mgr._raw_to_symbol["BTCUSDT"] = "BTC/USDT:USDT"
+    scheduled = []
+    monkeypatch.setattr(mgr, "_schedule_snapshot", lambda s: scheduled.append(s))
+
+    mgr.handle_depth_event({"e": "depthUpdate", "s": "BTCUSDT", "U": 200, "u": 210, "pu": 199, "b": [], "a": []})
+    assert scheduled == ["BTC/USDT:USDT"]
+    assert "BTC/USDT:USDT" in mgr._pending_snapshot
+
+
+@pytest.mark.asyncio
+async def test_pre_trade_reads_book_without_network():
+    class FakeExchange:
+        def __init__(self):
+            self.order_books = OrderBookManager("https://example", "wss://example", "USDT")
+            self.order_books.books["BTC/USDT:USDT"] = _book()
+
+        async def get_ticker(self, symbol):
+            raise AssertionError("REST ticker must not be called when a fresh book exists")
+
+    ex = FakeExchange()
+    assert await check_spread(ex, "BTC/USDT:USDT", max_pct=0.25)
+    assert not await check_spread(ex, "BTC/USDT:USDT", max_pct=0.1)
+    assert check_slippage(ex, "BTC/USDT:USDT", "buy", 100.0, max_pct=0.2)
+    assert not check_slippage(ex, "BTC/USDT:USDT", "buy", 10_000_000.0, max_pct=0.2)
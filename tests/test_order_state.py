@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""Order/position state machine: event ordering, REST reconcile, OrderManager reading it instead of polling."""
+
+import asyncio
+import time
+
+import pytest
+
+from core.market_data import FreshnessTracker
+from core.order_state import OrderStateMachine
+
+
+def _order_event(E, oid, status, filled="0", symbol="BTCUSDT", **extra):
+    o = {"s": symbol, "i": oid, "c": f"c{oid}", "S": "SELL", "ot": "TAKE_PROFIT_MARKET", "X": status, "z": filled}
+    return {"e": "ORDER_TRADE_UPDATE", "E": E, "o": {"q": "2", "R": True, **o, **extra}}
+
+
+def _algo_event(E, aid, status, symbol="BTCUSDT", **extra):
+    o = {"aid": aid, "caid": f"a{aid}", "at": "CONDITIONAL", "o": "TAKE_PROFIT_MARKET", "s": symbol, "S": "SELL"}
+    return {"e": "ALGO_UPDATE", "E": E, "T": E, "o": {"q": "2", "R": True, "X": status, **o, **extra}}
+
+
+def _account_event(E, symbol, amount, entry="100", upnl="0"):
+    return {"e": "ACCOUNT_UPDATE", "E": E, "a": {"P": [{"s": symbol, "pa": amount, "ep": entry, "up": upnl}]}}
+
+
+def test_events_only_move_forward():
+    state = OrderStateMachine()
+    assert state.apply_order_update(_order_event(1, 7, "NEW")).status == "NEW"
+    assert state.apply_order_update(_order_event(3, 7, "PARTIALLY_FILLED", "1")).filled == 1.0
+    assert state.apply_order_update(_order_event(2, 7, "NEW")) is None  # delivered late
+    assert state.apply_order_update(_order_event(4, 7, "FILLED", "2", ap="101.5", rp="3")).status == "FILLED"
+    assert state.apply_order_update(_order_event(5, 7, "CANCELED", "2")) is None  # terminal never changes
+    order = state.order(7)
+    assert (order.status, order.filled, order.avg_price, order.realized_pnl) == ("FILLED", 2.0, 101.5, 3.0)
+    assert state.stats["stale_events"] == 1 and state.stats["invalid_transitions"] == 1
+
+    assert [p.amount for p in state.apply_account_update(_account_event(10, "BTCUSDT", "-2"))] == [-2.0]
+    assert state.apply_account_update(_account_event(9, "BTCUSDT", "0")) == []
+    assert state.position("BTC/USDT:USDT").side == "short"
+    assert state.apply_account_update(_account_event(11, "BTCUSDT", "0"))[0].amount == 0.0
+    assert state.position("BTCUSDT") is None
+
+
+def test_reconcile_keeps_newer_stream_state_and_reports_missed_orders():
+    state = OrderStateMachine()
+    state.apply_order_update(_order_event(1, 1, "NEW"))  # will vanish without an event
+    state.apply_order_update(_order_event(1, 2, "NEW", symbol="ETHUSDT"))  # symbol not covered by REST orders
+    state.apply_account_update(_account_event(1, "SOLUSDT", "5"))  # closed while the stream was away
+    started = time.time()
+    state.apply_account_update(_account_event(2, "BTCUSDT", "1"))  # newer than the REST snapshot
+    state.attach_stream()
+    assert not state.authoritative  # nothing reconciled yet
+
+    rest_positions = [{"symbol": "XRP/USDT:USDT", "contracts": 10, "side": "long", "info": {"positionAmt": "10"}}]
+    rest_orders = [
+        {"id": "9", "symbol": "XRP/USDT:USDT", "status": "open", "amount": 10, "info": {"symbol": "XRPUSDT"}}
+    ]
+    missed = state.reconcile(rest_positions, rest_orders, started, symbols={"BTCUSDT", "XRPUSDT"})
+
+    assert [o.order_id for o in missed] == ["1"]
+    assert state.position("BTCUSDT").amount == 1.0 and state.position("XRPUSDT").amount == 10.0
+    assert state.position("SOLUSDT") is None
+    assert state.order(9).is_open and state.authoritative
+
+    state.apply_rest_order({"id": "1", "status": "closed", "filled": 2, "average": 99.0, "info": {"status": "FILLED"}})
+    assert state.order(1).status == "FILLED" and len(state.open_orders("ETH/USDT:USDT")) == 1
+    state.attach_stream(False)
+    assert not state.authoritative  # events may have been missed: wait for the next reconcile
+
+
+def test_algo_order_follows_the_order_it_triggered():
+    state = OrderStateMachine()
+    assert state.apply_algo_update(_algo_event(1, 77, "NEW")).algo
+    assert state.apply_order_update(_order_event(2, 9001, "NEW")).order_id == "9001"  # link not known yet
+    algo = state.apply_algo_update(_algo_event(3, 77, "TRIGGERED", ai=9001))
+    assert (algo.order_id, algo.status, algo.triggered_id) == ("77", "NEW", "9001")
+
+    filled = state.apply_order_update(_order_event(4, 9001, "FILLED", "2", ap="95", rp="-1"))
+    assert (filled.order_id, filled.status, filled.avg_price, filled.realized_pnl) == ("77", "FILLED", 95.0, -1.0)
+    assert state.apply_algo_update(_algo_event(5, 77, "FINISHED", ai=9001, aq="2", ap="95")) is None
+    assert state.stats["invalid_transitions"] == 0
+
+    # Triggered order never seen: FINISHED with an executed quantity settles the algo order itself
+    assert state.apply_algo_update(_algo_event(6, 78, "FINISHED", ai=9002, aq="2", ap="96")).status == "FILLED"
+    state.apply_algo_update(_algo_event(7, 79, "NEW"))
+    assert state.reconcile([], [], time.time()) == []  # openOrders never lists algo orders
+
+
+@pytest.mark.asyncio
+async def test_order_manager_reacts_to_events_without_polling(order_manager):
+    om = order_manager
+    raw = om.exchange.config.resolved_quote_coin
+    symbol = f"BTC/{raw}:{raw}"
+    om.active_positions[symbol] = {"symbol": symbol, "side": "sell", "size": 2, "entry_price": 100.0}
+    om.tp_orders[symbol] = [{"id": "7"}]
+
+    rest_calls = []
+
+    async def no_rest(*args, **kwargs):
+        rest_calls.append(args)
+
+    cancelled = []
+
+    async def cancel_all_orders(sym):
+        cancelled.append(sym)
+
+    om.exchange.get_order = no_rest
+    om.exchange.fetch_positions_snapshot = no_rest
+    om.cancel_all_orders = cancel_all_orders
+    om.state.attach_stream()
+    om.state.reconcile([{"symbol": symbol, "contracts": 2, "side": "short"}], [], time.time())
+
+    om.active_positions[f"ETH/{raw}:{raw}"] = {"side": "buy", "size": 1, "timestamp": time.time() + 1}
+    await om.monitor_positions()
+    assert f"ETH/{raw}:{raw}" in om.active_positions  # just opened: its ACCOUNT_UPDATE is not here yet
+    om.active_positions.pop(f"ETH/{raw}:{raw}")
+
+    await om.handle_ws_event(_order_event(1, 7, "NEW", symbol=f"BTC{raw}"))
+    await om.handle_ws_event(_account_event(2, f"BTC{raw}", "-2", upnl="-4"))
+    tickers = []
+
+    async def get_ticker(sym):
+        tickers.append(sym)
+        return {"symbol": sym, "last": 103.0}
+
+    om.exchange.get_ticker = get_ticker
+    await om.monitor_positions()  # no streamed mark: the ACCOUNT_UPDATE's may be stale, read the price
+    assert om.active_positions[symbol]["mark_price"] == pytest.approx(103.0)
+    assert om.active_positions[symbol]["unrealized_pnl"] == pytest.approx(-6.0)
+    fr = FreshnessTracker()
+    fr.mark("mark", f"BTC{raw}", 102.0)
+    om.exchange.market_freshness = fr
+    await om.monitor_positions()
+    assert om.active_positions[symbol]["unrealized_pnl"] == pytest.approx(-4.0)
+    assert tickers == [symbol]
+
+    logged = []
+    om.logger.log_event = lambda component, level, message, *a, **k: logged.append(message)
+    await om.handle_ws_event(_order_event(3, 7, "FILLED", "2", symbol=f"BTC{raw}", ap="95"))
+    await om.check_order_executions()
+    await om.handle_ws_event(_order_event(3, 7, "FILLED", "2", symbol=f"BTC{raw}", ap="95", T=1))  # replay
+    assert [m for m in logged if "executed" in m] == [f"Take profit executed: {symbol} @ 95.0"]
+    assert rest_calls == []
+
+    await om.handle_ws_event(_account_event(4, f"BTC{raw}", "0"))
+    assert symbol not in om.active_positions and cancelled == [symbol]  # on the event, not the next poll
+
+    # Live TP/SL are algo orders: the fill arrives under the id of the order placed on trigger
+    om.active_positions[symbol] = {"symbol": symbol, "side": "sell", "size": 2, "entry_price": 100.0}
+    om.sl_orders[symbol] = {"id": "88"}
+    await om.handle_ws_event(_algo_event(5, 88, "NEW", symbol=f"BTC{raw}", o="STOP_MARKET"))
+    await om.handle_ws_event(_algo_event(6, 88, "TRIGGERED", symbol=f"BTC{raw}", ai=9100))
+    await om.handle_ws_event(_order_event(7, 9100, "FILLED", "2", symbol=f"BTC{raw}", ap="104"))
+    await om.handle_ws_event(_algo_event(8, 88, "FINISHED", symbol=f"BTC{raw}", ai=9100, aq="2", ap="104"))
+    assert [m for m in logged if "executed" in m][1:] == [f"Stop loss executed: {symbol} @ 104.0"]
+    assert rest_calls == []
+
+
+@pytest.mark.asyncio
+async def test_settled_ids_are_dropped_with_the_position_orders(order_manager):
+    om = order_manager
+    raw = om.exchange.config.resolved_quote_coin
+    symbol = f"BTC/{raw}:{raw}"
+
+    async def cancel_all_orders(sym):
+        return []
+
+    om.exchange.cancel_all_orders = cancel_all_orders
+    om.tp_orders[symbol] = [{"id": "61"}, {"id": "62"}]
+    om.sl_orders[symbol] = {"id": "63"}
+    await om.handle_ws_event(_algo_event(1, 61, "FINISHED", symbol=f"BTC{raw}", ai=9300, aq="1", ap="110"))
+    assert om._settled_orders == {"61"}
+
+    await om.cancel_all_orders(symbol)
+    await om.handle_ws_event(_algo_event(2, 62, "CANCELED", symbol=f"BTC{raw}"))
+    assert om._settled_orders == set() and symbol not in om.tp_orders
+
+
+@pytest.mark.asyncio
+async def test_triggered_last_tp_fill_activates_trailing(order_manager):
+    om = order_manager
+    raw = om.exchange.config.resolved_quote_coin
+    symbol = f"BTC/{raw}:{raw}"
+    activated = []
+
+    async def activate(sym, pending):
+        activated.append((sym, pending["tp_order_id"]))
+
+    om._activate_trailing = activate
+    om.pending_trailing[f"BTC{raw}"] = {
+        "side": "buy",
+        "activation_price": 110.0,
+        "tp_order_id": "55",
+        "ccxt_symbol": symbol,
+    }
+    await om.handle_ws_event(_algo_event(1, 55, "NEW", symbol=f"BTC{raw}"))
+    await om.handle_ws_event(_algo_event(2, 55, "TRIGGERED", symbol=f"BTC{raw}", ai=9200))
+    await om.handle_ws_event(_order_event(3, 9200, "FILLED", "2", symbol=f"BTC{raw}", ap="110"))
+    assert activated == [(symbol, "55")] and om.pending_trailing[f"BTC{raw}"] is None
+
+    # FINISHED ahead of the triggered order's own events still activates, once
+    om.pending_trailing[f"ETH{raw}"] = {"side": "buy", "activation_price": 9.0, "tp_order_id": "56"}
+    await om.handle_ws_event(_algo_event(4, 56, "FINISHED", symbol=f"ETH{raw}", ai=9201, aq="1", ap="9"))
+    await om.handle_ws_event(_order_event(5, 9201, "FILLED", "1", symbol=f"ETH{raw}", ap="9"))
+    assert activated[1:] == [(f"ETH/{raw}:{raw}", "56")]
+
+
+@pytest.mark.asyncio
+async def test_sync_reconciles_and_looks_up_missed_orders(order_manager):
+    om = order_manager
+    q = om.exchange.config.resolved_quote_coin
+    symbol = f"ETH/{q}:{q}"
+
+    class Exchange:
+        lookups = []
+
+        async def fetch_positions_snapshot(self):
+            return [{"symbol": symbol, "contracts": 1, "side": "long", "info": {"positionAmt": "1"}}]
+
+        async def get_open_orders(self, sym=None):
+            if sym is None:
+                return []
+            return [{"id": "2", "symbol": symbol, "type": "STOP_MARKET", "reduceOnly": True, "status": "open"}]
+
+        async def get_order(self, order_id, sym):
+            self.lookups.append((order_id, sym))
+            return {"id": order_id, "symbol": sym, "status": "closed", "filled": 1, "info": {"status": "FILLED"}}
+
+    om.exchange = Exchange()
+    om.state.apply_order_update(_order_event(1, 1, "NEW", symbol=f"ETH{q}"))  # its FILLED event was lost
+    om.state.attach_stream()
+    await om.sync_with_exchange()
+
+    assert Exchange.lookups == [("1", symbol)]
+    assert om.state.order(1).status == "FILLED" and om.state.order(2).is_open
+    assert om.state.position(symbol).amount == 1.0 and om.state.authoritative
+
+
+@pytest.mark.asyncio
+async def test_fill_poll_only_while_stream_is_down(order_manager):
+    om = order_manager
+    q = om.exchange.config.resolved_quote_coin
+    btc, eth = f"BTC/{q}:{q}", f"ETH/{q}:{q}"
+    for sym, ids in ((btc, ("1", "2", "3")), (eth, ("4", "5", "6"))):
+        om.active_positions[sym] = {"side": "buy", "size": 1}
+        om.tp_orders[sym] = [{"id": ids[0]}, {"id": ids[1]}]
+        om.sl_orders[sym] = {"id": ids[2]}
+
+    class Exchange:
+        calls = []
+
+        async def get_open_algo_orders(self, sym):
+            self.calls.append(("open", sym))
+            return [{"id": i} for i in (("2", "3") if sym == btc else ("5", "6"))]
+
+        async def get_recent_algo_orders(self, sym, limit=20):
+            self.calls.append(("recent", sym))
+            info = {"algoId": 1, "algoStatus": "FINISHED", "actualOrderId": "901", "orderType": "TAKE_PROFIT_MARKET"}
+            return [{"id": "1", "symbol": sym, "status": "closed", "info": info}]
+
+        async def get_order(self, order_id, sym):
+            self.calls.append(("order", order_id))
+            price = 101.0 if sym == btc else 99.0
+            return {"id": order_id, "symbol": sym, "status": "closed", "average": price, "info": {"status": "FILLED"}}
+
+    om.exchange = Exchange()
+    logged = []
+    om.logger.log_event = lambda component, level, message, *a, **k: logged.append(message)
+    # ETH's TP triggered while the stream was still up: its placed order is looked up directly
+    om.state.apply_algo_update(_algo_event(1, 4, "TRIGGERED", symbol=f"ETH{q}", ai=904))
+
+    await om.check_order_executions()
+    await om.check_order_executions()  # within order_fill_poll_sec: no REST
+    assert Exchange.calls == [("open", btc), ("recent", btc), ("order", "901"), ("open", eth), ("order", "904")]
+    assert logged == [f"Take profit executed: {btc} @ 101.0", f"Take profit executed: {eth} @ 99.0"]
+
+    Exchange.calls.clear()
+    om._last_fill_poll = 0.0
+    await om.check_order_executions()  # settled orders are not looked up again
+    assert Exchange.calls == [("open", btc), ("open", eth)]
+
+    Exchange.calls.clear()
+    om.state.attach_stream()  # fills now come from events
+    om._last_fill_poll = 0.0
+    await om.check_order_executions()
+    assert Exchange.calls == []
+
+
+@pytest.mark.asyncio
+async def test_entry_fill_awaits_event_by_client_id(order_manager):
+    om = order_manager
+    q = om.exchange.config.resolved_quote_coin
+    symbol = f"SOL/{q}:{q}"
+    om.state.attach_stream()
+    om.config.entry_fill_timeout_sec = 0.2
+
+    rest = []
+
+    async def get_order(order_id, sym):
+        rest.append(order_id)
+        return {"id": order_id, "filled": 3.0}
+
+    om.exchange.get_order = get_order
+
+    # An earlier order reused the same clientOrderId: it must not satisfy the new entry
+    om.state.apply_order_update(_order_event(1, 10, "FILLED", "9", symbol=f"SOL{q}", c="entry-1"))
+
+    async def fill_later():
+        await asyncio.sleep(0.01)
+        await om.handle_ws_event(_order_event(2, 11, "PARTIALLY_FILLED", "1", symbol=f"SOL{q}", c="entry-1"))
+        await om.handle_ws_event(_order_event(3, 11, "FILLED", "4", symbol=f"SOL{q}", c="entry-1"))
+
+    started = time.perf_counter()
+    task = asyncio.create_task(fill_later())
+    ack = {"id": "11", "status": "open", "filled": 0.0}
+    assert await om._entry_filled_qty(symbol, ack, "entry-1", 4.0) == (4.0, "event")
+    assert time.perf_counter() - started < 0.15 and rest == []
+    await task
+
+    # Event already in before anyone waits; a filled response needs no wait at all
+    assert await om._entry_filled_qty(symbol, ack, "entry-1", 4.0) == (4.0, "event")
+    assert await om._entry_filled_qty(symbol, {"id": "12", "status": "closed", "filled": 2.0}, "x", 2.0) == (
+        2.0,
+        "response",
+    )
+
+    # No event within the timeout: one REST lookup
+    assert await om._entry_filled_qty(symbol, {"id": "13", "status": "open"}, "entry-2", 3.0) == (3.0, "rest")
+    assert rest == ["13"] and om.state._waiters == {}
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Direct order transport: signing, ccxt-shaped replies, ccxt error classes, client routing."""
+
+import hashlib
+import hmac
+from urllib.parse import parse_qsl
+
+import ccxt.async_support as ccxt
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from core.order_transport import OrderTransport, binance_exceptions
+
+SECRET = "s3cr3t"
+SEEN = web.AppKey("seen", list)
+
+
+def _usdt_market(base: str) -> dict:
+    filters = [
+        {"filterType": "PRICE_FILTER", "tickSize": "0.10", "minPrice": "1", "maxPrice": "1000000"},
+        {"filterType": "LOT_SIZE", "stepSize": "0.001", "minQty": "0.001", "maxQty": "1000"},
+        {"filterType": "MIN_NOTIONAL", "notional": "5"},
+    ]
+    return {
+        "symbol": f"{base}/USDT:USDT",
+        "id": f"{base}USDT",
+        "quote": "USDT",
+        "settle": "USDT",
+        "contract": True,
+        "info": {"symbol": f"{base}USDT", "filters": filters},
+    }
+
+
+def _signed_ok(request: web.Request) -> bool:
+    query = request.query_string
+    payload, _, signature = query.rpartition("&signature=")
+    expected = hmac.new(SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest()
+    return signature == expected and request.headers.get("X-MBX-APIKEY") == "key"
+
+
+async def _order(request: web.Request) -> web.Response:
+    if not _signed_ok(request):
+        return web.json_response({"code": -1022, "msg": "Signature for this request is not valid."}, status=400)
+    params = dict(parse_qsl(request.query_string))
+    request.app[SEEN].append((request.method, params))
+    if params.get("quantity") == "999":
+        return web.json_response({"code": -2019, "msg": "Margin is insufficient."}, status=400)
+    status = "CANCELED" if request.method == "DELETE" else "FILLED"
+    return web.json_response(
+        {
+            "orderId": 42,
+            "symbol": params["symbol"],
+            "status": status,
+            "clientOrderId": params.get("newClientOrderId", "x"),
+            "price": "0",
+            "avgPrice": "100.5",
+            "origQty": params.get("quantity", "0.01"),
+            "executedQty": params.get("quantity", "0.01"),
+            "type": params.get("type", "MARKET"),
+            "side": params.get("side", "BUY"),
+            "reduceOnly": params.get("reduceOnly") == "true",
+            "timeInForce": "GTC",
+            "stopPrice": "0",
+            "updateTime": 1700000000000,
+        },
+        headers={"X-MBX-ORDER-COUNT-10S": "1"},
+    )
+
+
+@pytest_asyncio.fixture
+async def server():
+    app = web.Application()
+    app[SEEN] = []
+    app.router.add_route("*", "/fapi/v1/order", _order)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    yield app, f"http://127.0.0.1:{port}/fapi/v1"
+    await runner.cleanup()
+
+
+@pytest.fixture
+def binance_errors():
+    return binance_exceptions(ccxt.binance())
+
+
+@pytest.mark.asyncio
+async def test_signed_order_round_trip(server, binance_errors):
+    app, base = server
+    transport = OrderTransport("key", SECRET, base_url=base, exceptions=binance_errors)
+    try:
+        order = await transport.create_order(
+            "BTCUSDC", "BTC/USDC:USDC", "market", "sell", 0.00001, None, {"reduceOnly": True, "newClientOrderId": "c1"}
+        )
+        assert order["id"] == "42" and order["status"] == "closed"
+        assert order["symbol"] == "BTC/USDC:USDC" and order["side"] == "sell" and order["type"] == "market"
+        assert order["filled"] == 0.00001 and order["average"] == 100.5 and order["price"] is None
+        assert order["clientOrderId"] == "c1" and order["info"]["orderId"] == 42
+
+        method, params = app[SEEN][0]
+        assert method == "POST" and params["quantity"] == "0.00001" and params["reduceOnly"] == "true"
+        assert "timeInForce" not in params
+
+        cancelled = await transport.cancel_order("42", "BTCUSDC", "BTC/USDC:USDC")
+        assert cancelled["status"] == "canceled" and app[SEEN][1][0] == "DELETE"
+        assert transport.last_response_headers["X-MBX-ORDER-COUNT-10S"] == "1"
+        assert transport.snapshot()["POST order"]["samples"] == 1
+    finally:
+        await transport.close()
+
+
+@pytest.mark.asyncio
+async def test_errors_use_ccxt_exception_classes(server, binance_errors):
+    _, base = server
+    transport = OrderTransport("key", SECRET, base_url=base, exceptions=binance_errors)
+    bad_key = OrderTransport("key", "wrong", base_url=base, exceptions=binance_errors)
+    down = OrderTransport("key", SECRET, base_url="http://127.0.0.1:9/fapi/v1", timeout=1.0)
+    try:
+        with pytest.raises(ccxt.InsufficientFunds):
+            await transport.create_order("BTCUSDC", "BTC/USDC:USDC", "limit", "buy", 999, 100.0)
+        with pytest.raises(ccxt.AuthenticationError):
+            await bad_key.create_order("BTCUSDC", "BTC/USDC:USDC", "market", "buy", 0.01)
+        with pytest.raises(ccxt.NetworkError):
+            await down.create_order("BTCUSDC", "BTC/USDC:USDC", "market", "buy", 0.01)
+        assert transport.stats["errors"] == 1
+    finally:
+        for t in (transport, bad_key, down):
+            await t.close()
+
+
+def test_only_plain_orders_are_supported():
+    assert OrderTransport.supports("market", {"reduceOnly": True})
+    assert OrderTransport.supports("limit", None)
+    assert not OrderTransport.supports("STOP_MARKET", {"stopPrice": 1.0})
+    assert not OrderTransport.supports("market", {"closePosition": True})
+    assert not OrderTransport.supports("market", {"test": True})
+
+
+@pytest.mark.asyncio
+async def test_client_routes_plain_orders_to_transport(exchange_client, server):
+    app, base = server
+
+    class RawExchange:
+        ccxt_orders = []
+
+        async def create_order(self, symbol, type, side, amount, price=None, params=None):
+            self.ccxt_orders.append(type)
+            return {"id": "ccxt"}
+
+        async def close(self):
+            pass
+
+    exchange_client.config.dry_run = False
+    exchange_client.exchange = RawExchange()
+    exchange_client.market_registry.build({"BTC/USDT:USDT": _usdt_market("BTC")}, "USDT")
+    transport = OrderTransport("key", SECRET, base_url=base)
+    transport.fetch = exchange_client._guard_fetch(transport, transport.fetch)
+    exchange_client.order_transport = transport
+
+    order = await exchange_client.create_order("BTC/USDT:USDT", "market", "sell", 0.01, None, {"reduceOnly": True})
+    assert order["id"] == "42" and app[SEEN][0][1]["symbol"] == "BTCUSDT"
+    stop = await exchange_client.create_order(
+        "BTC/USDT:USDT", "STOP_MARKET", "sell", 0.01, None, {"stopPrice": 90.0, "reduceOnly": True}
+    )
+    assert stop["id"] == "ccxt" and exchange_client.exchange.ccxt_orders == ["STOP_MARKET"]
+    assert exchange_client.health.breakers["order"].stats["requests"] == 1
+
+    # The direct path applies the tick/step grid ccxt would have applied
+    await exchange_client.create_order("BTC/USDT:USDT", "limit", "buy", 0.0129, 100.47, {})
+    assert (app[SEEN][-1][1]["price"], app[SEEN][-1][1]["quantity"]) == ("100.4", "0.012")
+    # Unknown filters: left to ccxt's precision handling
+    await exchange_client.create_order("ETH/USDT:USDT", "market", "buy", 0.0129, None, {})
+    assert exchange_client.exchange.ccxt_orders == ["STOP_MARKET", "market"]
+    assert "order_transport" in exchange_client.request_stats()
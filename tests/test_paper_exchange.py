@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Dry-run paper exchange: local fills, triggers, reduce-only, margin, synthetic user-data events."""
+
+import asyncio
+
+import ccxt.async_support as ccxt
+import pytest
+
+from core.paper_exchange import PaperExchange
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+class RawExchange:
+    """Market data only; any order/account call is recorded as a leak."""
+
+    def __init__(self):
+        self.price = 100.0
+        self.leaks = []
+        self.markets = {SYMBOL: {"id": "BTCUSDT"}}
+
+    async def fetch_ticker(self, symbol):
+        p = self.price
+        return {"symbol": symbol, "last": p, "bid": p - 0.1, "ask": p + 0.1}
+
+    def __getattr__(self, name):
+        if name.startswith(("create_", "cancel_", "fetch_", "set_", "edit_")):
+
+            async def leak(*args, **kwargs):
+                self.leaks.append(name)
+
+            return leak
+        raise AttributeError(name)
+
+    async def close(self):
+        pass
+
+
+def _paper(raw, events):
+    async def price_source(symbol):
+        return await raw.fetch_ticker(symbol)
+
+    return PaperExchange(
+        raw,
+        quote="USDT",
+        balance=1000.0,
+        price_source=price_source,
+        market_id=lambda s: s.split("/")[0] + "USDT",
+        taker_fee=0.001,
+        maker_fee=0.0,
+        default_leverage=5,
+        on_event=events.append,
+    )
+
+
+@pytest.mark.asyncio
+async def test_market_entry_and_stop_exit_book_pnl():
+    raw, events = RawExchange(), []
+    paper = _paper(raw, events)
+
+    entry = await paper.create_order(SYMBOL, "market", "buy", 1.0, None, {"newClientOrderId": "e1"})
+    assert entry["status"] == "closed" and entry["average"] == pytest.approx(100.1)
+    trade = [e["o"] for e in events if e["e"] == "ORDER_TRADE_UPDATE" and e["o"]["x"] == "TRADE"][0]
+    assert trade["s"] == "BTCUSDT" and trade["X"] == "FILLED" and trade["c"] == "e1" and trade["N"] == "USDT"
+    account = [e for e in events if e["e"] == "ACCOUNT_UPDATE"][-1]["a"]
+    assert account["P"][0]["pa"] == "1.0"
+    assert len({e["E"] for e in events}) == len(events)  # distinct timestamps survive de-duplication
+
+    with pytest.raises(ccxt.OrderImmediatelyFillable):
+        await paper.create_order(SYMBOL, "STOP_MARKET", "sell", 1.0, None, {"stopPrice": 101.0, "reduceOnly": True})
+    stop = await paper.create_order(SYMBOL, "STOP_MARKET", "sell", 1.0, None, {"stopPrice": 95.0, "reduceOnly": True})
+    positions = await paper.fetch_positions([SYMBOL])
+    assert positions[0]["side"] == "long" and positions[0]["info"]["positionAmt"] == "1.0"
+
+    raw.price = 96.0
+    await paper.evaluate(SYMBOL)
+    assert (await paper.fetch_order(stop["id"], SYMBOL))["status"] == "open"
+    raw.price = 94.0
+    await paper.evaluate(SYMBOL)
+    closed = await paper.fetch_order(None, SYMBOL, {"origClientOrderId": stop["clientOrderId"]})
+    assert closed["status"] == "closed" and closed["average"] == pytest.approx(93.9)
+    exit_fill = [e["o"] for e in events if e["e"] == "ORDER_TRADE_UPDATE" and e["o"]["x"] == "TRADE"][-1]
+    assert exit_fill["ot"] == "STOP_MARKET" and float(exit_fill["rp"]) == pytest.approx(-6.2)
+
+    fees = 100.1 * 0.001 + 93.9 * 0.001
+    balance = await paper.fetch_balance()
+    assert balance["total"]["USDT"] == pytest.approx(1000.0 - 6.2 - fees)
+    assert await paper.fetch_positions() == [] or (await paper.fetch_positions())[0]["contracts"] == 0
+    assert raw.leaks == []
+
+
+@pytest.mark.asyncio
+async def test_reduce_only_limits_and_margin():
+    raw, events = RawExchange(), []
+    paper = _paper(raw, events)
+
+    tp = await paper.create_order(SYMBOL, "limit", "sell", 1.0, 110.0, {"reduceOnly": True})
+    raw.price = 111.0
+    await paper.evaluate(SYMBOL)  # nothing to reduce
+    assert (await paper.fetch_order(tp["id"]))["status"] == "expired"
+    assert events[-1]["o"]["X"] == "EXPIRED"
+
+    with pytest.raises(ccxt.InsufficientFunds):
+        await paper.create_order(SYMBOL, "market", "buy", 100.0)  # 11100 notional / 5x > 1000
+
+    raw.price = 100.0
+    await paper.set_leverage(10, SYMBOL)
+    await paper.create_order(SYMBOL, "market", "sell", 2.0)
+    bid = await paper.create_order(SYMBOL, "limit", "buy", 1.0, 98.0, {"reduceOnly": True})
+    await paper.edit_order(bid["id"], SYMBOL, "limit", "buy", 1.0, 99.0)
+    assert (await paper.fetch_open_orders(SYMBOL))[0]["price"] == 99.0
+    raw.price = 98.5
+    await paper.evaluate(SYMBOL)
+    position = (await paper.fetch_positions([SYMBOL]))[0]
+    assert position["side"] == "short" and position["contracts"] == 1.0 and position["leverage"] == 10
+    assert position["entryPrice"] == pytest.approx(99.9)
+
+    await paper.cancel_all_orders(SYMBOL)
+    assert await paper.fetch_open_orders() == []
+    with pytest.raises(ccxt.OrderNotFound):
+        await paper.cancel_order(bid["id"], SYMBOL)
+    assert raw.leaks == []
+
+
+@pytest.mark.asyncio
+async def test_client_dry_run_routes_through_simulator(exchange_client):
+    raw = RawExchange()
+    exchange_client.config.dry_run = True
+    exchange_client.exchange = raw
+    await exchange_client._init_simulator()
+    events = []
+    exchange_client.simulator.on_event = events.append
+    await exchange_client.simulator.stop()
+    exchange_client.simulator.poll_interval = 0.01
+    await exchange_client.simulator.start()
+
+    order = await exchange_client.create_order(SYMBOL, "market", "buy", 0.5, None, {"newClientOrderId": "d1"})
+    assert order["status"] == "closed" and exchange_client.exchange is exchange_client.simulator
+    stop = await exchange_client.create_order(
+        SYMBOL, "STOP_MARKET", "sell", 0.5, None, {"stopPrice": 90.0, "reduceOnly": True}
+    )
+    raw.price = 89.0
+    exchange_client.single_flight.invalidate("get_ticker")  # 1s ticker cache
+    await asyncio.sleep(0.2)  # the watch loop triggers the stop
+    assert (await exchange_client.exchange.fetch_order(stop["id"], SYMBOL))["status"] == "closed"
+    assert await exchange_client.get_position(SYMBOL) is None
+    assert await exchange_client.get_quote_balance() < exchange_client.config.trading_deposit
+    assert "paper" in exchange_client.request_stats()
+    assert raw.leaks == [] and any(e["e"] == "ACCOUNT_UPDATE" for e in events)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Position snapshot: one REST fetch per cycle, ACCOUNT_UPDATE deltas, per-symbol reads from memory."""
+
+import pytest
+
+
+class RawExchange:
+    def __init__(self, positions):
+        self.positions = positions
+        self.calls = 0
+
+    async def fetch_positions(self, symbols=None):
+        self.calls += 1
+        return self.positions
+
+    async def close(self):
+        pass
+
+
+def _pos(symbol, contracts, mark=100.0):
+    return {"symbol": symbol, "contracts": contracts, "side": "long", "markPrice": mark, "unrealizedPnl": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_monitor_positions_uses_single_fetch(order_manager):
+    ex = order_manager.exchange
+    ex.exchange = RawExchange([_pos("BTC/USDT:USDT", 1), _pos("ETH/USDT:USDT", 2), _pos("SOL/USDT:USDT", 0)])
+    for sym in ("BTC/USDT:USDT", "ETH/USDT:USDT", "XRP/USDT:USDT"):
+        order_manager.active_positions[sym] = {"side": "buy", "size": 1}
+
+    cancelled = []
+
+    async def cancel_all_orders(symbol):
+        cancelled.append(symbol)
+
+    order_manager.cancel_all_orders = cancel_all_orders
+    await order_manager.monitor_positions()
+
+    assert ex.exchange.calls == 1
+    assert set(order_manager.active_positions) == {"BTC/USDT:USDT", "ETH/USDT:USDT"}
+    assert cancelled == ["XRP/USDT:USDT"]
+    assert order_manager.active_positions["BTC/USDT:USDT"]["mark_price"] == 100.0
+
+
+@pytest.mark.asyncio
+async def test_account_update_applies_and_beats_older_rest(exchange_client):
+    exchange_client.config._quote_coin_override = "USDT"
+    snap = exchange_client.position_snapshot
+    exchange_client.exchange = RawExchange([_pos("BTC/USDT:USDT", 1)])
+    assert (await snap.get("BTC/USDT:USDT"))["contracts"] == 1
+
+    snap.apply_account_update({"e": "ACCOUNT_UPDATE", "a": {"P": [{"s": "BTCUSDT", "pa": "0", "up": "0"}]}})
+    snap.apply_account_update({"e": "ACCOUNT_UPDATE", "a": {"P": [{"s": "ETHUSDT", "pa": "-3", "ep": "2000"}]}})
+    assert await snap.get("BTC/USDT:USDT") is None
+    eth = await snap.get("ETH/USDT:USDT")
+    assert eth["contracts"] == 3 and eth["side"] == "short" and eth["markPrice"] == 2000.0
+    assert exchange_client.exchange.calls == 1
+
+    # A REST snapshot requested before the event must not resurrect BTC; newer events always win
+    snap._ws_updated["BTC/USDT:USDT"] += 3600
+    exchange_client.single_flight.invalidate()
+    await snap.refresh(force=True)
+    assert await snap.get("BTC/USDT:USDT") is None
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_per_symbol_when_snapshot_fails(exchange_client):
+    class Failing(RawExchange):
+        async def fetch_positions(self, symbols=None):
+            raise RuntimeError("boom")
+
+    exchange_client.exchange = Failing([])
+    seen = []
+
+    async def get_position(symbol):
+        seen.append(symbol)
+        return None
+
+    exchange_client.get_position = get_position
+    assert await exchange_client.position_snapshot.get("BTC/USDT:USDT") is None
+    assert seen == ["BTC/USDT:USDT"] and exchange_client.position_snapshot.stats["fallbacks"] == 1
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Weight-aware token bucket: endpoint weights, concurrent admission, header correction."""
+
+import asyncio
+import time
+
+import pytest
+
+from core.rate_limiter import (
+    RequestShed,
+    WeightRateLimiter,
+    endpoint_cost,
+    priority_scope,
+    request_priority,
+    with_priority,
+)
+
+
+def test_endpoint_costs():
+    base = "https://fapi.binance.com"
+    assert endpoint_cost("GET", f"{base}/fapi/v1/klines?symbol=BTCUSDC&limit=150") == (2, 0)
+    assert endpoint_cost("GET", f"{base}/fapi/v1/klines?symbol=BTCUSDC&limit=1500") == (10, 0)
+    assert endpoint_cost("GET", f"{base}/fapi/v1/openOrders?symbol=BTCUSDC") == (1, 0)
+    assert endpoint_cost("GET", f"{base}/fapi/v1/openOrders") == (40, 0)
+    assert endpoint_cost("GET", f"{base}/fapi/v2/positionRisk") == (5, 0)
+    assert endpoint_cost("POST", f"{base}/fapi/v1/order", "symbol=BTCUSDC&side=BUY") == (0, 1)
+    assert endpoint_cost("DELETE", f"{base}/fapi/v1/order?symbol=BTCUSDC&orderId=1") == (1, 0)
+    batch = "batchOrders=" + '[{"symbol":"BTCUSDC"},{"symbol":"BTCUSDC"}]'
+    assert endpoint_cost("POST", f"{base}/fapi/v1/batchOrders", batch) == (5, 2)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_within_budget_do_not_wait():
+    limiter = WeightRateLimiter(weight_per_minute=600, safety=1.0)
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire(5) for _ in range(100)))
+    assert time.monotonic() - start < 0.05
+    assert limiter.stats["waits"] == 0
+    assert limiter.weight.tokens == pytest.approx(100, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_overdraw_waits_for_refill():
+    limiter = WeightRateLimiter(weight_per_minute=600, safety=1.0)  # 10 weight/s
+    limiter.weight.tokens = 0.0
+    start = time.monotonic()
+    await limiter.acquire(2, priority="critical")
+    assert 0.15 <= time.monotonic() - start < 0.5
+    assert limiter.stats["waits"] == 1
+
+
+def test_headers_tighten_budget_and_ban_blocks():
+    limiter = WeightRateLimiter(weight_per_minute=2400, safety=0.9)
+    limiter.update_from_headers({"X-MBX-USED-WEIGHT-1M": "2000", "X-MBX-ORDER-COUNT-10S": "5"})
+    assert limiter.weight.tokens == pytest.approx(160, abs=1)
+    assert limiter.orders_10s.tokens == pytest.approx(265, abs=1)
+    # A lower reading inside the same window never loosens the budget
+    limiter.update_from_headers({"x-mbx-used-weight-1m": "10"})
+    assert limiter.weight.tokens < 200
+
+    limiter.penalize(30)
+    assert limiter.weight.tokens == 0 and limiter.stats["bans"] == 1
+    assert limiter._blocked_until - time.monotonic() == pytest.approx(30, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_client_hook_charges_path_weight(exchange_client):
+    class RawExchange:
+        last_response_headers = {}
+
+        async def fetch(self, url, method="GET", headers=None, body=None):
+            self.last_response_headers = {"X-MBX-USED-WEIGHT-1M": "1200"}
+            return {}
+
+        async def close(self):
+            pass
+
+    limiter = WeightRateLimiter(weight_per_minute=2400, safety=1.0)
+    exchange_client.rate_limiter = limiter
+    exchange_client.exchange = RawExchange()
+    exchange_client._install_rate_limiter()
+
+    await exchange_client.exchange.fetch("https://fapi.binance.com/fapi/v1/openOrders")
+    assert limiter.stats["requests"] == 1
+    assert limiter.weight.tokens == pytest.approx(1200, abs=2)
+    # Hooked clients do not double-charge from _rate_limit
+    await exchange_client._rate_limit(weight=5)
+    assert limiter.stats["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_critical_preempts_queued_background_and_normal():
+    limiter = WeightRateLimiter(weight_per_minute=600, safety=1.0, max_background_wait=5.0)
+    limiter._blocked_until = time.monotonic() + 0.2  # everyone queues until the pause ends
+    order = []
+
+    async def call(priority, tag):
+        await limiter.acquire(1, priority=priority)
+        order.append(tag)
+
+    tasks = [asyncio.create_task(call("background", "bg")), asyncio.create_task(call("normal", "n"))]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(call("critical", "crit")))
+    await asyncio.gather(*tasks)
+    assert order == ["crit", "n", "bg"]
+    stats = limiter.queue_stats()
+    assert stats["critical"]["requests"] == 1 and stats["critical"]["avg_delay_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_background_shed_when_budget_low():
+    limiter = WeightRateLimiter(weight_per_minute=600, safety=1.0, max_background_wait=0.5)
+    limiter.weight.tokens = 100.0  # below the 25% background reserve (150)
+    with pytest.raises(RequestShed):
+        with priority_scope("background"):
+            await limiter.acquire(1)
+    await limiter.acquire(1, priority="normal")  # higher classes still pass
+    assert limiter.queue_stats()["background"]["shed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_method_priority_is_only_a_default():
+    limiter = WeightRateLimiter(weight_per_minute=600, safety=1.0, max_background_wait=0.5)
+
+    @with_priority("background")
+    async def get_ticker():
+        await limiter.acquire(1)
+
+    await get_ticker()
+    with priority_scope("critical"):  # e.g. pricing a stop loss
+        await get_ticker()
+    assert limiter.queue_stats()["background"]["requests"] == 1
+    assert limiter.queue_stats()["critical"]["requests"] == 1
+
+    limiter.weight.tokens = 100.0  # background would be shed; the entry path is not
+    with priority_scope("normal"):
+        await get_ticker()
+    with pytest.raises(RequestShed):
+        await get_ticker()
+
+
+@pytest.mark.asyncio
+async def test_auto_profit_prices_as_normal_and_closes_as_critical(order_manager):
+    om = order_manager
+    om.config.auto_profit_enabled = True
+    om.active_positions["BTC/USDC:USDC"] = {"side": "buy", "entry_price": 100.0, "timestamp": time.time()}
+    seen = []
+
+    async def get_ticker(symbol):
+        seen.append(("ticker", request_priority.get()))
+        return {"last": 100.0 * (1 + om.config.bonus_profit_threshold / 100) + 1}
+
+    async def close_position_market(symbol):
+        seen.append(("close", request_priority.get()))
+        return True
+
+    om.exchange.get_ticker = get_ticker
+    om.close_position_market = close_position_market
+    await om.check_auto_profit()
+    assert seen == [("ticker", "normal"), ("close", "critical")]
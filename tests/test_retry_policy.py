@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Retry policy: jittered backoff for reads, hedging after p95, clientOrderId-safe order retries."""
+
+import asyncio
+
+import ccxt.async_support as ccxt
+import pytest
+
+from core.retry_policy import LatencyWindow, RetryPolicy, backoff_delay
+
+
+def test_backoff_is_jittered_and_capped():
+    delays = [backoff_delay(5, base=0.2, cap=1.0) for _ in range(200)]
+    assert all(0 <= d <= 1.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+@pytest.mark.asyncio
+async def test_reads_retry_transport_errors_only():
+    policy = RetryPolicy(attempts=3, base_delay=0.001, max_delay=0.001)
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ccxt.RequestTimeout("timeout")
+        return "ok"
+
+    assert await policy.run("get_ticker", flaky) == "ok"
+    assert policy.stats["get_ticker"]["retries"] == 2
+
+    async def rejected():
+        raise ccxt.BadSymbol("unknown")
+
+    with pytest.raises(ccxt.BadSymbol):
+        await policy.run("get_order", rejected)
+    assert policy.stats["get_order"]["retries"] == 0
+    assert policy.stats["get_order"]["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_read_is_hedged_after_p95():
+    policy = RetryPolicy(hedge_methods=["get_ticker"], hedge_min_samples=5)
+    window = policy.latency.setdefault("get_ticker", LatencyWindow())
+    for _ in range(10):
+        window.add(0.01)
+
+    delays = iter([0.5, 0.0])  # first request stalls, the hedge answers at once
+
+    async def read():
+        await asyncio.sleep(next(delays))
+        return "tick"
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    assert await policy.run("get_ticker", read) == "tick"
+    assert loop.time() - start < 0.3
+    assert policy.stats["get_ticker"]["hedges"] == 1
+    assert policy.stats["get_ticker"]["hedge_wins"] == 1
+    assert policy.hedge_delay("get_ohlcv") is None  # not a hedged method
+
+
+@pytest.mark.asyncio
+async def test_order_without_client_id_is_not_retried():
+    policy = RetryPolicy(base_delay=0.001)
+    sends = []
+
+    async def send():
+        sends.append(1)
+        raise ccxt.RequestTimeout("timeout")
+
+    with pytest.raises(ccxt.RequestTimeout):
+        await policy.run_order(send)
+    assert len(sends) == 1
+
+
+@pytest.mark.asyncio
+async def test_order_retry_looks_up_client_id_first():
+    policy = RetryPolicy(base_delay=0.001, max_delay=0.001, order_attempts=2)
+
+    # Timed out but accepted: found by clientOrderId, not resent
+    sends = []
+
+    async def send_accepted():
+        sends.append(1)
+        raise ccxt.RequestTimeout("timeout")
+
+    async def found():
+        return {"id": "1", "clientOrderId": "cid"}
+
+    assert (await policy.run_order(send_accepted, found))["id"] == "1"
+    assert len(sends) == 1 and policy.stats["create_order"]["recovered"] == 1
+
+    # Timed out and never reached the exchange: resent once
+    attempts = []
+
+    async def send_lost():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ccxt.NetworkError("reset")
+        return {"id": "2"}
+
+    async def not_found():
+        raise ccxt.OrderNotFound("-2013")
+
+    assert (await policy.run_order(send_lost, not_found))["id"] == "2"
+    assert len(attempts) == 2 and policy.stats["create_order"]["retries"] == 1
+
+    # Business rejection: never retried
+    async def send_rejected():
+        raise ccxt.InsufficientFunds("-2019")
+
+    with pytest.raises(ccxt.InsufficientFunds):
+        await policy.run_order(send_rejected, found)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Server clock: RTT-compensated offset, drift, steps, -1021 resync-and-resend, client signing clock."""
+
+import time
+
+import ccxt.async_support as ccxt
+import pytest
+
+from core.retry_policy import RetryPolicy
+from core.server_time import ServerClock, is_clock_rejection
+
+
+class Host:
+    """Fake local wall clock plus a server clock `offset` ms ahead, drifting `drift` ms per second."""
+
+    def __init__(self, offset=2500.0, drift=0.0, rtts=(0.05,)):
+        self.t = 1_700_000_000.0
+        self.offset = offset
+        self.drift = drift
+        self.rtts = list(rtts)
+        self.calls = 0
+
+    def wall(self):
+        return self.t
+
+    def server_ms(self, at):
+        return at * 1000 + self.offset + self.drift * (at - 1_700_000_000.0)
+
+    async def fetch_time(self):
+        rtt = self.rtts[self.calls % len(self.rtts)]
+        self.calls += 1
+        # slow samples are asymmetric: most of the delay is on the way back
+        self.t += rtt * 0.1
+        stamp = self.server_ms(self.t)
+        self.t += rtt * 0.9
+        return int(stamp)
+
+
+@pytest.mark.asyncio
+async def test_offset_uses_fastest_round_trip():
+    host = Host(offset=2500.0, rtts=(0.400, 0.004, 0.200))
+    clock = ServerClock(host.fetch_time, samples=3, safety_ms=0, wall_clock=host.wall)
+    offset = await clock.sync()
+    assert offset == pytest.approx(2500.0, abs=3) and clock.last_rtt_ms == pytest.approx(4.0, abs=0.01)
+    assert clock.now_ms() == pytest.approx(host.server_ms(host.t), abs=3)
+
+    clock.safety_ms = 100
+    assert host.server_ms(host.t) - clock.now_ms() == pytest.approx(100, abs=3)  # biased into the past
+
+
+@pytest.mark.asyncio
+async def test_drift_is_tracked_and_steps_reset():
+    host = Host(offset=0.0, drift=0.5, rtts=(0.002,))  # server gains 0.5 ms/s = 500 ppm
+    clock = ServerClock(host.fetch_time, samples=1, alpha=0.5, safety_ms=0, wall_clock=host.wall)
+    for _ in range(12):
+        await clock.sync()
+        host.t += 60
+    assert clock.snapshot()["drift_ppm"] == pytest.approx(500, rel=0.05)
+    assert clock.now_ms() == pytest.approx(host.server_ms(host.t), abs=5)  # extrapolated 60 s ahead
+
+    host.offset += 5000  # host clock stepped back 5 s
+    await clock.sync()
+    assert clock.stats["steps"] == 1 and clock.drift == 0.0
+    assert clock.now_ms() == pytest.approx(host.server_ms(host.t), abs=5)
+    assert len(clock.snapshot()["history"]) == 10
+
+
+@pytest.mark.asyncio
+async def test_timestamp_rejection_is_resent_after_resync():
+    resyncs = []
+
+    async def resync():
+        resyncs.append(1)
+
+    policy = RetryPolicy(base_delay=0, max_delay=0, order_attempts=2)
+    policy.resync = resync
+    attempts = []
+
+    async def send():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ccxt.InvalidNonce(
+                'binance {"code":-1021,"msg":"Timestamp for this request is outside of the recvWindow."}'
+            )
+        return {"id": "1"}
+
+    async def lookup():
+        raise AssertionError("a -1021 rejection needs no lookup")
+
+    assert await policy.run_order(send, lookup) == {"id": "1"}
+    assert resyncs == [1] and policy.stats["create_order"]["clock_retries"] == 1
+
+    reads = []
+
+    async def read():
+        reads.append(1)
+        if len(reads) == 1:
+            raise ccxt.BadRequest('binance {"code":-1021,"msg":"..."}')
+        return 42
+
+    assert await policy.run("get_position", read) == 42 and len(resyncs) == 2
+    assert is_clock_rejection(ccxt.InvalidNonce("x")) and not is_clock_rejection(ccxt.BadRequest("-1022 signature"))
+
+
+@pytest.mark.asyncio
+async def test_client_signs_with_server_clock(exchange_client):
+    class RawExchange:
+        options = {"adjustForTimeDifference": True}
+        last_response_headers = {}
+
+        async def fetch_time(self):
+            return int(time.time() * 1000) - 3000  # host clock 3 s ahead of the exchange
+
+        async def fetch(self, url, method="GET", headers=None, body=None):
+            raise ccxt.InvalidNonce('binance {"code":-1021,"msg":"Timestamp ahead"}')
+
+        async def close(self):
+            pass
+
+    exchange_client.config.api_key, exchange_client.config.api_secret = "key", "secret"
+    exchange_client.exchange = RawExchange()
+    await exchange_client._init_server_clock()
+    clock = exchange_client.server_clock
+    assert exchange_client.exchange.nonce() == pytest.approx(time.time() * 1000 - 3100, abs=50)
+    assert exchange_client.exchange.options["adjustForTimeDifference"] is False
+    assert exchange_client.retry.resync == clock.resync
+
+    guarded = exchange_client._guard_fetch(exchange_client.exchange, exchange_client.exchange.fetch)
+    with pytest.raises(ccxt.InvalidNonce):
+        await guarded("https://fapi.binance.com/fapi/v1/order", "POST")
+    assert exchange_client.request_stats()["server_clock"]["rejections"] == 1
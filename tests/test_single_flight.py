@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Single-flight: concurrent identical reads share one request; short TTL reuse; writes invalidate."""
+
+import asyncio
+
+import pytest
+
+from core.rate_limiter import RequestShed, priority_scope
+from core.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_request():
+    sf = SingleFlight({"get_ticker": 0.0})
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"last": 1.0}
+
+    results = await asyncio.gather(*(sf.do("get_ticker", "BTC/USDC:USDC", fetch) for _ in range(5)))
+    assert calls == 1 and all(r is results[0] for r in results)
+    assert sf.stats["get_ticker"] == {"calls": 5, "hits": 0, "coalesced": 4, "fetches": 1}
+
+
+@pytest.mark.asyncio
+async def test_ttl_hit_error_not_cached_and_invalidate():
+    sf = SingleFlight({"get_position": 60.0})
+    outcomes = [RuntimeError("boom"), [{"contracts": 1}], [{"contracts": 0}]]
+
+    async def fetch():
+        out = outcomes.pop(0)
+        if isinstance(out, Exception):
+            raise out
+        return out
+
+    with pytest.raises(RuntimeError):
+        await sf.do("get_position", "BTC", fetch)
+    first = await sf.do("get_position", "BTC", fetch)  # error was not cached
+    assert await sf.do("get_position", "BTC", fetch) is first
+    assert sf.stats["get_position"]["hits"] == 1
+
+    sf.invalidate("get_position", "BTC")
+    assert (await sf.do("get_position", "BTC", fetch))[0]["contracts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_client_coalesces_ticker_reads(exchange_client):
+    calls = []
+
+    class RawExchange:
+        async def fetch_ticker(self, symbol):
+            calls.append(symbol)
+            await asyncio.sleep(0.01)
+            return {"symbol": symbol, "last": 100.0}
+
+        async def close(self):
+            pass
+
+    exchange_client.exchange = RawExchange()
+    tickers = await asyncio.gather(*(exchange_client.get_ticker("BTC/USDC:USDC") for _ in range(4)))
+    assert calls == ["BTC/USDC:USDC"] and tickers[0]["last"] == 100.0
+    await exchange_client.get_ticker("BTC/USDC:USDC")  # within TTL
+    assert len(calls) == 1
+    assert exchange_client.single_flight.stats["get_ticker"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_urgent_caller_does_not_join_background_leader():
+    sf = SingleFlight({"get_ticker": 0.0})
+    started = asyncio.Event()
+    calls = []
+
+    async def shed_fetch():
+        calls.append("background")
+        started.set()
+        await asyncio.sleep(0.02)
+        raise RequestShed("background shed")
+
+    async def fetch():
+        calls.append("critical")
+        return {"last": 1.0}
+
+    async def background():
+        with priority_scope("background"):
+            return await sf.do("get_ticker", "BTC", shed_fetch)
+
+    async def critical():
+        await started.wait()
+        with priority_scope("critical"):
+            return await sf.do("get_ticker", "BTC", fetch)
+
+    bg, crit = await asyncio.gather(background(), critical(), return_exceptions=True)
+    assert isinstance(bg, RequestShed) and crit == {"last": 1.0}
+    assert calls == ["background", "critical"]
+
+    # A background caller still shares a more urgent leader's request
+    async def slow():
+        calls.append("slow")
+        await asyncio.sleep(0.01)
+        return {"last": 2.0}
+
+    async def in_scope(priority):
+        with priority_scope(priority):
+            return await sf.do("get_ticker", "ETH", slow)
+
+    results = await asyncio.gather(in_scope("critical"), in_scope("background"))
+    assert results[0] is results[1] and calls.count("slow") == 1
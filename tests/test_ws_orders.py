@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""WebSocket API orders: signed frames, id correlation, error classes, REST fallback on disconnect."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+
+import ccxt.async_support as ccxt
+import pytest
+import pytest_asyncio
+from aiohttp import WSMsgType, web
+
+from core.order_transport import binance_exceptions
+from core.ws_orders import WSOrderClient
+
+SECRET = "s3cr3t"
+STATE = web.AppKey("state", dict)
+
+
+def _signed_ok(params: dict) -> bool:
+    signature = params.pop("signature", "")
+    payload = "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+    return signature == hmac.new(SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest()
+
+
+async def _ws_api(request: web.Request) -> web.WebSocketResponse:
+    state = request.app[STATE]
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    state["sockets"].append(ws)
+    held = []
+    async for msg in ws:
+        if msg.type != WSMsgType.TEXT:
+            continue
+        frame = json.loads(msg.data)
+        params = dict(frame["params"])
+        state["frames"].append(frame)
+        limits = [{"rateLimitType": "ORDERS", "interval": "SECOND", "intervalNum": 10, "limit": 300, "count": 3}]
+        if not _signed_ok(params) or params["apiKey"] != "key":
+            reply = {"id": frame["id"], "status": 401, "error": {"code": -1022, "msg": "Signature invalid."}}
+        elif params.get("quantity") == "999":
+            reply = {"id": frame["id"], "status": 400, "error": {"code": -2019, "msg": "Margin is insufficient."}}
+        elif params.get("newClientOrderId") == "hang":
+            continue  # never answered
+        else:
+            status = {"order.place": "NEW", "order.cancel": "CANCELED", "order.modify": "NEW"}[frame["method"]]
+            result = {
+                "orderId": int(params.get("orderId", 7)),
+                "symbol": params["symbol"],
+                "status": status,
+                "clientOrderId": params.get("newClientOrderId", "x"),
+                "price": params.get("price", "0"),
+                "avgPrice": "0",
+                "origQty": params.get("quantity", "0.01"),
+                "executedQty": "0",
+                "type": params.get("type", "LIMIT"),
+                "side": params.get("side", "BUY"),
+                "updateTime": 1700000000000,
+            }
+            reply = {"id": frame["id"], "status": 200, "result": result, "rateLimits": limits}
+        held.append(reply)
+        if len(held) >= state["answer_in_pairs"]:
+            for r in reversed(held):  # out of order
+                await ws.send_str(json.dumps(r))
+            held.clear()
+    return ws
+
+
+@pytest_asyncio.fixture
+async def server():
+    app = web.Application()
+    app[STATE] = {"frames": [], "sockets": [], "answer_in_pairs": 1}
+    app.router.add_get("/ws-fapi/v1", _ws_api)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    yield app[STATE], f"http://127.0.0.1:{runner.addresses[0][1]}/ws-fapi/v1"
+    await runner.cleanup()
+
+
+@pytest_asyncio.fixture
+async def client(server):
+    _, url = server
+    c = WSOrderClient("key", SECRET, url=url, exceptions=binance_exceptions(ccxt.binance()), timeout=1.0)
+    await c.start()
+    assert await c.wait_connected(2.0)
+    yield c
+    await c.stop()
+
+
+@pytest.mark.asyncio
+async def test_replies_are_correlated_by_id(server, client):
+    state, _ = server
+    state["answer_in_pairs"] = 2
+    a, b = await asyncio.gather(
+        client.create_order("BTCUSDC", "BTC/USDC:USDC", "limit", "buy", 0.01, 100.0, {"newClientOrderId": "a"}),
+        client.create_order("BTCUSDC", "BTC/USDC:USDC", "limit", "buy", 0.02, 101.0, {"newClientOrderId": "b"}),
+    )
+    assert a["clientOrderId"] == "a" and a["amount"] == 0.01 and a["price"] == 100.0
+    assert b["clientOrderId"] == "b" and b["amount"] == 0.02 and b["status"] == "open"
+    assert state["frames"][0]["method"] == "order.place"
+    assert state["frames"][0]["params"]["timeInForce"] == "GTC"
+    assert client.last_response_headers == {"x-mbx-order-count-10s": "3"}
+
+    state["answer_in_pairs"] = 1
+    modified = await client.modify_order("7", "BTCUSDC", "BTC/USDC:USDC", "buy", 0.01, 99.5)
+    assert modified["price"] == 99.5 and state["frames"][-1]["method"] == "order.modify"
+    cancelled = await client.cancel_order("7", "BTCUSDC", "BTC/USDC:USDC")
+    assert cancelled["status"] == "canceled"
+    assert client.snapshot()["order.place"]["samples"] == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_timeouts_and_disconnect(server, client):
+    state, _ = server
+    with pytest.raises(ccxt.InsufficientFunds):
+        await client.create_order("BTCUSDC", "BTC/USDC:USDC", "market", "buy", 999)
+    with pytest.raises(ccxt.RequestTimeout):
+        await client.create_order("BTCUSDC", "BTC/USDC:USDC", "market", "buy", 1, None, {"newClientOrderId": "hang"})
+
+    pending = asyncio.create_task(
+        client.create_order("BTCUSDC", "BTC/USDC:USDC", "market", "buy", 1, None, {"newClientOrderId": "hang"})
+    )
+    await asyncio.sleep(0.1)
+    await state["sockets"][-1].close()
+    with pytest.raises(ccxt.NetworkError):
+        await pending
+    assert not client.connected
+    with pytest.raises(ccxt.NetworkError):
+        await client.cancel_order("7", "BTCUSDC", "BTC/USDC:USDC")
+    assert await client.wait_connected(3.0)  # reconnects in the background
+    assert client.stats["connects"] == 2
+
+
+@pytest.mark.asyncio
+async def test_exchange_client_falls_back_to_rest(exchange_client, server, client):
+    state, _ = server
+
+    class RawExchange:
+        rest = []
+
+        async def create_order(self, symbol, type, side, amount, price=None, params=None):
+            self.rest.append(params.get("newClientOrderId"))
+            return {"id": "rest"}
+
+        async def close(self):
+            pass
+
+    exchange_client.config.dry_run = False
+    exchange_client.exchange = RawExchange()
+    exchange_client.market_registry.build(
+        {"BTC/USDT:USDT": {"symbol": "BTC/USDT:USDT", "id": "BTCUSDT", "quote": "USDT", "contract": True}}, "USDT"
+    )
+    client.fetch = exchange_client._guard_fetch(client, client.fetch)
+    exchange_client.ws_orders = client
+
+    params = {"reduceOnly": True, "newClientOrderId": "ws1"}
+    order = await exchange_client.create_order("BTC/USDT:USDT", "market", "sell", 0.01, None, params)
+    assert order["id"] == "7" and state["frames"][-1]["params"]["symbol"] == "BTCUSDT"
+    assert exchange_client.health.breakers["order"].stats["requests"] == 1
+
+    await state["sockets"][-1].close()
+    await asyncio.sleep(0.1)
+    params = {"reduceOnly": True, "newClientOrderId": "rest1"}
+    order = await exchange_client.create_order("BTC/USDT:USDT", "market", "sell", 0.01, None, params)
+    assert order["id"] == "rest" and exchange_client.exchange.rest == ["rest1"]
+    assert exchange_client.request_stats()["ws_orders"]["disconnects"] == 1
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Compare order placement through ccxt, the direct signed REST transport and
+the WebSocket API client (offline).
+
+All paths talk to the same local aiohttp server that answers like
+`/fapi/v1/order` and `ws-fapi` `order.place`, so network time is near zero and the difference is the
+client-side cost: request building, signing, response parsing. Reports
+wall-clock latency percentiles and CPU time per order for each path (the
+server runs in the same process, so CPU includes its identical share).
+
+Usage:
+    python tools/bench_order_transport.py [--orders 2000] [--concurrency 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import ccxt.async_support as ccxt  # noqa: E402
+from aiohttp import WSMsgType, web  # noqa: E402
+
+from core.order_transport import OrderTransport, binance_exceptions  # noqa: E402
+from core.ws_orders import WSOrderClient  # noqa: E402
+
+SYMBOL, MARKET_ID = "BTC/USDC:USDC", "BTCUSDC"
+
+EXCHANGE_INFO = {
+    "timezone": "UTC",
+    "serverTime": 1700000000000,
+    "rateLimits": [],
+    "assets": [],
+    "symbols": [
+        {
+            "symbol": MARKET_ID,
+            "pair": MARKET_ID,
+            "contractType": "PERPETUAL",
+            "deliveryDate": 4133404800000,
+            "onboardDate": 1569398400000,
+            "status": "TRADING",
+            "baseAsset": "BTC",
+            "quoteAsset": "USDC",
+            "marginAsset": "USDC",
+            "pricePrecision": 1,
+            "quantityPrecision": 3,
+            "baseAssetPrecision": 8,
+            "quotePrecision": 8,
+            "underlyingType": "COIN",
+            "filters": [
+                {"minPrice": "556.80", "maxPrice": "4529764", "filterType": "PRICE_FILTER", "tickSize": "0.10"},
+                {"stepSize": "0.001", "filterType": "LOT_SIZE", "maxQty": "1000", "minQty": "0.001"},
+                {"stepSize": "0.001", "filterType": "MARKET_LOT_SIZE", "maxQty": "120", "minQty": "0.001"},
+                {"filterType": "MIN_NOTIONAL", "notional": "5"},
+            ],
+            "orderTypes": ["LIMIT", "MARKET", "STOP", "STOP_MARKET", "TAKE_PROFIT", "TAKE_PROFIT_MARKET"],
+            "timeInForce": ["GTC", "IOC", "FOK", "GTX"],
+        }
+    ],
+}
+
+
+def _reply(params: dict) -> dict:
+    qty = params.get("quantity", "0.001")
+    return {
+        "orderId": 4000000001,
+        "symbol": params.get("symbol", MARKET_ID),
+        "status": "NEW",
+        "clientOrderId": params.get("newClientOrderId", "bench"),
+        "price": "0.0",
+        "avgPrice": "0.00",
+        "origQty": qty,
+        "executedQty": "0",
+        "cumQty": "0",
+        "cumQuote": "0",
+        "timeInForce": "GTC",
+        "type": params.get("type", "MARKET"),
+        "reduceOnly": params.get("reduceOnly") == "true",
+        "closePosition": False,
+        "side": params.get("side", "BUY"),
+        "positionSide": "BOTH",
+        "stopPrice": "0",
+        "workingType": "CONTRACT_PRICE",
+        "priceProtect": False,
+        "origType": params.get("type", "MARKET"),
+        "updateTime": 1700000000000,
+    }
+
+
+async def _order(request: web.Request) -> web.Response:
+    params = dict(parse_qsl(request.query_string))
+    if request.can_read_body:
+        params.update(parse_qsl(await request.text()))
+    return web.json_response(_reply(params))
+
+
+async def _ws_api(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    async for msg in ws:
+        if msg.type == WSMsgType.TEXT:
+            frame = json.loads(msg.data)
+            await ws.send_str(json.dumps({"id": frame["id"], "status": 200, "result": _reply(frame["params"])}))
+    return ws
+
+
+async def _serve() -> tuple[web.AppRunner, str]:
+    app = web.Application()
+    app.router.add_route("*", "/fapi/v1/order", _order)
+    app.router.add_get("/fapi/v1/exchangeInfo", lambda r: web.json_response(EXCHANGE_INFO))
+    app.router.add_get("/ws-fapi/v1", _ws_api)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}"
+
+
+async def _measure(name: str, place, orders: int, concurrency: int) -> dict[str, float]:
+    for _ in range(min(50, orders)):  # warm up connections and caches
+        await place()
+    latencies: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            started = time.perf_counter()
+            await place()
+            latencies.append(time.perf_counter() - started)
+
+    cpu, wall = time.process_time(), time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(orders)))
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    latencies.sort()
+    return {
+        "path": name,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "cpu_us_per_order": cpu / orders * 1e6,
+        "orders_per_sec": orders / wall,
+    }
+
+
+async def main(orders: int, concurrency: int) -> None:
+    runner, base = await _serve()
+    raw = ccxt.binance(
+        {
+            "apiKey": "bench",
+            "secret": "bench",
+            "enableRateLimit": False,  # as in production: throttling is done by core.rate_limiter
+            "options": {"defaultType": "future", "fetchMarkets": {"types": ["linear"]}, "fetchCurrencies": False},
+        }
+    )
+    for key in list(raw.urls["api"]):
+        if key.startswith("fapi"):
+            raw.urls["api"][key] = raw.urls["api"][key].replace("https://fapi.binance.com", base)
+    transport = OrderTransport("bench", "bench", base_url=f"{base}/fapi/v1", exceptions=binance_exceptions(raw))
+    ws = WSOrderClient("bench", "bench", url=f"{base}/ws-fapi/v1", exceptions=binance_exceptions(raw))
+    try:
+        await raw.load_markets()
+        await ws.start()
+        await ws.wait_connected(5.0)
+
+        async def via_ccxt():
+            await raw.create_order(SYMBOL, "market", "buy", 0.001, None, {"newClientOrderId": "bench"})
+
+        async def via_transport():
+            await transport.create_order(MARKET_ID, SYMBOL, "market", "buy", 0.001, None, {"newClientOrderId": "bench"})
+
+        async def via_ws():
+            await ws.create_order(MARKET_ID, SYMBOL, "market", "buy", 0.001, None, {"newClientOrderId": "bench"})
+
+        rows = [
+            await _measure("ccxt", via_ccxt, orders, concurrency),
+            await _measure("direct", via_transport, orders, concurrency),
+            await _measure("ws", via_ws, orders, concurrency),
+        ]
+    finally:
+        await ws.stop()
+        await transport.close()
+        await raw.close()
+        await runner.cleanup()
+
+    print(f"{orders} market orders, concurrency {concurrency} (local server; client-side cost only)")
+    print(f"{'path':<8} {'p50 ms':>8} {'p95 ms':>8} {'CPU us/order':>13} {'orders/s':>9}")
+    for r in rows:
+        print(
+            f"{r['path']:<8} {r['p50_ms']:>8.3f} {r['p95_ms']:>8.3f} {r['cpu_us_per_order']:>13.0f} "
+            f"{r['orders_per_sec']:>9.0f}"
+        )
+    base_row = rows[0]
+    for r in rows[1:]:
+        print(
+            f"{r['path']} vs ccxt: p50 {r['p50_ms'] / base_row['p50_ms']:.2f}x, "
+            f"CPU {r['cpu_us_per_order'] / base_row['cpu_us_per_order']:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(main(args.orders, args.concurrency))
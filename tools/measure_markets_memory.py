@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Measure memory held by market metadata (offline, no API keys needed).
+
+Builds Binance USDⓈ-M-shaped exchangeInfo entries, parses them with ccxt and
+compares what stays resident:
+  1. all contracts as loaded by ccxt (load_markets default)
+  2. quote-coin contracts only (markets snapshot filter)
+  3. quote-coin contracts after registry indexing and `info` compaction
+
+Usage:
+    python tools/measure_markets_memory.py [--contracts 600] [--quote-share 0.06] [--quote USDC]
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import ccxt.async_support as ccxt  # noqa: E402
+
+from core.market_registry import MarketRegistry, deep_sizeof  # noqa: E402
+from core.markets_cache import filter_quote_markets  # noqa: E402
+
+
+def _raw_contract(i: int, quote: str) -> dict:
+    base = f"C{i:04d}"
+    return {
+        "symbol": f"{base}{quote}",
+        "pair": f"{base}{quote}",
+        "contractType": "PERPETUAL",
+        "deliveryDate": 4133404800000,
+        "onboardDate": 1569398400000,
+        "status": "TRADING",
+        "maintMarginPercent": "2.5000",
+        "requiredMarginPercent": "5.0000",
+        "baseAsset": base,
+        "quoteAsset": quote,
+        "marginAsset": quote,
+        "pricePrecision": 2,
+        "quantityPrecision": 3,
+        "baseAssetPrecision": 8,
+        "quotePrecision": 8,
+        "underlyingType": "COIN",
+        "underlyingSubType": ["Layer-1"],
+        "settlePlan": 0,
+        "triggerProtect": "0.0500",
+        "liquidationFee": "0.012500",
+        "marketTakeBound": "0.05",
+        "maxMoveOrderLimit": 10000,
+        "filters": [
+            {"minPrice": "556.80", "maxPrice": "4529764", "filterType": "PRICE_FILTER", "tickSize": "0.10"},
+            {"stepSize": "0.001", "filterType": "LOT_SIZE", "maxQty": "1000", "minQty": "0.001"},
+            {"stepSize": "0.001", "filterType": "MARKET_LOT_SIZE", "maxQty": "120", "minQty": "0.001"},
+            {"limit": 200, "filterType": "MAX_NUM_ORDERS"},
+            {"limit": 10, "filterType": "MAX_NUM_ALGO_ORDERS"},
+            {"notional": "100", "filterType": "MIN_NOTIONAL"},
+            {
+                "multiplierDown": "0.9500",
+                "multiplierUp": "1.0500",
+                "multiplierDecimal": "4",
+                "filterType": "PERCENT_PRICE",
+            },
+        ],
+        "orderTypes": [
+            "LIMIT",
+            "MARKET",
+            "STOP",
+            "STOP_MARKET",
+            "TAKE_PROFIT",
+            "TAKE_PROFIT_MARKET",
+            "TRAILING_STOP_MARKET",
+        ],
+        "timeInForce": ["GTC", "IOC", "FOK", "GTX", "GTD"],
+    }
+
+
+def _parsed_markets(exchange, contracts: int, quote_share: float, quote: str) -> list[dict]:
+    n_quote = max(1, int(contracts * quote_share))
+    raw = [_raw_contract(i, quote if i < n_quote else "USDT") for i in range(contracts)]
+    return [exchange.parse_market(m) for m in raw]
+
+
+def _resident(build, exchange) -> tuple[int, object]:
+    """tracemalloc bytes still allocated after `build(exchange)` returns (its result kept alive)."""
+    gc.collect()
+    tracemalloc.start()
+    result = build(exchange)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Market metadata memory footprint")
+    parser.add_argument("--contracts", type=int, default=600)
+    parser.add_argument("--quote-share", type=float, default=0.06, help="fraction of contracts in the quote coin")
+    parser.add_argument("--quote", default="USDC")
+    args = parser.parse_args()
+
+    template = ccxt.binanceusdm()
+    parsed = _parsed_markets(template, args.contracts, args.quote_share, args.quote)
+
+    def load_all(ex):
+        ex.set_markets(copy.deepcopy(parsed))
+        return ex
+
+    def load_quote(ex):
+        subset = copy.deepcopy(parsed)
+        ex.set_markets(filter_quote_markets(subset, args.quote))
+        return ex
+
+    def load_compact(ex):
+        load_quote(ex)
+        registry = MarketRegistry()
+        registry.build(ex.markets, args.quote)
+        registry.compact(ex.markets, ex.markets_by_id)
+        return ex, registry
+
+    rows = []
+    for label, build in (
+        ("all contracts (ccxt default)", load_all),
+        (f"{args.quote} contracts only", load_quote),
+        (f"{args.quote} + registry, compacted", load_compact),
+    ):
+        traced, result = _resident(build, ccxt.binanceusdm())
+        ex, registry = result if isinstance(result, tuple) else (result, None)
+        deep = deep_sizeof([ex.markets, ex.markets_by_id, registry.specs if registry else None])
+        rows.append((label, len(ex.markets), traced, deep))
+
+    print(f"{'variant':<36}{'markets':>9}{'traced KiB':>13}{'deep KiB':>11}")
+    for label, n, traced, deep in rows:
+        print(f"{label:<36}{n:>9}{traced / 1024:>13.1f}{deep / 1024:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,32 @@
 #!/usr/bin/env python3
 """Pre-trade validation filters"""
 
+from core.rate_limiter import with_priority
+from core.symbol_utils import to_binance_symbol
+
+# Max age (seconds) of a local order book before checks fall back to REST
+ORDER_BOOK_MAX_AGE_SEC = 2.0
+
+
+def _local_book(exchange, symbol: str, max_age_sec: float = ORDER_BOOK_MAX_AGE_SEC):
+    """Return a fresh LocalOrderBook for symbol if the exchange client maintains one."""
+    try:
+        books = getattr(exchange, "order_books", None)
+        book = books.get_book(symbol) if books else None
+        if book is not None and book.is_fresh(max_age_sec):
+            return book
+    except Exception:
+        pass
+    return None
+
 
 async def check_volume(exchange, symbol: str, size_usdc: float, mult: float = 100.0) -> bool:
-    """Check if 24h volume is sufficient"""
+    """Check if 24h volume is sufficient (live all-market table first, REST ticker as fallback)"""
     try:
+        table = getattr(exchange, "ticker_table", None)
+        if table is not None and table.is_fresh():
+            return table.quote_volume(to_binance_symbol(symbol)) >= size_usdc * mult
+
         ticker = await exchange.get_ticker(symbol)
         qv = float(ticker.get("quoteVolume", 0) or 0)
         return qv >= size_usdc * mult
@@ -13,9 +35,13 @@ async def check_volume(exchange, symbol: str, size_usdc: float, mult: float = 10
 
 
 async def check_spread(exchange, symbol: str, max_pct: float = 0.1) -> bool:
-    """Check bid-ask spread"""
+    """Check bid-ask spread (local order book first, REST ticker as fallback)"""
     try:
-        ticker = await exchange.get_ticker(symbol)
+        book = _local_book(exchange, symbol)
+        if book is not None:
+            return book.spread_pct is not None and book.spread_pct <= max_pct
+
+        ticker = await exchange.get_ticker(symbol, with_quotes=True)
         bid = float(ticker.get("bid", 0) or 0)
         ask = float(ticker.get("ask", 0) or 0)
 
@@ -32,13 +58,29 @@ async def check_spread(exchange, symbol: str, max_pct: float = 0.1) -> bool:
         return False
 
 
+def check_slippage(exchange, symbol: str, side: str, notional: float, max_pct: float) -> bool:
+    """Check expected market-order slippage against the local order book.
+
+    Passes when no fresh book is available: slippage cannot be estimated without depth,
+    and the spread check still guards the entry.
+    """
+    book = _local_book(exchange, symbol)
+    if book is None:
+        return True
+    slippage = book.estimate_slippage_pct(side, notional)
+    return slippage is not None and slippage <= max_pct
+
+
+@with_priority("normal")
 async def can_enter_position(
     order_manager,
     symbol: str,
     planned_margin_usdc: float,
+    side: str | None = None,
+    notional: float | None = None,
 ) -> tuple[bool, dict]:
     """
-    Run all pre-trade checks.
+    Run all pre-trade checks (their ticker/volume reads run as entry-path "normal" requests).
 
     Returns:
         (allowed, check_details) tuple
@@ -62,6 +104,15 @@ async def can_enter_position(
     else:
         checks["spread"] = await check_spread(exchange, symbol, max_spread)
 
+    # Slippage check from local depth (only when side/notional are known)
+    if side and notional:
+        try:
+            # max_slippage_pct is a fraction (0.02 == 2%)
+            max_slippage = float(getattr(order_manager.config, "max_slippage_pct", 0.02)) * 100.0
+        except Exception:
+            max_slippage = 2.0
+        checks["slippage"] = check_slippage(exchange, symbol, side, float(notional), max_slippage)
+
     # Position limit check
     max_positions = getattr(order_manager.config, "max_concurrent_positions", 2)
     checks["positions"] = order_manager.get_position_count() < max_positions
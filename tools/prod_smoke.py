@@ -6,6 +6,11 @@ Usage examples:
 
   BINANCE_TESTNET=true  python tools/prod_smoke.py --symbol XRP/USDT:USDT --usd 10 --leverage 3 --side BUY
   BINANCE_TESTNET=false python tools/prod_smoke.py --symbol XRP/USDC:USDC --usd 10 --leverage 3 --side BUY
+
+Record once against testnet, then replay offline (same arguments, no network):
+
+  python tools/prod_smoke.py --symbol XRP/USDT:USDT --usd 10 --record data/cassettes/smoke.jsonl
+  python tools/prod_smoke.py --symbol XRP/USDT:USDT --usd 10 --replay data/cassettes/smoke.jsonl
 """
 
 from __future__ import annotations
@@ -23,18 +28,29 @@ if str(REPO_ROOT) not in sys.path:
 
 from core.config import TradingConfig
 from core.exchange_client import OptimizedExchangeClient
+from core.market_registry import rules_for
 from core.order_manager import cleanup_stray_orders
 from core.precision import PrecisionError, normalize
 from core.unified_logger import UnifiedLogger, get_logger
 
 
-async def run_smoke(symbol: str, usd: float, leverage: int, side: str) -> int:
+async def run_smoke(
+    symbol: str,
+    usd: float,
+    leverage: int,
+    side: str,
+    cassette_mode: str | None = None,
+    cassette_path: str | None = None,
+    latency_scale: float = 0.0,
+) -> int:
     # Initialize unified logger for downstream components
     ulog = UnifiedLogger()
     logger = get_logger(tag="SMOKE")
     # Resolve testnet via unified config
     cfg = TradingConfig.from_env()
     cfg.dry_run = False
+    if cassette_mode:
+        cfg.cassette_mode, cfg.cassette_path, cfg.cassette_latency_scale = cassette_mode, cassette_path, latency_scale
 
     ex: OptimizedExchangeClient | None = None
     try:
@@ -44,7 +60,7 @@ async def run_smoke(symbol: str, usd: float, leverage: int, side: str) -> int:
 
         # Fetch market + mark price
         markets = await ex.get_markets()
-        market = markets.get(symbol, {})
+        market = rules_for(ex, symbol, markets.get(symbol, {}))
         ticker = await ex.get_ticker(symbol)
         last = (ticker or {}).get("last") or (ticker or {}).get("close")
         if last is None:
@@ -195,6 +211,10 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     p.add_argument("--usd", type=float, required=True, help="Dollar notional to allocate (pre-leverage)")
     p.add_argument("--leverage", type=int, default=3, help="Leverage to apply")
     p.add_argument("--side", type=str, default="BUY", help="BUY or SELL (default BUY)")
+    tape = p.add_mutually_exclusive_group()
+    tape.add_argument("--record", metavar="PATH", help="Record exchange traffic to a cassette file")
+    tape.add_argument("--replay", metavar="PATH", help="Replay a recorded cassette offline")
+    p.add_argument("--latency-scale", type=float, default=0.0, help="Replay: recorded latency x factor (default 0)")
     return p.parse_args(argv)
 
 
@@ -206,7 +226,18 @@ def main(argv: list[str]) -> int:
         except Exception:
             pass
     args = parse_args(argv)
-    return asyncio.run(run_smoke(symbol=args.symbol, usd=args.usd, leverage=args.leverage, side=args.side))
+    mode = "record" if args.record else ("replay" if args.replay else None)
+    return asyncio.run(
+        run_smoke(
+            symbol=args.symbol,
+            usd=args.usd,
+            leverage=args.leverage,
+            side=args.side,
+            cassette_mode=mode,
+            cassette_path=args.record or args.replay,
+            latency_scale=args.latency_scale,
+        )
+    )
 
 
 if __name__ == "__main__":
@@ -11,6 +11,9 @@ Testnet Smoke-Test for Binance USDC Futures Bot.
  - Forces TESTNET mode via env
  - Small size order
  - Cancels open orders at the end
+
+ Offline: CASSETTE_MODE=record (then replay) with CASSETTE_PATH=<file> records the
+ exchange traffic of one testnet run and replays it without network access.
 """
 
 import asyncio